@@ -1,4 +1,9 @@
 __author__ = "Bruno Lee J"
 __email__ = "brunoleej@gmail.com"
 
-from .extension import MobileExtension
+import importlib.util
+
+# The extension is only loaded by Kit. Without it, the numpy and pxr models of the logic package, e.g. the vehicle,
+# arm and sensor models, can still be imported from a plain python interpreter
+if importlib.util.find_spec("omni.ext") is not None:
+    from .extension import MobileExtension
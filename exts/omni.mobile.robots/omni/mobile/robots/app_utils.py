@@ -0,0 +1,54 @@
+"""
+| File: app_utils.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Helpers shared by the headless entry points (run, render_batch, benchmark, arm_benchmark) and the logic
+
+Nothing from omni is imported at the module level, so the entry points can import this module before they start the
+SimulationApp.
+"""
+
+__all__ = ["enable_extensions", "run_until_complete", "get_env_url", "get_rss"]
+
+import os
+import asyncio
+from typing import Optional, Sequence
+
+
+def enable_extensions(extensions: Sequence[str]):
+    """Enable extensions which are not part of the default SimulationApp experience, before their modules are imported"""
+    from omni.isaac.core.utils.extensions import enable_extension
+
+    for extension in extensions:
+        enable_extension(extension)
+
+
+def run_until_complete(simulation_app, coroutine):
+    """Run a coroutine on the Kit event loop, pumping the app until it is done"""
+    task = asyncio.ensure_future(coroutine)
+    while not task.done():
+        simulation_app.update()
+    return task.result()
+
+
+def get_env_url(env: str) -> str:
+    """Url of an environment, relative to /Isaac/Environments of the asset server unless it is a full url or path"""
+    from omni.mobile.robots.params import _asset_server
+
+    if "://" in env or env.startswith("/"):
+        return env
+    return _asset_server("/Isaac/Environments/" + env)
+
+
+def get_rss() -> Optional[int]:
+    """Resident memory of the process in bytes, None when it cannot be read"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
@@ -0,0 +1,172 @@
+"""
+| File: arm_benchmark.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Cost of one arm control tick against the number of robots, batched and with one call per robot
+
+Usage (from the Isaac Sim python, with exts/omni.mobile.robots in the python path):
+    python -m omni.mobile.robots.arm_benchmark --counts 1 16 64 256 1024 --output arm_control.json
+    python -m omni.mobile.robots.arm_benchmark --controller-only --counts 1 1024 65536 --output controller.json
+"""
+
+__all__ = ["measure_controller_cost", "main", "parse_args"]
+
+import sys
+import time
+import platform
+import argparse
+import numpy as np
+from typing import Any, Dict, List
+from omni.mobile.robots.benchmark import write_report
+from omni.mobile.robots.logic.arms.arm_spec import ARM_SPECS, ArmSpec
+from omni.mobile.robots.logic.arms.joint_controller import JointImpedanceController
+
+REPORT_KIND = "arm_control"
+
+
+def measure_controller_cost(num_robots: int, num_ticks: int, spec: ArmSpec = ARM_SPECS["FR3"]) -> float:
+    """Mean seconds of one JointImpedanceController tick of num_robots arms, on random joint states"""
+    rng = np.random.default_rng(0)
+    num_joints = len(spec.joint_names)
+    controller = JointImpedanceController(num_robots, spec)
+    positions = rng.uniform(spec.lower_limits, spec.upper_limits, size=(num_robots, num_joints))
+    velocities = rng.normal(0.0, 0.1, size=(num_robots, num_joints))
+    targets = np.asarray(spec.home_positions)
+    controller.compute(positions, velocities, targets)
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        controller.compute(positions, velocities, targets)
+    return (time.perf_counter() - start) / num_ticks
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m omni.mobile.robots.arm_benchmark",
+        description="Measure the cost of one control tick of all the arms against the number of robots",
+    )
+    parser.add_argument("--output", required=True, help="Json report to write")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 16, 64, 256, 1024], help="Numbers of robots")
+    parser.add_argument("--ticks", type=int, default=200, help="Control ticks measured per count")
+    parser.add_argument("--robot", default="FR3", choices=list(ARM_SPECS), help="Robot spawned in every copy")
+    parser.add_argument(
+        "--env", default="Grid/default_environment.usd", help="Environment of every copy, relative to /Isaac/Environments"
+    )
+    parser.add_argument(
+        "--loop-max", type=int, default=64,
+        help="Largest number of robots also measured with one articulation per robot, which is slow",
+    )
+    parser.add_argument(
+        "--controller-only", action="store_true", help="Only measure the controller, without starting Isaac Sim"
+    )
+    return parser.parse_args(argv)
+
+
+def _measure_simulation(simulation_app, args, num_robots: int) -> Dict[str, Any]:
+    """Spawn num_robots robots and time the batched ticks, and the ticks with one articulation per robot"""
+    from omni.isaac.core.articulations import Articulation
+    from omni.mobile.robots.params import get_robot_usd_path
+    from omni.mobile.robots.app_utils import get_env_url, run_until_complete
+    from omni.mobile.robots.logic.arms.arm_batch import ArmBatch
+    from omni.mobile.robots.logic.world.scene_cloner import SceneCloner
+    from omni.mobile.robots.logic.world.world_session import WorldSession
+
+    spec = ARM_SPECS[args.robot]
+    session = WorldSession(use_world_pool=False)
+    world = run_until_complete(simulation_app, session.create_world_async())
+    cloner = SceneCloner(world.stage)
+    env_paths = cloner.clone(get_env_url(args.env), num_robots, robot_usd_path=get_robot_usd_path(args.robot))
+    run_until_complete(simulation_app, world.reset_async())
+
+    arms = ArmBatch(f"{cloner.root_path}/env_.*/{SceneCloner.ROBOT_NAME}", spec)
+    arms.initialize(world.physics_sim_view)
+    arms.reset()
+    targets = np.asarray(spec.home_positions)
+    read_time = compute_time = write_time = 0.0
+    for _ in range(args.ticks):
+        world.step(render=False)
+        start = time.perf_counter()
+        state = arms.read_state()
+        read_end = time.perf_counter()
+        efforts = arms.controller.compute(state.positions, state.velocities, targets)
+        compute_end = time.perf_counter()
+        arms.write_efforts(efforts)
+        write_end = time.perf_counter()
+        read_time += read_end - start
+        compute_time += compute_end - read_end
+        write_time += write_end - compute_end
+
+    result = {
+        "robots": num_robots,
+        "read": read_time / args.ticks,
+        "compute": compute_time / args.ticks,
+        "write": write_time / args.ticks,
+        "tick": (read_time + compute_time + write_time) / args.ticks,
+        "loop_tick": None,
+    }
+
+    if num_robots <= args.loop_max:
+        # The same tick with one articulation, and one get and set call per quantity, per robot
+        robots = [Articulation(str(path.AppendChild(SceneCloner.ROBOT_NAME))) for path in env_paths]
+        for robot in robots:
+            robot.initialize(world.physics_sim_view)
+        controller = JointImpedanceController(1, spec)
+        loop_time = 0.0
+        for _ in range(args.ticks):
+            world.step(render=False)
+            start = time.perf_counter()
+            for robot in robots:
+                positions = robot.get_joint_positions(joint_indices=arms.joint_indices)
+                velocities = robot.get_joint_velocities(joint_indices=arms.joint_indices)
+                efforts = controller.compute(positions[None], velocities[None], targets)
+                robot.set_joint_efforts(efforts[0], joint_indices=arms.joint_indices)
+            loop_time += time.perf_counter() - start
+        result["loop_tick"] = loop_time / args.ticks
+
+    session.clear()
+    return result
+
+
+def _print_results(results: List[Dict[str, Any]]):
+    for result in results:
+        line = f"arm benchmark: {result['robots']:6d} robots, {result['tick'] * 1e6:9.1f} us per tick"
+        if "read" in result:
+            line += (f" (read {result['read'] * 1e6:.1f}, compute {result['compute'] * 1e6:.1f}, "
+                     f"write {result['write'] * 1e6:.1f})")
+        if result.get("loop_tick") is not None:
+            line += f", {result['loop_tick'] * 1e6:.1f} us with one articulation per robot"
+        print(line)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    metadata = {
+        "kind": REPORT_KIND,
+        "robot": args.robot,
+        "ticks": args.ticks,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+    }
+
+    if args.controller_only:
+        results = [{"robots": count, "tick": measure_controller_cost(count, args.ticks, ARM_SPECS[args.robot])}
+                   for count in args.counts]
+    else:
+        # SimulationApp must be started before anything from omni or pxr is imported
+        from omni.isaac.kit import SimulationApp
+
+        simulation_app = SimulationApp({"headless": True})
+        try:
+            results = [_measure_simulation(simulation_app, args, count) for count in args.counts]
+        finally:
+            simulation_app.close()
+
+    _print_results(results)
+    write_report(
+        args.output,
+        {"version": 1, "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "metadata": metadata, "results": results},
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""
+| File: benchmark.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Headless capture benchmark over environments, resolutions, render presets and output formats
+
+Usage (from the Isaac Sim python, with exts/omni.mobile.robots in the python path):
+    python -m omni.mobile.robots.benchmark --output results.json --label 1.1.0
+    python -m omni.mobile.robots.benchmark --env Simple_Room/simple_room.usd --resolution 720p --file-type .png \\
+        --output results.json --baseline previous_release.json
+"""
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "ResourceSampler",
+    "get_benchmark_cases",
+    "make_report",
+    "write_report",
+    "read_report",
+    "compare_reports",
+    "main",
+    "parse_args",
+]
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import itertools
+import tempfile
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from omni.mobile.robots.params import BENCHMARK_SETTINGS, SIMULATION_ENVIRONMENTS
+from omni.mobile.robots.app_utils import enable_extensions, get_env_url, get_rss, run_until_complete
+
+REPORT_VERSION = 1
+# Extensions of the capture jobs, which a bare SimulationApp does not enable
+REQUIRED_EXTENSIONS = ["omni.kit.capture.viewport", "omni.replicator.core", "omni.videoencoding"]
+# Rtx render mode of every preset of CAPTURE_RENDER_PRESET
+RENDER_MODES = {"RAY_TRACE": "RaytracedLighting", "PATH_TRACE": "PathTracing"}
+# Metrics compared against a baseline report, and whether a larger value is better
+COMPARED_METRICS = {
+    "fps": True,
+    "time_to_first_frame": False,
+    "encode_time": False,
+    "peak_rss": False,
+    "peak_vram": False,
+}
+
+
+class BenchmarkCase(NamedTuple):
+    """One capture job of the benchmark"""
+
+    env: str
+    resolution: str
+    render_preset: str
+    file_type: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.env}|{self.resolution}|{self.render_preset}|{self.file_type}"
+
+
+class BenchmarkResult(NamedTuple):
+    """Measures of one capture job. The metrics are None when the job failed"""
+
+    case: BenchmarkCase
+    frames: int
+    # Frames per second after the first frame
+    fps: Optional[float]
+    # Seconds from the start of the capture to the first frame, including the creation of the render products
+    time_to_first_frame: Optional[float]
+    capture_time: Optional[float]
+    # Mean seconds spent encoding a frame, by the frame writers or the video encoder
+    encode_time: Optional[float]
+    # Peak resident memory of the process and peak used memory of the GPU during the capture, in bytes
+    peak_rss: Optional[int]
+    peak_vram: Optional[int]
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self._asdict()
+        case = result.pop("case")
+        return {"name": case.name, **case._asdict(), **result}
+
+
+def get_benchmark_cases(
+    envs: Sequence[str], resolutions: Sequence[str], render_presets: Sequence[str], file_types: Sequence[str]
+) -> List[BenchmarkCase]:
+    """Every combination of the parameters, grouped by environment so each environment is loaded once"""
+    for resolution in resolutions:
+        if resolution not in BENCHMARK_SETTINGS["resolutions"]:
+            raise ValueError(f"Unknown resolution {resolution}, expected one of {list(BENCHMARK_SETTINGS['resolutions'])}")
+    for render_preset in render_presets:
+        if render_preset not in RENDER_MODES:
+            raise ValueError(f"Unknown render preset {render_preset}, expected one of {list(RENDER_MODES)}")
+    return [BenchmarkCase(*values) for values in itertools.product(envs, resolutions, render_presets, file_types)]
+
+
+class ResourceSampler:
+    """
+    Peak memory of the process and of the GPU over a capture, sampled after every frame. The GPU memory is read with
+    pynvml when it is installed, and is the memory used on the whole device.
+    """
+
+    def __init__(self, gpu: int = 0):
+        self._nvml = None
+        self._gpu_handle = None
+        try:
+            import pynvml
+
+            pynvml.nvmlInit()
+            self._nvml = pynvml
+            self._gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(gpu)
+        except Exception:
+            self._nvml = None
+        self.reset()
+
+    @property
+    def gpu_name(self) -> Optional[str]:
+        if self._gpu_handle is None:
+            return None
+        name = self._nvml.nvmlDeviceGetName(self._gpu_handle)
+        return name.decode() if isinstance(name, bytes) else name
+
+    def reset(self):
+        self.peak_rss: Optional[int] = None
+        self.peak_vram: Optional[int] = None
+
+    def sample(self):
+        rss = get_rss()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+        if self._gpu_handle is not None:
+            vram = self._nvml.nvmlDeviceGetMemoryInfo(self._gpu_handle).used
+            self.peak_vram = max(self.peak_vram or 0, vram)
+
+
+def make_report(results: Sequence[BenchmarkResult], metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    return {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "metadata": dict(metadata or {}),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def write_report(path: str, report: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def read_report(path: str) -> Dict[str, Any]:
+    with open(path) as report_file:
+        report = json.load(report_file)
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"Unsupported benchmark report version {report.get('version')} in {path}")
+    return report
+
+
+def compare_reports(baseline: Dict[str, Any], report: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Find the cases of a report which got worse than in a baseline report, e.g. the report of the previous release.
+
+    Args:
+        baseline (Dict[str, Any]): The reference report.
+        report (Dict[str, Any]): The report to check.
+        tolerance (float): Relative change of a metric below which it is not reported, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: One line per regression: a metric worse by more than the tolerance, or a case which now fails.
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        reference = baseline_results.get(result["name"])
+        if reference is None or reference.get("error"):
+            continue
+        if result.get("error"):
+            regressions.append(f"{result['name']}: failed, {result['error']}")
+            continue
+        for metric, larger_is_better in COMPARED_METRICS.items():
+            value, reference_value = result.get(metric), reference.get(metric)
+            if value is None or not reference_value:
+                continue
+            change = (value - reference_value) / reference_value
+            if (-change if larger_is_better else change) > tolerance:
+                regressions.append(f"{result['name']}: {metric} {reference_value:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m omni.mobile.robots.benchmark",
+        description="Run fixed capture jobs headlessly and write their frame rate, latency and memory into a json report",
+    )
+    parser.add_argument("--output", required=True, help="Json report to write")
+    parser.add_argument(
+        "--env", action="append", default=None, help="Environment of SIMULATION_ENVIRONMENTS, all of them by default"
+    )
+    parser.add_argument(
+        "--resolution", action="append", default=None, choices=list(BENCHMARK_SETTINGS["resolutions"]),
+        help="Resolution preset, all of them by default",
+    )
+    parser.add_argument(
+        "--render-preset", action="append", default=None, choices=list(RENDER_MODES),
+        help="Render preset, all of them by default",
+    )
+    parser.add_argument(
+        "--file-type", action="append", default=None, help="Output format, all the ones of BENCHMARK_SETTINGS by default"
+    )
+    parser.add_argument("--frames", type=int, default=BENCHMARK_SETTINGS["num_frames"], help="Frames captured per job")
+    parser.add_argument("--label", default="", help="Label stored in the report, e.g. the release")
+    parser.add_argument("--baseline", default=None, help="Report to compare with, exits with 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=BENCHMARK_SETTINGS["tolerance"])
+    parser.add_argument("--keep-frames", default=None, metavar="DIR", help="Keep the captured frames in DIR")
+    parser.add_argument("--gpu", type=int, default=0, help="GPU whose memory is sampled")
+    return parser.parse_args(argv)
+
+
+def _add_benchmark_camera():
+    """The fixed camera every job captures from, so the results of two runs are comparable"""
+    import omni.usd
+    from pxr import Gf, UsdGeom
+
+    stage = omni.usd.get_context().get_stage()
+    camera = UsdGeom.Camera.Define(stage, BENCHMARK_SETTINGS["camera_path"])
+    view = Gf.Matrix4d().SetLookAt(
+        Gf.Vec3d(*BENCHMARK_SETTINGS["camera_position"]), Gf.Vec3d(*BENCHMARK_SETTINGS["camera_target"]), Gf.Vec3d(0, 0, 1)
+    )
+    camera.ClearXformOpOrder()
+    camera.AddTransformOp().Set(view.GetInverse())
+    return camera.GetPath().pathString
+
+
+async def _run_case_async(case: BenchmarkCase, camera_path: str, num_frames: int, output_folder: str, sampler):
+    import carb.settings
+    import omni.kit.app
+    from omni.mobile.robots.logic.capture.multi_camera_capture import MultiCameraCapture
+
+    carb.settings.get_settings().set("/rtx/rendermode", RENDER_MODES[case.render_preset])
+    await omni.kit.app.get_app().next_update_async()
+
+    capture = MultiCameraCapture(
+        [camera_path],
+        output_folder,
+        file_type=case.file_type,
+        resolution=tuple(BENCHMARK_SETTINGS["resolutions"][case.resolution]),
+        rt_subframes=BENCHMARK_SETTINGS["rt_subframes"][case.render_preset],
+    )
+    frame_times = []
+
+    def on_progress(captured: int, total: int):
+        frame_times.append(time.perf_counter())
+        sampler.sample()
+
+    sampler.reset()
+    sampler.sample()
+    start = time.perf_counter()
+    try:
+        frames = await capture.capture_sequence_async(0, num_frames - 1, BENCHMARK_SETTINGS["fps"], progress_fn=on_progress)
+        # Frames are written in the background, the capture is done when the last one is on disk
+        await capture.writer.flush_async()
+        end = time.perf_counter()
+    finally:
+        await capture.close_async()
+    sampler.sample()
+
+    if not frame_times:
+        raise RuntimeError("No frame was captured")
+    return BenchmarkResult(
+        case=case,
+        frames=frames,
+        fps=(frames - 1) / (end - frame_times[0]) if frames > 1 else frames / (end - start),
+        time_to_first_frame=frame_times[0] - start,
+        capture_time=end - start,
+        encode_time=capture.encode_time / frames,
+        peak_rss=sampler.peak_rss,
+        peak_vram=sampler.peak_vram,
+    )
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    cases = get_benchmark_cases(
+        args.env or SIMULATION_ENVIRONMENTS,
+        args.resolution or list(BENCHMARK_SETTINGS["resolutions"]),
+        args.render_preset or BENCHMARK_SETTINGS["render_presets"],
+        args.file_type or BENCHMARK_SETTINGS["file_types"],
+    )
+    baseline = read_report(args.baseline) if args.baseline else None
+
+    # SimulationApp must be started before anything from omni or pxr is imported
+    from omni.isaac.kit import SimulationApp
+
+    simulation_app = SimulationApp({"headless": True})
+    frames_folder = args.keep_frames or tempfile.mkdtemp(prefix="mobile_simulator_benchmark_")
+    try:
+        # Enabled before the session and the capture import them
+        enable_extensions(REQUIRED_EXTENSIONS)
+
+        import omni.kit.app
+        from omni.mobile.robots.logic.world.world_session import WorldSession
+
+        sampler = ResourceSampler(args.gpu)
+        session = WorldSession(use_world_pool=False)
+        run_until_complete(simulation_app, session.create_world_async())
+
+        results = []
+        for env, env_cases in itertools.groupby(cases, key=lambda case: case.env):
+            if results:
+                session.clear()
+                run_until_complete(simulation_app, session.create_world_async())
+            run_until_complete(simulation_app, session.load_env_async(get_env_url(env)))
+            run_until_complete(simulation_app, session.world.reset_async())
+            camera_path = _add_benchmark_camera()
+            for _ in range(BENCHMARK_SETTINGS["settle_updates"]):
+                simulation_app.update()
+
+            for case in env_cases:
+                output_folder = os.path.join(frames_folder, f"{len(results):04d}")
+                try:
+                    result = run_until_complete(
+                        simulation_app, _run_case_async(case, camera_path, args.frames, output_folder, sampler)
+                    )
+                    print(f"benchmark: {case.name}: {result.fps:.2f} frames/s, first frame in "
+                          f"{result.time_to_first_frame:.2f} s, {result.encode_time * 1000.0:.1f} ms encode per frame")
+                except Exception as e:
+                    result = BenchmarkResult(case, 0, None, None, None, None, None, None, error=str(e))
+                    print(f"benchmark: {case.name}: failed, {e}")
+                results.append(result)
+                if args.keep_frames is None:
+                    shutil.rmtree(output_folder, ignore_errors=True)
+
+        report = make_report(
+            results,
+            {
+                "label": args.label,
+                "kit_version": omni.kit.app.get_app().get_build_version(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "gpu": sampler.gpu_name,
+                "num_frames": args.frames,
+                "settings": BENCHMARK_SETTINGS,
+            },
+        )
+        write_report(args.output, report)
+        print(f"benchmark: {len(results)} jobs written to {args.output}")
+    finally:
+        if args.keep_frames is None:
+            shutil.rmtree(frames_folder, ignore_errors=True)
+        simulation_app.close()
+
+    if baseline is not None:
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for regression in regressions:
+            print(f"benchmark: regression, {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,36 @@
 __all__ = ["MobileExtension"]
 
 import gc
+import sys
+import time
 import carb
+import carb.settings
 import omni.ext
-from omni.mobile.robots.ui.ui_window import WidgetWindow
+
+# Duration of the last on_startup, and the duration it is expected to stay under
+STARTUP_TIME_SETTING_PATH = "/exts/omni.mobile.robots/startup_time_ms"
+STARTUP_BUDGET_SETTING_PATH = "/exts/omni.mobile.robots/startup_budget_ms"
 
 
 class MobileExtension(omni.ext.IExt):
     def on_startup(self, ext_id):
         carb.log_info("Pegasus Simulator is starting up")
+        start = time.perf_counter()
 
         # Save the extension id
         self._ext_id = ext_id
         
         self._count = 0
 
+        # The UI is only imported by the extension, so the headless runner can import this package without omni.ui
+        from omni.mobile.robots.ui.ui_window import WidgetWindow
+
         self._window = WidgetWindow("Mobile Simulator", width=260, height=270)
 
+        startup_time = (time.perf_counter() - start) * 1000.0
+        carb.settings.get_settings().set_float(STARTUP_TIME_SETTING_PATH, startup_time)
+        carb.log_info(f"Mobile Simulator started up in {startup_time:.1f} ms")
+
     def on_shutdown(self):
         """
         Callback called when the extension is shutdown
@@ -27,6 +41,16 @@ class MobileExtension(omni.ext.IExt):
             self._window.destroy()
             self._window = None
 
+        # The shared prim index subscribes to the stage events and USD notices, release it with the extension
+        from omni.mobile.robots.logic.stage.prim_index import release_prim_index
+
+        release_prim_index()
+
+        # The farm clients keep their http sessions open, close them if the capture widgets used any
+        farm_client = sys.modules.get("omni.mobile.robots.ui.widgets.scene_capture.utils.farm_client")
+        if farm_client is not None:
+            farm_client.release_farm_client_pool()
+
         # Call the garbage collector
         gc.collect()
 
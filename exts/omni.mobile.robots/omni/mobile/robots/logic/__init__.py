@@ -1,2 +1 @@
 # from .interface.mobile_interface import MobileInterface
-from .animation.animation_fps_model import AnimationFPSModel
\ No newline at end of file
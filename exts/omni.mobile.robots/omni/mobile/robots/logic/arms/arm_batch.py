@@ -0,0 +1,129 @@
+"""
+| File: arm_batch.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Joint state of all the arms of a stage read and written as contiguous arrays, one call per tick
+"""
+
+__all__ = ["ArmBatch", "ArmState"]
+
+import numpy as np
+from typing import NamedTuple, Optional, Sequence
+from omni.isaac.core.articulations import ArticulationView
+from omni.mobile.robots.logic.arms.arm_spec import ARM_SPECS, ArmSpec
+from omni.mobile.robots.logic.arms.joint_controller import JointImpedanceController
+
+
+class ArmState(NamedTuple):
+    """(N, J) joint state of N arms"""
+
+    positions: np.ndarray
+    velocities: np.ndarray
+    efforts: np.ndarray
+
+
+class ArmBatch:
+    """
+    All the arms matching a prim path expression, e.g. /World/envs/env_.*/Robot for the FR3 of every copy spawned by
+    the SceneCloner, driven through a single ArticulationView. Reading the positions, velocities or efforts of the arm
+    joints of every robot is one call of the physics tensor API returning an (N, J) array, and so is writing their
+    efforts or targets, instead of one call per robot and joint.
+
+    step runs one control tick: it reads the state, computes the efforts of the JointImpedanceController for all the
+    arms at once and writes them back.
+    """
+
+    def __init__(self, prim_paths_expr: str, spec: ArmSpec = ARM_SPECS["FR3"], name: str = "arm_batch"):
+        """
+        Args:
+            prim_paths_expr (str): Regular expression of the paths of the articulation roots of the robots.
+            spec (ArmSpec): The arm of the robots. Only its joints are read and written, so the arm of a mobile
+                manipulator is controlled without its wheels.
+            name (str): The name of the articulation view.
+        """
+        self._spec = spec
+        self._view = ArticulationView(prim_paths_expr=prim_paths_expr, name=name, reset_xform_properties=False)
+        self._joint_indices: Optional[np.ndarray] = None
+        self._controller: Optional[JointImpedanceController] = None
+
+    @property
+    def view(self) -> ArticulationView:
+        return self._view
+
+    @property
+    def num_robots(self) -> int:
+        return self._view.count
+
+    @property
+    def joint_indices(self) -> Optional[np.ndarray]:
+        """Indices of the arm joints among the degrees of freedom of the articulations"""
+        return self._joint_indices
+
+    @property
+    def controller(self) -> Optional[JointImpedanceController]:
+        return self._controller
+
+    def initialize(self, physics_sim_view=None, effort_control: bool = True):
+        """
+        Bind the view to the simulation, once the World has been reset.
+
+        Args:
+            physics_sim_view: The physics simulation view, the one of the World by default.
+            effort_control (bool): Turn the joint drives of the arms off, so the joints only follow the efforts of the
+                controller. Otherwise the joints are driven by position targets.
+        """
+        self._view.initialize(physics_sim_view)
+        self._joint_indices = np.array([self._view.get_dof_index(name) for name in self._spec.joint_names])
+        self._controller = JointImpedanceController(self._view.count, self._spec)
+        if effort_control:
+            zeros = np.zeros((self._view.count, len(self._joint_indices)), dtype=np.float32)
+            self._view.set_gains(kps=zeros, kds=zeros, joint_indices=self._joint_indices)
+
+    def read_state(self) -> ArmState:
+        """The joint state of all the arms. The arrays may be reused by the next read, copy them to keep them"""
+        return ArmState(
+            positions=self._view.get_joint_positions(joint_indices=self._joint_indices, clone=False),
+            velocities=self._view.get_joint_velocities(joint_indices=self._joint_indices, clone=False),
+            efforts=self._view.get_measured_joint_efforts(joint_indices=self._joint_indices, clone=False),
+        )
+
+    def write_efforts(self, efforts: np.ndarray, indices: Optional[Sequence[int]] = None):
+        """Apply (N, J) efforts to the arm joints, or (K, J) efforts to the arms of indices"""
+        self._view.set_joint_efforts(efforts, indices=indices, joint_indices=self._joint_indices)
+
+    def write_position_targets(self, positions: np.ndarray, indices: Optional[Sequence[int]] = None):
+        """Set the (N, J) targets of the joint drives, when the arms are not effort controlled"""
+        self._view.set_joint_position_targets(positions, indices=indices, joint_indices=self._joint_indices)
+
+    def reset(self, indices: Optional[Sequence[int]] = None, positions: Optional[np.ndarray] = None):
+        """Teleport arms to joint positions, their home positions by default, at rest"""
+        count = self._view.count if indices is None else len(indices)
+        if positions is None:
+            positions = np.tile(np.asarray(self._spec.home_positions, dtype=np.float32), (count, 1))
+        self._view.set_joint_positions(positions, indices=indices, joint_indices=self._joint_indices)
+        self._view.set_joint_velocities(
+            np.zeros((count, len(self._joint_indices)), dtype=np.float32), indices=indices, joint_indices=self._joint_indices
+        )
+
+    def step(
+        self,
+        target_positions: np.ndarray,
+        target_velocities: Optional[np.ndarray] = None,
+        feedforward: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        One control tick of all the arms: read their joint state, compute the impedance efforts and write them.
+
+        Args:
+            target_positions (np.ndarray): (N, J) or (J,) target joint positions.
+            target_velocities (np.ndarray): (N, J) or (J,) target joint velocities, zero by default.
+            feedforward (np.ndarray): (N, J) or (J,) efforts added to the feedback ones.
+
+        Returns:
+            np.ndarray: The (N, J) efforts written, reused by the next tick.
+        """
+        positions = self._view.get_joint_positions(joint_indices=self._joint_indices, clone=False)
+        velocities = self._view.get_joint_velocities(joint_indices=self._joint_indices, clone=False)
+        efforts = self._controller.compute(positions, velocities, target_positions, target_velocities, feedforward)
+        self.write_efforts(efforts)
+        return efforts
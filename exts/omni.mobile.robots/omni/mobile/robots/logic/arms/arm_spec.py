@@ -0,0 +1,43 @@
+"""
+| File: arm_spec.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Joints, limits and default gains of the arms of ROBOT_ENVIRONMENTS, for the joint controllers
+"""
+
+__all__ = ["ArmSpec", "ARM_SPECS", "FR3_SPEC"]
+
+from typing import NamedTuple, Tuple
+
+
+class ArmSpec(NamedTuple):
+    """Joints of an arm and their parameters, one value per joint, in radians, seconds and newton meters"""
+
+    joint_names: Tuple[str, ...]
+    home_positions: Tuple[float, ...]
+    lower_limits: Tuple[float, ...]
+    upper_limits: Tuple[float, ...]
+    velocity_limits: Tuple[float, ...]
+    effort_limits: Tuple[float, ...]
+    # Default gains of the joint space impedance controller
+    stiffness: Tuple[float, ...]
+    damping: Tuple[float, ...]
+
+
+# Franka Research 3, without the gripper whose fingers are driven by position targets
+FR3_SPEC = ArmSpec(
+    joint_names=tuple(f"fr3_joint{index}" for index in range(1, 8)),
+    home_positions=(0.0, -0.785, 0.0, -2.356, 0.0, 1.571, 0.785),
+    lower_limits=(-2.7437, -1.7837, -2.9007, -3.0421, -2.8065, 0.5445, -3.0159),
+    upper_limits=(2.7437, 1.7837, 2.9007, -0.1518, 2.8065, 4.5169, 3.0159),
+    velocity_limits=(2.62, 2.62, 2.62, 2.62, 5.26, 4.18, 5.26),
+    effort_limits=(87.0, 87.0, 87.0, 87.0, 12.0, 12.0, 12.0),
+    stiffness=(600.0, 600.0, 600.0, 600.0, 250.0, 150.0, 50.0),
+    damping=(50.0, 50.0, 50.0, 20.0, 20.0, 20.0, 10.0),
+)
+
+# The Husky + FR3 carries the same arm, its wheels are driven by the vehicle models
+ARM_SPECS = {
+    "FR3": FR3_SPEC,
+    "Husky + FR3": FR3_SPEC,
+}
@@ -0,0 +1,125 @@
+"""
+| File: joint_controller.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Joint space PD / impedance controller of a batch of arms, computed on (robots, joints) arrays
+"""
+
+__all__ = ["JointImpedanceController"]
+
+import numpy as np
+from typing import Optional, Sequence, Union
+from omni.mobile.robots.logic.arms.arm_spec import ArmSpec
+
+
+class JointImpedanceController:
+    """
+    Joint efforts of N arms with J joints each, from their measured state and their targets:
+
+        effort = stiffness * (target_position - position) + damping * (target_velocity - velocity) + feedforward
+
+    clamped to the effort limits of the joints. The feedforward term carries e.g. the gravity compensation. With no
+    target velocity and no feedforward it is a PD controller holding the target positions.
+
+    Every operation works on whole (N, J) arrays written into buffers allocated once, so computing the efforts of a
+    tick allocates nothing, whatever the number of arms. The gains may differ per arm and per joint.
+    """
+
+    def __init__(
+        self,
+        num_robots: int,
+        spec: ArmSpec = None,
+        stiffness: Union[Sequence[float], np.ndarray] = None,
+        damping: Union[Sequence[float], np.ndarray] = None,
+        effort_limits: Union[Sequence[float], np.ndarray] = None,
+    ):
+        """
+        Args:
+            num_robots (int): The number of arms N.
+            spec (ArmSpec): The arm, giving the default gains and effort limits.
+            stiffness (np.ndarray): (J,) or (N, J) stiffness of the joints, the one of the spec by default.
+            damping (np.ndarray): (J,) or (N, J) damping of the joints, the one of the spec by default.
+            effort_limits (np.ndarray): (J,) or (N, J) largest effort of the joints, the one of the spec by default.
+        """
+        if spec is None and (stiffness is None or damping is None):
+            raise ValueError("Either an arm spec or the stiffness and damping of the joints are needed")
+        stiffness = spec.stiffness if stiffness is None else stiffness
+        damping = spec.damping if damping is None else damping
+        if effort_limits is None:
+            effort_limits = spec.effort_limits if spec is not None else np.full(np.shape(stiffness)[-1], np.inf)
+
+        num_joints = np.shape(stiffness)[-1]
+        shape = (num_robots, num_joints)
+        self._stiffness = np.empty(shape, dtype=np.float64)
+        self._damping = np.empty(shape, dtype=np.float64)
+        self._effort_limits = np.empty(shape, dtype=np.float64)
+        self._stiffness[:] = stiffness
+        self._damping[:] = damping
+        self._effort_limits[:] = effort_limits
+        self._lower_effort_limits = -self._effort_limits
+        self._efforts = np.zeros(shape, dtype=np.float64)
+        self._error = np.zeros(shape, dtype=np.float64)
+
+    @property
+    def num_robots(self) -> int:
+        return self._efforts.shape[0]
+
+    @property
+    def num_joints(self) -> int:
+        return self._efforts.shape[1]
+
+    @property
+    def stiffness(self) -> np.ndarray:
+        return self._stiffness
+
+    @property
+    def damping(self) -> np.ndarray:
+        return self._damping
+
+    def set_gains(
+        self,
+        stiffness: Optional[np.ndarray] = None,
+        damping: Optional[np.ndarray] = None,
+        indices: Optional[Sequence[int]] = None,
+    ):
+        """Change the gains of some arms, all of them by default. The gains are (J,) or (K, J) arrays"""
+        selection = slice(None) if indices is None else np.asarray(indices, dtype=np.int64)
+        if stiffness is not None:
+            self._stiffness[selection] = stiffness
+        if damping is not None:
+            self._damping[selection] = damping
+
+    def compute(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        target_positions: np.ndarray,
+        target_velocities: Optional[np.ndarray] = None,
+        feedforward: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        The efforts of all the joints of all the arms.
+
+        Args:
+            positions (np.ndarray): (N, J) measured joint positions.
+            velocities (np.ndarray): (N, J) measured joint velocities.
+            target_positions (np.ndarray): (N, J) or (J,) target joint positions.
+            target_velocities (np.ndarray): (N, J) or (J,) target joint velocities, zero by default.
+            feedforward (np.ndarray): (N, J) or (J,) efforts added to the feedback ones, e.g. the gravity compensation.
+
+        Returns:
+            np.ndarray: (N, J) joint efforts. The array is reused by the next call, copy it to keep it.
+        """
+        efforts, error = self._efforts, self._error
+        np.subtract(target_positions, positions, out=error)
+        np.multiply(self._stiffness, error, out=efforts)
+        if target_velocities is None:
+            np.negative(velocities, out=error)
+        else:
+            np.subtract(target_velocities, velocities, out=error)
+        np.multiply(self._damping, error, out=error)
+        np.add(efforts, error, out=efforts)
+        if feedforward is not None:
+            np.add(efforts, feedforward, out=efforts)
+        np.clip(efforts, self._lower_effort_limits, self._effort_limits, out=efforts)
+        return efforts
@@ -1,11 +1,13 @@
-__all__ = ["CamerasModel"]
+__all__ = ["CamerasItem", "CamerasModel"]
 
 import carb
 import omni
 import omni.ui as ui
-from pxr import Usd, UsdGeom
+import omni.kit.capture.viewport
+from pxr import UsdGeom
 from collections import OrderedDict
-from omni.kit.viewport.utility import get_viewport_window_camera_string
+from omni.kit.viewport.utility import get_active_viewport, get_viewport_window_camera_string
+from omni.mobile.robots.logic.stage.prim_index import get_prim_index
 
 SEQUENCER_CAMERA = "[ Sequencer Camera ]"
 USE_SEQUENCER_CAMERA = "/persistent/exts/omni.kit.window.sequencer/useSequencerCamera"
@@ -15,27 +17,30 @@ class CamerasItem(ui.AbstractItem):
     def __init__(self, model):
         super().__init__()
         self.model = model
-        
+
 
 class CamerasModel(ui.AbstractItemModel):
+    """
+    Combo box model listing the cameras of the stage. The cameras come from the shared prim index, which only traverses
+    the stage when it is opened and is then updated from USD change notices. The active viewport camera is followed
+    through the view change events of the viewport instead of being polled every frame.
+    """
+
     def __init__(self):
         super().__init__()
 
         # Omniverse interfaces
-        self._app = omni.kit.app.get_app_interface()
-        self._stage_update = omni.stageupdate.get_stage_update_interface()
-        self._usd_context = omni.usd.get_context()
-        self._stage_subscription = self._stage_update.create_stage_update_node(
-            "CamerasModel", None, None, None, self._on_prim_created, None, self._on_prim_removed
-        )
-        self._update_sub = self._app.get_update_event_stream().create_subscription_to_pop(
-            self._on_update, name="omni.kit.window.moive_capture cameras"
-        )
+        self._prim_index = get_prim_index()
+        self._index_change_fn_id = self._prim_index.add_change_fn(self._on_index_changed)
         self._capture_instance = omni.kit.capture.viewport.CaptureExtension.get_instance()
         self._active_camera = ""
         # define if we want to automatically change the camera in viewport
         self._track_current_camera = True
 
+        # Paths of the cameras of the stage
+        self._camera_paths = self._get_camera_paths()
+        self._cameras = []
+
         # The current index of the editable_combo box
         self._current_index = ui.SimpleIntModel()
         self._camera_value_changed_fn = self._current_index.add_value_changed_fn(self._current_index_changed)
@@ -44,6 +49,12 @@ class CamerasModel(ui.AbstractItemModel):
         self._camera_switch_setting_sub = omni.kit.app.SettingChangeSubscription(
             USE_SEQUENCER_CAMERA, on_change=lambda *_: self._on_sequencer_camera_synced())
 
+        # Follow the camera of the active viewport
+        self._view_change_sub = None
+        viewport_api = get_active_viewport()
+        if viewport_api is not None:
+            self._view_change_sub = viewport_api.subscribe_to_view_change(self._on_view_changed)
+
         self._refresh_cameras()
 
     def __del__(self):
@@ -59,6 +70,10 @@ class CamerasModel(ui.AbstractItemModel):
 
     def clear(self):
         self._capture_instance = None
+        self._view_change_sub = None
+        if self._index_change_fn_id is not None:
+            self._prim_index.remove_change_fn(self._index_change_fn_id)
+            self._index_change_fn_id = None
 
     def get_item_children(self, item):
         return self._cameras
@@ -93,6 +108,9 @@ class CamerasModel(ui.AbstractItemModel):
         else:
             return camera_name
 
+    def _get_camera_paths(self):
+        return {path.pathString for path in self._prim_index.get_prims_of_type(UsdGeom.Camera)}
+
     def _refresh_cameras(self, index=0):
         self._current_index.remove_value_changed_fn(self._camera_value_changed_fn)
 
@@ -111,14 +129,10 @@ class CamerasModel(ui.AbstractItemModel):
         self._current_index.set_value(0)
 
         if self._track_current_camera:
-            # Iterate the stage and get all the cameras
-            stage = self._usd_context.get_stage()
-            if stage is not None:
-                for prim in Usd.PrimRange(stage.GetPseudoRoot()):
-                    if prim.IsA(UsdGeom.Camera):
-                        camera_name = prim.GetPath().pathString
-                        if camera_name not in new_cameras:
-                            new_cameras[camera_name] = CamerasItem(ui.SimpleStringModel(camera_name))
+            # The cameras of the stage come from the index, no traversal is needed
+            for camera_name in self._camera_paths:
+                if camera_name not in new_cameras:
+                    new_cameras[camera_name] = CamerasItem(ui.SimpleStringModel(camera_name))
         else:
             # if we don't track the current camera in viewport, we still update the current camera option in the dropdown
             # to make it show the current camera, but we don't change the selection in the dropdown
@@ -138,30 +152,46 @@ class CamerasModel(ui.AbstractItemModel):
         # Trigger a menu redraw
         self._item_changed(None)
 
-    def _on_update(self, event):
-        if (
+    def _is_capturing(self) -> bool:
+        return (
             self._capture_instance is not None
-            and self._capture_instance.progress.capture_status == omni.kit.capture.viewport.CaptureStatus.NONE
-        ):
-            # Get camera from default/active Viewport Window for now
-            active_camera = get_viewport_window_camera_string(window_name=None)
-            if self._active_camera != active_camera:
-                self._current_index_changed(None)
-
-    def _on_prim_created(self, path):
-        stage = self._usd_context.get_stage()
-        prim = stage.GetPrimAtPath(path)
-        if prim.IsValid() and prim.IsA(UsdGeom.Camera):
-            self._cameras.append(CamerasItem(ui.SimpleStringModel(path)))
-        self._item_changed(None)
+            and self._capture_instance.progress.capture_status != omni.kit.capture.viewport.CaptureStatus.NONE
+        )
 
-    def _on_prim_removed(self, path):
-        cameras = [cam.model.as_string for cam in self._cameras]
-        if path in cameras:
-            index = cameras.index(path)
-            del self._cameras[index]
-            self._current_index.as_int = 0
-            self._item_changed(None)
+    def _on_view_changed(self, viewport_api):
+        # View changes are also sent when the camera moves, so only a change of camera path refreshes the list
+        active_camera = viewport_api.camera_path.pathString
+        if self._active_camera != active_camera and not self._is_capturing():
+            self._current_index_changed(None)
+
+    def _on_index_changed(self, added, removed):
+        # Only the cameras are compared, the rest of the stage is not looked at
+        camera_paths = self._get_camera_paths()
+        if camera_paths != self._camera_paths:
+            self._camera_paths = camera_paths
+            if self._track_current_camera:
+                self._update_camera_items()
+
+    def _update_camera_items(self):
+        """Update the listed cameras from the index, keeping the current selection if it still exists"""
+        if len(self._cameras) < 2:
+            self._refresh_cameras()
+            return
+
+        current_camera = self._cameras[self._current_index.as_int].model.as_string
+        header = self._cameras[0:2]
+        header_names = {self._strip_current_from_camera_name(cam.model.as_string) for cam in header}
+        self._cameras = header + [
+            CamerasItem(ui.SimpleStringModel(camera_name))
+            for camera_name in sorted(self._camera_paths)
+            if camera_name not in header_names
+        ]
+
+        names = [cam.model.as_string for cam in self._cameras]
+        index = names.index(current_camera) if current_camera in names else 0
+        if index != self._current_index.as_int:
+            self._current_index.set_value(index)
+        self._item_changed(None)
 
     def _current_index_changed(self, model):
         if model is None:
@@ -187,4 +217,4 @@ class CamerasModel(ui.AbstractItemModel):
             if (sync_sequencer_camera and camera_name == SEQUENCER_CAMERA) or (not sync_sequencer_camera and camera_name.startswith("Current (")):
                 # If sequence sync is disabled, then select current camera
                 self._current_index.set_value(index)
-                break
\ No newline at end of file
+                break
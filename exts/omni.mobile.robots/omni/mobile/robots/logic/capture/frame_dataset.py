@@ -0,0 +1,273 @@
+"""
+| File: frame_dataset.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Chunked, compressed array store of captured frames and their metadata, with random access by frame
+"""
+
+__all__ = ["DATASET_FILE_TYPE", "FrameDataset", "FrameDatasetWriter"]
+
+import os
+import json
+import zlib
+import asyncio
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from omni.mobile.robots.params import FRAME_DATASET_SETTINGS
+
+# Extension of the dataset folders, also used as the file type of a capture writing a dataset
+DATASET_FILE_TYPE = ".dataset"
+INDEX_FILE_NAME = "index.json"
+FORMAT_VERSION = 1
+# Stream holding the capture frame number of every dataset frame
+FRAME_ID_STREAM = "frame_id"
+# Chunks being compressed and written at the same time, before append waits for the oldest one
+MAX_PENDING_CHUNKS = 2
+
+
+def _get_chunk_path(path: str, stream: str, chunk_index: int, compressed: bool) -> str:
+    return os.path.join(path, stream, f"{chunk_index:06d}" + (".zlib" if compressed else ".npy"))
+
+
+class FrameDatasetWriter:
+    """
+    Write frames as streams of fixed shape arrays, e.g. the image of every camera, the camera poses, the timestamp and
+    the robot state, instead of one file per frame. The frames are grouped into chunks of chunk_size frames shared by
+    all the streams, so frame i is in chunk i // chunk_size of every stream and no per frame index is needed. Every
+    chunk of a stream is one file, zlib compressed, or a plain .npy file which readers memory map when the compression
+    level is 0. The chunks are compressed and written by a background thread while the next frames are captured.
+
+    The index is rewritten as the chunks are written, so the frames of an interrupted capture are readable up to the
+    last written chunk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = FRAME_DATASET_SETTINGS["chunk_size"],
+        compression_level: int = FRAME_DATASET_SETTINGS["compression_level"],
+        attributes: Dict[str, Any] = None,
+    ):
+        """
+        Args:
+            path (str): The folder of the dataset, created if needed.
+            chunk_size (int): The number of frames of a chunk.
+            compression_level (int): The zlib level of the chunks, 0 to store them uncompressed and memory mappable.
+            attributes (Dict[str, Any]): Json serializable values stored in the index, e.g. the resolution or the fps.
+        """
+        self._path = path
+        self._chunk_size = max(1, chunk_size)
+        self._compression_level = compression_level
+        self._attributes = dict(attributes or {})
+        self._streams: Dict[str, Tuple[Tuple[int, ...], np.dtype]] = {}
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._num_frames = 0
+        self._chunks_written = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FrameDatasetWriter")
+        self._pending: List[Future] = []
+        self._closed = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def num_frames(self) -> int:
+        return self._num_frames
+
+    def __enter__(self) -> "FrameDatasetWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, frame_id: int, data: Dict[str, np.ndarray]):
+        """
+        Add one frame. The streams and their shapes are set by the first frame, every frame must have the same ones.
+
+        Args:
+            frame_id (int): The frame number of the capture.
+            data (Dict[str, np.ndarray]): The value of every stream, by stream name.
+        """
+        if self._closed:
+            raise ValueError(f"Dataset {self._path} is closed")
+        data = {name: np.asarray(value) for name, value in data.items()}
+        data[FRAME_ID_STREAM] = np.asarray(frame_id, dtype=np.int64)
+        if not self._streams:
+            self._start(data)
+        elif data.keys() != self._streams.keys():
+            raise ValueError(f"Expected the streams {sorted(self._streams)}, got {sorted(data)}")
+
+        position = self._num_frames % self._chunk_size
+        for name, value in data.items():
+            shape, dtype = self._streams[name]
+            if value.shape != shape:
+                raise ValueError(f"Expected a {shape} array for the stream {name}, got {value.shape}")
+            # Frames are copied into the chunk, the caller may reuse its arrays
+            self._buffers[name][position] = value
+        self._num_frames += 1
+
+        if position == self._chunk_size - 1:
+            self._flush_chunk(self._chunk_size)
+
+    async def append_async(self, frame_id: int, data: Dict[str, np.ndarray]):
+        """Add one frame, waiting without blocking the event loop when the writer thread is behind"""
+        if len(self._pending) >= MAX_PENDING_CHUNKS:
+            await asyncio.wrap_future(self._pending[0])
+        self.append(frame_id, data)
+
+    def close(self):
+        """Write the last, partial chunk and the index"""
+        if self._closed:
+            return
+        self._closed = True
+        remaining = self._num_frames % self._chunk_size
+        if remaining:
+            self._flush_chunk(remaining)
+        while self._pending:
+            self._complete_oldest_chunk()
+        self._executor.shutdown(wait=True)
+        self._write_index(self._num_frames)
+
+    def _start(self, data: Dict[str, np.ndarray]):
+        os.makedirs(self._path, exist_ok=True)
+        for name, value in data.items():
+            self._streams[name] = (value.shape, value.dtype)
+            os.makedirs(os.path.join(self._path, name), exist_ok=True)
+        self._allocate_buffers()
+
+    def _allocate_buffers(self):
+        self._buffers = {
+            name: np.empty((self._chunk_size,) + shape, dtype=dtype) for name, (shape, dtype) in self._streams.items()
+        }
+
+    def _flush_chunk(self, num_frames: int):
+        while self._pending and (self._pending[0].done() or len(self._pending) >= MAX_PENDING_CHUNKS):
+            self._complete_oldest_chunk()
+        chunk_index = (self._num_frames - 1) // self._chunk_size
+        buffers = {name: buffer[:num_frames] for name, buffer in self._buffers.items()}
+        self._pending.append(self._executor.submit(self._write_chunk, chunk_index, buffers))
+        # The written buffers belong to the writer thread until the chunk is written
+        self._allocate_buffers()
+
+    def _complete_oldest_chunk(self):
+        self._pending.pop(0).result()
+        self._chunks_written += 1
+        self._write_index(min(self._num_frames, self._chunks_written * self._chunk_size))
+
+    def _write_chunk(self, chunk_index: int, buffers: Dict[str, np.ndarray]):
+        compressed = self._compression_level > 0
+        for name, buffer in buffers.items():
+            chunk_path = _get_chunk_path(self._path, name, chunk_index, compressed)
+            if compressed:
+                with open(chunk_path, "wb") as chunk_file:
+                    chunk_file.write(zlib.compress(np.ascontiguousarray(buffer).data, self._compression_level))
+            else:
+                np.save(chunk_path, buffer)
+
+    def _write_index(self, num_frames: int):
+        index = {
+            "version": FORMAT_VERSION,
+            "num_frames": num_frames,
+            "chunk_size": self._chunk_size,
+            "compression_level": self._compression_level,
+            "streams": {name: {"shape": list(shape), "dtype": dtype.str} for name, (shape, dtype) in self._streams.items()},
+            "attributes": self._attributes,
+        }
+        index_path = os.path.join(self._path, INDEX_FILE_NAME)
+        with open(index_path + ".tmp", "w") as index_file:
+            json.dump(index, index_file)
+        os.replace(index_path + ".tmp", index_path)
+
+
+class FrameDataset:
+    """
+    Random access to the frames of a dataset written by a FrameDatasetWriter. Only the index is read when opening it:
+    reading frame i opens the chunk holding it, which is memory mapped when uncompressed and kept in a small cache
+    otherwise, so reading consecutive frames does not touch the file system per frame.
+    """
+
+    def __init__(self, path: str, cache_size: int = 8):
+        """
+        Args:
+            path (str): The folder of the dataset.
+            cache_size (int): The number of decompressed chunks kept in memory.
+        """
+        self._path = path
+        with open(os.path.join(path, INDEX_FILE_NAME)) as index_file:
+            index = json.load(index_file)
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset version {index.get('version')} in {path}")
+        self._num_frames = index["num_frames"]
+        self._chunk_size = index["chunk_size"]
+        self._compressed = index["compression_level"] > 0
+        self._streams = {
+            name: (tuple(stream["shape"]), np.dtype(stream["dtype"])) for name, stream in index["streams"].items()
+        }
+        self._attributes = index.get("attributes", {})
+        self._cache_size = max(1, cache_size)
+        self._chunks: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        self._frame_ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._num_frames
+
+    def __getitem__(self, index: int) -> Dict[str, np.ndarray]:
+        return {name: self.get(name, index) for name in self._streams}
+
+    @property
+    def streams(self) -> Dict[str, Tuple[Tuple[int, ...], np.dtype]]:
+        """Shape and dtype of a frame of every stream"""
+        return dict(self._streams)
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return dict(self._attributes)
+
+    @property
+    def frame_ids(self) -> np.ndarray:
+        """The capture frame number of every frame of the dataset"""
+        if self._frame_ids is None:
+            self._frame_ids = self.get_stream(FRAME_ID_STREAM)
+        return self._frame_ids
+
+    def get(self, stream: str, index: int) -> np.ndarray:
+        """The value of a stream at frame index"""
+        if index < 0:
+            index += self._num_frames
+        if not 0 <= index < self._num_frames:
+            raise IndexError(f"Frame {index} out of range for a dataset of {self._num_frames} frames")
+        return self.get_chunk(stream, index // self._chunk_size)[index % self._chunk_size]
+
+    def get_chunk(self, stream: str, chunk_index: int) -> np.ndarray:
+        """All the frames of a chunk of a stream"""
+        key = (stream, chunk_index)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        shape, dtype = self._streams[stream]
+        num_frames = min(self._chunk_size, self._num_frames - chunk_index * self._chunk_size)
+        chunk_path = _get_chunk_path(self._path, stream, chunk_index, self._compressed)
+        if self._compressed:
+            with open(chunk_path, "rb") as chunk_file:
+                chunk = np.frombuffer(zlib.decompress(chunk_file.read()), dtype=dtype).reshape((-1,) + shape)
+        else:
+            chunk = np.load(chunk_path, mmap_mode="r")
+        chunk = chunk[:num_frames]
+
+        self._chunks[key] = chunk
+        if len(self._chunks) > self._cache_size:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def get_stream(self, stream: str) -> np.ndarray:
+        """All the frames of a stream, e.g. every timestamp. Reads every chunk of the stream"""
+        num_chunks = (self._num_frames + self._chunk_size - 1) // self._chunk_size
+        shape, dtype = self._streams[stream]
+        if num_chunks == 0:
+            return np.empty((0,) + shape, dtype=dtype)
+        return np.concatenate([self.get_chunk(stream, chunk_index) for chunk_index in range(num_chunks)])
@@ -0,0 +1,227 @@
+"""
+| File: frame_writer.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Pool of encoder threads writing the captured frames to disk, fed by a bounded queue off the render loop
+"""
+
+__all__ = ["FrameWriter", "FrameWriterMetrics", "IMAGE_FILE_TYPES", "write_frame"]
+
+import os
+import time
+import asyncio
+import carb
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from omni.mobile.robots.params import FRAME_WRITER_SETTINGS
+
+# File types written with PIL. The raw arrays are written as .npy and the float images as .exr
+IMAGE_FILE_TYPES = (".png", ".tga", ".jpg")
+
+
+class FrameWriterMetrics(NamedTuple):
+    """Counters of a FrameWriter since it was started"""
+
+    queue_depth: int
+    max_queue_depth: int
+    written: int
+    failed: int
+    # Seconds spent encoding and writing, summed over the encoders
+    encode_time: float
+    # Seconds the capture waited for a free slot of the queue
+    blocked_time: float
+    bytes_written: int
+    # Bytes written per second since the first frame was queued
+    bytes_per_second: float
+
+    @property
+    def mean_encode_time(self) -> float:
+        return self.encode_time / self.written if self.written else 0.0
+
+
+class FrameWriter:
+    """
+    Bounded queue of (path, array) pairs, encoded and written to disk by a pool of encoder threads owned by the writer,
+    so the frames of the next timestep render while the previous ones are compressed. PNG compression and file writes
+    release the GIL, so the encoders run in parallel with each other and with the render loop. When the queue is full,
+    put_async waits for a slot, which keeps the memory held by pending frames bounded.
+
+    The frames are handed over without copy: the writer keeps a reference to the array until it is written, so the
+    caller must not modify it after put_async.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = FRAME_WRITER_SETTINGS["num_workers"],
+        max_queue_size: int = FRAME_WRITER_SETTINGS["max_queue_size"],
+        png_compress_level: int = FRAME_WRITER_SETTINGS["png_compress_level"],
+    ):
+        """
+        Args:
+            num_workers (int): The number of encoder threads.
+            max_queue_size (int): The number of frames waiting to be written before put_async blocks.
+            png_compress_level (int): The zlib level of the .png frames, from 0 (fastest) to 9 (smallest).
+        """
+        self._num_workers = max(1, num_workers)
+        self._max_queue_size = max_queue_size
+        self._png_compress_level = png_compress_level
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers = []
+        self._reset_metrics()
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    @property
+    def failed(self) -> int:
+        return self._failed
+
+    @property
+    def pending(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    @property
+    def metrics(self) -> FrameWriterMetrics:
+        elapsed = time.perf_counter() - self._first_put_time if self._first_put_time is not None else 0.0
+        return FrameWriterMetrics(
+            queue_depth=self.pending,
+            max_queue_depth=self._max_queue_depth,
+            written=self._written,
+            failed=self._failed,
+            encode_time=self._encode_time,
+            blocked_time=self._blocked_time,
+            bytes_written=self._bytes_written,
+            bytes_per_second=self._bytes_written / elapsed if elapsed > 0.0 else 0.0,
+        )
+
+    def start(self):
+        if self._workers:
+            return
+        self._reset_metrics()
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self._num_workers, thread_name_prefix="FrameWriter")
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self._num_workers)]
+
+    async def put_async(self, path: str, data: np.ndarray):
+        """Queue a frame, waiting for a free slot if the encoders are behind. The array is not copied"""
+        if not self._workers:
+            self.start()
+        if self._first_put_time is None:
+            self._first_put_time = time.perf_counter()
+        if self._queue.full():
+            start = time.perf_counter()
+            await self._queue.put((path, data))
+            self._blocked_time += time.perf_counter() - start
+        else:
+            self._queue.put_nowait((path, data))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    async def flush_async(self):
+        """Wait until every queued frame has been written"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close_async(self):
+        """Write the remaining frames and stop the encoders"""
+        await self.flush_async()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _reset_metrics(self):
+        self._written = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._encode_time = 0.0
+        self._blocked_time = 0.0
+        self._bytes_written = 0
+        self._first_put_time = None
+
+    def _encode(self, path: str, data: np.ndarray):
+        start = time.perf_counter()
+        size = write_frame(path, data, png_compress_level=self._png_compress_level)
+        return size, time.perf_counter() - start
+
+    async def _worker(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            path, data = await self._queue.get()
+            try:
+                size, encode_time = await loop.run_in_executor(self._executor, self._encode, path, data)
+                self._written += 1
+                self._bytes_written += size
+                self._encode_time += encode_time
+            except Exception as e:
+                self._failed += 1
+                carb.log_error(f"Frame writer: failed to write {path}: {e}")
+            finally:
+                # Drop the reference to the frame as soon as it is written
+                data = None
+                self._queue.task_done()
+
+
+def write_frame(path: str, data: np.ndarray, png_compress_level: int = 6) -> int:
+    """
+    Write one frame, as an image or as a raw array depending on the extension of the path.
+
+    Returns:
+        int: The size of the written file in bytes.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_type = os.path.splitext(path)[1].lower()
+    if file_type == ".npy":
+        np.save(path, data)
+    elif file_type == ".exr":
+        _write_exr(path, np.asarray(data))
+    elif file_type in IMAGE_FILE_TYPES:
+        _write_image(path, np.asarray(data), file_type, png_compress_level)
+    else:
+        raise ValueError(
+            f"Unsupported frame file type {file_type}, expected one of {IMAGE_FILE_TYPES + ('.exr', '.npy')}"
+        )
+    return os.stat(path).st_size
+
+
+def _write_image(path: str, data: np.ndarray, file_type: str, png_compress_level: int):
+    from PIL import Image
+
+    if data.dtype != np.uint8:
+        data = np.clip(data * 255.0, 0, 255).astype(np.uint8)
+    # Wraps the buffer of a contiguous array instead of copying it
+    image = Image.fromarray(np.ascontiguousarray(data))
+    if file_type == ".jpg" and image.mode == "RGBA":
+        image = image.convert("RGB")
+    if file_type == ".png":
+        image.save(path, compress_level=png_compress_level)
+    else:
+        image.save(path)
+
+
+def _write_exr(path: str, data: np.ndarray):
+    try:
+        import OpenEXR
+        import Imath
+    except ImportError:
+        raise ValueError("Writing .exr frames requires the OpenEXR python package")
+
+    if data.ndim == 2:
+        data = data[:, :, np.newaxis]
+    if data.dtype == np.uint8:
+        data = data.astype(np.float32) / 255.0
+    channel_names = "RGBA"[:data.shape[2]] if data.shape[2] > 1 else "Y"
+    header = OpenEXR.Header(data.shape[1], data.shape[0])
+    header["channels"] = {name: Imath.Channel(Imath.PixelType(Imath.PixelType.HALF)) for name in channel_names}
+    exr_file = OpenEXR.OutputFile(path, header)
+    try:
+        exr_file.writePixels(
+            {name: data[:, :, index].astype(np.float16).tobytes() for index, name in enumerate(channel_names)}
+        )
+    finally:
+        exr_file.close()
@@ -0,0 +1,288 @@
+"""
+| File: multi_camera_capture.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Capture of several cameras at the same timestep, one render product per camera
+"""
+
+__all__ = ["MultiCameraCapture", "get_camera_output_name"]
+
+import os
+import time
+import carb
+import numpy as np
+import omni.kit.app
+import omni.timeline
+import omni.usd
+from pxr import Sdf, UsdGeom
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from omni.mobile.robots.logic.capture.frame_dataset import DATASET_FILE_TYPE, FrameDatasetWriter
+from omni.mobile.robots.logic.capture.frame_writer import FrameWriter
+from omni.mobile.robots.logic.capture.video_stream import VideoStreamEncoder
+from omni.mobile.robots.logic.stage.prim_index import get_prim_index
+
+VIDEO_FILE_TYPE = ".mp4"
+# Cameras created by Kit for the viewports live in the session layer and are not captured by default
+KIT_CAMERA_PREFIX = "/OmniverseKit_"
+
+
+def get_camera_output_name(camera_path: str) -> str:
+    """Name of the output folder of a camera, e.g. /World/Robot/front_cam -> World_Robot_front_cam"""
+    return str(camera_path).strip("/").replace("/", "_")
+
+
+class MultiCameraCapture:
+    """
+    Render every camera of a list through its own render product, so they all see the same simulation state, and
+    write one image per camera and frame. The frames of all the cameras share the same frame index and are written to
+    <output_folder>/<camera>/<file_name>.<frame><file_type> by a FrameWriter, while the next frame renders.
+
+    With the DATASET_FILE_TYPE file type, the frames are written instead into the chunked dataset
+    <output_folder>/<file_name>.dataset, with the image and the world pose of every camera, the timeline time and the
+    values returned by metadata_fn (e.g. the robot state) for every frame.
+
+    With the .mp4 file type, the frames of a single camera are streamed to the video encoder as they are rendered and
+    written to <output_folder>/<file_name>.mp4, without any intermediate image file.
+
+    The render products and annotators come from omni.replicator.core, which is imported when the capture is attached
+    unless a module with the same interface is given, e.g. a stand-in in the tests.
+    """
+
+    def __init__(
+        self,
+        camera_paths: Sequence[str],
+        output_folder: str,
+        file_name: str = "frame",
+        file_type: str = ".png",
+        resolution: Tuple[int, int] = (1280, 720),
+        rt_subframes: int = 1,
+        writer: FrameWriter = None,
+        metadata_fn: Callable[[int], Dict[str, np.ndarray]] = None,
+        encoding_settings: Dict[str, Any] = None,
+        replicator: Any = None,
+    ):
+        if not camera_paths:
+            raise ValueError("At least one camera is needed for a multi camera capture")
+        if file_type == VIDEO_FILE_TYPE and len(camera_paths) != 1:
+            raise ValueError("An .mp4 capture streams a single camera to the video encoder")
+        self._camera_paths = [str(path) for path in camera_paths]
+        self._output_folder = output_folder
+        self._file_name = file_name
+        self._file_type = file_type
+        self._resolution = tuple(resolution)
+        self._rt_subframes = rt_subframes
+        self._writer = writer or FrameWriter()
+        self._metadata_fn = metadata_fn
+        self._dataset: FrameDatasetWriter = None
+        self._encoding_settings = encoding_settings
+        self._video: VideoStreamEncoder = None
+        self._video_encode_time = 0.0
+
+        self._rep = replicator
+        self._render_products = []
+        self._annotators = []
+        self._is_capturing = False
+        self._cancelled = False
+        self._captured_frames = 0
+
+    @staticmethod
+    def get_stage_cameras(root_path: str = "/") -> List[str]:
+        """Paths of the cameras under the given prim, e.g. the cameras mounted on a robot, from the prim index"""
+        root = Sdf.Path(root_path)
+        return sorted(
+            path.pathString
+            for path in get_prim_index().get_prims_of_type(UsdGeom.Camera)
+            if path.HasPrefix(root) and not path.pathString.startswith(KIT_CAMERA_PREFIX)
+        )
+
+    @property
+    def camera_paths(self) -> List[str]:
+        return list(self._camera_paths)
+
+    @property
+    def is_capturing(self) -> bool:
+        return self._is_capturing
+
+    @property
+    def captured_frames(self) -> int:
+        return self._captured_frames
+
+    @property
+    def writer(self) -> FrameWriter:
+        return self._writer
+
+    @property
+    def encode_time(self) -> float:
+        """Seconds spent encoding the frames of the last capture, by the frame writer or the video encoder"""
+        return self._writer.metrics.encode_time + self._video_encode_time
+
+    @property
+    def dataset_path(self) -> str:
+        return os.path.join(self._output_folder, self._file_name + DATASET_FILE_TYPE)
+
+    @property
+    def video_path(self) -> str:
+        return os.path.join(self._output_folder, self._file_name + VIDEO_FILE_TYPE)
+
+    def get_frame_path(self, camera_path: str, frame_index: int) -> str:
+        return os.path.join(
+            self._output_folder,
+            get_camera_output_name(camera_path),
+            f"{self._file_name}.{frame_index:04d}{self._file_type}",
+        )
+
+    def attach(self):
+        """Create one render product and one rgb annotator per camera"""
+        if self._render_products:
+            return
+        if self._rep is None:
+            try:
+                import omni.replicator.core as rep
+            except ImportError:
+                carb.log_error("Multi camera capture: omni.replicator.core is required, please enable the extension")
+                raise
+            self._rep = rep
+        rep = self._rep
+
+        # Frames are only rendered when requested, not every time the timeline plays
+        try:
+            rep.orchestrator.set_capture_on_play(False)
+        except AttributeError:
+            pass
+
+        for camera_path in self._camera_paths:
+            render_product = rep.create.render_product(camera_path, self._resolution)
+            annotator = rep.AnnotatorRegistry.get_annotator("rgb")
+            annotator.attach([render_product])
+            self._render_products.append(render_product)
+            self._annotators.append(annotator)
+        self._writer.start()
+
+    def detach(self):
+        for annotator, render_product in zip(self._annotators, self._render_products):
+            annotator.detach([render_product])
+            render_product.destroy()
+        self._annotators = []
+        self._render_products = []
+
+    def cancel(self):
+        self._cancelled = True
+
+    async def capture_frame_async(self, frame_index: int):
+        """
+        Render every camera at the current simulation state and queue their frames.
+
+        Args:
+            frame_index (int): Index shared by the frames of all the cameras.
+        """
+        self.attach()
+        # One orchestrator step renders all the render products of the stage together
+        await self._rep.orchestrator.step_async(rt_subframes=self._rt_subframes, pause_timeline=False)
+        if self._file_type == DATASET_FILE_TYPE:
+            await self._append_to_dataset_async(frame_index)
+        elif self._file_type == VIDEO_FILE_TYPE:
+            if self._video is None:
+                raise ValueError("An .mp4 capture is made with capture_sequence_async, which knows the number of frames")
+            await self._video.put_async(self._annotators[0].get_data())
+        else:
+            for camera_path, annotator in zip(self._camera_paths, self._annotators):
+                await self._writer.put_async(self.get_frame_path(camera_path, frame_index), annotator.get_data())
+        self._captured_frames += 1
+
+    async def _append_to_dataset_async(self, frame_index: int):
+        if self._dataset is None:
+            self._dataset = FrameDatasetWriter(
+                self.dataset_path,
+                attributes={"cameras": self._camera_paths, "resolution": list(self._resolution)},
+            )
+        time_code = omni.timeline.get_timeline_interface().get_current_time()
+        stage = omni.usd.get_context().get_stage()
+        data = {"timestamp": np.asarray(time_code, dtype=np.float64)}
+        for camera_path, annotator in zip(self._camera_paths, self._annotators):
+            name = get_camera_output_name(camera_path)
+            data[f"{name}.rgb"] = annotator.get_data()
+            transform = UsdGeom.Xformable(stage.GetPrimAtPath(camera_path)).ComputeLocalToWorldTransform(
+                time_code * stage.GetTimeCodesPerSecond()
+            )
+            data[f"{name}.pose"] = np.array(transform, dtype=np.float64)
+        if self._metadata_fn is not None:
+            data.update(self._metadata_fn(frame_index))
+        await self._dataset.append_async(frame_index, data)
+
+    async def capture_sequence_async(
+        self,
+        start_frame: int,
+        end_frame: int,
+        fps: float,
+        every_nth_frame: int = 1,
+        progress_fn: Callable[[int, int], None] = None,
+    ) -> int:
+        """
+        Capture the frames from start_frame to end_frame (included) of the timeline in a single pass.
+
+        Args:
+            start_frame (int): The first frame of the timeline to capture.
+            end_frame (int): The last frame of the timeline to capture.
+            fps (float): The frame rate of the timeline.
+            every_nth_frame (int): Only capture one frame out of every_nth_frame.
+            progress_fn (Callable[[int, int], None]): Called with (captured, total) after every frame.
+
+        Returns:
+            int: The number of captured frames.
+        """
+        frames = list(range(start_frame, end_frame + 1, max(1, every_nth_frame)))
+        timeline = omni.timeline.get_timeline_interface()
+        was_playing = timeline.is_playing()
+        timeline.pause()
+
+        self._is_capturing = True
+        self._cancelled = False
+        self._captured_frames = 0
+        self._video_encode_time = 0.0
+        start = time.perf_counter()
+        try:
+            self.attach()
+            if self._file_type == VIDEO_FILE_TYPE:
+                self._video = VideoStreamEncoder(self.video_path, fps, len(frames), self._encoding_settings)
+                self._video.start()
+            for frame in frames:
+                if self._cancelled:
+                    carb.log_warn("Multi camera capture: cancelled")
+                    break
+                timeline.set_current_time(frame / fps)
+                await omni.kit.app.get_app().next_update_async()
+                await self.capture_frame_async(frame)
+                if progress_fn is not None:
+                    progress_fn(self._captured_frames, len(frames))
+            await self._writer.flush_async()
+            if self._dataset is not None:
+                self._dataset.close()
+                self._dataset = None
+        finally:
+            if self._video is not None:
+                await self._video.close_async()
+                self._video_encode_time = self._video.encode_time
+                self._video = None
+            self.detach()
+            self._is_capturing = False
+            if was_playing:
+                timeline.play()
+
+        carb.log_info(
+            f"Multi camera capture: {self._captured_frames} frames of {len(self._camera_paths)} cameras in "
+            f"{time.perf_counter() - start:.2f} s, {self._writer.failed} failed writes"
+        )
+        metrics = self._writer.metrics
+        carb.log_info(
+            f"Multi camera capture: {metrics.mean_encode_time * 1000.0:.1f} ms per frame encode, "
+            f"{metrics.bytes_per_second / 1e6:.1f} MB/s, queue depth up to {metrics.max_queue_depth}, "
+            f"{metrics.blocked_time:.2f} s waiting for the writers"
+        )
+        return self._captured_frames
+
+    async def close_async(self):
+        self.detach()
+        await self._writer.close_async()
+        if self._dataset is not None:
+            self._dataset.close()
+            self._dataset = None
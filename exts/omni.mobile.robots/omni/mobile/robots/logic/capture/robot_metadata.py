@@ -0,0 +1,73 @@
+"""
+| File: robot_metadata.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Root poses and joint positions of the robots of a stage, recorded with every frame of a dataset capture
+"""
+
+__all__ = ["RobotMetadata"]
+
+import numpy as np
+from pxr import Sdf, UsdPhysics
+from typing import Dict, List, Optional, Sequence
+from omni.isaac.core.articulations import ArticulationView
+from omni.mobile.robots.logic.capture.multi_camera_capture import get_camera_output_name
+from omni.mobile.robots.logic.stage.prim_index import get_prim_index
+
+
+class RobotMetadata:
+    """
+    metadata_fn of a MultiCameraCapture which writes two streams per articulation into the dataset:
+
+        <robot>.root_pose         (7,) world position and (w, x, y, z) orientation of the articulation root
+        <robot>.joint_positions   (J,) positions of the degrees of freedom of the articulation
+
+    where <robot> is named after the path of the articulation root like the cameras, e.g. World_Robot. Robots of
+    different kinds have different degrees of freedom, so every articulation is read through its own ArticulationView.
+    The views are bound to the simulation on the first frame, after the World has been reset.
+    """
+
+    def __init__(self, articulation_paths: Sequence[str]):
+        """
+        Args:
+            articulation_paths (Sequence[str]): The paths of the articulation roots of the robots.
+        """
+        if not articulation_paths:
+            raise ValueError("At least one articulation is needed to record the robot state")
+        self._articulation_paths = [str(path) for path in articulation_paths]
+        self._views: Optional[List[ArticulationView]] = None
+
+    @staticmethod
+    def get_stage_articulations(root_path: str = "/World") -> List[str]:
+        """Paths of the articulation roots under the given prim, e.g. the robot spawned by a WorldSession"""
+        root = Sdf.Path(root_path)
+        return sorted(
+            path.pathString
+            for path in get_prim_index().get_prims_with_api(UsdPhysics.ArticulationRootAPI)
+            if path.HasPrefix(root)
+        )
+
+    @property
+    def articulation_paths(self) -> List[str]:
+        return list(self._articulation_paths)
+
+    def initialize(self, physics_sim_view=None):
+        """Bind one view per articulation to the simulation, the one of the World by default"""
+        self._views = []
+        for path in self._articulation_paths:
+            view = ArticulationView(
+                prim_paths_expr=path, name=f"{get_camera_output_name(path)}_metadata", reset_xform_properties=False
+            )
+            view.initialize(physics_sim_view)
+            self._views.append(view)
+
+    def __call__(self, frame_index: int) -> Dict[str, np.ndarray]:
+        if self._views is None:
+            self.initialize()
+        data = {}
+        for path, view in zip(self._articulation_paths, self._views):
+            name = get_camera_output_name(path)
+            positions, orientations = view.get_world_poses()
+            data[f"{name}.root_pose"] = np.concatenate([positions[0], orientations[0]]).astype(np.float64)
+            data[f"{name}.joint_positions"] = np.asarray(view.get_joint_positions()[0], dtype=np.float32)
+        return data
@@ -0,0 +1,171 @@
+"""
+| File: video_stream.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Encoding of captured frames into an mp4 as they are rendered, without intermediate image files
+"""
+
+__all__ = ["VideoStreamEncoder"]
+
+import os
+import time
+import asyncio
+import carb
+import carb.settings
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+# Settings of the omni.videoencoding extension, set from the mp4 options of the capture before encoding
+VIDEO_ENCODING_SETTINGS_PATH = "/exts/omni.videoencoding"
+ENCODING_SETTING_NAMES = {
+    "bitrate": "bitrate",
+    "iframe_interval": "iframeinterval",
+    "preset": "preset",
+    "profile": "profile",
+    "rc_mode": "rcMode",
+    "rc_target_quality": "rcTargetQuality",
+    "video_full_range": "videoFullRangeFlag",
+}
+
+
+class VideoStreamEncoder:
+    """
+    Feed frames to the hardware video encoder of omni.videoencoding while the capture runs, instead of writing every
+    frame to disk and assembling the mp4 afterwards. Frames wait in a bounded queue and are handed to the encoder by a
+    dedicated thread, so the next frame renders while the previous one is encoded, and the capture waits when the
+    encoder falls behind.
+
+    omni.videoencoding holds a single encoding session, so only one stream can be encoded at a time.
+    """
+
+    _active: Optional["VideoStreamEncoder"] = None
+
+    def __init__(
+        self,
+        path: str,
+        fps: float,
+        num_frames: int,
+        encoding_settings: Dict[str, Any] = None,
+        max_queue_size: int = 8,
+        interface: Any = None,
+    ):
+        """
+        Args:
+            path (str): The mp4 file to write, overwritten if it exists.
+            fps (float): The frame rate of the video.
+            num_frames (int): The number of frames of the video.
+            encoding_settings (Dict[str, Any]): bitrate, iframe_interval, preset, profile, rc_mode, rc_target_quality
+                and video_full_range, as in the mp4 options of the capture. The current settings of
+                omni.videoencoding are used for the missing ones.
+            max_queue_size (int): The number of frames waiting for the encoder before put_async blocks.
+            interface (Any): The video encoding interface, from video_encoding.get_video_encoding_interface() by
+                default.
+        """
+        self._path = path
+        self._fps = fps
+        self._num_frames = num_frames
+        self._encoding_settings = dict(encoding_settings or {})
+        self._max_queue_size = max_queue_size
+        self._interface = interface
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker: Optional[asyncio.Future] = None
+        self._encoded = 0
+        self._failed = 0
+        self._encode_time = 0.0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def encoded(self) -> int:
+        return self._encoded
+
+    @property
+    def failed(self) -> int:
+        return self._failed
+
+    @property
+    def encode_time(self) -> float:
+        """Seconds spent handing the frames to the encoder"""
+        return self._encode_time
+
+    @property
+    def is_encoding(self) -> bool:
+        return self._worker is not None
+
+    def start(self):
+        """Start the encoding session. Raises RuntimeError if another stream is being encoded or the encoder fails"""
+        if self._worker is not None:
+            return
+        if VideoStreamEncoder._active is not None:
+            raise RuntimeError(f"The video encoder is already writing {VideoStreamEncoder._active.path}")
+        if self._interface is None:
+            import video_encoding
+
+            self._interface = video_encoding.get_video_encoding_interface()
+
+        settings = carb.settings.get_settings()
+        for name, value in self._encoding_settings.items():
+            settings.set(f"{VIDEO_ENCODING_SETTINGS_PATH}/{ENCODING_SETTING_NAMES[name]}", value)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        if not self._interface.start_encoding(self._path, self._fps, self._num_frames, True):
+            raise RuntimeError(f"The video encoder could not start writing {self._path}")
+
+        VideoStreamEncoder._active = self
+        self._encoded = 0
+        self._failed = 0
+        self._encode_time = 0.0
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        # One thread, the frames must reach the encoder in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VideoStreamEncoder")
+        self._worker = asyncio.ensure_future(self._encode_frames())
+
+    async def put_async(self, frame: np.ndarray):
+        """Queue the next frame of the video, an RGBA uint8 array, waiting if the encoder is behind"""
+        if self._worker is None:
+            self.start()
+        await self._queue.put(frame)
+
+    async def close_async(self):
+        """Encode the remaining frames and write the mp4"""
+        if self._worker is None:
+            return
+        try:
+            await self._queue.join()
+            self._worker.cancel()
+            await asyncio.get_event_loop().run_in_executor(self._executor, self._interface.finalize_encoding)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._worker = None
+            self._queue = None
+            self._executor = None
+            VideoStreamEncoder._active = None
+        carb.log_info(f"Video stream: {self._encoded} frames encoded into {self._path}, {self._failed} failed")
+
+    def _encode(self, frame: np.ndarray) -> float:
+        start = time.perf_counter()
+        frame = np.ascontiguousarray(frame)
+        if frame.dtype != np.uint8:
+            frame = np.clip(frame * 255.0, 0, 255).astype(np.uint8)
+        if frame.ndim == 3 and frame.shape[2] == 3:
+            # The encoder reads RGBA pixels
+            frame = np.concatenate([frame, np.full(frame.shape[:2] + (1,), 255, dtype=np.uint8)], axis=2)
+        self._interface.encode_next_frame_from_buffer(frame, frame.shape[1], frame.shape[0])
+        return time.perf_counter() - start
+
+    async def _encode_frames(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            frame = await self._queue.get()
+            try:
+                self._encode_time += await loop.run_in_executor(self._executor, self._encode, frame)
+                self._encoded += 1
+            except Exception as e:
+                self._failed += 1
+                carb.log_error(f"Video stream: failed to encode frame {self._encoded + self._failed} of {self._path}: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,141 @@
+"""
+| File: imu.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: IMUs of a batch of robots, measured from the state of their articulations at the physics rate
+"""
+
+__all__ = ["ImuBatch", "IMU_SIZE", "ACCEL", "GYRO"]
+
+import numpy as np
+from pxr import UsdGeom
+from typing import Optional
+from omni.mobile.robots.params import DEFAULT_WORLD_SETTINGS
+from omni.mobile.robots.logic.sensors.odometry_spec import IMU_SPECS, ImuSpec
+from omni.mobile.robots.logic.sensors.ring_buffer import RingBuffer
+from omni.mobile.robots.logic.world.xform_utils import get_rotation_matrices
+
+# Columns of a measurement: specific force and angular velocity, in the frame of the robot
+ACCEL = slice(0, 3)
+GYRO = slice(3, 6)
+IMU_SIZE = 6
+
+
+class ImuBatch:
+    """
+    IMU at the root of the articulation of N robots. Every update takes the world velocities and orientations of the
+    roots, e.g. of an ArticulationView, and writes the (N, 6) measurements of all the robots into a RingBuffer:
+
+        accel = R^T (dv/dt + g) + accel_bias + noise
+        gyro = R^T w + gyro_bias + noise
+
+    where g is the reaction to gravity, along the up axis of the stage.
+
+    The linear acceleration is the finite difference of the velocities of two updates, so update must be called at
+    every physics step. The biases drift as random walks. The measurements are computed in place in the write slot of
+    the buffer, and the history and work arrays are allocated once, so updating at 250 Hz allocates no per-sample
+    storage whatever the number of robots.
+    """
+
+    def __init__(
+        self,
+        num_robots: int,
+        spec: ImuSpec = IMU_SPECS["Husky"],
+        dt: float = DEFAULT_WORLD_SETTINGS["physics_dt"],
+        capacity: int = 250,
+        seed: Optional[int] = None,
+        up_axis: str = UsdGeom.Tokens.z,
+    ):
+        """
+        Args:
+            num_robots (int): The number of robots N.
+            spec (ImuSpec): The noise model of the IMUs.
+            dt (float): The time between two updates, the physics step by default.
+            capacity (int): The number of measurements kept in the history, one second at 250 Hz by default.
+            seed (int): The seed of the noise and biases, random by default.
+            up_axis (str): The up axis of the stage, which gravity points against.
+        """
+        self._spec = spec
+        self._dt = dt
+        self._rng = np.random.default_rng(seed)
+        self._history = RingBuffer(capacity, (num_robots, IMU_SIZE))
+        self._rotations = np.empty((num_robots, 3, 3), dtype=np.float64)
+        self._acceleration = np.zeros((num_robots, 3), dtype=np.float64)
+        # An accelerometer at rest measures the reaction to gravity, upward
+        self._gravity_reaction = np.zeros(3, dtype=np.float64)
+        self._gravity_reaction[1 if up_axis == UsdGeom.Tokens.y else 2] = spec.gravity
+        self._previous_velocities = np.zeros((num_robots, 3), dtype=np.float64)
+        self._has_previous = False
+        self._noise = np.empty((num_robots, IMU_SIZE), dtype=np.float64)
+        # Standard deviations of one sample of the white noise and of one step of the bias random walks
+        rate_scale, step_scale = 1.0 / np.sqrt(dt), np.sqrt(dt)
+        self._noise_std = np.repeat([spec.accel_noise_density * rate_scale, spec.gyro_noise_density * rate_scale], 3)
+        self._bias_walk_std = np.repeat([spec.accel_bias_random_walk * step_scale, spec.gyro_bias_random_walk * step_scale], 3)
+        self._biases = np.zeros((num_robots, IMU_SIZE), dtype=np.float64)
+        self.reset()
+
+    @property
+    def history(self) -> RingBuffer:
+        """The (N, 6) measurements of the last updates"""
+        return self._history
+
+    @property
+    def biases(self) -> np.ndarray:
+        """(N, 6) current biases of the accelerometers and gyroscopes"""
+        return self._biases
+
+    def reset(self):
+        """Draw new turn on biases and forget the history, e.g. when the robots are teleported"""
+        self._rng.standard_normal(out=self._biases)
+        self._biases[:, ACCEL] *= self._spec.accel_bias_std
+        self._biases[:, GYRO] *= self._spec.gyro_bias_std
+        self._has_previous = False
+        self._history.clear()
+
+    def update(
+        self, linear_velocities: np.ndarray, angular_velocities: np.ndarray, orientations: np.ndarray, timestamp: float
+    ) -> np.ndarray:
+        """
+        Measure the IMUs of all the robots.
+
+        Args:
+            linear_velocities (np.ndarray): (N, 3) velocities of the roots in the world frame.
+            angular_velocities (np.ndarray): (N, 3) angular velocities of the roots in the world frame, in rad/s.
+            orientations (np.ndarray): (N, 4) orientations of the roots as (w, x, y, z) quaternions.
+            timestamp (float): The simulation time of the measurements.
+
+        Returns:
+            np.ndarray: View of the (N, 6) measurements in the history.
+        """
+        acceleration = self._acceleration
+        if self._has_previous:
+            np.subtract(linear_velocities, self._previous_velocities, out=acceleration)
+            acceleration /= self._dt
+        else:
+            # The first update of a robot assumes a constant velocity
+            acceleration.fill(0.0)
+        self._previous_velocities[:] = linear_velocities
+        self._has_previous = True
+        acceleration += self._gravity_reaction
+
+        # World to body frame: v_body = R^T v_world
+        rotations = get_rotation_matrices(orientations, out=self._rotations)
+        measurements = self._history.get_write_slot()
+        np.einsum("nji,nj->ni", rotations, acceleration, out=measurements[:, ACCEL])
+        np.einsum("nji,nj->ni", rotations, angular_velocities, out=measurements[:, GYRO])
+
+        self._rng.standard_normal(out=self._noise)
+        self._noise *= self._bias_walk_std
+        self._biases += self._noise
+        self._rng.standard_normal(out=self._noise)
+        self._noise *= self._noise_std
+        measurements += self._biases
+        measurements += self._noise
+        self._history.commit(timestamp)
+        return measurements
+
+    def update_from_view(self, view, timestamp: float) -> np.ndarray:
+        """Measure the IMUs at the roots of the articulations of an ArticulationView, after a physics step"""
+        _, orientations = view.get_world_poses(clone=False)
+        velocities = view.get_velocities(clone=False)
+        return self.update(velocities[:, :3], velocities[:, 3:], orientations, timestamp)
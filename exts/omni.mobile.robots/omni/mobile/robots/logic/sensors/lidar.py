@@ -0,0 +1,120 @@
+"""
+| File: lidar.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Batch of 2D / 3D LiDARs scanning a raycast scene, every beam of every sensor in one query per tick
+"""
+
+__all__ = ["LidarBatch", "LidarScan"]
+
+import numpy as np
+from typing import NamedTuple, Optional
+from omni.mobile.robots.logic.sensors.lidar_spec import LIDAR_SPECS, LidarSpec, get_beam_directions
+from omni.mobile.robots.logic.sensors.raycast_scene import RaycastScene
+from omni.mobile.robots.logic.world.xform_utils import get_rotation_matrices
+
+
+class LidarScan(NamedTuple):
+    """Scan of N sensors with B beams each. The arrays are reused by the next scan, copy them to keep them"""
+
+    # (N, B) measured distances, inf for the beams without a return
+    ranges: np.ndarray
+    # (N, B, 3) measured points in the frame of the scene, nan for the beams without a return
+    points: np.ndarray
+    # (N, B) beams with a return
+    hits: np.ndarray
+
+
+class LidarBatch:
+    """
+    N identical LiDARs, e.g. one per robot, scanning a RaycastScene. A scan rotates the beams of the spec by the
+    orientation of every sensor, casts all of them in one call of the scene, then adds the range noise and drops
+    returns, all on (N, B) arrays. Every array is allocated once, so a scan allocates no per-beam python object
+    whatever the number of sensors and beams.
+
+    The scene is the OccupancyGridScene or TriangleMeshScene on the CPU, or the WarpMeshScene on the GPU.
+    """
+
+    def __init__(self, num_sensors: int, scene: RaycastScene, spec: LidarSpec = LIDAR_SPECS["2D"], seed: Optional[int] = None):
+        """
+        Args:
+            num_sensors (int): The number of LiDARs N.
+            scene (RaycastScene): The scene the beams are cast in.
+            spec (LidarSpec): The scan pattern, range and noise of the LiDARs.
+            seed (int): The seed of the noise and dropouts, random by default.
+        """
+        self._spec = spec
+        self._scene = scene
+        self._rng = np.random.default_rng(seed)
+        self._beam_directions = get_beam_directions(spec)
+        shape = (num_sensors, len(self._beam_directions))
+        self._rotations = np.empty((num_sensors, 3, 3), dtype=np.float64)
+        self._directions = np.empty(shape + (3,), dtype=np.float64)
+        self._ranges = np.empty(shape, dtype=np.float64)
+        self._points = np.empty(shape + (3,), dtype=np.float64)
+        self._hits = np.empty(shape, dtype=bool)
+        self._misses = np.empty(shape, dtype=bool)
+        self._noise = np.empty(shape, dtype=np.float64)
+
+    @property
+    def spec(self) -> LidarSpec:
+        return self._spec
+
+    @property
+    def num_sensors(self) -> int:
+        return self._ranges.shape[0]
+
+    @property
+    def num_beams(self) -> int:
+        return self._ranges.shape[1]
+
+    @property
+    def beam_directions(self) -> np.ndarray:
+        """(B, 3) directions of the beams in the frame of a sensor"""
+        return self._beam_directions
+
+    def scan(self, positions: np.ndarray, orientations: Optional[np.ndarray] = None) -> LidarScan:
+        """
+        One scan of all the sensors.
+
+        Args:
+            positions (np.ndarray): (N, 3) positions of the sensors, in the frame of the scene.
+            orientations (np.ndarray): (N, 4) orientations of the sensors as (w, x, y, z) quaternions, or None for
+                sensors aligned with the scene.
+
+        Returns:
+            LidarScan: The ranges, points and returns of all the beams.
+        """
+        spec = self._spec
+        positions = np.asarray(positions, dtype=np.float64)
+        directions, ranges, points, hits, misses = self._directions, self._ranges, self._points, self._hits, self._misses
+
+        # directions[n] = beam_directions @ rotation[n]^T
+        if orientations is None:
+            directions[:] = self._beam_directions
+        else:
+            get_rotation_matrices(orientations, out=self._rotations)
+            np.matmul(self._beam_directions, self._rotations.transpose(0, 2, 1), out=directions)
+
+        self._scene.cast(positions, directions, spec.max_range, out=ranges)
+
+        if spec.range_noise_std > 0.0:
+            self._rng.standard_normal(out=self._noise)
+            self._noise *= spec.range_noise_std
+            ranges += self._noise
+        np.greater_equal(ranges, spec.min_range, out=hits)
+        np.less_equal(ranges, spec.max_range, out=misses)
+        np.logical_and(hits, misses, out=hits)
+        if spec.dropout_probability > 0.0:
+            self._rng.random(out=self._noise)
+            np.greater_equal(self._noise, spec.dropout_probability, out=misses)
+            np.logical_and(hits, misses, out=hits)
+        np.logical_not(hits, out=misses)
+        ranges[misses] = np.inf
+
+        with np.errstate(invalid="ignore"):
+            np.multiply(directions, ranges[..., None], out=points)
+        points += positions[:, None]
+        points[misses] = np.nan
+        return LidarScan(ranges=ranges, points=points, hits=hits)
+
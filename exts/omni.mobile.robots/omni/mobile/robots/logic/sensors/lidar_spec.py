@@ -0,0 +1,73 @@
+"""
+| File: lidar_spec.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Scan pattern, range and noise of the 2D and 3D LiDARs, and the directions of their beams
+"""
+
+__all__ = ["LidarSpec", "LIDAR_SPECS", "get_beam_directions"]
+
+import numpy as np
+from typing import NamedTuple, Tuple
+
+
+class LidarSpec(NamedTuple):
+    """Parameters of a LiDAR model, angles in degrees and distances in meters"""
+
+    # Horizontal field of view, centered on the x axis of the sensor, and angle between two beams of a channel
+    horizontal_fov: float
+    horizontal_resolution: float
+    # Elevation of every channel, a single channel at 0 for a planar 2D LiDAR
+    channel_elevations: Tuple[float, ...] = (0.0,)
+    min_range: float = 0.1
+    max_range: float = 30.0
+    # Standard deviation of the gaussian noise added to the measured ranges
+    range_noise_std: float = 0.0
+    # Probability that a beam hitting something returns nothing, e.g. on dark or specular surfaces
+    dropout_probability: float = 0.0
+
+
+LIDAR_SPECS = {
+    # Planar safety scanner of the Husky, SICK LMS111-like
+    "2D": LidarSpec(
+        horizontal_fov=270.0,
+        horizontal_resolution=0.5,
+        min_range=0.5,
+        max_range=20.0,
+        range_noise_std=0.012,
+        dropout_probability=0.001,
+    ),
+    # 16 channel spinning LiDAR, Velodyne VLP-16-like
+    "3D": LidarSpec(
+        horizontal_fov=360.0,
+        horizontal_resolution=0.2,
+        channel_elevations=tuple(np.linspace(-15.0, 15.0, 16).tolist()),
+        min_range=0.4,
+        max_range=100.0,
+        range_noise_std=0.03,
+        dropout_probability=0.001,
+    ),
+}
+
+
+def get_beam_directions(spec: LidarSpec) -> np.ndarray:
+    """
+    Unit directions of all the beams of one scan, in the frame of the sensor (x forward, z up).
+
+    Args:
+        spec (LidarSpec): The LiDAR.
+
+    Returns:
+        np.ndarray: (C * H, 3) directions, channel by channel, each channel sweeping the field of view counterclockwise.
+    """
+    num_columns = int(round(spec.horizontal_fov / spec.horizontal_resolution))
+    if spec.horizontal_fov < 360.0:
+        # Both edges of the field of view are measured
+        num_columns += 1
+    azimuths = np.radians(-0.5 * spec.horizontal_fov + spec.horizontal_resolution * np.arange(num_columns))
+    elevations = np.radians(np.asarray(spec.channel_elevations, dtype=np.float64))[:, None]
+    directions = np.empty((len(spec.channel_elevations), num_columns, 3), dtype=np.float64)
+    directions[..., 0] = np.cos(elevations) * np.cos(azimuths)
+    directions[..., 1] = np.cos(elevations) * np.sin(azimuths)
+    directions[..., 2] = np.sin(elevations)
+    return directions.reshape(-1, 3)
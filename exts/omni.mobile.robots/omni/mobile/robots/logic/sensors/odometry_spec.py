@@ -0,0 +1,67 @@
+"""
+| File: odometry_spec.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Noise and bias models of the IMUs and wheel encoders of the mobile bases of ROBOT_ENVIRONMENTS
+"""
+
+__all__ = ["ImuSpec", "IMU_SPECS", "WheelEncoderSpec", "WHEEL_ENCODER_SPECS"]
+
+from typing import NamedTuple
+
+
+class ImuSpec(NamedTuple):
+    """
+    Noise of an IMU as in its datasheet or an Allan variance calibration, in SI units. The white noise of a sample
+    at the rate f has the standard deviation noise_density * sqrt(f), and the bias drifts as a random walk.
+    """
+
+    # m/s^2/sqrt(Hz) and rad/s/sqrt(Hz)
+    accel_noise_density: float
+    gyro_noise_density: float
+    # m/s^3/sqrt(Hz) and rad/s^2/sqrt(Hz)
+    accel_bias_random_walk: float
+    gyro_bias_random_walk: float
+    # Standard deviation of the turn on biases, in m/s^2 and rad/s
+    accel_bias_std: float = 0.0
+    gyro_bias_std: float = 0.0
+    gravity: float = 9.81
+
+
+class WheelEncoderSpec(NamedTuple):
+    """Wheel encoders of a mobile base and the errors of the odometry integrated from them"""
+
+    ticks_per_revolution: int
+    # Relative error of the effective radius of the wheels of each side, drawn once per robot
+    radius_error_std: float = 0.0
+    # Standard deviation of the slip, relative to the distance travelled by a wheel
+    slip_std: float = 0.0
+
+
+# MEMS IMUs of the BMI088 class
+IMU_SPECS = {
+    "Husky": ImuSpec(
+        accel_noise_density=1.7e-3,
+        gyro_noise_density=2.4e-4,
+        accel_bias_random_walk=3.0e-3,
+        gyro_bias_random_walk=2.0e-5,
+        accel_bias_std=0.02,
+        gyro_bias_std=1.0e-3,
+    ),
+    "WeCAR": ImuSpec(
+        accel_noise_density=2.0e-3,
+        gyro_noise_density=3.0e-4,
+        accel_bias_random_walk=4.0e-3,
+        gyro_bias_random_walk=3.0e-5,
+        accel_bias_std=0.05,
+        gyro_bias_std=2.0e-3,
+    ),
+}
+IMU_SPECS["Husky + FR3"] = IMU_SPECS["Husky"]
+
+# The skid steering of the Husky slips much more than the rolling wheels of the WeCAR
+WHEEL_ENCODER_SPECS = {
+    "Husky": WheelEncoderSpec(ticks_per_revolution=4096, radius_error_std=0.01, slip_std=0.05),
+    "WeCAR": WheelEncoderSpec(ticks_per_revolution=1024, radius_error_std=0.005, slip_std=0.01),
+}
+WHEEL_ENCODER_SPECS["Husky + FR3"] = WHEEL_ENCODER_SPECS["Husky"]
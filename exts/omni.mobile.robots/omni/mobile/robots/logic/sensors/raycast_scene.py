@@ -0,0 +1,235 @@
+"""
+| File: raycast_scene.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: CPU scenes casting the beams of a batch of LiDARs, an occupancy grid and a triangle mesh
+"""
+
+__all__ = ["RaycastScene", "OccupancyGridScene", "TriangleMeshScene", "get_stage_triangles"]
+
+import numpy as np
+from abc import ABC, abstractmethod
+from pxr import Usd, UsdGeom
+from typing import Tuple
+
+# Upper bound of the number of (ray, triangle) pairs tested at once by the TriangleMeshScene, to bound its memory
+_MESH_CHUNK_SIZE = 1 << 20
+
+
+class RaycastScene(ABC):
+    """
+    Scene queried by the LidarBatch. cast finds the first hit of every beam of every sensor in one call, the beams are
+    never cast one by one from python.
+    """
+
+    @abstractmethod
+    def cast(self, origins: np.ndarray, directions: np.ndarray, max_range: float, out: np.ndarray) -> np.ndarray:
+        """
+        Distance to the first hit of every beam.
+
+        Args:
+            origins (np.ndarray): (N, 3) positions of the sensors, in the frame of the scene.
+            directions (np.ndarray): (N, B, 3) unit directions of the beams of every sensor.
+            max_range (float): The longest distance searched.
+            out (np.ndarray): (N, B) distances written, inf for the beams hitting nothing within max_range.
+
+        Returns:
+            np.ndarray: out.
+        """
+
+
+class OccupancyGridScene(RaycastScene):
+    """
+    2D occupancy grid whose occupied cells are boxes extruded from z = 0 to the height of the obstacles, e.g. a map of
+    a warehouse. There is no ground: beams only hit the obstacles.
+
+    The beams are traversed cell by cell with a DDA (Amanatides & Woo) vectorized over all the beams, so the number
+    of python iterations is the number of cells crossed by the longest beam, whatever the number of beams.
+    """
+
+    def __init__(self, occupancy: np.ndarray, resolution: float, origin: Tuple[float, float] = (0.0, 0.0), height: float = 2.0):
+        """
+        Args:
+            occupancy (np.ndarray): (rows, columns) occupied cells, rows along y and columns along x.
+            resolution (float): The size of the cells, in meters.
+            origin (Tuple[float, float]): The x and y of the corner of the cell (0, 0).
+            height (float): The height of the obstacles.
+        """
+        self._occupancy = np.ascontiguousarray(occupancy, dtype=bool)
+        self._resolution = float(resolution)
+        self._origin = np.asarray(origin, dtype=np.float64)
+        self._height = float(height)
+        # Number of cells along x and y
+        self._size = np.array(self._occupancy.shape[::-1], dtype=np.int64)
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        return self._occupancy
+
+    def cast(self, origins: np.ndarray, directions: np.ndarray, max_range: float, out: np.ndarray) -> np.ndarray:
+        num_beams = directions.shape[1]
+        directions = directions.reshape(-1, 3)
+        starts = np.repeat(np.asarray(origins, dtype=np.float64), num_beams, axis=0)
+        distances = out.reshape(-1)
+        distances.fill(np.inf)
+
+        # Every beam in grid units: position(t) = start + direction * t, t being the distance over the resolution
+        resolution, height = self._resolution, self._height
+        start = (starts[:, :2] - self._origin) / resolution
+        planar = directions[:, :2]
+        z0, dz = starts[:, 2], directions[:, 2]
+        cell = np.floor(start).astype(np.int64)
+        step = np.where(planar >= 0.0, 1, -1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Parameter of the next cell boundary crossed along x and y, and between two boundaries
+            t_next = np.where(planar != 0.0, (cell + (step > 0) - start) / planar, np.inf)
+            t_delta = np.where(planar != 0.0, 1.0 / np.abs(planar), np.inf)
+        t_enter = np.zeros(len(start))
+        max_t = max_range / resolution
+        index = np.arange(len(start))
+
+        while index.size:
+            keep = np.all((cell >= 0) & (cell < self._size), axis=1) & (t_enter < max_t)
+            if not keep.all():
+                index, cell, step, t_next, t_delta, t_enter, z0, dz = (
+                    array[keep] for array in (index, cell, step, t_next, t_delta, t_enter, z0, dz)
+                )
+                if not index.size:
+                    break
+
+            # A beam hits an occupied cell if it is between the floor and the top of the obstacle inside the cell
+            t_exit = np.minimum(t_next.min(axis=1), max_t)
+            z_enter = z0 + dz * t_enter * resolution
+            z_exit = z0 + dz * t_exit * resolution
+            hit = (
+                self._occupancy[cell[:, 1], cell[:, 0]]
+                & (np.maximum(z_enter, z_exit) >= 0.0)
+                & (np.minimum(z_enter, z_exit) <= height)
+            )
+            if hit.any():
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    # Beams entering the cell above or below the obstacle hit it where they cross its top or the floor
+                    t_band = np.where(z_enter > height, height - z0, -z0) / (dz * resolution)
+                t_hit = np.where((z_enter >= 0.0) & (z_enter <= height), t_enter, t_band)
+                distances[index[hit]] = t_hit[hit] * resolution
+                missed = ~hit
+                index, cell, step, t_next, t_delta, t_exit, z0, dz = (
+                    array[missed] for array in (index, cell, step, t_next, t_delta, t_exit, z0, dz)
+                )
+
+            # Move every beam to the next cell it crosses
+            rows = np.arange(index.size)
+            axis = np.argmin(t_next, axis=1)
+            t_enter = t_exit
+            cell[rows, axis] += step[rows, axis]
+            t_next[rows, axis] += t_delta[rows, axis]
+
+        distances[distances > max_range] = np.inf
+        return out
+
+
+class TriangleMeshScene(RaycastScene):
+    """
+    Triangle mesh intersected with the Moller-Trumbore test of every beam against every triangle, vectorized over
+    chunks of beams. The cost grows with the number of triangles, so this is the reference implementation for tests
+    and small scenes without a GPU; the WarpMeshScene casts the beams of large scenes on the GPU.
+    """
+
+    def __init__(self, points: np.ndarray, triangles: np.ndarray):
+        """
+        Args:
+            points (np.ndarray): (V, 3) vertices of the mesh, in the frame of the scene.
+            triangles (np.ndarray): (T, 3) vertex indices of the triangles.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self._v0 = points[triangles[:, 0]]
+        self._edge1 = points[triangles[:, 1]] - self._v0
+        self._edge2 = points[triangles[:, 2]] - self._v0
+
+    @classmethod
+    def from_stage(cls, stage: Usd.Stage, root_path: str = "/") -> "TriangleMeshScene":
+        """The scene of the meshes of a stage under root_path"""
+        return cls(*get_stage_triangles(stage, root_path))
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self._v0)
+
+    def cast(self, origins: np.ndarray, directions: np.ndarray, max_range: float, out: np.ndarray) -> np.ndarray:
+        num_beams = directions.shape[1]
+        directions = directions.reshape(-1, 3)
+        starts = np.repeat(np.asarray(origins, dtype=np.float64), num_beams, axis=0)
+        distances = out.reshape(-1)
+        distances.fill(np.inf)
+        if not self.num_triangles:
+            return out
+
+        v0, edge1, edge2 = self._v0[None], self._edge1[None], self._edge2[None]
+        chunk_size = max(1, _MESH_CHUNK_SIZE // self.num_triangles)
+        for begin in range(0, len(directions), chunk_size):
+            direction = directions[begin : begin + chunk_size, None]
+            p = np.cross(direction, edge2)
+            determinant = np.einsum("rtk,rtk->rt", p, np.broadcast_to(edge1, p.shape))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inverse = 1.0 / determinant
+                offset = starts[begin : begin + chunk_size, None] - v0
+                u = np.einsum("rtk,rtk->rt", offset, p) * inverse
+                q = np.cross(offset, edge1)
+                v = np.einsum("rtk,rtk->rt", np.broadcast_to(direction, q.shape), q) * inverse
+                t = np.einsum("rtk,rtk->rt", np.broadcast_to(edge2, q.shape), q) * inverse
+                # Both faces of the triangles are hit
+                valid = (np.abs(determinant) > 1e-12) & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t > 1e-9)
+            distances[begin : begin + chunk_size] = np.where(valid, t, np.inf).min(axis=1)
+
+        distances[distances > max_range] = np.inf
+        return out
+
+
+def get_stage_triangles(stage: Usd.Stage, root_path: str = "/", time=Usd.TimeCode.Default()) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Triangles of all the meshes of a stage under root_path, instances included, in world space.
+
+    Args:
+        stage (Usd.Stage): The stage.
+        root_path (str): The root of the meshes.
+        time (Usd.TimeCode): The time of the points and transforms.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (V, 3) vertices and (T, 3) vertex indices of the triangles. The polygons of the
+            meshes are fan triangulated.
+    """
+    root = stage.GetPrimAtPath(root_path)
+    xform_cache = UsdGeom.XformCache(time)
+    all_points, all_triangles = [], []
+    num_points = 0
+    for prim in Usd.PrimRange(root, Usd.TraverseInstanceProxies()):
+        if not prim.IsA(UsdGeom.Mesh):
+            continue
+        mesh = UsdGeom.Mesh(prim)
+        points = mesh.GetPointsAttr().Get(time)
+        counts = mesh.GetFaceVertexCountsAttr().Get(time)
+        indices = mesh.GetFaceVertexIndicesAttr().Get(time)
+        if not points or not counts or not indices:
+            continue
+        points = np.asarray(points, dtype=np.float64)
+        counts = np.asarray(counts, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+
+        # Row vectors, as Gf: world = [point, 1] @ transform
+        transform = np.array(xform_cache.GetLocalToWorldTransform(prim), dtype=np.float64)
+        points = points @ transform[:3, :3] + transform[3, :3]
+
+        # Fan of every polygon: (first, k, k + 1) for k in 1 .. count - 2
+        num_triangles = np.maximum(counts - 2, 0)
+        first = np.repeat(np.cumsum(counts) - counts, num_triangles)
+        k = np.arange(num_triangles.sum()) - np.repeat(np.cumsum(num_triangles) - num_triangles, num_triangles) + 1
+        triangles = indices[np.stack([first, first + k, first + k + 1], axis=1)]
+
+        all_points.append(points)
+        all_triangles.append(triangles + num_points)
+        num_points += len(points)
+
+    if not all_points:
+        return np.zeros((0, 3), dtype=np.float64), np.zeros((0, 3), dtype=np.int64)
+    return np.concatenate(all_points), np.concatenate(all_triangles)
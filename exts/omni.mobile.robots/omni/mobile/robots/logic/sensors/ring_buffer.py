@@ -0,0 +1,112 @@
+"""
+| File: ring_buffer.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Fixed size history of the samples of a sensor stream, read back as array views without copies
+"""
+
+__all__ = ["RingBuffer"]
+
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+
+class RingBuffer:
+    """
+    The last capacity samples of a stream, e.g. the (N, 6) IMU measurements of N robots at every physics step, and
+    their timestamps.
+
+    Every sample is stored twice, at slots i and i + capacity of an array of 2 * capacity samples, so the most recent
+    samples, up to capacity of them, are always contiguous and in chronological order. Reads return views of the
+    storage and never copy; writes copy one sample twice and allocate nothing. The views are overwritten as new
+    samples arrive, a consumer keeping samples for longer than capacity samples must copy them.
+
+    A producer either appends a sample computed elsewhere, or computes it in place: it writes into get_write_slot(),
+    then commits it.
+    """
+
+    def __init__(self, capacity: int, shape: Sequence[int], dtype=np.float64):
+        """
+        Args:
+            capacity (int): The number of samples kept.
+            shape (Sequence[int]): The shape of one sample.
+            dtype: The type of the samples.
+        """
+        if capacity <= 0:
+            raise ValueError(f"The capacity of a ring buffer must be positive, got {capacity}")
+        self._capacity = capacity
+        self._data = np.zeros((2 * capacity,) + tuple(shape), dtype=dtype)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._num_samples = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """The shape of one sample"""
+        return self._data.shape[1:]
+
+    @property
+    def num_samples(self) -> int:
+        """The number of samples written since the creation or the last clear, kept or not"""
+        return self._num_samples
+
+    def __len__(self) -> int:
+        """The number of samples kept"""
+        return min(self._num_samples, self._capacity)
+
+    def clear(self):
+        self._num_samples = 0
+
+    def get_write_slot(self) -> np.ndarray:
+        """View of the storage of the next sample, to compute it in place before calling commit"""
+        return self._data[self._num_samples % self._capacity]
+
+    def commit(self, timestamp: float):
+        """Publish the sample written into the write slot"""
+        index = self._num_samples % self._capacity
+        self._data[index + self._capacity] = self._data[index]
+        self._timestamps[index] = self._timestamps[index + self._capacity] = timestamp
+        self._num_samples += 1
+
+    def append(self, sample: np.ndarray, timestamp: float):
+        """Copy a sample into the buffer"""
+        self.get_write_slot()[...] = sample
+        self.commit(timestamp)
+
+    def get_latest(self, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The most recent samples, oldest first.
+
+        Args:
+            count (int): The number of samples, all the samples kept by default. Capped at the number of samples kept.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Views of the (K,) timestamps and of the (K, *shape) samples.
+        """
+        count = len(self) if count is None else min(count, len(self))
+        # The last sample is the mirror copy at index + capacity, the older ones precede it in the storage
+        end = (self._num_samples - 1) % self._capacity + self._capacity + 1
+        return self._timestamps[end - count : end], self._data[end - count : end]
+
+    def get_since(self, sample_index: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        The samples written since a consumer last read, for consumers slower than the producer.
+
+        Args:
+            sample_index (int): The num_samples of the previous read, 0 for the first one.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, int]: Views of the timestamps and samples, and the sample_index of the next
+                read. If more than capacity samples were written since the previous read, the oldest ones are lost.
+        """
+        timestamps, samples = self.get_latest(max(self._num_samples - sample_index, 0))
+        return timestamps, samples, self._num_samples
+
+    def get_last(self) -> Optional[np.ndarray]:
+        """View of the most recent sample, None if there is none"""
+        if not self._num_samples:
+            return None
+        return self._data[(self._num_samples - 1) % self._capacity]
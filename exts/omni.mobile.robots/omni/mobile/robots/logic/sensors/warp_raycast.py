@@ -0,0 +1,103 @@
+"""
+| File: warp_raycast.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Triangle mesh scene casting all the beams of all the LiDARs in one warp kernel launch, on the GPU
+"""
+
+__all__ = ["WarpMeshScene"]
+
+import numpy as np
+import warp as wp
+from pxr import Usd
+from omni.mobile.robots.logic.sensors.raycast_scene import RaycastScene, get_stage_triangles
+
+
+@wp.kernel
+def _raycast_kernel(
+    mesh: wp.uint64,
+    origins: wp.array(dtype=wp.vec3),
+    directions: wp.array2d(dtype=wp.vec3),
+    max_range: float,
+    distances: wp.array2d(dtype=float),
+):
+    sensor, beam = wp.tid()
+    t = float(0.0)
+    u = float(0.0)
+    v = float(0.0)
+    sign = float(0.0)
+    normal = wp.vec3()
+    face = int(0)
+    if wp.mesh_query_ray(mesh, origins[sensor], directions[sensor, beam], max_range, t, u, v, sign, normal, face):
+        distances[sensor, beam] = t
+    else:
+        distances[sensor, beam] = wp.inf
+
+
+class WarpMeshScene(RaycastScene):
+    """
+    Triangle mesh held in a warp BVH. cast uploads the sensor poses and beam directions, then a single kernel launch
+    finds the first hit of every beam of every sensor. The device buffers, and the pinned host buffers which the
+    uploads and downloads go through, are allocated on the first cast and reused while the number of sensors and beams
+    does not change, so a cast allocates nothing.
+
+    The PhysX scene queries of omni.physx raycast one beam per python call, so the colliders of the stage are not
+    queried directly: the scene is built from the meshes of the stage, once, and static.
+    """
+
+    def __init__(self, points: np.ndarray, triangles: np.ndarray, device: str = "cuda:0"):
+        """
+        Args:
+            points (np.ndarray): (V, 3) vertices of the mesh, in the frame of the scene.
+            triangles (np.ndarray): (T, 3) vertex indices of the triangles.
+            device (str): The warp device of the mesh and of the queries.
+        """
+        # Initializing warp loads CUDA, so it happens with the first scene instead of at import
+        wp.init()
+        self._device = device
+        self._pinned = wp.get_device(device).is_cuda
+        self._mesh = wp.Mesh(
+            points=wp.array(np.asarray(points, dtype=np.float32), dtype=wp.vec3, device=device),
+            indices=wp.array(np.asarray(triangles, dtype=np.int32).reshape(-1), dtype=wp.int32, device=device),
+        )
+        self._origins = None
+        self._directions = None
+        self._distances = None
+        self._host_origins = None
+        self._host_directions = None
+        self._host_distances = None
+
+    @classmethod
+    def from_stage(cls, stage: Usd.Stage, root_path: str = "/", device: str = "cuda:0") -> "WarpMeshScene":
+        """The scene of the meshes of a stage under root_path"""
+        points, triangles = get_stage_triangles(stage, root_path)
+        return cls(points, triangles, device)
+
+    def _allocate(self, shape):
+        self._origins = wp.zeros(shape[0], dtype=wp.vec3, device=self._device)
+        self._directions = wp.zeros(shape, dtype=wp.vec3, device=self._device)
+        self._distances = wp.zeros(shape, dtype=float, device=self._device)
+        self._host_origins = wp.zeros(shape[0], dtype=wp.vec3, device="cpu", pinned=self._pinned)
+        self._host_directions = wp.zeros(shape, dtype=wp.vec3, device="cpu", pinned=self._pinned)
+        self._host_distances = wp.zeros(shape, dtype=float, device="cpu", pinned=self._pinned)
+
+    def cast(self, origins: np.ndarray, directions: np.ndarray, max_range: float, out: np.ndarray) -> np.ndarray:
+        shape = directions.shape[:2]
+        if self._distances is None or self._distances.shape != shape:
+            self._allocate(shape)
+        # numpy of a host array is a view: the float64 poses are cast into the pinned buffers without a temporary
+        np.copyto(self._host_origins.numpy(), origins, casting="same_kind")
+        np.copyto(self._host_directions.numpy(), directions, casting="same_kind")
+        wp.copy(self._origins, self._host_origins)
+        wp.copy(self._directions, self._host_directions)
+        wp.launch(
+            _raycast_kernel,
+            dim=shape,
+            inputs=[self._mesh.id, self._origins, self._directions, float(max_range), self._distances],
+            device=self._device,
+        )
+        wp.copy(self._host_distances, self._distances)
+        # The copies from and to pinned memory are asynchronous
+        wp.synchronize_device(self._device)
+        np.copyto(out, self._host_distances.numpy())
+        return out
@@ -0,0 +1,212 @@
+"""
+| File: wheel_odometry.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Wheel encoders of a batch of mobile bases and the odometry integrated from them, at the physics rate
+"""
+
+__all__ = ["WheelOdometryBatch", "ODOMETRY_SIZE", "X", "Y", "YAW", "SPEED", "YAW_RATE"]
+
+import numpy as np
+from typing import Optional, Sequence
+from omni.mobile.robots.params import DEFAULT_WORLD_SETTINGS
+from omni.mobile.robots.logic.sensors.odometry_spec import WHEEL_ENCODER_SPECS, WheelEncoderSpec
+from omni.mobile.robots.logic.sensors.ring_buffer import RingBuffer
+from omni.mobile.robots.logic.vehicles.vehicle_spec import VEHICLE_SPECS, VehicleSpec
+
+# Columns of an odometry sample: planar pose in the odometry frame, forward speed and yaw rate
+X, Y, YAW, SPEED, YAW_RATE = range(5)
+ODOMETRY_SIZE = 5
+
+
+class WheelOdometryBatch:
+    """
+    Wheel encoders of N mobile bases of the same kind, and the dead reckoning of their planar pose. Every update takes
+    the (N, W) angles of the wheel joints, e.g. read from an ArticulationView, and writes two streams:
+
+        encoder_history     (N, W) encoder counts, the wheel angles quantized to the ticks of the encoders
+        odometry_history    (N, 5) x, y, yaw, speed and yaw rate integrated from the counts
+
+    The distance travelled by each side is the mean of its wheels, scaled by a radius error drawn once per robot, plus
+    a slip proportional to it. Differential drives turn by the difference of the sides over the effective track width
+    of the skid steering; Ackermann drives need the steering angle and use the bicycle model.
+
+    Every array is allocated once and the samples are computed in the write slots of the buffers, so updating at 250 Hz
+    allocates no per-sample storage whatever the number of robots.
+    """
+
+    def __init__(
+        self,
+        num_robots: int,
+        vehicle: VehicleSpec = VEHICLE_SPECS["Husky"],
+        encoder: WheelEncoderSpec = WHEEL_ENCODER_SPECS["Husky"],
+        left_wheels: Sequence[int] = (0, 2),
+        right_wheels: Sequence[int] = (1, 3),
+        dt: float = DEFAULT_WORLD_SETTINGS["physics_dt"],
+        capacity: int = 250,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            num_robots (int): The number of robots N.
+            vehicle (VehicleSpec): The geometry of the mobile bases.
+            encoder (WheelEncoderSpec): The encoders and the errors of the odometry.
+            left_wheels (Sequence[int]): The columns of the wheel angles of the left wheels.
+            right_wheels (Sequence[int]): The columns of the wheel angles of the right wheels.
+            dt (float): The time between two updates, the physics step by default.
+            capacity (int): The number of samples kept in the histories, one second at 250 Hz by default.
+            seed (int): The seed of the radius errors and slips, random by default.
+        """
+        self._vehicle = vehicle
+        self._encoder = encoder
+        self._dt = dt
+        self._rng = np.random.default_rng(seed)
+        self._radians_per_tick = 2.0 * np.pi / encoder.ticks_per_revolution
+        num_wheels = max(max(left_wheels), max(right_wheels)) + 1
+
+        # (W, 2) mean of the wheels of the left and right sides, as one matrix product
+        self._side_weights = np.zeros((num_wheels, 2), dtype=np.float64)
+        self._side_weights[list(left_wheels), 0] = 1.0 / len(left_wheels)
+        self._side_weights[list(right_wheels), 1] = 1.0 / len(right_wheels)
+        self._radius_scales = np.empty((num_robots, 2), dtype=np.float64)
+
+        self._encoder_history = RingBuffer(capacity, (num_robots, num_wheels), dtype=np.int64)
+        self._odometry_history = RingBuffer(capacity, (num_robots, ODOMETRY_SIZE))
+        self._previous_ticks = np.zeros((num_robots, num_wheels), dtype=np.int64)
+        self._has_previous = False
+        self._angles = np.empty((num_robots, num_wheels), dtype=np.float64)
+        self._sides = np.empty((num_robots, 2), dtype=np.float64)
+        self._slips = np.empty((num_robots, 2), dtype=np.float64)
+        self._magnitudes = np.empty((num_robots, 2), dtype=np.float64)
+        self._distances = np.empty(num_robots, dtype=np.float64)
+        self._yaw_changes = np.empty(num_robots, dtype=np.float64)
+        self._headings = np.empty(num_robots, dtype=np.float64)
+        self._work = np.empty(num_robots, dtype=np.float64)
+        self._poses = np.zeros((num_robots, 3), dtype=np.float64)
+        self.reset()
+
+    @property
+    def encoder_history(self) -> RingBuffer:
+        """The (N, W) encoder counts of the last updates"""
+        return self._encoder_history
+
+    @property
+    def odometry_history(self) -> RingBuffer:
+        """The (N, 5) odometry of the last updates"""
+        return self._odometry_history
+
+    @property
+    def poses(self) -> np.ndarray:
+        """(N, 3) current x, y and yaw of the odometry"""
+        return self._poses
+
+    def reset(self, poses: Optional[np.ndarray] = None):
+        """
+        Restart the odometry of all the robots, and draw new radius errors.
+
+        Args:
+            poses (np.ndarray): (N, 3) x, y and yaw the odometry starts from, the origin by default.
+        """
+        self._rng.standard_normal(out=self._radius_scales)
+        self._radius_scales *= self._encoder.radius_error_std
+        self._radius_scales += 1.0
+        self._radius_scales *= self._vehicle.wheel_radius * self._radians_per_tick
+        if poses is None:
+            self._poses.fill(0.0)
+        else:
+            self._poses[:] = poses
+        self._has_previous = False
+        self._encoder_history.clear()
+        self._odometry_history.clear()
+
+    def update(self, wheel_angles: np.ndarray, timestamp: float, steering_angles: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read the encoders of all the robots and integrate their odometry.
+
+        Args:
+            wheel_angles (np.ndarray): (N, W) angles of the wheel joints, in radians, counted forward.
+            timestamp (float): The simulation time of the measurements.
+            steering_angles (np.ndarray): (N,) steering angles of the virtual center front wheels, needed by the
+                Ackermann drives.
+
+        Returns:
+            np.ndarray: View of the (N, 5) odometry in the history.
+        """
+        ticks = self._encoder_history.get_write_slot()
+        np.divide(wheel_angles, self._radians_per_tick, out=self._angles)
+        np.floor(self._angles, out=self._angles)
+        ticks[...] = self._angles
+        odometry = self._odometry_history.get_write_slot()
+        if not self._has_previous:
+            # The first counts are the reference of the next ones
+            self._previous_ticks[:] = ticks
+            self._has_previous = True
+
+        # Ticks of every wheel since the previous update, then distance travelled by the left and right sides
+        np.subtract(ticks, self._previous_ticks, out=self._angles)
+        self._previous_ticks[:] = ticks
+        np.matmul(self._angles, self._side_weights, out=self._sides)
+        self._sides *= self._radius_scales
+        if self._encoder.slip_std > 0.0:
+            self._rng.standard_normal(out=self._slips)
+            self._slips *= self._encoder.slip_std
+            np.abs(self._sides, out=self._magnitudes)
+            self._slips *= self._magnitudes
+            self._sides += self._slips
+        distances, yaw_changes = self._distances, self._yaw_changes
+        np.add(self._sides[:, 0], self._sides[:, 1], out=distances)
+        distances *= 0.5
+
+        if steering_angles is None:
+            np.subtract(self._sides[:, 1], self._sides[:, 0], out=yaw_changes)
+            yaw_changes /= self._vehicle.track_width * self._vehicle.skid_factor
+        else:
+            np.tan(steering_angles, out=yaw_changes)
+            yaw_changes *= distances
+            yaw_changes /= self._vehicle.wheelbase
+
+        # Midpoint integration of the pose
+        poses, headings, work = self._poses, self._headings, self._work
+        np.multiply(yaw_changes, 0.5, out=headings)
+        headings += poses[:, YAW]
+        np.cos(headings, out=work)
+        work *= distances
+        poses[:, X] += work
+        np.sin(headings, out=work)
+        work *= distances
+        poses[:, Y] += work
+        poses[:, YAW] += yaw_changes
+        poses[:, YAW] += np.pi
+        np.remainder(poses[:, YAW], 2.0 * np.pi, out=poses[:, YAW])
+        poses[:, YAW] -= np.pi
+
+        odometry[:, :3] = poses
+        np.divide(distances, self._dt, out=odometry[:, SPEED])
+        np.divide(yaw_changes, self._dt, out=odometry[:, YAW_RATE])
+        self._encoder_history.commit(timestamp)
+        self._odometry_history.commit(timestamp)
+        return odometry
+
+    def update_from_view(
+        self,
+        view,
+        wheel_joint_indices: Sequence[int],
+        timestamp: float,
+        steering_joint_indices: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Read the encoders of the wheel joints of an ArticulationView, after a physics step.
+
+        Args:
+            view (ArticulationView): The articulations of the robots.
+            wheel_joint_indices (Sequence[int]): The degrees of freedom of the wheels, in the order of the columns of
+                left_wheels and right_wheels.
+            timestamp (float): The simulation time of the measurements.
+            steering_joint_indices (Sequence[int]): The steering joints of Ackermann drives, whose mean angle is the one
+                of the virtual center wheel.
+        """
+        wheel_angles = view.get_joint_positions(joint_indices=wheel_joint_indices, clone=False)
+        steering_angles = None
+        if steering_joint_indices is not None:
+            steering_angles = view.get_joint_positions(joint_indices=steering_joint_indices, clone=False).mean(axis=1)
+        return self.update(wheel_angles, timestamp, steering_angles)
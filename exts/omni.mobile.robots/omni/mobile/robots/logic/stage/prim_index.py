@@ -0,0 +1,286 @@
+"""
+| File: prim_index.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Index of the prims of the stage by schema type and applied API, kept up to date from USD change notices
+"""
+
+__all__ = ["PrimIndex", "get_prim_index", "release_prim_index"]
+
+import time
+import asyncio
+import carb
+import omni.kit.app
+import omni.usd
+from pxr import Sdf, Tf, Usd
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+
+class PrimIndex:
+    """
+    Paths of the prims of a stage, grouped by schema type and by applied API schema.
+
+    A prim is indexed under its own type and every schema type it derives from (a Camera is found when asking for
+    Camera, Xformable or Imageable), and under each of its applied APIs, with and without their instance name
+    (CollectionAPI:lights is found when asking for CollectionAPI). The stage is only traversed when it is attached;
+    afterwards only the subtrees resynced by Usd.Notice.ObjectsChanged are traversed again. Notices are accumulated and
+    applied on the next update, or before a query if one comes first.
+
+    Only the prims which can be edited are indexed: the prototypes of the instanceable prims and the instance proxies
+    below the instances are not. The cameras and sensors used by the capture and the robots are authored outside of
+    the instanceable subtrees (e.g. the meshes of a robot), so they are found under their own path.
+    """
+
+    def __init__(self):
+        self._stage: Usd.Stage = None
+        self._notice_listener = None
+        self._stage_event_sub = None
+
+        self._by_type: Dict[str, Set[Sdf.Path]] = {}
+        self._by_api: Dict[str, Set[Sdf.Path]] = {}
+        # Keys of every indexed prim, and its indexed children, so a removed subtree is dropped without USD queries
+        self._prim_keys: Dict[Sdf.Path, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._children: Dict[Sdf.Path, Set[Sdf.Path]] = {}
+        self._type_names_cache: Dict[str, Tuple[str, ...]] = {}
+
+        self._pending_paths: Set[Sdf.Path] = set()
+        self._flush_task = None
+
+        self._change_fns: Dict[int, Callable[[Set[Sdf.Path], Set[Sdf.Path]], None]] = {}
+        self._next_change_fn_id = 0
+
+    @property
+    def stage(self) -> Usd.Stage:
+        return self._stage
+
+    def attach(self, stage: Usd.Stage):
+        """Index the given stage with one traversal and start listening to its changes"""
+        self.detach()
+        if stage is None:
+            return
+
+        start = time.perf_counter()
+        self._stage = stage
+        self._index_subtree(stage.GetPseudoRoot(), set())
+        self._notice_listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+        carb.log_info(
+            f"Prim index: indexed {len(self._prim_keys)} prims in {(time.perf_counter() - start) * 1000.0:.1f} ms"
+        )
+
+        self._notify(set(self._prim_keys.keys()), set())
+
+    def follow_usd_context(self, usd_context):
+        """Attach to the stage of the usd context, and to every stage opened in it later on"""
+        self.attach(usd_context.get_stage())
+
+        def _on_stage_event(event):
+            if event.type == int(omni.usd.StageEventType.OPENED):
+                self.attach(usd_context.get_stage())
+            elif event.type == int(omni.usd.StageEventType.CLOSED):
+                self.detach()
+
+        self._stage_event_sub = usd_context.get_stage_event_stream().create_subscription_to_pop(
+            _on_stage_event, name="omni.mobile.robots prim index"
+        )
+
+    def destroy(self):
+        """Stop following the usd context and release the indexed stage"""
+        self._stage_event_sub = None
+        self.detach()
+        self._change_fns.clear()
+
+    def detach(self):
+        if self._notice_listener is not None:
+            self._notice_listener.Revoke()
+            self._notice_listener = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        removed = set(self._prim_keys.keys())
+        self._stage = None
+        self._by_type.clear()
+        self._by_api.clear()
+        self._prim_keys.clear()
+        self._children.clear()
+        self._pending_paths.clear()
+        if removed:
+            self._notify(set(), removed)
+
+    def get_prims_of_type(self, schema_type: Union[str, type]) -> List[Sdf.Path]:
+        """
+        Paths of the prims of the given schema type, or of a type derived from it.
+
+        Args:
+            schema_type (Union[str, type]): The schema type name (e.g. "Camera") or class (e.g. UsdGeom.Camera).
+
+        Returns:
+            List[Sdf.Path]: The paths of the prims.
+        """
+        self.flush()
+        return list(self._by_type.get(self._get_schema_name(schema_type), ()))
+
+    def get_prims_with_api(self, api_schema: Union[str, type]) -> List[Sdf.Path]:
+        """Paths of the prims which have the given API schema (e.g. "PhysicsRigidBodyAPI") applied"""
+        self.flush()
+        return list(self._by_api.get(self._get_schema_name(api_schema), ()))
+
+    def get_type_names(self, path: Sdf.Path) -> Tuple[str, ...]:
+        """Schema types the prim at the given path is indexed under"""
+        self.flush()
+        return self._prim_keys.get(path, ((), ()))[0]
+
+    def add_change_fn(self, fn: Callable[[Set[Sdf.Path], Set[Sdf.Path]], None]) -> int:
+        """
+        Call fn(added_paths, removed_paths) every time the index changes. A resynced prim is reported as removed and
+        added again. Returns an id for remove_change_fn.
+        """
+        self._next_change_fn_id += 1
+        self._change_fns[self._next_change_fn_id] = fn
+        return self._next_change_fn_id
+
+    def remove_change_fn(self, fn_id: int):
+        self._change_fns.pop(fn_id, None)
+
+    def flush(self):
+        """Apply the changes received since the last update"""
+        if not self._pending_paths or self._stage is None:
+            return
+        pending = sorted(self._pending_paths)
+        self._pending_paths.clear()
+
+        added = set()
+        removed = set()
+        resynced = []
+        for path in pending:
+            # Sorted paths put the ancestors first, so a path below an already resynced one is skipped
+            if resynced and path.HasPrefix(resynced[-1]):
+                continue
+            resynced.append(path)
+
+            self._remove_subtree(path, removed)
+            prim = self._stage.GetPrimAtPath(path)
+            # Resyncs of the prototypes (/__Prototype_N) and of the prims below the instances are not indexed
+            if prim and prim.IsActive() and not prim.IsInPrototype() and not prim.IsInstanceProxy():
+                self._index_subtree(prim, added)
+
+        self._notify(added, removed)
+
+    def _on_objects_changed(self, notice, stage):
+        if stage != self._stage:
+            return
+        for path in notice.GetResyncedPaths():
+            # Adding or removing a property does not change the type or the applied APIs of its prim
+            if path.IsPrimPath() or path.IsAbsoluteRootPath():
+                self._pending_paths.add(path)
+        if self._pending_paths and self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_on_next_update())
+
+    async def _flush_on_next_update(self):
+        try:
+            await omni.kit.app.get_app().next_update_async()
+        finally:
+            self._flush_task = None
+        self.flush()
+
+    def _index_subtree(self, root: Usd.Prim, added: Set[Sdf.Path]):
+        for prim in Usd.PrimRange(root):
+            path = prim.GetPath()
+            if path == Sdf.Path.absoluteRootPath:
+                continue
+            type_names = self._get_type_names(prim)
+            api_names = self._get_api_names(prim)
+            self._prim_keys[path] = (type_names, api_names)
+            self._children.setdefault(path.GetParentPath(), set()).add(path)
+            for type_name in type_names:
+                self._by_type.setdefault(type_name, set()).add(path)
+            for api_name in api_names:
+                self._by_api.setdefault(api_name, set()).add(path)
+            added.add(path)
+
+    def _remove_subtree(self, root: Sdf.Path, removed: Set[Sdf.Path]):
+        pending = [root]
+        while pending:
+            path = pending.pop()
+            pending.extend(self._children.pop(path, ()))
+            keys = self._prim_keys.pop(path, None)
+            if keys is None:
+                continue
+            type_names, api_names = keys
+            for type_name in type_names:
+                self._discard(self._by_type, type_name, path)
+            for api_name in api_names:
+                self._discard(self._by_api, api_name, path)
+            removed.add(path)
+
+        parent_children = self._children.get(root.GetParentPath())
+        if parent_children is not None:
+            parent_children.discard(root)
+
+    def _discard(self, index: Dict[str, Set[Sdf.Path]], key: str, path: Sdf.Path):
+        paths = index.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del index[key]
+
+    def _get_type_names(self, prim: Usd.Prim) -> Tuple[str, ...]:
+        type_name = prim.GetTypeName()
+        if not type_name:
+            return ()
+        if type_name not in self._type_names_cache:
+            # The prim is indexed under its type and every schema type it derives from
+            schema_type = prim.GetPrimTypeInfo().GetSchemaType()
+            names = [type_name]
+            for ancestor in schema_type.GetAllAncestorTypes():
+                name = Usd.SchemaRegistry.GetSchemaTypeName(ancestor)
+                if name and name not in names:
+                    names.append(name)
+            self._type_names_cache[type_name] = tuple(names)
+        return self._type_names_cache[type_name]
+
+    def _get_api_names(self, prim: Usd.Prim) -> Tuple[str, ...]:
+        names = []
+        for api_name in prim.GetAppliedSchemas():
+            names.append(api_name)
+            # Multiple apply schemas are also indexed without their instance name
+            if ":" in api_name:
+                names.append(api_name.split(":", 1)[0])
+        return tuple(names)
+
+    def _get_schema_name(self, schema_type: Union[str, type]) -> str:
+        if isinstance(schema_type, str):
+            return schema_type
+        return Usd.SchemaRegistry.GetSchemaTypeName(Tf.Type.Find(schema_type))
+
+    def _notify(self, added: Set[Sdf.Path], removed: Set[Sdf.Path]):
+        if not added and not removed:
+            return
+        for fn in list(self._change_fns.values()):
+            try:
+                fn(added, removed)
+            except Exception as e:
+                carb.log_warn(f"Prim index: change callback failed: {e}")
+
+
+_PRIM_INDEX = None
+
+
+def get_prim_index() -> PrimIndex:
+    """
+    Shared index of the stage of the default usd context. It is attached to the current stage on first use, and
+    re-attached every time a stage is opened.
+    """
+    global _PRIM_INDEX
+    if _PRIM_INDEX is None:
+        _PRIM_INDEX = PrimIndex()
+        _PRIM_INDEX.follow_usd_context(omni.usd.get_context())
+    return _PRIM_INDEX
+
+
+def release_prim_index():
+    """Destroy the shared index, e.g. when the extension shuts down. The next get_prim_index creates a new one"""
+    global _PRIM_INDEX
+    if _PRIM_INDEX is not None:
+        _PRIM_INDEX.destroy()
+        _PRIM_INDEX = None
@@ -0,0 +1,231 @@
+"""
+| File: vehicle_batch.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Differential and Ackermann models of a batch of mobile bases, stepped together as numpy arrays
+"""
+
+__all__ = ["VehicleBatch", "STATE_SIZE", "X", "Y", "YAW", "VX", "VY", "YAW_RATE", "STEER"]
+
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple, Union
+from omni.mobile.robots.logic.vehicles.vehicle_spec import ACKERMANN, DIFFERENTIAL, VEHICLE_SPECS, VehicleSpec
+
+# Columns of the state of a vehicle: planar pose in the world frame, velocities in the vehicle frame at the center of
+# mass, and steering angle of the virtual center front wheel (Ackermann drives only)
+X, Y, YAW, VX, VY, YAW_RATE, STEER = range(7)
+STATE_SIZE = 7
+
+# Parameters of the vehicle specs kept as one array per field
+PARAMETER_FIELDS = tuple(field for field in VehicleSpec._fields if field != "model")
+
+
+def _track(value: np.ndarray, target: np.ndarray, time_constant: np.ndarray, max_rate: np.ndarray, dt: float):
+    """First order response of value to target, with a rate limit"""
+    alpha = np.where(time_constant > 0.0, -np.expm1(-dt / np.maximum(time_constant, 1e-9)), 1.0)
+    max_delta = max_rate * dt
+    return value + np.clip((target - value) * alpha, -max_delta, max_delta)
+
+
+def _integrate_pose(state: np.ndarray, forward: np.ndarray, lateral: np.ndarray, yaw_rate: np.ndarray, dt: float):
+    """Move the poses by the body velocities over dt, with the heading of the middle of the step"""
+    yaw = state[:, YAW] + 0.5 * yaw_rate * dt
+    cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+    state[:, X] += (forward * cos_yaw - lateral * sin_yaw) * dt
+    state[:, Y] += (forward * sin_yaw + lateral * cos_yaw) * dt
+    state[:, YAW] = np.remainder(state[:, YAW] + yaw_rate * dt + np.pi, 2.0 * np.pi) - np.pi
+
+
+class VehicleBatch:
+    """
+    State of N mobile bases, possibly of different kinds, stored as one (N, STATE_SIZE) array and stepped by
+    vectorized differential (skid steer) and Ackermann models instead of one python object per robot. The vehicles of
+    each drive model are stepped together, with their parameters gathered once into arrays, so the cost of a step is a
+    few numpy operations whatever the number of vehicles.
+
+    The kinematic models apply the commands instantly. The dynamic models follow them with a first order response
+    limited by the accelerations of the specs, and the Ackermann one adds the lateral slip of a single track model
+    with linear tires. dt should then be the physics step.
+
+    Only numpy is used, so the models run without Isaac Sim.
+    """
+
+    def __init__(self, vehicle_names: Sequence[str], dynamic: bool = True, specs: Dict[str, VehicleSpec] = None):
+        """
+        Args:
+            vehicle_names (Sequence[str]): The kind of every vehicle, a key of specs.
+            dynamic (bool): Use the dynamic models instead of the kinematic ones.
+            specs (Dict[str, VehicleSpec]): The specs by vehicle kind, VEHICLE_SPECS by default.
+        """
+        specs = VEHICLE_SPECS if specs is None else specs
+        unknown = sorted(set(vehicle_names) - set(specs))
+        if unknown:
+            raise ValueError(f"Unknown vehicles {unknown}, expected some of {list(specs)}")
+
+        self._names = list(vehicle_names)
+        self._dynamic = dynamic
+        vehicle_specs = [specs[name] for name in self._names]
+        parameters = {
+            field: np.array([getattr(spec, field) for spec in vehicle_specs], dtype=np.float64)
+            for field in PARAMETER_FIELDS
+        }
+        models = np.array([spec.model for spec in vehicle_specs])
+        # The vehicles of each model, and their parameters, gathered once
+        self._groups = []
+        for model in (DIFFERENTIAL, ACKERMANN):
+            indices = np.flatnonzero(models == model)
+            if indices.size == 0:
+                continue
+            # A slice keeps the state of a batch with a single model from being copied at every step
+            selection = slice(None) if indices.size == len(self._names) else indices
+            self._groups.append((model, selection, {field: values[indices] for field, values in parameters.items()}))
+        self._state = np.zeros((len(self._names), STATE_SIZE), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self):
+        return list(self._names)
+
+    @property
+    def dynamic(self) -> bool:
+        return self._dynamic
+
+    @property
+    def state(self) -> np.ndarray:
+        """(N, STATE_SIZE) state of the vehicles, indexed by the X ... STEER columns. Modified in place by step"""
+        return self._state
+
+    @property
+    def poses(self) -> np.ndarray:
+        """(N, 3) view of the x, y and yaw of the vehicles"""
+        return self._state[:, X:YAW + 1]
+
+    def reset(self, indices: Union[Sequence[int], np.ndarray, None] = None, poses: Optional[np.ndarray] = None):
+        """
+        Stop vehicles and place them.
+
+        Args:
+            indices (Sequence[int]): The vehicles to reset, all of them by default.
+            poses (np.ndarray): (K, 3) x, y and yaw of the vehicles, or None to put them at the origin.
+        """
+        selection = slice(None) if indices is None else np.asarray(indices, dtype=np.int64)
+        self._state[selection] = 0.0
+        if poses is not None:
+            self._state[selection, X:YAW + 1] = poses
+
+    def step(self, commands: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Advance all the vehicles by dt.
+
+        Args:
+            commands (np.ndarray): (N, 2) commands of the vehicles: the forward speed, then the yaw rate for the
+                differential drives or the steering angle for the Ackermann drives. Commands beyond the limits of the
+                specs are clamped.
+            dt (float): The duration of the step in seconds.
+
+        Returns:
+            np.ndarray: The (N, STATE_SIZE) state after the step.
+        """
+        commands = np.asarray(commands, dtype=np.float64)
+        if commands.shape != (len(self._names), 2):
+            raise ValueError(f"Expected ({len(self._names)}, 2) commands, got {commands.shape}")
+        for model, selection, parameters in self._groups:
+            step_fn = self._step_differential if model == DIFFERENTIAL else self._step_ackermann
+            if isinstance(selection, slice):
+                step_fn(self._state, commands, parameters, dt)
+            else:
+                state = self._state[selection]
+                step_fn(state, commands[selection], parameters, dt)
+                self._state[selection] = state
+        return self._state
+
+    def get_wheel_commands(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The wheel speeds and steering angles matching the current state, to drive the wheel joints of the robots.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (N, 4) angular velocities of the front left, front right, rear left and
+                rear right wheels in rad/s, and (N, 2) steering angles of the front left and front right wheels, zero
+                for the differential drives.
+        """
+        wheel_velocities = np.zeros((len(self._names), 4), dtype=np.float64)
+        steering_angles = np.zeros((len(self._names), 2), dtype=np.float64)
+        for model, selection, p in self._groups:
+            state = self._state[selection]
+            forward, lateral, yaw_rate = state[:, VX], state[:, VY], state[:, YAW_RATE]
+            if model == DIFFERENTIAL:
+                half_track = 0.5 * p["skid_factor"] * p["track_width"]
+                left = (forward - yaw_rate * half_track) / p["wheel_radius"]
+                right = (forward + yaw_rate * half_track) / p["wheel_radius"]
+                wheel_velocities[selection] = np.stack([left, right, left, right], axis=1)
+            else:
+                half_track = 0.5 * p["track_width"]
+                tan_steer = np.tan(state[:, STEER])
+                # Ackermann geometry: the wheels turn around the same point of the rear axle line
+                steer_left = np.arctan(p["wheelbase"] * tan_steer / (p["wheelbase"] - half_track * tan_steer))
+                steer_right = np.arctan(p["wheelbase"] * tan_steer / (p["wheelbase"] + half_track * tan_steer))
+                front_lateral = lateral + yaw_rate * p["front_axle_distance"]
+                rear_left = forward - yaw_rate * half_track
+                rear_right = forward + yaw_rate * half_track
+                # Speed of the front wheels along their rolling direction
+                front_left = rear_left * np.cos(steer_left) + front_lateral * np.sin(steer_left)
+                front_right = rear_right * np.cos(steer_right) + front_lateral * np.sin(steer_right)
+                wheel_velocities[selection] = (
+                    np.stack([front_left, front_right, rear_left, rear_right], axis=1) / p["wheel_radius"][:, None]
+                )
+                steering_angles[selection] = np.stack([steer_left, steer_right], axis=1)
+        return wheel_velocities, steering_angles
+
+    def _step_differential(self, state: np.ndarray, commands: np.ndarray, p: Dict[str, np.ndarray], dt: float):
+        speed_command = np.clip(commands[:, 0], -p["max_speed"], p["max_speed"])
+        yaw_rate_command = np.clip(commands[:, 1], -p["max_yaw_rate"], p["max_yaw_rate"])
+        if self._dynamic:
+            speed = _track(state[:, VX], speed_command, p["time_constant"], p["max_accel"], dt)
+            yaw_rate = _track(state[:, YAW_RATE], yaw_rate_command, p["time_constant"], p["max_yaw_accel"], dt)
+        else:
+            speed, yaw_rate = speed_command, yaw_rate_command
+        _integrate_pose(state, speed, 0.0, yaw_rate, dt)
+        state[:, VX] = speed
+        state[:, VY] = 0.0
+        state[:, YAW_RATE] = yaw_rate
+
+    def _step_ackermann(self, state: np.ndarray, commands: np.ndarray, p: Dict[str, np.ndarray], dt: float):
+        speed_command = np.clip(commands[:, 0], -p["max_speed"], p["max_speed"])
+        steer_command = np.clip(commands[:, 1], -p["max_steer"], p["max_steer"])
+        if self._dynamic:
+            speed = _track(state[:, VX], speed_command, p["time_constant"], p["max_accel"], dt)
+            max_steer_delta = p["max_steer_rate"] * dt
+            steer = state[:, STEER] + np.clip(steer_command - state[:, STEER], -max_steer_delta, max_steer_delta)
+        else:
+            speed, steer = speed_command, steer_command
+
+        front_distance = p["front_axle_distance"]
+        rear_distance = p["wheelbase"] - front_distance
+        # Kinematic single track model, without slip: the velocity of the rear axle is along the vehicle
+        yaw_rate = speed * np.tan(steer) / p["wheelbase"]
+        lateral = yaw_rate * rear_distance
+
+        if self._dynamic:
+            previous_lateral, previous_yaw_rate = state[:, VY], state[:, YAW_RATE]
+            min_speed = p["min_dynamic_speed"]
+            safe_speed = np.where(np.abs(speed) < min_speed, np.copysign(min_speed, speed), speed)
+            front_slip = steer - np.arctan((previous_lateral + front_distance * previous_yaw_rate) / safe_speed)
+            rear_slip = -np.arctan((previous_lateral - rear_distance * previous_yaw_rate) / safe_speed)
+            front_force = p["front_cornering_stiffness"] * front_slip * np.cos(steer)
+            rear_force = p["rear_cornering_stiffness"] * rear_slip
+            dynamic_lateral = previous_lateral + ((front_force + rear_force) / p["mass"] - speed * previous_yaw_rate) * dt
+            dynamic_yaw_rate = previous_yaw_rate + (
+                (front_distance * front_force - rear_distance * rear_force) / p["yaw_inertia"] * dt
+            )
+            # Kinematic below min_dynamic_speed, dynamic above twice that speed, blended in between
+            weight = np.clip(np.abs(speed) / min_speed - 1.0, 0.0, 1.0)
+            lateral = lateral + weight * (dynamic_lateral - lateral)
+            yaw_rate = yaw_rate + weight * (dynamic_yaw_rate - yaw_rate)
+
+        _integrate_pose(state, speed, lateral, yaw_rate, dt)
+        state[:, VX] = speed
+        state[:, VY] = lateral
+        state[:, YAW_RATE] = yaw_rate
+        state[:, STEER] = steer
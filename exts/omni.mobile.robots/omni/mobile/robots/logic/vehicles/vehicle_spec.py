@@ -0,0 +1,97 @@
+"""
+| File: vehicle_spec.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Geometry, limits and inertia of the mobile bases of ROBOT_ENVIRONMENTS, for the vehicle models
+"""
+
+__all__ = ["DIFFERENTIAL", "ACKERMANN", "VehicleSpec", "VEHICLE_SPECS"]
+
+from typing import NamedTuple
+
+# Drive models of the vehicles
+DIFFERENTIAL = "differential"
+ACKERMANN = "ackermann"
+
+
+class VehicleSpec(NamedTuple):
+    """Parameters of the model of one kind of mobile base, in meters, seconds, radians and kilograms"""
+
+    model: str
+    wheel_radius: float
+    # Distance between the left and right wheels
+    track_width: float
+    # Distance between the front and rear axles
+    wheelbase: float
+    max_speed: float
+    max_accel: float
+    # Differential drives: limits of the yaw rate command
+    max_yaw_rate: float = 0.0
+    max_yaw_accel: float = 0.0
+    # Skid steering: the track width is effectively larger than the geometric one, since the wheels slip sideways when
+    # turning. 1 for a true differential drive
+    skid_factor: float = 1.0
+    # Ackermann drives: limits of the steering angle of the virtual center wheel
+    max_steer: float = 0.0
+    max_steer_rate: float = 0.0
+    # Time constant of the speed and yaw rate response of the dynamic models
+    time_constant: float = 0.1
+    mass: float = 1.0
+    # Yaw moment of inertia around the center of mass
+    yaw_inertia: float = 1.0
+    # Ackermann drives: distance from the center of mass to the front axle, and cornering stiffness of the front and
+    # rear axles (N/rad) of the linear tire model
+    front_axle_distance: float = 0.0
+    front_cornering_stiffness: float = 0.0
+    rear_cornering_stiffness: float = 0.0
+    # Ackermann drives: below this speed the dynamic model, whose tire slip angles are undefined at rest, falls back to
+    # the kinematic one
+    min_dynamic_speed: float = 0.5
+
+
+VEHICLE_SPECS = {
+    "Husky": VehicleSpec(
+        model=DIFFERENTIAL,
+        wheel_radius=0.165,
+        track_width=0.555,
+        wheelbase=0.512,
+        max_speed=1.0,
+        max_accel=3.0,
+        max_yaw_rate=2.0,
+        max_yaw_accel=6.0,
+        skid_factor=1.875,
+        mass=50.0,
+        yaw_inertia=3.2,
+    ),
+    "WeCAR": VehicleSpec(
+        model=ACKERMANN,
+        wheel_radius=0.05,
+        track_width=0.22,
+        wheelbase=0.26,
+        max_speed=2.0,
+        max_accel=4.0,
+        max_steer=0.45,
+        max_steer_rate=3.0,
+        time_constant=0.05,
+        mass=5.0,
+        yaw_inertia=0.06,
+        front_axle_distance=0.13,
+        front_cornering_stiffness=60.0,
+        rear_cornering_stiffness=70.0,
+    ),
+    # The arm on top of the Husky makes it heavier and slower to accelerate
+    "Husky + FR3": VehicleSpec(
+        model=DIFFERENTIAL,
+        wheel_radius=0.165,
+        track_width=0.555,
+        wheelbase=0.512,
+        max_speed=1.0,
+        max_accel=2.0,
+        max_yaw_rate=1.5,
+        max_yaw_accel=4.0,
+        skid_factor=1.875,
+        time_constant=0.15,
+        mass=68.0,
+        yaw_inertia=4.1,
+    ),
+}
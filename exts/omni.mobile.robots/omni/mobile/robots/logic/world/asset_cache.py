@@ -0,0 +1,374 @@
+"""
+| File: asset_cache.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Local, content-addressed cache of the environment layers and textures read from the asset server
+"""
+
+__all__ = ["AssetCache"]
+
+import os
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import hashlib
+import carb
+import carb.tokens
+import omni.client
+from pxr import Sdf, UsdUtils
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from omni.mobile.robots.params import ASSET_CACHE_PATH, ASSET_CACHE_MAX_SIZE, ASSET_CACHE_MAX_DOWNLOADS
+
+LAYER_EXTENSIONS = (".usd", ".usda", ".usdc")
+INDEX_FILE_NAME = "index.json"
+
+
+class AssetCache:
+    """
+    Mirror of remote environment assets on the local disk.
+
+    Every asset is stored once under the hash of its content. Layers are stored with their asset paths rewritten to
+    the cached copies of their dependencies, so a cached environment is composed without touching the server. The
+    index maps each url to its cached file, the server modification time and size it was fetched at, and the urls it
+    depends on. Entries are validated against the server once per process and evicted in least recently used order
+    when the cache grows larger than its maximum size. The dependencies of a layer which are not cached yet are read
+    from the server concurrently, at most max_downloads at a time.
+    """
+
+    def __init__(
+        self,
+        cache_path: str = ASSET_CACHE_PATH,
+        max_size: int = ASSET_CACHE_MAX_SIZE,
+        max_downloads: int = ASSET_CACHE_MAX_DOWNLOADS,
+    ):
+        self._cache_path = carb.tokens.get_tokens_interface().resolve(cache_path)
+        self._objects_path = os.path.join(self._cache_path, "objects")
+        self._tmp_path = os.path.join(self._cache_path, "tmp")
+        self._index_path = os.path.join(self._cache_path, INDEX_FILE_NAME)
+        self._max_size = max_size
+        self._max_downloads = max_downloads
+
+        # Urls which have already been checked against the server in this process
+        self._validated: Set[str] = set()
+        self._index: Dict[str, Dict] = self._load_index()
+
+    @property
+    def size(self) -> int:
+        """Size in bytes of the cached files"""
+        return sum(size for size in self._get_file_sizes().values())
+
+    async def fetch_async(self, url: str, progress_fn: Callable[[str, int, int], None] = None) -> str:
+        """
+        Return the local path of the given asset, reading it and its dependencies from the server when they are not
+        cached yet or when they changed on the server.
+
+        Args:
+            url (str): The url of the asset on the server.
+            progress_fn (Callable[[str, int, int], None]): Called with (url, fetched, discovered) for every asset.
+
+        Returns:
+            str: The path of the cached asset, or the url itself if it could not be cached.
+        """
+        os.makedirs(self._objects_path, exist_ok=True)
+        os.makedirs(self._tmp_path, exist_ok=True)
+
+        fetched: Dict[str, str] = {}
+        downloads = _Downloads(self._max_downloads)
+        try:
+            local_path = await self._fetch_async(url, fetched, set(), downloads, progress_fn)
+        finally:
+            await downloads.discard_async()
+            self.evict(pinned=set(fetched.keys()))
+            self._save_index()
+        return local_path
+
+    async def validate_async(self) -> int:
+        """
+        Compare every cached entry with the server and drop the ones which changed, along with the entries depending on
+        them. Returns the number of dropped entries.
+        """
+        stale = []
+        for url, entry in list(self._index.items()):
+            if not await self._is_up_to_date_async(url, entry):
+                stale.append(url)
+        dropped = self._drop(stale)
+        self._save_index()
+        return dropped
+
+    def evict(self, pinned: Set[str] = None) -> int:
+        """Drop the least recently used entries until the cache fits in its maximum size"""
+        pinned = pinned or set()
+        file_sizes = self._get_file_sizes()
+        total_size = sum(file_sizes.values())
+        dropped = 0
+        for url in sorted(self._index, key=lambda url: self._index[url]["last_access"]):
+            if total_size <= self._max_size:
+                break
+            if url in pinned or url not in self._index:
+                continue
+            dropped += self._drop([url])
+            file_sizes = self._get_file_sizes()
+            total_size = sum(file_sizes.values())
+
+        if dropped:
+            carb.log_info(f"Asset cache: evicted {dropped} entries, {total_size / (1024 * 1024):.1f} MB left")
+        return dropped
+
+    def clear(self):
+        self._index = {}
+        self._validated.clear()
+        shutil.rmtree(self._cache_path, ignore_errors=True)
+
+    async def _fetch_async(
+        self, url: str, fetched: Dict[str, str], visiting: Set[str], downloads: "_Downloads", progress_fn
+    ) -> str:
+        if url in fetched:
+            return fetched[url]
+        # A layer which (indirectly) references itself keeps pointing to the server for the cyclic dependency
+        if url in visiting:
+            return url
+        visiting.add(url)
+
+        entry = self._index.get(url)
+        if entry is not None and not await self._is_up_to_date_async(url, entry):
+            self._drop([url])
+            entry = None
+
+        if entry is not None and self._is_layer(url):
+            # A cached layer is only valid if its dependencies are still cached at the same files
+            for dependency, dependency_file in entry["deps"].items():
+                if await self._fetch_async(dependency, fetched, visiting, downloads, progress_fn) != dependency_file:
+                    self._drop([url])
+                    entry = None
+                    break
+
+        if entry is None:
+            entry = await self._add_async(url, fetched, visiting, downloads, progress_fn)
+
+        if entry is None:
+            local_path = url
+        else:
+            entry["last_access"] = time.time()
+            local_path = os.path.join(self._objects_path, entry["file"])
+
+        fetched[url] = local_path
+        visiting.discard(url)
+        if progress_fn is not None:
+            progress_fn(url, len(fetched), len(fetched) + len(visiting))
+        return local_path
+
+    async def _add_async(
+        self, url: str, fetched: Dict[str, str], visiting: Set[str], downloads: "_Downloads", progress_fn
+    ) -> Optional[Dict]:
+        downloaded = await downloads.get_async(url, self._download_async)
+        if downloaded is None:
+            return None
+        list_entry, tmp_file = downloaded
+        loop = asyncio.get_event_loop()
+
+        dependencies = {}
+        try:
+            if self._is_layer(url):
+                # Cache the dependencies first, so the layer can be rewritten to point to their cached copies
+                asset_paths = await loop.run_in_executor(None, self._get_asset_paths, tmp_file)
+                dependency_urls = {asset_path: self._get_cacheable_url(url, asset_path) for asset_path in asset_paths}
+                # The dependencies which are not cached yet are all read from the server at once, then cached one by
+                # one: a dependency shared by, or cyclic between, several branches is still cached only once
+                for dependency in dependency_urls.values():
+                    if dependency is not None and self._is_cacheable(dependency) and dependency not in self._index:
+                        if dependency not in fetched and dependency not in visiting:
+                            downloads.start(dependency, self._download_async)
+                remapped = {}
+                for asset_path, dependency in dependency_urls.items():
+                    if dependency is None:
+                        continue
+                    if self._is_cacheable(dependency):
+                        dependencies[dependency] = await self._fetch_async(
+                            dependency, fetched, visiting, downloads, progress_fn
+                        )
+                        remapped[asset_path] = dependencies[dependency]
+                    else:
+                        remapped[asset_path] = dependency
+                await loop.run_in_executor(None, self._remap_asset_paths, tmp_file, remapped)
+
+            file_hash = await loop.run_in_executor(None, self._hash_file, tmp_file)
+            file_name = os.path.join(file_hash[:2], file_hash + os.path.splitext(tmp_file)[1])
+            object_file = os.path.join(self._objects_path, file_name)
+            os.makedirs(os.path.dirname(object_file), exist_ok=True)
+            os.replace(tmp_file, object_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        entry = {
+            "file": file_name,
+            "mtime": self._get_modified_time(list_entry),
+            "size": list_entry.size,
+            "deps": {dependency: path for dependency, path in dependencies.items() if path != dependency},
+            "last_access": time.time(),
+        }
+        self._index[url] = entry
+        self._validated.add(url)
+        return entry
+
+    async def _download_async(self, url: str) -> Optional[Tuple[object, str]]:
+        """Read an asset from the server into a temporary file. Returns its server list entry and the file"""
+        result, list_entry = await omni.client.stat_async(url)
+        if result != omni.client.Result.OK:
+            carb.log_warn(f"Asset cache: could not stat {url}: {result}")
+            return None
+
+        result, _, content = await omni.client.read_file_async(url)
+        if result != omni.client.Result.OK:
+            carb.log_warn(f"Asset cache: could not read {url}: {result}")
+            return None
+
+        extension = os.path.splitext(omni.client.break_url(url).path)[1].lower()
+        tmp_file = os.path.join(self._tmp_path, uuid.uuid4().hex + extension)
+        await asyncio.get_event_loop().run_in_executor(None, self._write_file, tmp_file, content)
+        return list_entry, tmp_file
+
+    async def _is_up_to_date_async(self, url: str, entry: Dict) -> bool:
+        if not os.path.exists(os.path.join(self._objects_path, entry["file"])):
+            return False
+        if url in self._validated:
+            return True
+
+        result, list_entry = await omni.client.stat_async(url)
+        if result != omni.client.Result.OK:
+            # The server can not be reached, so the cached copy is the best we have
+            carb.log_warn(f"Asset cache: could not validate {url}: {result}")
+            return True
+
+        up_to_date = entry["mtime"] == self._get_modified_time(list_entry) and entry["size"] == list_entry.size
+        if up_to_date:
+            self._validated.add(url)
+        return up_to_date
+
+    def _drop(self, urls: List[str]) -> int:
+        """Remove the given entries, and recursively the entries of the layers depending on them"""
+        dropped = 0
+        pending = list(urls)
+        while pending:
+            url = pending.pop()
+            if self._index.pop(url, None) is None:
+                continue
+            self._validated.discard(url)
+            dropped += 1
+            pending.extend(parent for parent, entry in self._index.items() if url in entry["deps"])
+
+        # Files are shared by the entries with the same content, so only the unreferenced ones are deleted
+        referenced = {entry["file"] for entry in self._index.values()}
+        if os.path.isdir(self._objects_path):
+            for folder in os.scandir(self._objects_path):
+                if not folder.is_dir():
+                    continue
+                for file in os.scandir(folder.path):
+                    if os.path.join(folder.name, file.name) not in referenced:
+                        os.remove(file.path)
+        return dropped
+
+    def _get_file_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for entry in self._index.values():
+            if entry["file"] not in sizes:
+                path = os.path.join(self._objects_path, entry["file"])
+                sizes[entry["file"]] = os.path.getsize(path) if os.path.exists(path) else 0
+        return sizes
+
+    def _get_cacheable_url(self, layer_url: str, asset_path: str) -> Optional[str]:
+        # UDIM and other templated paths can't be fetched as a single file
+        if not asset_path or "<" in asset_path:
+            return None
+        # MDL modules given without an anchor are found through the search paths and not relative to the layer
+        if asset_path.lower().endswith(".mdl") and not asset_path.startswith(("./", "../")):
+            return None
+        return omni.client.normalize_url(omni.client.combine_urls(layer_url, asset_path))
+
+    def _is_cacheable(self, url: str) -> bool:
+        # MDL modules resolve their own relative imports and textures, so they are referenced from the server
+        return not url.lower().endswith(".mdl")
+
+    def _is_layer(self, url: str) -> bool:
+        return os.path.splitext(omni.client.break_url(url).path)[1].lower() in LAYER_EXTENSIONS
+
+    def _get_asset_paths(self, layer_file: str) -> List[str]:
+        asset_paths = []
+        layer = Sdf.Layer.OpenAsAnonymous(layer_file)
+
+        def _collect(asset_path):
+            asset_paths.append(asset_path)
+            return asset_path
+
+        UsdUtils.ModifyAssetPaths(layer, _collect)
+        return list(dict.fromkeys(asset_paths))
+
+    def _remap_asset_paths(self, layer_file: str, remapped: Dict[str, str]):
+        layer = Sdf.Layer.OpenAsAnonymous(layer_file)
+        UsdUtils.ModifyAssetPaths(layer, lambda asset_path: remapped.get(asset_path, asset_path))
+        layer.Export(layer_file)
+
+    def _write_file(self, path: str, content):
+        with open(path, "wb") as f:
+            f.write(memoryview(content))
+
+    def _hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _get_modified_time(self, list_entry) -> float:
+        modified_time = list_entry.modified_time
+        return modified_time.timestamp() if hasattr(modified_time, "timestamp") else float(modified_time)
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            carb.log_warn(f"Asset cache: index {self._index_path} could not be read and is reset: {e}")
+            return {}
+
+    def _save_index(self):
+        os.makedirs(self._cache_path, exist_ok=True)
+        tmp_index_path = self._index_path + ".tmp"
+        with open(tmp_index_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_index_path, self._index_path)
+
+
+class _Downloads:
+    """Downloads of the assets of one fetch, started ahead of their caching and run at most max_downloads at a time"""
+
+    def __init__(self, max_downloads: int):
+        self._semaphore = asyncio.Semaphore(max(1, max_downloads))
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, url: str, download_fn: Callable[[str], Awaitable]):
+        if url not in self._tasks:
+            self._tasks[url] = asyncio.ensure_future(self._run_async(url, download_fn))
+
+    async def get_async(self, url: str, download_fn: Callable[[str], Awaitable]):
+        """Result of the download of url, started now if it was not started ahead"""
+        self.start(url, download_fn)
+        return await self._tasks.pop(url)
+
+    async def discard_async(self):
+        """Cancel the downloads which were started but not used, and delete their files"""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, tuple) and os.path.exists(result[1]):
+                os.remove(result[1])
+
+    async def _run_async(self, url: str, download_fn: Callable[[str], Awaitable]):
+        async with self._semaphore:
+            return await download_fn(url)
@@ -0,0 +1,225 @@
+"""
+| File: env_loader.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Staged and cancellable loader which prefetches the layers of an environment before referencing it
+"""
+
+__all__ = ["EnvironmentLoader", "LoadProgress"]
+
+import os
+import time
+import asyncio
+import contextlib
+import carb
+import omni
+import omni.client
+import omni.kit.app
+from pxr import Sdf, Usd
+from typing import Callable, Dict, List, Optional
+from omni.mobile.robots.logic.world.asset_cache import AssetCache
+
+
+class LoadProgress:
+    """Snapshot of an environment load, handed to the progress callback of the EnvironmentLoader"""
+
+    def __init__(self, phase: str, completed: int, total: int, layer: Optional[str] = None):
+        self.phase = phase
+        self.completed = completed
+        self.total = total
+        self.layer = layer
+
+    def __repr__(self):
+        return f"LoadProgress({self.phase}, {self.completed}/{self.total}, {self.layer})"
+
+
+class EnvironmentLoader:
+    """
+    Load an environment USD in stages so the Kit UI keeps running while the asset is being read:
+        - resolve:  check that the asset exists on the asset server, or fetch it into the local asset cache
+        - prefetch: open the root layer and every sublayer/reference/payload it depends on, off the main thread
+        - compose:  reference the (now already opened) root layer into the stage and wait for the next update
+    """
+
+    PHASE_RESOLVE = "resolve"
+    PHASE_PREFETCH = "prefetch"
+    PHASE_COMPOSE = "compose"
+
+    def __init__(self, progress_fn: Callable[[LoadProgress], None] = None, asset_cache: Optional[AssetCache] = None):
+        self._progress_fn = progress_fn
+        self._asset_cache = asset_cache
+        self._task: Optional[asyncio.Task] = None
+        # The prefetched layers must be kept alive until the stage holds its own reference to them, otherwise they
+        # would be dropped from the layer registry and read again from the server when composing
+        self._layers: List[Sdf.Layer] = []
+        self._loaded_layers: List[Sdf.Layer] = []
+        # Size in bytes of the file of every prefetched layer, by identifier
+        self._layer_sizes: Dict[str, int] = {}
+        self._loaded_layer_sizes: Dict[str, int] = {}
+        self._timings: Dict[str, float] = {}
+
+    @property
+    def is_loading(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def layers(self) -> List[Sdf.Layer]:
+        """Layers of the last successful load, for callers that keep the environment resident"""
+        return list(self._loaded_layers)
+
+    @property
+    def footprint(self) -> int:
+        """Estimated size in bytes of the last loaded environment, from the size of its layer files"""
+        return sum(self._loaded_layer_sizes.values())
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Duration in seconds of each phase of the last load"""
+        return dict(self._timings)
+
+    def start(self, stage: Usd.Stage, usd_path: str, stage_prefix: str) -> asyncio.Task:
+        """
+        Start loading the environment in the background.
+
+        Args:
+            stage (Usd.Stage): The stage where the environment is loaded.
+            usd_path (str): The url of the environment usd.
+            stage_prefix (str): The path of the primitive that will reference the environment.
+
+        Returns:
+            asyncio.Task: The task of the load, whose result is the primitive referencing the environment.
+        """
+        if self.is_loading:
+            raise Exception("An environment is already being loaded")
+        self._task = asyncio.ensure_future(self.load_async(stage, usd_path, stage_prefix))
+        return self._task
+
+    def cancel(self) -> bool:
+        """Cancel the load in progress. Returns True if there was a load to cancel"""
+        if not self.is_loading:
+            return False
+        self._task.cancel()
+        carb.log_info("Environment loader: load has been cancelled")
+        return True
+
+    async def load_async(self, stage: Usd.Stage, usd_path: str, stage_prefix: str) -> Usd.Prim:
+        self._timings.clear()
+        self._loaded_layers = []
+        self._loaded_layer_sizes = {}
+        start = time.perf_counter()
+        try:
+            with self._phase(EnvironmentLoader.PHASE_RESOLVE):
+                resolved_path = await self._resolve_async(usd_path)
+
+            with self._phase(EnvironmentLoader.PHASE_PREFETCH):
+                await self._prefetch_async(resolved_path)
+
+            with self._phase(EnvironmentLoader.PHASE_COMPOSE):
+                prim = self._compose(stage, resolved_path, stage_prefix)
+                await omni.kit.app.get_app().next_update_async()
+            self._loaded_layers = self._layers
+            self._loaded_layer_sizes = self._layer_sizes
+        finally:
+            self._layers = []
+            self._layer_sizes = {}
+
+        carb.log_info(f"Environment loader: {usd_path} loaded in {(time.perf_counter() - start) * 1000.0:.1f} ms")
+        return prim
+
+    @contextlib.contextmanager
+    def _phase(self, phase: str):
+        self._report(LoadProgress(phase, 0, 1))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[phase] = time.perf_counter() - start
+            carb.log_info(f"Environment loader: {phase} phase took {self._timings[phase] * 1000.0:.1f} ms")
+
+    def _report(self, progress: LoadProgress):
+        if self._progress_fn is not None:
+            try:
+                self._progress_fn(progress)
+            except Exception as e:
+                carb.log_warn(f"Environment loader: progress callback failed: {e}")
+
+    async def _resolve_async(self, usd_path: str) -> str:
+        if not usd_path:
+            raise Exception("No environment has been selected")
+
+        if self._asset_cache is not None:
+            # The cached root layer points to the cached copies of its dependencies, so nothing is read from the server
+            # when prefetching and composing it
+            return await self._asset_cache.fetch_async(
+                usd_path,
+                lambda url, completed, total: self._report(
+                    LoadProgress(EnvironmentLoader.PHASE_RESOLVE, completed, total, url)
+                ),
+            )
+
+        result, _ = await omni.client.stat_async(usd_path)
+        if result != omni.client.Result.OK:
+            raise Exception(f"The usd asset {usd_path} could not be resolved: {result}")
+        self._report(LoadProgress(EnvironmentLoader.PHASE_RESOLVE, 1, 1, usd_path))
+        return usd_path
+
+    async def _prefetch_async(self, root_path: str):
+        visited = {root_path}
+        pending = [root_path]
+
+        # Open the layers level by level, every layer of a level being opened concurrently in the executor
+        while pending:
+            layers = await asyncio.gather(*[self._open_layer_async(path) for path in pending])
+            next_pending = []
+            for path, layer in zip(pending, layers):
+                if layer is None:
+                    if path == root_path:
+                        raise Exception(f"The usd asset {root_path} could not be opened")
+                    carb.log_warn(f"Environment loader: could not open layer {path}")
+                    continue
+
+                self._layers.append(layer)
+                for dependency in self._get_layer_dependencies(layer):
+                    if dependency not in visited:
+                        visited.add(dependency)
+                        next_pending.append(dependency)
+
+                self._report(LoadProgress(EnvironmentLoader.PHASE_PREFETCH, len(self._layers), len(visited), path))
+            pending = next_pending
+
+    async def _open_layer_async(self, path: str) -> Optional[Sdf.Layer]:
+        loop = asyncio.get_event_loop()
+        layer = await loop.run_in_executor(None, Sdf.Layer.FindOrOpen, path)
+        if layer is not None:
+            self._layer_sizes[layer.identifier] = await self._get_layer_size_async(layer)
+        return layer
+
+    async def _get_layer_size_async(self, layer: Sdf.Layer) -> int:
+        if layer.realPath and os.path.isfile(layer.realPath):
+            return os.path.getsize(layer.realPath)
+        # Layers read from the asset server have no local file, the size of the server file is used instead
+        result, list_entry = await omni.client.stat_async(layer.realPath or layer.identifier)
+        if result == omni.client.Result.OK and list_entry.size:
+            return list_entry.size
+        # Serializing the layer to measure it would hold a second copy of it in memory, so it is left out instead
+        carb.log_warn(f"Environment loader: size of {layer.identifier} unknown, left out of the footprint")
+        return 0
+
+    def _get_layer_dependencies(self, layer: Sdf.Layer) -> List[str]:
+        dependencies = []
+        for asset_path in layer.GetCompositionAssetDependencies():
+            if asset_path:
+                dependencies.append(layer.ComputeAbsolutePath(asset_path))
+        return dependencies
+
+    def _compose(self, stage: Usd.Stage, usd_path: str, stage_prefix: str) -> Usd.Prim:
+        if stage.GetPrimAtPath(stage_prefix):
+            raise Exception("A primitive already exists at the specified path")
+
+        # Create the stage primitive and load the usd into it
+        prim = stage.DefinePrim(stage_prefix)
+        if not prim.GetReferences().AddReference(usd_path):
+            raise Exception("The usd asset " + usd_path + " is not load at stage path " + stage_prefix)
+
+        self._report(LoadProgress(EnvironmentLoader.PHASE_COMPOSE, 1, 1, usd_path))
+        return prim
@@ -0,0 +1,274 @@
+"""
+| File: robot_spawner.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Fleets of identical robots, stamped out as instances of one prototype per robot usd
+"""
+
+__all__ = ["RobotSpawner", "SpawnReport"]
+
+import re
+import time
+import carb
+import numpy as np
+from pxr import Sdf, Usd, UsdGeom, UsdPhysics
+from typing import Dict, List, NamedTuple, Optional
+from omni.mobile.robots.params import ROBOT_SPAWNER_SETTINGS, get_robot_usd_path
+from omni.mobile.robots.app_utils import get_rss
+from omni.mobile.robots.logic.world.xform_utils import get_grid_positions, write_xform_specs
+
+
+class SpawnReport(NamedTuple):
+    """Cost of one call of RobotSpawner.spawn"""
+
+    robot_name: str
+    num_instances: int
+    # Seconds spent authoring and composing the robots
+    spawn_time: float
+    # Prims added to the stage per robot. Instance proxies are not prims of the stage, so an instanceable robot adds
+    # one, and the instanceable visual and collision subtrees of an expanded robot one each
+    prims_per_instance: float
+    # Growth of the resident memory of the process per robot, in bytes, None when it cannot be read
+    memory_per_instance: Optional[float]
+
+
+class RobotSpawner:
+    """
+    Spawn many copies of the robots of ROBOT_ENVIRONMENTS:
+
+        <prototype_root_path>/<robot>    class prim referencing the robot usd, authored once per robot
+        <root_path>/<robot>_<i>          robot: internal reference to the prototype
+
+    The robot usd is only opened once, by its prototype, and a batch of robots is authored with the Sdf API inside one
+    Sdf.ChangeBlock, poses included, so the stage is recomposed once per batch.
+
+    By default every robot is expanded: its articulation root, joints and sensors are prims of the stage, which the
+    physics simulates and the ArticulationViews and the prim index find under the path of the robot. Its meshes are not:
+    as in the *_instanceable assets of Isaac Sim, the subtrees of the robot which reference their own usd, e.g. the
+    visuals and collisions of a link, and hold no rigid body, joint, articulation or camera are made instanceable on the
+    prototype, so every robot adds one prim per subtree and all of them share one composed prototype per mesh.
+
+    With instanceable True, USD shares a single composed prototype between all the robots instead of expanding the whole
+    robot N times, which only suits robots which are not simulated, e.g. parked or visual only fleets: the articulation
+    prims of an instance are instance proxies in the prototype, as for the robots of SceneCloner.clone.
+    """
+
+    def __init__(
+        self,
+        stage: Usd.Stage,
+        root_path: str = None,
+        prototype_root_path: str = None,
+        usd_paths: Dict[str, str] = None,
+    ):
+        """
+        Args:
+            stage (Usd.Stage): The stage of the robots, edited at its current edit target.
+            root_path (str): The parent of the robots, ROBOT_SPAWNER_SETTINGS by default.
+            prototype_root_path (str): The parent of the prototypes, ROBOT_SPAWNER_SETTINGS by default.
+            usd_paths (Dict[str, str]): The usd of every robot, the ones of get_robot_usd_path by default.
+        """
+        self._stage = stage
+        self._usd_paths = usd_paths
+        self._root_path = Sdf.Path(root_path or ROBOT_SPAWNER_SETTINGS["root_path"])
+        self._prototype_root_path = Sdf.Path(prototype_root_path or ROBOT_SPAWNER_SETTINGS["prototype_root_path"])
+        self._counts: Dict[str, int] = {}
+
+    @property
+    def stage(self) -> Usd.Stage:
+        return self._stage
+
+    @property
+    def root_path(self) -> Sdf.Path:
+        return self._root_path
+
+    @staticmethod
+    def get_prim_name(robot_name: str) -> str:
+        """Valid prim name of a robot, e.g. Husky + FR3 -> Husky_FR3"""
+        return re.sub(r"_+", "_", re.sub(r"[^A-Za-z0-9_]", "_", robot_name)).strip("_")
+
+    def get_prototype_path(self, robot_name: str) -> Sdf.Path:
+        return self._prototype_root_path.AppendChild(self.get_prim_name(robot_name))
+
+    def get_instance_paths(self, robot_name: str) -> List[Sdf.Path]:
+        """Paths of the spawned robots of one kind, in spawn order"""
+        prefix = self.get_prim_name(robot_name) + "_"
+        root = self._stage.GetPrimAtPath(self._root_path)
+        if not root:
+            return []
+        paths = [
+            child.GetPath()
+            for child in root.GetChildren()
+            if child.GetName().startswith(prefix) and child.GetName()[len(prefix):].isdigit()
+        ]
+        return sorted(paths, key=lambda path: int(path.name[len(prefix):]))
+
+    def spawn(
+        self,
+        robot_name: str,
+        num_instances: int,
+        positions: Optional[np.ndarray] = None,
+        orientations: Optional[np.ndarray] = None,
+        spacing: float = None,
+        instanceable: bool = None,
+    ) -> SpawnReport:
+        """
+        Spawn num_instances robots of one kind, registering its prototype first if needed.
+
+        Args:
+            robot_name (str): The robot, one of ROBOT_ENVIRONMENTS.
+            num_instances (int): The number of robots to spawn.
+            positions (np.ndarray): (N, 3) positions of the robots, on a grid around the origin by default.
+            orientations (np.ndarray): (N, 4) orientations of the robots as (w, x, y, z) quaternions, or None.
+            spacing (float): The distance between two neighbour robots of the default grid, in stage units.
+            instanceable (bool): If the robots are instances of the prototype, ROBOT_SPAWNER_SETTINGS by default.
+
+        Returns:
+            SpawnReport: The time taken and the stage growth per robot.
+        """
+        usd_path = self._get_usd_path(robot_name)
+        if num_instances <= 0:
+            return SpawnReport(robot_name, 0, 0.0, 0.0, None)
+        spacing = ROBOT_SPAWNER_SETTINGS["spacing"] if spacing is None else spacing
+        instanceable = ROBOT_SPAWNER_SETTINGS["instanceable"] if instanceable is None else instanceable
+        if positions is None:
+            positions = get_grid_positions(num_instances, spacing, UsdGeom.GetStageUpAxis(self._stage))
+
+        num_prims = self._count_prims()
+        memory = get_rss()
+        start = time.perf_counter()
+
+        prototype_path = self.get_prototype_path(robot_name)
+        first_index = self._get_next_index(robot_name)
+        prim_name = self.get_prim_name(robot_name)
+        instance_paths = [self._root_path.AppendChild(f"{prim_name}_{first_index + i}") for i in range(num_instances)]
+        layer = self._stage.GetEditTarget().GetLayer()
+        if not layer.GetPrimAtPath(prototype_path):
+            # The subtrees to instance are found on the composed prototype, before the robots reference it
+            self._define_prototype(layer, prototype_path, usd_path)
+            if ROBOT_SPAWNER_SETTINGS["instanceable_meshes"]:
+                self._make_meshes_instanceable(layer, prototype_path)
+        with Sdf.ChangeBlock():
+            self._define_root(layer)
+            for path in instance_paths:
+                spec = Sdf.CreatePrimInLayer(layer, path)
+                spec.specifier = Sdf.SpecifierDef
+                spec.typeName = "Xform"
+                spec.referenceList.Prepend(Sdf.Reference(primPath=prototype_path))
+                spec.instanceable = instanceable
+            # The robots have just been created, so they have no xform op yet
+            write_xform_specs(layer, instance_paths, positions=positions, orientations=orientations)
+        self._counts[robot_name] = first_index + num_instances
+
+        spawn_time = time.perf_counter() - start
+        memory_after = get_rss()
+        report = SpawnReport(
+            robot_name=robot_name,
+            num_instances=num_instances,
+            spawn_time=spawn_time,
+            prims_per_instance=(self._count_prims() - num_prims) / num_instances,
+            memory_per_instance=None if memory is None or memory_after is None else (memory_after - memory) / num_instances,
+        )
+        memory_text = "" if report.memory_per_instance is None else f", {report.memory_per_instance / 1024.0:.1f} KB"
+        carb.log_info(
+            f"Robot spawner: {num_instances} {robot_name} in {spawn_time * 1000.0:.1f} ms, "
+            f"{report.prims_per_instance:.1f} prims{memory_text} per robot"
+        )
+        return report
+
+    def clear(self, robot_name: Optional[str] = None):
+        """Remove the spawned robots of one kind, or every spawned robot and the prototypes"""
+        if robot_name is None:
+            for path in (self._root_path, self._prototype_root_path):
+                if self._stage.GetPrimAtPath(path):
+                    self._stage.RemovePrim(path)
+            self._counts = {}
+            return
+        # One namespace edit of the layer removes all the robots, the stage is recomposed once
+        edit = Sdf.BatchNamespaceEdit()
+        for path in self.get_instance_paths(robot_name):
+            edit.Add(path, Sdf.Path.emptyPath)
+        self._stage.GetEditTarget().GetLayer().Apply(edit)
+        self._counts.pop(robot_name, None)
+
+    def _get_usd_path(self, robot_name: str) -> str:
+        if self._usd_paths is None:
+            return get_robot_usd_path(robot_name)
+        if robot_name not in self._usd_paths:
+            raise ValueError(f"Unknown robot {robot_name}, expected one of {list(self._usd_paths.keys())}")
+        return self._usd_paths[robot_name]
+
+    def _get_next_index(self, robot_name: str) -> int:
+        if robot_name not in self._counts:
+            # Robots spawned before this spawner was created, e.g. by a previous session on the same stage
+            paths = self.get_instance_paths(robot_name)
+            prefix_length = len(self.get_prim_name(robot_name)) + 1
+            self._counts[robot_name] = int(paths[-1].name[prefix_length:]) + 1 if paths else 0
+        return self._counts[robot_name]
+
+    def _define_root(self, layer: Sdf.Layer):
+        # The root and its ancestors must be defined, or the robots under them are not composed as defined prims
+        for path in self._root_path.GetPrefixes():
+            prim = self._stage.GetPrimAtPath(path)
+            if prim and prim.IsDefined():
+                continue
+            spec = Sdf.CreatePrimInLayer(layer, path)
+            spec.specifier = Sdf.SpecifierDef
+            if not spec.typeName:
+                spec.typeName = "Scope" if path == self._root_path else "Xform"
+
+    def _define_prototype(self, layer: Sdf.Layer, path: Sdf.Path, usd_path: str):
+        if not layer.GetPrimAtPath(self._prototype_root_path):
+            # An abstract root, so the prototypes are neither rendered nor simulated
+            Sdf.CreatePrimInLayer(layer, self._prototype_root_path).specifier = Sdf.SpecifierClass
+        spec = Sdf.CreatePrimInLayer(layer, path)
+        spec.specifier = Sdf.SpecifierClass
+        spec.typeName = "Xform"
+        spec.referenceList.Prepend(Sdf.Reference(usd_path))
+
+    def _make_meshes_instanceable(self, layer: Sdf.Layer, path: Sdf.Path) -> int:
+        """Make the visual and collision subtrees of a prototype instanceable. Returns the number of subtrees"""
+        prototype = self._stage.GetPrimAtPath(path)
+        prims = Usd.PrimRange(prototype, Usd.PrimAllPrimsPredicate)
+        # The prims which every robot needs in the stage, and so their ancestors
+        expanded_paths = [prim.GetPath() for prim in prims if _is_simulated(prim)]
+        subtree_paths = []
+        iterator = iter(prims)
+        for prim in iterator:
+            if prim == prototype or not (prim.HasAuthoredReferences() or prim.HasAuthoredPayloads()):
+                continue
+            if prim.IsInstance():
+                iterator.PruneChildren()
+                continue
+            prim_path = prim.GetPath()
+            if _has_physics_api(prim) or any(expanded.HasPrefix(prim_path) for expanded in expanded_paths):
+                continue
+            subtree_paths.append(prim_path)
+            iterator.PruneChildren()
+        with Sdf.ChangeBlock():
+            for subtree_path in subtree_paths:
+                Sdf.CreatePrimInLayer(layer, subtree_path).instanceable = True
+        return len(subtree_paths)
+
+    def _count_prims(self) -> int:
+        root = self._stage.GetPrimAtPath(self._root_path)
+        prototypes = self._stage.GetPrimAtPath(self._prototype_root_path)
+        count = 0
+        for prim in (root, prototypes):
+            if prim:
+                # Abstract prims, the prototypes, are not traversed by the default predicate
+                count += sum(1 for _ in Usd.PrimRange(prim, Usd.PrimAllPrimsPredicate))
+        return count
+
+
+def _has_physics_api(prim: Usd.Prim) -> bool:
+    return any(schema.startswith(("Physics", "Physx")) for schema in prim.GetAppliedSchemas())
+
+
+def _is_simulated(prim: Usd.Prim) -> bool:
+    """If the prim is simulated or sensed per robot, so it cannot be an instance proxy"""
+    return (
+        prim.HasAPI(UsdPhysics.RigidBodyAPI)
+        or prim.HasAPI(UsdPhysics.ArticulationRootAPI)
+        or prim.IsA(UsdPhysics.Joint)
+        or prim.IsA(UsdGeom.Camera)
+    )
@@ -0,0 +1,130 @@
+"""
+| File: scene_cloner.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Batch spawner which tiles many copies of an environment (and their robots) in one stage
+"""
+
+__all__ = ["SceneCloner"]
+
+import time
+import carb
+import numpy as np
+from pxr import Sdf, Usd, UsdGeom
+from typing import List, Optional
+from omni.mobile.robots.params import SCENE_CLONER_SETTINGS
+from omni.mobile.robots.logic.world.xform_utils import get_grid_positions, write_xform_specs
+
+
+class SceneCloner:
+    """
+    Spawn K copies of an environment under <root_path>/env_<i>, laid out on a grid of the ground plane:
+
+        <root_path>/env_<i>              Xform translated to its cell of the grid
+        <root_path>/env_<i>/Environment  instanceable reference to the environment usd
+        <root_path>/env_<i>/Robot        (optional) reference to the robot usd
+
+    Every spec is authored with the Sdf API inside a single Sdf.ChangeBlock, so the stage is recomposed once for the
+    whole batch, and the environment copies share a single prototype because their references are instanceable.
+    """
+
+    ENVIRONMENT_NAME = "Environment"
+    ROBOT_NAME = "Robot"
+
+    def __init__(self, stage: Usd.Stage, root_path: str = None):
+        self._stage = stage
+        self._root_path = Sdf.Path(root_path or SCENE_CLONER_SETTINGS["root_path"])
+
+    @property
+    def root_path(self) -> Sdf.Path:
+        return self._root_path
+
+    def get_env_path(self, index: int) -> Sdf.Path:
+        return self._root_path.AppendChild(f"env_{index}")
+
+    def get_env_paths(self) -> List[Sdf.Path]:
+        root = self._stage.GetPrimAtPath(self._root_path)
+        if not root:
+            return []
+        return [child.GetPath() for child in root.GetChildren() if child.GetName().startswith("env_")]
+
+    def get_grid_positions(self, num_envs: int, spacing: float) -> np.ndarray:
+        """
+        Positions of num_envs cells on a square grid of the ground plane, centered around the origin.
+
+        Returns:
+            np.ndarray: (num_envs, 3) array of positions, following the up axis of the stage.
+        """
+        return get_grid_positions(num_envs, spacing, UsdGeom.GetStageUpAxis(self._stage))
+
+    def clone(
+        self,
+        env_usd_path: str,
+        num_envs: int,
+        spacing: float = None,
+        robot_usd_path: Optional[str] = None,
+        instanceable_robots: bool = False,
+    ) -> List[Sdf.Path]:
+        """
+        Spawn num_envs copies of the environment, and optionally of a robot, in one batch of Sdf edits.
+
+        Args:
+            env_usd_path (str): The url of the environment usd.
+            num_envs (int): The number of copies to spawn.
+            spacing (float): The distance between two neighbour copies, in stage units.
+            robot_usd_path (str): The url of a robot usd to spawn in every copy, or None.
+            instanceable_robots (bool): If the robot references are instanceable as well. Robots which are controlled
+                individually (articulations, sensors) should usually not be.
+
+        Returns:
+            List[Sdf.Path]: The paths of the spawned copies.
+        """
+        if num_envs <= 0:
+            return []
+        spacing = SCENE_CLONER_SETTINGS["spacing"] if spacing is None else spacing
+        if self._stage.GetPrimAtPath(self.get_env_path(0)):
+            raise Exception("Environment copies already exist at " + str(self._root_path) + ", clear them first")
+
+        start = time.perf_counter()
+        positions = self.get_grid_positions(num_envs, spacing)
+        layer = self._stage.GetEditTarget().GetLayer()
+        env_paths = [self.get_env_path(i) for i in range(num_envs)]
+
+        with Sdf.ChangeBlock():
+            root_spec = Sdf.CreatePrimInLayer(layer, self._root_path)
+            root_spec.specifier = Sdf.SpecifierDef
+            if not root_spec.typeName:
+                root_spec.typeName = "Scope"
+
+            for env_path in env_paths:
+                self._define_xform(layer, env_path)
+                self._define_reference(layer, env_path.AppendChild(SceneCloner.ENVIRONMENT_NAME), env_usd_path, True)
+                if robot_usd_path:
+                    self._define_reference(
+                        layer, env_path.AppendChild(SceneCloner.ROBOT_NAME), robot_usd_path, instanceable_robots
+                    )
+
+            # The copies have just been created, so they have no xform op yet
+            write_xform_specs(layer, env_paths, positions=positions)
+
+        carb.log_info(
+            f"Scene cloner: spawned {num_envs} copies of {env_usd_path} in {(time.perf_counter() - start) * 1000.0:.1f} ms"
+        )
+        return env_paths
+
+    def clear(self):
+        """Remove every copy spawned under the root path"""
+        if self._stage.GetPrimAtPath(self._root_path):
+            self._stage.RemovePrim(self._root_path)
+
+    def _define_xform(self, layer: Sdf.Layer, path: Sdf.Path) -> Sdf.PrimSpec:
+        spec = Sdf.CreatePrimInLayer(layer, path)
+        spec.specifier = Sdf.SpecifierDef
+        spec.typeName = "Xform"
+        return spec
+
+    def _define_reference(self, layer: Sdf.Layer, path: Sdf.Path, usd_path: str, instanceable: bool) -> Sdf.PrimSpec:
+        spec = self._define_xform(layer, path)
+        spec.referenceList.Prepend(Sdf.Reference(usd_path))
+        spec.instanceable = instanceable
+        return spec
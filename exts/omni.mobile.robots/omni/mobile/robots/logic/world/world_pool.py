@@ -0,0 +1,159 @@
+"""
+| File: world_pool.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Warm pool which keeps the most recently used environments resident in the stage
+"""
+
+__all__ = ["WorldPool"]
+
+import os
+import re
+import carb
+import hashlib
+import omni.client
+from collections import OrderedDict
+from pxr import Sdf, Usd
+from typing import List, Optional
+from omni.mobile.robots.params import WORLD_POOL_SETTINGS
+
+
+class _PoolEntry:
+    def __init__(self, prim_path: Sdf.Path, layers: List[Sdf.Layer], size: int):
+        self.prim_path = prim_path
+        # Holding the layers keeps them in the layer registry while the prim is deactivated, so activating it again
+        # recomposes the environment from memory instead of reading it from disk or the server
+        self.layers = layers
+        self.size = size
+
+
+class WorldPool:
+    """
+    Keep the N most recently used environments loaded under a hidden root of the stage. Only the current environment
+    is active, the others are deactivated prims, so switching environments is a matter of toggling their activation.
+    Environments are evicted in least recently used order when the pool holds more than max_worlds environments or
+    when their estimated size is larger than max_size.
+
+    Environments are keyed by their full resolved url (see get_key), so two files with the same name in different
+    folders or on different servers are two environments.
+    """
+
+    def __init__(self, root_path: str = None, max_worlds: int = None, max_size: int = None):
+        self._root_path = Sdf.Path(root_path or WORLD_POOL_SETTINGS["root_path"])
+        self._max_worlds = max(1, max_worlds or WORLD_POOL_SETTINGS["max_worlds"])
+        self._max_size = max_size or WORLD_POOL_SETTINGS["max_size"]
+
+        self._stage: Optional[Usd.Stage] = None
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._active_key: Optional[str] = None
+
+    @property
+    def active_key(self) -> Optional[str]:
+        return self._active_key
+
+    @property
+    def size(self) -> int:
+        return sum(entry.size for entry in self._entries.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(usd_path: str) -> str:
+        """Key of the environment at the given url or path: its normalized url, local paths being made absolute"""
+        if "://" not in usd_path:
+            usd_path = os.path.abspath(usd_path)
+        return omni.client.normalize_url(usd_path)
+
+    def get_prim_path(self, key: str) -> Sdf.Path:
+        """Path of the primitive where the environment with the given key is (or will be) loaded"""
+        name = re.sub(r"[^A-Za-z0-9_]", "_", key.rsplit("/", 1)[-1].split(".")[0])
+        # The hash of the whole key tells apart environments whose files have the same name
+        return self._root_path.AppendChild(f"{name}_{hashlib.sha1(key.encode()).hexdigest()[:8]}")
+
+    def bind(self, stage: Usd.Stage):
+        """Use the given stage, forgetting the environments of the previous one if it changed"""
+        if self._stage is not None and self._stage != stage:
+            self._entries.clear()
+            self._active_key = None
+        self._stage = stage
+
+        root = stage.GetPrimAtPath(self._root_path)
+        if not root:
+            root = stage.DefinePrim(self._root_path, "Scope")
+            root.SetMetadata("hide_in_stage_window", True)
+
+    def activate(self, key: str) -> Optional[Usd.Prim]:
+        """
+        Make the environment with the given key the active one.
+
+        Args:
+            key (str): The key of the environment, from get_key.
+
+        Returns:
+            Usd.Prim: The primitive of the environment, or None if it is not resident in the pool.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._stage is None:
+            return None
+
+        prim = self._stage.GetPrimAtPath(entry.prim_path)
+        if not prim:
+            # The environment was deleted from the stage behind our back
+            del self._entries[key]
+            if self._active_key == key:
+                self._active_key = None
+            return None
+
+        self._deactivate_current(key)
+        prim.SetActive(True)
+        self._active_key = key
+        self._entries.move_to_end(key)
+        carb.log_info(f"World pool: switched to {key}")
+        return self._stage.GetPrimAtPath(entry.prim_path)
+
+    def add(self, key: str, prim: Usd.Prim, layers: List[Sdf.Layer], size: int):
+        """
+        Register an environment that has just been loaded at get_prim_path(key) as the active one, and evict the least
+        recently used environments which no longer fit in the pool.
+        """
+        self._deactivate_current(key)
+        self._entries[key] = _PoolEntry(prim.GetPath(), layers, size)
+        self._entries.move_to_end(key)
+        self._active_key = key
+        self._evict()
+
+    def deactivate(self):
+        """Deactivate the current environment, keeping it resident"""
+        self._deactivate_current(None)
+        self._active_key = None
+
+    def clear(self):
+        """Remove every environment of the pool from the stage"""
+        for key in list(self._entries.keys()):
+            self._remove(key)
+        self._active_key = None
+
+    def _deactivate_current(self, next_key: Optional[str]):
+        if self._active_key is None or self._active_key == next_key or self._active_key not in self._entries:
+            return
+        prim = self._stage.GetPrimAtPath(self._entries[self._active_key].prim_path)
+        if prim:
+            prim.SetActive(False)
+
+    def _evict(self):
+        for key in list(self._entries.keys()):
+            if len(self._entries) <= self._max_worlds and self.size <= self._max_size:
+                break
+            if key == self._active_key:
+                continue
+            carb.log_info(f"World pool: evicting {key}")
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        if self._stage is not None and self._stage.GetPrimAtPath(entry.prim_path):
+            self._stage.RemovePrim(entry.prim_path)
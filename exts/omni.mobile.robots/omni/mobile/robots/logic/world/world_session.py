@@ -0,0 +1,184 @@
+"""
+| File: world_session.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: UI-free world, environment and robot logic, shared by the extension widgets and the headless runner
+"""
+
+__all__ = ["WorldSession"]
+
+import gc
+import time
+import carb
+import numpy as np
+from pxr import Sdf, Usd
+from typing import Callable, List, Optional
+from omni.isaac.core import World
+from omni.isaac.core.utils.stage import create_new_stage_async, clear_stage
+from omni.mobile.robots.params import DEFAULT_WORLD_SETTINGS, WORLD_POOL_SETTINGS, get_robot_usd_path
+from omni.mobile.robots.logic.world.env_loader import EnvironmentLoader, LoadProgress
+from omni.mobile.robots.logic.world.asset_cache import AssetCache
+from omni.mobile.robots.logic.world.world_pool import WorldPool
+from omni.mobile.robots.logic.world.xform_utils import set_prim_poses
+
+
+class WorldSession:
+    """
+    Owner of the simulation World and of what is loaded in it. Nothing in here builds omni.ui widgets, so the same
+    logic runs behind the extension buttons and in the headless runner.
+    """
+
+    ENV_PRIM_PATH = "/World/Environment"
+    ROBOT_PRIM_PATH = "/World/Robot"
+
+    def __init__(
+        self,
+        world_settings: dict = None,
+        progress_fn: Callable[[LoadProgress], None] = None,
+        use_world_pool: bool = None,
+    ):
+        self._world_settings = world_settings or DEFAULT_WORLD_SETTINGS
+        self._world: Optional[World] = None
+        self._robot_paths: List[Sdf.Path] = []
+        self._env_loader = EnvironmentLoader(progress_fn=progress_fn, asset_cache=AssetCache())
+
+        use_world_pool = WORLD_POOL_SETTINGS["enabled"] if use_world_pool is None else use_world_pool
+        self._world_pool = WorldPool() if use_world_pool else None
+
+    @property
+    def world(self) -> Optional[World]:
+        return self._world
+
+    @property
+    def env_loader(self) -> EnvironmentLoader:
+        return self._env_loader
+
+    @property
+    def robot_paths(self) -> List[Sdf.Path]:
+        """Paths of the robots spawned since the last clear"""
+        return list(self._robot_paths)
+
+    async def create_world_async(self, setup_scene_fn: Callable[[], None] = None) -> World:
+        """
+        Create the World (and a new stage) if there is none yet, then reset and pause it.
+
+        Args:
+            setup_scene_fn (Callable[[], None]): Called once after a new World has been created.
+
+        Returns:
+            World: The simulation World.
+        """
+        start = time.perf_counter()
+        if World.instance() is None:
+            await create_new_stage_async()
+            self._world = World(**self._world_settings)
+            await self._world.initialize_simulation_context_async()
+            if setup_scene_fn is not None:
+                setup_scene_fn()
+        else:
+            self._world = World.instance()
+
+        await self._world.reset_async()
+        await self._world.pause_async()
+        carb.log_info(f"World setup took {(time.perf_counter() - start) * 1000.0:.1f} ms")
+        return self._world
+
+    async def load_env_async(
+        self,
+        usd_path: str,
+        stage_prefix: str = ENV_PRIM_PATH,
+        position: np.ndarray = None,
+        scale: np.ndarray = None,
+    ) -> Usd.Prim:
+        """
+        Load an environment into the World, or re-activate it if it is still resident in the warm pool.
+
+        Args:
+            usd_path (str): The url of the environment usd.
+            stage_prefix (str): The path of the environment primitive, when the warm pool is disabled.
+            position (np.ndarray): The translation of the environment, or None to leave it at the origin.
+            scale (np.ndarray): The scale of the environment, or None to leave it unscaled.
+
+        Returns:
+            Usd.Prim: The primitive of the environment.
+        """
+        if self._world is None:
+            raise Exception("The World must be created before loading an environment")
+
+        if self._world_pool is not None:
+            self._world_pool.bind(self._world.stage)
+            pool_key = self._world_pool.get_key(usd_path)
+            prim = self._world_pool.activate(pool_key)
+            if prim is not None:
+                return prim
+            stage_prefix = str(self._world_pool.get_prim_path(pool_key))
+
+        # The layers of the environment are prefetched in the background, the prim is only created once they are ready
+        prim = await self._env_loader.start(self._world.stage, usd_path, stage_prefix)
+        self.place(prim, position, scale)
+
+        if self._world_pool is not None:
+            self._world_pool.add(pool_key, prim, self._env_loader.layers, self._env_loader.footprint)
+        return prim
+
+    def spawn_robot(self, robot_name: str, prim_path: str = ROBOT_PRIM_PATH, position: np.ndarray = None) -> Usd.Prim:
+        """
+        Reference the usd of one of the ROBOT_ENVIRONMENTS into the World.
+
+        Args:
+            robot_name (str): The name of the robot, as listed in ROBOT_ENVIRONMENTS.
+            prim_path (str): The path of the robot primitive.
+            position (np.ndarray): The translation of the robot, or None to leave it at the origin.
+
+        Returns:
+            Usd.Prim: The primitive of the robot.
+        """
+        # Local file or asset server url, raises if the robot has neither
+        usd_path = get_robot_usd_path(robot_name)
+
+        stage = self._world.stage
+        if stage.GetPrimAtPath(prim_path):
+            raise Exception("A primitive already exists at the specified path")
+        prim = stage.DefinePrim(prim_path, "Xform")
+        if not prim.GetReferences().AddReference(usd_path):
+            raise Exception("The usd asset " + usd_path + " is not load at stage path " + prim_path)
+        self.place(prim, position)
+        self._robot_paths.append(prim.GetPath())
+        return prim
+
+    def place(self, prim: Usd.Prim, position: np.ndarray = None, scale: np.ndarray = None):
+        if not isinstance(prim, Usd.Prim):
+            raise ValueError("prim must be a Usd.Prim object")
+        if position is None and scale is None:
+            return
+        set_prim_poses(
+            prim.GetStage(),
+            [prim.GetPath()],
+            positions=None if position is None else np.asarray(position)[None],
+            scales=None if scale is None else np.asarray(scale)[None],
+        )
+
+    def step(self, num_steps: int, render: bool = True) -> float:
+        """Step the World synchronously. Returns the mean duration of a step in seconds"""
+        if self._world is None:
+            raise Exception("The World must be created before stepping it")
+        if num_steps <= 0:
+            return 0.0
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            self._world.step(render=render)
+        return (time.perf_counter() - start) / num_steps
+
+    def clear(self):
+        """Stop the World and remove everything from the stage"""
+        if self._world is not None:
+            self._world.stop()
+            self._world.clear_all_callbacks()
+            self._world.clear()
+
+        if self._world_pool is not None:
+            self._world_pool.clear()
+
+        self._robot_paths = []
+        clear_stage()
+        gc.collect()
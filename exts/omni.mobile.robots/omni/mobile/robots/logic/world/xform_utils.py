@@ -0,0 +1,202 @@
+"""
+| File: xform_utils.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Bulk placement of many primitives, authored in a single batch of Sdf edits
+"""
+
+__all__ = ["set_prim_poses", "write_xform_specs", "get_grid_positions", "get_rotation_matrices"]
+
+import numpy as np
+from pxr import Gf, Sdf, Usd, UsdGeom
+from typing import Dict, List, Optional, Sequence
+
+TRANSLATE_OP = "xformOp:translate"
+ORIENT_OP = "xformOp:orient"
+SCALE_OP = "xformOp:scale"
+
+DEFAULT_TYPE_NAMES = {
+    TRANSLATE_OP: Sdf.ValueTypeNames.Double3,
+    ORIENT_OP: Sdf.ValueTypeNames.Quatd,
+    SCALE_OP: Sdf.ValueTypeNames.Double3,
+}
+
+
+def set_prim_poses(
+    stage: Usd.Stage,
+    prim_paths: Sequence,
+    positions: Optional[np.ndarray] = None,
+    orientations: Optional[np.ndarray] = None,
+    scales: Optional[np.ndarray] = None,
+):
+    """
+    Set the translation, orientation and scale of many primitives at once. The xform ops that the primitives already
+    have are reused, so placing a primitive again does not grow its op stack.
+
+    Args:
+        stage (Usd.Stage): The stage of the primitives, edited at its current edit target.
+        prim_paths (Sequence): The N paths of the primitives.
+        positions (np.ndarray): (N, 3) array of translations, or None to leave them untouched.
+        orientations (np.ndarray): (N, 4) array of quaternions as (w, x, y, z), or None to leave them untouched.
+        scales (np.ndarray): (N, 3) array of scales, or None to leave them untouched.
+    """
+    prim_paths = [Sdf.Path(str(path)) for path in prim_paths]
+
+    # The composed op stacks are read before editing, as the Usd API must not be used inside an Sdf.ChangeBlock
+    op_orders = []
+    type_names = []
+    for path in prim_paths:
+        prim = stage.GetPrimAtPath(path)
+        if not prim:
+            raise ValueError(f"No primitive exists at {path}")
+        xformable = UsdGeom.Xformable(prim)
+        op_orders.append(list(xformable.GetXformOpOrderAttr().Get() or []))
+        prim_type_names = {}
+        for op_name in DEFAULT_TYPE_NAMES:
+            attribute = prim.GetAttribute(op_name)
+            if attribute:
+                prim_type_names[op_name] = attribute.GetTypeName()
+        type_names.append(prim_type_names)
+
+    write_xform_specs(
+        stage.GetEditTarget().GetLayer(), prim_paths, positions, orientations, scales, op_orders, type_names
+    )
+
+
+def write_xform_specs(
+    layer: Sdf.Layer,
+    prim_paths: Sequence,
+    positions: Optional[np.ndarray] = None,
+    orientations: Optional[np.ndarray] = None,
+    scales: Optional[np.ndarray] = None,
+    op_orders: Optional[List[List[str]]] = None,
+    type_names: Optional[List[Dict[str, Sdf.ValueTypeName]]] = None,
+):
+    """
+    Author the xform ops of many primitives in the given layer, inside one Sdf.ChangeBlock. Only the Sdf API is used,
+    so this can also be called from within the change block of a caller which is creating the primitives.
+
+    Args:
+        layer (Sdf.Layer): The layer where the opinions are authored.
+        prim_paths (Sequence): The N paths of the primitives.
+        positions (np.ndarray): (N, 3) array of translations, or None.
+        orientations (np.ndarray): (N, 4) array of quaternions as (w, x, y, z), or None.
+        scales (np.ndarray): (N, 3) array of scales, or None.
+        op_orders (List[List[str]]): The current op order of every primitive, or None if they have no ops yet.
+        type_names (List[Dict[str, Sdf.ValueTypeName]]): The value type of the ops that already exist on every
+            primitive, which must be kept when authoring stronger opinions.
+    """
+    num_prims = len(prim_paths)
+    values = {
+        TRANSLATE_OP: _check_array("positions", positions, num_prims, 3),
+        ORIENT_OP: _check_array("orientations", orientations, num_prims, 4),
+        SCALE_OP: _check_array("scales", scales, num_prims, 3),
+    }
+    values = {op_name: array for op_name, array in values.items() if array is not None}
+    if not values:
+        return
+
+    with Sdf.ChangeBlock():
+        for index, path in enumerate(prim_paths):
+            spec = layer.GetPrimAtPath(path) or Sdf.CreatePrimInLayer(layer, path)
+            prim_type_names = type_names[index] if type_names is not None else {}
+
+            for op_name, array in values.items():
+                type_name = prim_type_names.get(op_name, DEFAULT_TYPE_NAMES[op_name])
+                attribute = spec.attributes.get(op_name)
+                if attribute is None:
+                    attribute = Sdf.AttributeSpec(spec, op_name, type_name)
+                attribute.default = _to_value(type_name, array[index])
+
+            op_order = op_orders[index] if op_orders is not None else []
+            new_op_order = _merge_op_order(op_order, values.keys())
+            if new_op_order != op_order:
+                op_order_spec = spec.attributes.get(UsdGeom.Tokens.xformOpOrder)
+                if op_order_spec is None:
+                    op_order_spec = Sdf.AttributeSpec(
+                        spec, UsdGeom.Tokens.xformOpOrder, Sdf.ValueTypeNames.TokenArray, Sdf.VariabilityUniform
+                    )
+                op_order_spec.default = new_op_order
+
+
+def get_grid_positions(num_cells: int, spacing: float, up_axis: str = UsdGeom.Tokens.z) -> np.ndarray:
+    """
+    Positions of num_cells cells on a square grid of the ground plane, centered around the origin.
+
+    Args:
+        num_cells (int): The number of cells.
+        spacing (float): The distance between two neighbour cells.
+        up_axis (str): The up axis of the stage, the grid lies on the plane orthogonal to it.
+
+    Returns:
+        np.ndarray: (num_cells, 3) array of positions.
+    """
+    num_cols = int(np.ceil(np.sqrt(num_cells)))
+    num_rows = int(np.ceil(num_cells / num_cols)) if num_cells > 0 else 0
+    indices = np.arange(num_cells)
+    rows = indices // max(1, num_cols)
+    cols = indices % max(1, num_cols)
+
+    positions = np.zeros((num_cells, 3), dtype=np.float64)
+    positions[:, 0] = (cols - (num_cols - 1) / 2.0) * spacing
+    second_axis = (rows - (num_rows - 1) / 2.0) * spacing
+    if up_axis == UsdGeom.Tokens.y:
+        positions[:, 2] = second_axis
+    else:
+        positions[:, 1] = second_axis
+    return positions
+
+
+def get_rotation_matrices(quaternions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rotation matrices of a batch of unit quaternions.
+
+    Args:
+        quaternions (np.ndarray): (N, 4) array of quaternions as (w, x, y, z).
+        out (np.ndarray): (N, 3, 3) array the matrices are written to, a new one by default.
+
+    Returns:
+        np.ndarray: (N, 3, 3) matrices, rotating vectors of the local frame to the parent frame.
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64)
+    if out is None:
+        out = np.empty((len(quaternions), 3, 3), dtype=np.float64)
+    w, x, y, z = quaternions[:, 0], quaternions[:, 1], quaternions[:, 2], quaternions[:, 3]
+    out[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    out[:, 0, 1] = 2.0 * (x * y - w * z)
+    out[:, 0, 2] = 2.0 * (x * z + w * y)
+    out[:, 1, 0] = 2.0 * (x * y + w * z)
+    out[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    out[:, 1, 2] = 2.0 * (y * z - w * x)
+    out[:, 2, 0] = 2.0 * (x * z - w * y)
+    out[:, 2, 1] = 2.0 * (y * z + w * x)
+    out[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return out
+
+
+def _check_array(name: str, array: Optional[np.ndarray], num_prims: int, width: int) -> Optional[np.ndarray]:
+    if array is None:
+        return None
+    array = np.asarray(array, dtype=np.float64)
+    if array.shape != (num_prims, width):
+        raise ValueError(f"{name} must be an array of shape ({num_prims}, {width}), got {array.shape}")
+    return array
+
+
+def _to_value(type_name: Sdf.ValueTypeName, value: np.ndarray):
+    python_class = type_name.type.pythonClass
+    if python_class in (Gf.Quatd, Gf.Quatf, Gf.Quath):
+        return python_class(float(value[0]), float(value[1]), float(value[2]), float(value[3]))
+    return python_class(*[float(component) for component in value])
+
+
+def _merge_op_order(op_order: List[str], op_names) -> List[str]:
+    """Add the missing ops to the op order, translate first and scale last, keeping the ops which already exist"""
+    new_op_order = list(op_order)
+    if TRANSLATE_OP in op_names and TRANSLATE_OP not in new_op_order:
+        new_op_order.insert(0, TRANSLATE_OP)
+    if ORIENT_OP in op_names and ORIENT_OP not in new_op_order:
+        new_op_order.insert(new_op_order.index(TRANSLATE_OP) + 1 if TRANSLATE_OP in new_op_order else 0, ORIENT_OP)
+    if SCALE_OP in op_names and SCALE_OP not in new_op_order:
+        new_op_order.append(SCALE_OP)
+    return new_op_order
@@ -1,8 +1,5 @@
 import os
-import omni
-import carb
 from pathlib import Path
-from omni.isaac.core.utils.nucleus import get_assets_root_path
 
 # Extension configuration
 EXTENSION_NAME = "Mobile Simulator"
@@ -27,10 +24,24 @@ ICON_PATH = os.path.dirname(os.path.abspath(__file__)) + "/../../../data/icon"
 #     "husky fr3": "husky_fr3.usd",
 # }
 
+# The assets root only changes when the application is restarted, so it is resolved once per process
+_ASSETS_ROOT_PATH = None
+
+def _get_assets_root_path():
+    global _ASSETS_ROOT_PATH
+    if _ASSETS_ROOT_PATH is None:
+        # Imported here so that importing the parameters does not load omni.isaac.core
+        from omni.isaac.core.utils.nucleus import get_assets_root_path
+
+        _ASSETS_ROOT_PATH = get_assets_root_path()
+    return _ASSETS_ROOT_PATH
+
 # Setup the default simulation environments path
 def _asset_server(asset_path):
-    asset_root_path = get_assets_root_path()
+    asset_root_path = _get_assets_root_path()
     if asset_root_path is None:
+        import carb
+
         carb.log_error("Could not find Isaac Sim assets folder")
         return
     return asset_root_path + asset_path
@@ -53,6 +64,131 @@ WORLD_THUMBNAILS = {
 
 ROBOT_ENVIRONMENTS = ["Husky", "WeCAR", "FR3", "Husky + FR3"]
 
+# Usd of the robots of ROBOT_ENVIRONMENTS on the Isaac Sim asset server, resolved like SIMULATION_ENVIRONMENTS. The WeCAR
+# and the Husky + FR3 have no stock asset, their usd must be added to the assets folder
+ROBOT_ASSET_PATHS = {
+    "Husky": "/Isaac/Robots/Clearpath/Husky/husky.usd",
+    "WeCAR": None,
+    "FR3": "/Isaac/Robots/Franka/FR3/fr3.usd",
+    "Husky + FR3": None,
+}
+
+# Usd of the robots in the assets folder, used instead of the ones of the asset server when they exist
+ROBOT_LOCAL_USD_PATHS = {
+    "Husky": ROBOT_PATH + "/husky.usd",
+    "WeCAR": ROBOT_PATH + "/wecar.usd",
+    "FR3": ROBOT_PATH + "/fr3.usd",
+    "Husky + FR3": ROBOT_PATH + "/husky_fr3.usd",
+}
+
+def get_robot_usd_path(robot_name):
+    """Usd of one of the ROBOT_ENVIRONMENTS: the one of the assets folder if it exists, else the one of the asset server"""
+    if robot_name not in ROBOT_ASSET_PATHS:
+        raise ValueError(f"Unknown robot {robot_name}, expected one of {ROBOT_ENVIRONMENTS}")
+    local_path = ROBOT_LOCAL_USD_PATHS[robot_name]
+    if os.path.isfile(local_path):
+        return local_path
+    asset_path = ROBOT_ASSET_PATHS[robot_name]
+    if asset_path is None:
+        raise FileNotFoundError(f"The {robot_name} has no asset on the Isaac Sim asset server, add its usd at {local_path}")
+    usd_path = _asset_server(asset_path)
+    if usd_path is None:
+        raise FileNotFoundError(f"The usd of the {robot_name} could not be resolved without the Isaac Sim assets folder")
+    return usd_path
+
+# Local cache of the environment layers and textures read from the asset server
+ASSET_CACHE_PATH = "${cache}/omni.mobile.robots/asset_cache"
+ASSET_CACHE_MAX_SIZE = 8 * 1024 * 1024 * 1024
+# Dependencies of a layer read from the asset server at the same time
+ASSET_CACHE_MAX_DOWNLOADS = 8
+
+# Warm pool of the most recently used environments, kept deactivated in the stage for instant switching
+WORLD_POOL_SETTINGS = {
+    "enabled": True,
+    "root_path": "/World/EnvPool",
+    "max_worlds": 3,
+    "max_size": 4 * 1024 * 1024 * 1024,
+}
+
+# Batch spawner tiling copies of an environment on a grid, for parallel rollouts of the learning tasks
+SCENE_CLONER_SETTINGS = {
+    "root_path": "/World/envs",
+    "spacing": 20.0,
+}
+
+# Fleets of robots: every robot usd is referenced once by a prototype, which the robots of the fleet reference. The
+# robots are not instanceable by default: an instanceable robot has its articulation root and joints in the shared
+# prototype, so it can neither be simulated nor controlled individually. The visual and collision subtrees of the
+# expanded robots (referenced meshes without rigid body, joint or camera) are instanceable unless instanceable_meshes
+# is False
+ROBOT_SPAWNER_SETTINGS = {
+    "root_path": "/World/Robots",
+    "prototype_root_path": "/World/RobotPrototypes",
+    "spacing": 2.0,
+    "instanceable": False,
+    "instanceable_meshes": True,
+}
+
+# Encoder threads writing the frames of the multi camera capture, frames waiting for them, zlib level of the .png frames
+FRAME_WRITER_SETTINGS = {
+    "num_workers": 4,
+    "max_queue_size": 32,
+    "png_compress_level": 6,
+}
+
+# Chunked dataset output of the multi camera capture: frames per chunk, zlib level of the chunks (0 to memory map them)
+FRAME_DATASET_SETTINGS = {
+    "chunk_size": 16,
+    "compression_level": 1,
+}
+
+# Capture benchmark (python -m omni.mobile.robots.benchmark): the matrix of jobs run for every environment of
+# SIMULATION_ENVIRONMENTS, and the fixed camera and frame count which keep its results comparable across releases
+BENCHMARK_SETTINGS = {
+    "resolutions": {"480p": [640, 480], "720p": [1280, 720], "1080p": [1920, 1080]},
+    # Names of the CAPTURE_RENDER_PRESET presets
+    "render_presets": ["RAY_TRACE", "PATH_TRACE"],
+    # Subframes rendered per captured frame with each preset, so the path traced frames converge
+    "rt_subframes": {"RAY_TRACE": 1, "PATH_TRACE": 16},
+    "file_types": [".png", ".npy", ".dataset", ".mp4"],
+    "num_frames": 60,
+    "fps": 30.0,
+    # Updates after loading an environment, so textures and shaders are loaded before the first capture
+    "settle_updates": 30,
+    "camera_path": "/World/BenchmarkCamera",
+    "camera_position": [6.0, 6.0, 4.0],
+    "camera_target": [0.0, 0.0, 0.5],
+    # Relative change of a metric against the baseline report reported as a regression
+    "tolerance": 0.1,
+}
+
+# Submission of render batches to a Farm Queue: tasks in flight, retries of a failed task, first retry delay (s)
+FARM_CLIENT_SETTINGS = {
+    "max_concurrency": 16,
+    "max_retries": 4,
+    "backoff": 0.5,
+    # Seconds the settings of a Farm Queue are reused before being read again
+    "settings_ttl": 60.0,
+    # Seconds and number of submissions whose response is kept by idempotency key, so a retried task is not queued twice
+    "submitted_ttl": 3600.0,
+    "max_submitted": 10000,
+    # Bounds of the adaptive interval between two status queries of a submission, in seconds
+    "poll_min_interval": 2.0,
+    "poll_max_interval": 30.0,
+}
+
+# Farm Queue stand-in rendering the batches in headless Kit processes on this machine (LocalFarmClient)
+LOCAL_FARM_SETTINGS = {
+    # Python of Isaac Sim starting the workers, empty for the python.sh (python.bat) of the install running Kit
+    "python_executable": "",
+    # GPUs the workers are spread over, round robin, empty for the default GPU of Kit
+    "gpus": [],
+    # Folder of the output folder where every worker writes its frames before they are merged
+    "staging_folder": ".local_farm",
+    # Seconds a worker waits for the next frame of its batch before failing it, 0 to wait forever
+    "frame_timeout": 600.0,
+}
+
 # Define the default settings for the simulation environment
 DEFAULT_WORLD_SETTINGS = {"physics_dt": 1.0 / 250.0, "stage_units_in_meters": 1.0, "rendering_dt": 1.0 / 60.0}
 
@@ -72,11 +208,8 @@ DEFAULT_ANIMATION_FPS = ["24", "25", "29.97", "30", "60", "120"]
 DEFAULT_SELECTED_FPS = 24
 DEFAULT_FPS_SETTING_PATH = "/exts/omni.kit.window.movie_capture/default_fps"
 
-CAPTURE_RANGE_TYPES = (omni.kit.capture.viewport.CaptureRangeType.FRAMES, omni.kit.capture.viewport.CaptureRangeType.SECONDS)
-CAPTURE_RENDER_PRESET = (
-    omni.kit.capture.viewport.CaptureRenderPreset.PATH_TRACE,
-    omni.kit.capture.viewport.CaptureRenderPreset.RAY_TRACE,
-)
+# CAPTURE_RANGE_TYPES and CAPTURE_RENDER_PRESET are defined by the capture settings widget, so that importing the
+# parameters does not load omni.kit.capture.viewport
 
 """Replay Trajectories"""
 # default_file_path = os.path.join(os.path.abspath(__file__), "..", "..", "..", "..", "data", "example_data_file.json")
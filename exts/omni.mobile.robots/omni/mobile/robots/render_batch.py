@@ -0,0 +1,160 @@
+"""
+| File: render_batch.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Headless worker rendering one batch of frames of a stage, started by the LocalFarmClient
+
+Usage (from the Isaac Sim python, with exts/omni.mobile.robots in the python path):
+    python -m omni.mobile.robots.render_batch --usd-file scene.usd --settings batch.json --gpu 1
+"""
+
+__all__ = ["main", "parse_args", "run_capture", "get_num_frames", "count_written_frames"]
+
+import os
+import sys
+import json
+import enum
+import time
+import argparse
+from omni.mobile.robots.app_utils import enable_extensions, run_until_complete
+from omni.mobile.robots.params import LOCAL_FARM_SETTINGS
+
+# Extensions of the capture, which a bare SimulationApp does not enable
+REQUIRED_EXTENSIONS = ["omni.kit.capture.viewport"]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m omni.mobile.robots.render_batch", description="Render one batch of frames of a stage"
+    )
+    parser.add_argument("--usd-file", required=True, help="Stage to render")
+    parser.add_argument("--settings", required=True, help="Json file of the capture options of the batch")
+    parser.add_argument("--gpu", type=int, default=None, help="GPU to render on, the default one of Kit otherwise")
+    parser.add_argument(
+        "--start-delay", type=float, default=0.0, help="Seconds to wait after opening the stage, for shaders and textures"
+    )
+    parser.add_argument(
+        "--frame-timeout",
+        type=float,
+        default=LOCAL_FARM_SETTINGS["frame_timeout"],
+        help="Seconds without a new frame after which the batch fails, 0 to wait forever",
+    )
+    return parser.parse_args(argv)
+
+
+def get_num_frames(render_settings: dict) -> int:
+    """Number of frames of a batch: one every capture_every_Nth_frames frames from start_frame to end_frame"""
+    step = max(1, render_settings.get("capture_every_Nth_frames", 1))
+    return len(range(render_settings["start_frame"], render_settings["end_frame"] + 1, step))
+
+
+def count_written_frames(output_folder: str) -> int:
+    """Number of files in the output folder of a batch, which only holds the frames of the batch"""
+    return sum(len(file_names) for _, _, file_names in os.walk(output_folder))
+
+
+def _apply_render_settings(options, render_settings: dict):
+    """Set the capture options from their dictionary, as sent to the Farm Queue by CaptureOptions.to_dict"""
+    for key, value in render_settings.items():
+        if not hasattr(options, key):
+            continue
+        current = getattr(options, key)
+        if isinstance(current, enum.Enum):
+            value = type(current)(value)
+        setattr(options, key, value)
+
+
+def run_capture(simulation_app, capture, render_settings: dict, frame_timeout: float, cancelled_status) -> int:
+    """Run the capture until it finishes, is cancelled or stops writing frames
+
+    Args:
+        simulation_app: app updated until the end of the capture
+        capture: CaptureExtension, with its options already set
+        render_settings (dict): capture options of the batch
+        frame_timeout (float): seconds without a new frame after which the batch fails, 0 to wait forever
+        cancelled_status: CaptureStatus of a cancelled capture
+
+    Returns:
+        int: exit code of the worker, 0 once every frame of the batch is written
+    """
+    finished = []
+    capture.capture_finished_fn = lambda *_: finished.append(True)
+
+    start = time.perf_counter()
+    capture.start()
+    # A capture which stops writing frames, or is cancelled, never calls capture_finished_fn
+    output_folder = render_settings["output_folder"]
+    written_frames = 0
+    last_frame_time = last_check_time = start
+    while not finished:
+        simulation_app.update()
+        if capture.progress.capture_status == cancelled_status:
+            print("render_batch: the capture was cancelled")
+            return 1
+        now = time.perf_counter()
+        if now - last_check_time < 1.0:
+            continue
+        last_check_time = now
+        frames = count_written_frames(output_folder)
+        if frames != written_frames:
+            written_frames, last_frame_time = frames, now
+        elif frame_timeout > 0.0 and now - last_frame_time > frame_timeout:
+            print(f"render_batch: no new frame in {frame_timeout:.0f} s, giving up after {frames} frames")
+            capture.cancel()
+            return 1
+
+    # A batch missing frames fails, so its partial frames are not merged into the output
+    num_frames = get_num_frames(render_settings)
+    written_frames = count_written_frames(output_folder)
+    if written_frames < num_frames:
+        print(f"render_batch: {written_frames} of {num_frames} frames were written")
+        return 2
+    print(
+        f"render_batch: frames {render_settings['start_frame']}-{render_settings['end_frame']} "
+        f"in {time.perf_counter() - start:.1f} s"
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    with open(args.settings) as settings_file:
+        render_settings = json.load(settings_file)
+
+    # SimulationApp must be started before anything from omni or pxr is imported
+    from omni.isaac.kit import SimulationApp
+
+    config = {"headless": True}
+    if args.gpu is not None:
+        config.update({"active_gpu": args.gpu, "physics_gpu": args.gpu, "multi_gpu": False})
+    simulation_app = SimulationApp(config)
+    try:
+        enable_extensions(REQUIRED_EXTENSIONS)
+
+        import omni.usd
+        import omni.kit.capture.viewport
+
+        result, error = run_until_complete(simulation_app, omni.usd.get_context().open_stage_async(args.usd_file))
+        if not result:
+            print(f"render_batch: could not open {args.usd_file}: {error}")
+            return 1
+
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.start_delay:
+            simulation_app.update()
+
+        capture = omni.kit.capture.viewport.CaptureExtension.get_instance()
+        _apply_render_settings(capture.options, render_settings)
+        return run_capture(
+            simulation_app,
+            capture,
+            render_settings,
+            args.frame_timeout,
+            cancelled_status=omni.kit.capture.viewport.CaptureStatus.CANCELLED,
+        )
+    finally:
+        simulation_app.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+| File: run.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Headless entry point which loads an environment and a robot and steps the simulation, without any UI
+
+Usage (from the Isaac Sim python, with exts/omni.mobile.robots in the python path):
+    python -m omni.mobile.robots.run --env Simple_Warehouse/warehouse.usd --robot Husky --steps 1000
+"""
+
+__all__ = ["main", "parse_args"]
+
+import sys
+import time
+import argparse
+from omni.mobile.robots.app_utils import enable_extensions, get_env_url, run_until_complete
+
+# Extensions which are required by the simulation logic, but are not part of the default SimulationApp experience:
+# the viewport capture, and the render products of the multi camera capture of --capture
+REQUIRED_EXTENSIONS = ["omni.kit.capture.viewport", "omni.replicator.core"]
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m omni.mobile.robots.run", description="Run a Mobile Simulator scenario without the UI"
+    )
+    parser.add_argument(
+        "--env",
+        default="Grid/default_environment.usd",
+        help="Environment, relative to /Isaac/Environments of the asset server, or a full url",
+    )
+    parser.add_argument("--robot", default=None, help="Robot to spawn, one of ROBOT_ENVIRONMENTS")
+    parser.add_argument("--steps", type=int, default=100, help="Number of physics steps to run")
+    parser.add_argument("--gui", action="store_true", help="Open the Isaac Sim window instead of running headless")
+    parser.add_argument("--render", action="store_true", help="Render every step, even when headless")
+    parser.add_argument(
+        "--capture", default=None, metavar="DIR", help="Capture every camera of the World after each step into DIR"
+    )
+    parser.add_argument(
+        "--dataset", action="store_true", help="Write the captured frames into a chunked dataset instead of image files"
+    )
+    return parser.parse_args(argv)
+
+
+def _step_and_capture(
+    simulation_app, session, camera_paths, num_steps: int, output_folder: str, dataset: bool = False
+) -> float:
+    """
+    Step the World and capture the given cameras after each step. A dataset also records the root poses and joint
+    positions of the robots of the session with every frame. Returns the mean duration of a step in seconds
+    """
+    from omni.mobile.robots.logic.capture.frame_dataset import DATASET_FILE_TYPE
+    from omni.mobile.robots.logic.capture.multi_camera_capture import MultiCameraCapture
+    from omni.mobile.robots.logic.capture.robot_metadata import RobotMetadata
+
+    metadata_fn = None
+    if dataset:
+        articulation_paths = [
+            path for robot_path in session.robot_paths for path in RobotMetadata.get_stage_articulations(robot_path)
+        ]
+        if articulation_paths:
+            metadata_fn = RobotMetadata(articulation_paths)
+            print(f"capture: recording the state of {', '.join(articulation_paths)}")
+    capture = MultiCameraCapture(
+        camera_paths,
+        output_folder,
+        file_type=DATASET_FILE_TYPE if dataset else ".png",
+        metadata_fn=metadata_fn,
+    )
+    step_time = 0.0
+    try:
+        for frame in range(num_steps):
+            step_time += session.step(1, render=False)
+            run_until_complete(simulation_app, capture.capture_frame_async(frame))
+    finally:
+        run_until_complete(simulation_app, capture.close_async())
+    print(f"capture: {capture.captured_frames} frames of {len(capture.camera_paths)} cameras in {output_folder}")
+    return step_time / max(1, num_steps)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # SimulationApp must be started before anything from omni or pxr is imported
+    from omni.isaac.kit import SimulationApp
+
+    start = time.perf_counter()
+    simulation_app = SimulationApp({"headless": not args.gui})
+    try:
+        enable_extensions(REQUIRED_EXTENSIONS)
+        simulation_app.update()
+        startup_time = time.perf_counter() - start
+
+        from omni.mobile.robots.logic.world.world_session import WorldSession
+
+        session = WorldSession(use_world_pool=False)
+
+        start = time.perf_counter()
+        run_until_complete(simulation_app, session.create_world_async())
+        run_until_complete(simulation_app, session.load_env_async(get_env_url(args.env)))
+        if args.robot is not None:
+            session.spawn_robot(args.robot)
+        run_until_complete(simulation_app, session.world.reset_async())
+        load_time = time.perf_counter() - start
+
+        if args.capture is None:
+            step_time = session.step(args.steps, render=args.gui or args.render)
+        else:
+            from omni.mobile.robots.logic.capture.multi_camera_capture import MultiCameraCapture
+
+            camera_paths = MultiCameraCapture.get_stage_cameras("/World")
+            if not camera_paths:
+                print(f"capture: no camera under /World in {args.env}, nothing to capture into {args.capture}")
+                session.clear()
+                return 1
+            step_time = _step_and_capture(
+                simulation_app, session, camera_paths, args.steps, args.capture, args.dataset
+            )
+
+        print(f"startup: {startup_time:.3f} s, load: {load_time:.3f} s, "
+              f"steps: {args.steps} x {step_time * 1000.0:.3f} ms")
+        session.clear()
+    finally:
+        simulation_app.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,24 @@
-from .test_hello_world import *
\ No newline at end of file
+from .test_extension import *
+from .test_startup import *
+from .test_frame_partition import *
+from .test_farm_client import *
+from .test_farm_job_tracker import *
+from .test_local_farm import *
+from .test_capture_resume import *
+from .test_frame_writer import *
+from .test_frame_dataset import *
+from .test_video_stream import *
+from .test_benchmark import *
+from .test_vehicle_batch import *
+from .test_joint_controller import *
+from .test_robot_spawner import *
+from .test_lidar import *
+from .test_odometry import *
+from .test_prim_index import *
+from .test_scene_cloner import *
+from .test_xform_utils import *
+from .test_world_pool import *
+from .test_env_loader import *
+from .test_asset_cache import *
+from .test_multi_camera_capture import *
+from .test_robot_metadata import *
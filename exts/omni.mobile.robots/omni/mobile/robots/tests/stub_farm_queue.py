@@ -0,0 +1,148 @@
+"""
+| File: stub_farm_queue.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: In-process Omniverse Farm Queue with configurable latency and failures, to test large dispatches quickly
+"""
+
+__all__ = ["StubFarmQueue"]
+
+import uuid
+import random
+import asyncio
+from typing import Any, Dict, List, Optional
+
+
+class _Endpoint:
+    """Attribute access builds the endpoint path, like omni.services.client.AsyncClient does"""
+
+    def __init__(self, queue: "StubFarmQueue", path: str):
+        self._queue = queue
+        self._path = path
+
+    def __getattr__(self, name: str) -> "_Endpoint":
+        return _Endpoint(self._queue, f"{self._path}/{name}")
+
+    async def __call__(self, **kwargs) -> Any:
+        return await self._queue.handle(self._path, kwargs)
+
+
+class _StubClient:
+    def __init__(self, queue: "StubFarmQueue", uri: str):
+        self._queue = queue
+        self.uri = uri
+
+    def __getattr__(self, name: str) -> _Endpoint:
+        return _Endpoint(self._queue, f"/{name}")
+
+    async def stop_async(self):
+        self._queue.closed_clients += 1
+
+
+class StubFarmQueue:
+    """
+    Farm Queue answering the management endpoints used by the capture widgets. Every request waits `latency` seconds,
+    and a fraction of the task submissions fail: some before the task is queued (a refused connection), the others
+    after it (the response is lost). Like the Farm Queue, tasks are not deduplicated: a task submitted twice is queued
+    twice, whatever its idempotency key.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.01,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        settings: Dict = None,
+        bulk_list: bool = True,
+        lost_fraction: float = 0.5,
+        list_metadata: bool = True,
+    ):
+        self.latency = latency
+        # Whether /tasks/list filters by task_ids, else it rejects them like a queue without that filter
+        self.bulk_list = bulk_list
+        self.failure_rate = failure_rate
+        # Fraction of the failed submissions whose task is queued before the response is lost
+        self.lost_fraction = lost_fraction
+        # Whether /tasks/list returns the metadata of the tasks
+        self.list_metadata = list_metadata
+        # Fails /tasks/list with the given exception when set
+        self.list_error: Optional[Exception] = None
+        self.settings = settings or {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.task_statuses: Dict[str, Dict[str, Any]] = {}
+        self.submit_calls = 0
+        self.requests: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.created_clients = 0
+        self.closed_clients = 0
+        self._random = random.Random(seed)
+
+    def client_factory(self, uri: str) -> _StubClient:
+        self.created_clients += 1
+        return _StubClient(self, uri)
+
+    async def handle(self, path: str, kwargs: Dict[str, Any]) -> Any:
+        self.requests[path] = self.requests.get(path, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if path == "/tasks/submit":
+                return self._submit(kwargs)
+            if path == "/queue/settings/get":
+                return {"settings": self.settings}
+            if path == "/tasks/list":
+                return {"tasks": self._list(kwargs)}
+            if path == "/tasks/get":
+                return self.task_statuses[kwargs["task_id"]]
+            if path == "/jobs/load/get":
+                return {"create-render": {}}
+            if path in ("/dashboard/get", "/ui/get"):
+                return {}
+            raise ValueError(f"Unknown endpoint {path}")
+        finally:
+            self.in_flight -= 1
+
+    def set_task_status(self, task_id: str, status: str, progress: Optional[float] = 0.0):
+        self.task_statuses[task_id] = {"task_id": task_id, "status": status}
+        if progress is not None:
+            self.task_statuses[task_id]["progress"] = progress
+
+    def get_queued_keys(self) -> List[str]:
+        """Idempotency keys of the queued tasks, once per queued task"""
+        return [task.get("metadata", {}).get("idempotency_key") for task in self.tasks.values()]
+
+    def _list(self, kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self.list_error is not None:
+            raise self.list_error
+        if "task_ids" in kwargs and not self.bulk_list:
+            raise ValueError("Stub farm queue: unknown argument task_ids")
+        task_ids = kwargs.get("task_ids", list(self.tasks.keys()))
+        batch_id = kwargs.get("metadata", {}).get("batches", {}).get("batch_id")
+        tasks = []
+        for task_id in task_ids:
+            if task_id not in self.task_statuses:
+                continue
+            metadata = self.tasks[task_id].get("metadata", {})
+            if batch_id is not None and metadata.get("batches", {}).get("batch_id") != batch_id:
+                continue
+            task = dict(self.task_statuses[task_id])
+            if self.list_metadata:
+                task["metadata"] = metadata
+            tasks.append(task)
+        return tasks
+
+    def _submit(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        self.submit_calls += 1
+        fail = self._random.random() < self.failure_rate
+        if fail and self._random.random() >= self.lost_fraction:
+            raise ConnectionRefusedError("Stub farm queue: connection refused")
+
+        task_id = str(uuid.uuid4())
+        self.tasks[task_id] = task
+        self.set_task_status(task_id, "submitted")
+
+        if fail:
+            raise TimeoutError("Stub farm queue: response lost")
+        return {"task_id": task_id}
@@ -0,0 +1,180 @@
+import os
+import asyncio
+import tempfile
+import omni.client
+import omni.kit.test
+from unittest import mock
+from pxr import Sdf
+
+from omni.mobile.robots.logic.world.asset_cache import AssetCache
+
+TEXTURE = b"\x89PNG" + bytes(range(256)) * 4
+
+
+def _write_file(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _write_layer(path: str, reference: str = None, textures=()) -> str:
+    """Layer with a prim referencing another layer, and an asset attribute per texture"""
+    layer = Sdf.Layer.CreateNew(path)
+    prim = Sdf.CreatePrimInLayer(layer, "/Root")
+    prim.specifier = Sdf.SpecifierDef
+    if reference is not None:
+        prim.referenceList.Prepend(Sdf.Reference(reference))
+    for index, texture in enumerate(textures):
+        attribute = Sdf.AttributeSpec(prim, f"texture_{index}", Sdf.ValueTypeNames.Asset)
+        attribute.default = Sdf.AssetPath(texture)
+    layer.defaultPrim = "Root"
+    layer.Save()
+    return layer.identifier
+
+
+def _get_asset_paths(path: str):
+    """Reference then textures of the layer written by _write_layer"""
+    layer = Sdf.Layer.OpenAsAnonymous(path)
+    prim = layer.GetPrimAtPath("/Root")
+    references = [reference.assetPath for reference in prim.referenceList.prependedItems]
+    return references + [prim.attributes[name].default.path for name in sorted(prim.attributes.keys())]
+
+
+class TestAssetCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        # The "server" is a local folder, which omni.client reads like any other url
+        self._folder = tempfile.TemporaryDirectory()
+        self._server = os.path.join(self._folder.name, "server")
+        self._cache_path = os.path.join(self._folder.name, "cache")
+        _write_file(os.path.join(self._server, "textures", "wall.png"), TEXTURE)
+        _write_file(os.path.join(self._server, "textures", "wall_copy.png"), TEXTURE)
+        _write_layer(os.path.join(self._server, "props", "prop.usda"), textures=["../textures/wall.png"])
+        self._root_url = _write_layer(
+            os.path.join(self._server, "root.usda"),
+            reference="./props/prop.usda",
+            textures=["./textures/wall.png", "./textures/wall_copy.png"],
+        )
+        self._reads = []
+        self._read_file_async = omni.client.read_file_async
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    async def _counting_read_async(self, url: str):
+        self._reads.append(url)
+        return await self._read_file_async(url)
+
+    async def _fetch_async(self, cache: AssetCache, url: str) -> str:
+        with mock.patch.object(omni.client, "read_file_async", self._counting_read_async):
+            return await cache.fetch_async(url)
+
+    def _get_object_files(self):
+        objects_path = os.path.join(self._cache_path, "objects")
+        return [os.path.join(root, name) for root, _, names in os.walk(objects_path) for name in names]
+
+    async def test_fetch_rewrites_asset_paths(self):
+        cache = AssetCache(self._cache_path)
+        local_root = await self._fetch_async(cache, self._root_url)
+
+        self.assertTrue(local_root.startswith(self._cache_path))
+        self.assertEqual(len(self._reads), 4)
+        # Every asset path of the cached layers points to a cached file
+        asset_paths = _get_asset_paths(local_root)
+        self.assertEqual(len(asset_paths), 3)
+        for asset_path in asset_paths:
+            self.assertTrue(asset_path.startswith(self._cache_path), asset_path)
+            self.assertTrue(os.path.isfile(asset_path))
+        local_prop = next(path for path in asset_paths if path.endswith(".usda"))
+        local_texture = _get_asset_paths(local_prop)[0]
+        self.assertIn(local_texture, asset_paths)
+
+    async def test_same_content_stored_once(self):
+        cache = AssetCache(self._cache_path)
+        local_root = await self._fetch_async(cache, self._root_url)
+
+        # wall.png and wall_copy.png are two entries of one file
+        textures = [path for path in _get_asset_paths(local_root) if path.endswith(".png")]
+        self.assertEqual(len(textures), 2)
+        self.assertEqual(textures[0], textures[1])
+        self.assertEqual(len(self._get_object_files()), 3)
+        self.assertEqual(cache.size, sum(os.path.getsize(path) for path in self._get_object_files()))
+
+    async def test_cached_entries_are_not_read_again(self):
+        local_root = await self._fetch_async(AssetCache(self._cache_path), self._root_url)
+        self._reads.clear()
+
+        # A new cache, e.g. of the next session, validates the entries of the index with a stat only
+        self.assertEqual(await self._fetch_async(AssetCache(self._cache_path), self._root_url), local_root)
+        self.assertEqual(self._reads, [])
+
+    async def test_changed_size_or_time_drops_the_dependents(self):
+        local_root = await self._fetch_async(AssetCache(self._cache_path), self._root_url)
+        texture_path = os.path.join(self._server, "textures", "wall.png")
+
+        # Same size, newer modification time
+        _write_file(texture_path, TEXTURE[::-1])
+        stat = os.stat(texture_path)
+        os.utime(texture_path, (stat.st_atime, stat.st_mtime + 10.0))
+        cache = AssetCache(self._cache_path)
+        # The texture, the prop and the root which depend on it
+        self.assertEqual(await cache.validate_async(), 3)
+
+        # Different size: the texture and its dependents are read again, the untouched copy is not
+        _write_file(texture_path, TEXTURE * 2)
+        self._reads.clear()
+        new_root = await self._fetch_async(AssetCache(self._cache_path), self._root_url)
+        self.assertNotEqual(new_root, local_root)
+        self.assertEqual(len(self._reads), 3)
+        self.assertNotIn(os.path.join(self._server, "textures", "wall_copy.png"), self._reads)
+        contents = []
+        for path in _get_asset_paths(new_root):
+            with open(path, "rb") as f:
+                contents.append(f.read())
+        self.assertIn(TEXTURE * 2, contents)
+        self.assertIn(TEXTURE, contents)
+
+    async def test_lru_eviction_keeps_pinned_entries(self):
+        urls = []
+        for index in range(3):
+            path = os.path.join(self._server, "textures", f"texture_{index}.png")
+            _write_file(path, bytes([index]) * 100)
+            urls.append(path)
+
+        cache = AssetCache(self._cache_path, max_size=250)
+        local_paths = [await self._fetch_async(cache, url) for url in urls[:2]]
+        self.assertTrue(all(os.path.isfile(path) for path in local_paths))
+
+        # The third texture is pinned by its own fetch, the least recently used one goes
+        local_paths.append(await self._fetch_async(cache, urls[2]))
+        self.assertEqual([os.path.isfile(path) for path in local_paths], [False, True, True])
+
+        # Using the second texture again makes the third one the least recently used, but it is pinned
+        await self._fetch_async(cache, urls[1])
+        cache = AssetCache(self._cache_path, max_size=100)
+        self.assertEqual(cache.evict(pinned={urls[2]}), 1)
+        self.assertEqual([os.path.isfile(path) for path in local_paths], [False, False, True])
+        self.assertLessEqual(cache.size, 100)
+
+    async def test_dependencies_read_concurrently(self):
+        textures = []
+        for index in range(6):
+            _write_file(os.path.join(self._server, "many", f"texture_{index}.png"), bytes([index]) * 10)
+            textures.append(f"./texture_{index}.png")
+        url = _write_layer(os.path.join(self._server, "many", "many.usda"), textures=textures)
+
+        running, max_running = [0], [0]
+
+        async def _slow_read_async(read_url: str):
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return await self._read_file_async(read_url)
+
+        cache = AssetCache(self._cache_path, max_downloads=2)
+        with mock.patch.object(omni.client, "read_file_async", _slow_read_async):
+            local_path = await cache.fetch_async(url)
+        self.assertEqual(max_running[0], 2)
+        self.assertEqual(len(set(_get_asset_paths(local_path))), 6)
+        # No temporary file is left behind
+        self.assertEqual(os.listdir(os.path.join(self._cache_path, "tmp")), [])
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import omni.kit.test
+
+from omni.mobile.robots.benchmark import (
+    BenchmarkCase,
+    BenchmarkResult,
+    ResourceSampler,
+    compare_reports,
+    get_benchmark_cases,
+    make_report,
+    read_report,
+    write_report,
+)
+
+ENVS = ["Grid/default_environment.usd", "Simple_Room/simple_room.usd"]
+
+
+def _result(case: BenchmarkCase, fps: float, time_to_first_frame: float = 1.0, error: str = None) -> BenchmarkResult:
+    if error is not None:
+        return BenchmarkResult(case, 0, None, None, None, None, None, None, error=error)
+    return BenchmarkResult(case, 60, fps, time_to_first_frame, 60 / fps, 0.005, 2 << 30, None)
+
+
+class TestBenchmark(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._cases = get_benchmark_cases(ENVS, ["480p", "720p"], ["RAY_TRACE"], [".png", ".mp4"])
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    async def test_cases_are_grouped_by_environment(self):
+        self.assertEqual(len(self._cases), 8)
+        self.assertEqual(len({case.name for case in self._cases}), 8)
+        self.assertEqual([case.env for case in self._cases], [ENVS[0]] * 4 + [ENVS[1]] * 4)
+
+    async def test_unknown_presets(self):
+        with self.assertRaises(ValueError):
+            get_benchmark_cases(ENVS, ["8k"], ["RAY_TRACE"], [".png"])
+        with self.assertRaises(ValueError):
+            get_benchmark_cases(ENVS, ["720p"], ["IRAY"], [".png"])
+
+    async def test_report_round_trip(self):
+        path = os.path.join(self._folder.name, "reports", "benchmark.json")
+        results = [_result(self._cases[0], 30.0), _result(self._cases[1], 0.0, error="no encoder")]
+        write_report(path, make_report(results, {"label": "1.0.0"}))
+
+        report = read_report(path)
+        self.assertEqual(report["metadata"], {"label": "1.0.0"})
+        self.assertEqual(report["results"][0]["name"], self._cases[0].name)
+        self.assertEqual(report["results"][0]["resolution"], "480p")
+        self.assertEqual(report["results"][0]["fps"], 30.0)
+        self.assertIsNone(report["results"][0]["peak_vram"])
+        self.assertEqual(report["results"][1]["error"], "no encoder")
+
+    async def test_regressions(self):
+        baseline = make_report([_result(case, 30.0) for case in self._cases[:3]])
+        report = make_report(
+            [
+                # Within the tolerance
+                _result(self._cases[0], 28.0),
+                # Slower, and a slower first frame
+                _result(self._cases[1], 20.0, time_to_first_frame=2.0),
+                _result(self._cases[2], 0.0, error="no encoder"),
+                # Not in the baseline
+                _result(self._cases[3], 1.0),
+            ]
+        )
+        regressions = compare_reports(baseline, report, tolerance=0.1)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith(f"{self._cases[1].name}: fps"))
+        self.assertTrue(regressions[1].startswith(f"{self._cases[1].name}: time_to_first_frame"))
+        self.assertTrue(regressions[2].startswith(f"{self._cases[2].name}: failed"))
+        self.assertEqual(compare_reports(baseline, baseline, tolerance=0.1), [])
+
+    async def test_resource_sampler(self):
+        sampler = ResourceSampler()
+        sampler.sample()
+        self.assertGreater(sampler.peak_rss, 0)
+        sampler.reset()
+        self.assertIsNone(sampler.peak_rss)
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import omni.kit.test
+
+from omni.mobile.robots.ui.widgets.scene_capture.utils.capture_resume import (
+    plan_resume,
+    scan_output_frames,
+    write_capture_manifest,
+)
+
+
+class TestCaptureResume(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._output = self._folder.name
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _write_frame(self, frame: int, size: int = 100, file_name: str = "capture"):
+        with open(os.path.join(self._output, f"{file_name}.{frame:04d}.png"), "wb") as frame_file:
+            frame_file.write(b"x" * size)
+
+    async def test_scan_matches_capture_frames_only(self):
+        self._write_frame(1)
+        self._write_frame(2, size=10)
+        self._write_frame(3, file_name="other")
+        open(os.path.join(self._output, "capture.0004.png.tmp"), "w").close()
+
+        frames = scan_output_frames(self._output, "capture", ".png")
+        self.assertEqual(frames, {1: ("capture.0001.png", 100), 2: ("capture.0002.png", 10)})
+
+    async def test_missing_and_bad_frames(self):
+        for frame in range(0, 20):
+            if frame not in (4, 5, 13):
+                self._write_frame(frame, size=10 if frame == 9 else 100)
+
+        plan = plan_resume(self._output, "capture", ".png", 0, 19, min_frame_size=50)
+        self.assertEqual(plan.missing_frames, [4, 5, 9, 13])
+        self.assertEqual(plan.bad_files, ["capture.0009.png"])
+        self.assertEqual(plan.valid_frames, 16)
+        self.assertEqual(plan.span, (4, 13))
+
+        plan = plan_resume(self._output, "capture", ".png", 0, 19, step=2, min_frame_size=50)
+        self.assertEqual(plan.missing_frames, [4])
+
+    async def test_complete_range(self):
+        for frame in range(5):
+            self._write_frame(frame)
+        plan = plan_resume(self._output, "capture", ".png", 0, 4)
+        self.assertIsNone(plan.span)
+        self.assertEqual(plan.valid_frames, 5)
+
+    async def test_missing_output_folder(self):
+        plan = plan_resume(os.path.join(self._output, "missing"), "capture", ".png", 0, 2)
+        self.assertEqual(plan.missing_frames, [0, 1, 2])
+
+    async def test_manifest_is_reused_until_frames_change(self):
+        for frame in range(10):
+            self._write_frame(frame)
+
+        self.assertFalse(plan_resume(self._output, "capture", ".png", 0, 19).from_manifest)
+        plan = plan_resume(self._output, "capture", ".png", 0, 19)
+        self.assertTrue(plan.from_manifest)
+        self.assertEqual(plan.missing_frames, list(range(10, 20)))
+
+        # A new frame makes the manifest stale, the folder is scanned again
+        self._write_frame(10)
+        # File systems with a coarse clock may not move the folder time within the test
+        os.utime(self._output, ns=(0, 1))
+        plan = plan_resume(self._output, "capture", ".png", 0, 19)
+        self.assertFalse(plan.from_manifest)
+        self.assertEqual(plan.missing_frames, list(range(11, 20)))
+
+        # Written at the end of a capture, the manifest makes the next plan skip the scan
+        self._write_frame(11)
+        write_capture_manifest(self._output, "capture", ".png")
+        plan = plan_resume(self._output, "capture", ".png", 0, 19)
+        self.assertTrue(plan.from_manifest)
+        self.assertEqual(plan.missing_frames, list(range(12, 20)))
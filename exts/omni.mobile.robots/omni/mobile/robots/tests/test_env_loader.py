@@ -0,0 +1,123 @@
+import os
+import asyncio
+import tempfile
+import omni.kit.test
+from pxr import Sdf, Usd, UsdGeom
+
+from omni.mobile.robots.logic.world.env_loader import EnvironmentLoader
+
+STAGE_PREFIX = "/World/Environment"
+
+
+def _write_environment(folder: str) -> str:
+    """Root layer with a sublayer, a reference and a missing payload, as files of a local folder"""
+    for name, type_name in [("sub.usda", "Cube"), ("ref.usda", "Sphere")]:
+        layer = Sdf.Layer.CreateNew(os.path.join(folder, name))
+        prim = Sdf.CreatePrimInLayer(layer, "/Root")
+        prim.specifier = Sdf.SpecifierDef
+        prim.typeName = type_name
+        layer.defaultPrim = "Root"
+        layer.Save()
+
+    root = Sdf.Layer.CreateNew(os.path.join(folder, "root.usda"))
+    root.subLayerPaths.append("./sub.usda")
+    stage = Usd.Stage.Open(root)
+    UsdGeom.Xform.Define(stage, "/Root").GetPrim().GetReferences().AddReference("./ref.usda")
+    stage.DefinePrim("/Root/Missing").GetPayloads().AddPayload("./missing.usda")
+    stage.SetDefaultPrim(stage.GetPrimAtPath("/Root"))
+    root.Save()
+    return root.identifier
+
+
+class TestEnvLoader(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._root_path = _write_environment(self._folder.name)
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.Xform.Define(self._stage, "/World")
+        self._progress = []
+        self._loader = EnvironmentLoader(progress_fn=self._progress.append)
+
+    async def tearDown(self):
+        self._loader = None
+        self._stage = None
+        self._folder.cleanup()
+
+    def _get_path(self, name: str) -> str:
+        return os.path.join(self._folder.name, name)
+
+    async def test_load(self):
+        prim = await self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+
+        self.assertEqual(prim.GetPath(), STAGE_PREFIX)
+        self.assertTrue(self._stage.GetPrimAtPath(f"{STAGE_PREFIX}/Missing"))
+        self.assertFalse(self._loader.is_loading)
+        # The missing payload is skipped, the layers which were opened are kept alive
+        layer_paths = {layer.realPath for layer in self._loader.layers}
+        self.assertEqual(layer_paths, {self._root_path, self._get_path("sub.usda"), self._get_path("ref.usda")})
+        file_sizes = sum(os.path.getsize(path) for path in layer_paths)
+        self.assertEqual(self._loader.footprint, file_sizes)
+        self.assertEqual(set(self._loader.timings), {"resolve", "prefetch", "compose"})
+
+    async def test_progress(self):
+        await self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+
+        # Every phase starts at 0
+        phases = [progress.phase for progress in self._progress if progress.completed == 0]
+        self.assertEqual(phases, ["resolve", "prefetch", "compose"])
+        resolved = [progress for progress in self._progress if progress.phase == EnvironmentLoader.PHASE_RESOLVE]
+        self.assertEqual((resolved[-1].completed, resolved[-1].total, resolved[-1].layer), (1, 1, self._root_path))
+
+        # The prefetch reports every layer it opened, out of the layers found so far
+        prefetched = [
+            (progress.completed, progress.total, progress.layer)
+            for progress in self._progress
+            if progress.phase == EnvironmentLoader.PHASE_PREFETCH and progress.completed > 0
+        ]
+        self.assertEqual(prefetched[0], (1, 4, self._root_path))
+        self.assertEqual([(completed, total) for completed, total, _ in prefetched[1:]], [(2, 4), (3, 4)])
+        dependencies = {self._get_path("sub.usda"), self._get_path("ref.usda")}
+        self.assertEqual({layer for _, _, layer in prefetched[1:]}, dependencies)
+
+        last = self._progress[-1]
+        self.assertEqual((last.phase, last.completed, last.total, last.layer), ("compose", 1, 1, self._root_path))
+
+    async def test_cancel_while_loading(self):
+        cancelled = []
+
+        def _cancel_on_prefetch(progress):
+            # The second click of the Load Scene button, once the layers are being read
+            if progress.phase == EnvironmentLoader.PHASE_PREFETCH and not cancelled:
+                self.assertTrue(self._loader.is_loading)
+                with self.assertRaises(Exception):
+                    self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+                cancelled.append(self._loader.cancel())
+
+        self._loader = EnvironmentLoader(progress_fn=_cancel_on_prefetch)
+        with self.assertRaises(asyncio.CancelledError):
+            await self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+        self.assertFalse(self._loader.is_loading)
+        self.assertFalse(self._loader.cancel())
+        self.assertFalse(self._stage.GetPrimAtPath(STAGE_PREFIX))
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(self._loader.layers, [])
+
+        # The next click loads the environment again
+        prim = await self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+        self.assertEqual(prim.GetPath(), STAGE_PREFIX)
+
+    async def test_errors(self):
+        with self.assertRaises(Exception):
+            await self._loader.start(self._stage, "", STAGE_PREFIX)
+        with self.assertRaises(Exception):
+            await self._loader.start(self._stage, os.path.join(self._folder.name, "unknown.usda"), STAGE_PREFIX)
+
+        # A primitive is already at the path: the layers of the failed load are released
+        self._stage.DefinePrim(STAGE_PREFIX)
+        with self.assertRaises(Exception):
+            await self._loader.start(self._stage, self._root_path, STAGE_PREFIX)
+        self.assertFalse(self._loader.is_loading)
+        self.assertEqual(self._loader.layers, [])
+        self.assertEqual(self._loader.footprint, 0)
+        # Nothing is left to cancel
+        self.assertFalse(self._loader.cancel())
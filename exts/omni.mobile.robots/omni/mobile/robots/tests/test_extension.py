@@ -0,0 +1,25 @@
+import omni.kit.app
+import omni.kit.test
+import omni.kit.ui_test as ui_test
+
+# Imported with its absolute path, as another extension would
+import omni.mobile.robots
+
+
+class TestExtension(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        pass
+
+    async def tearDown(self):
+        pass
+
+    async def test_extension_is_enabled(self):
+        extension_manager = omni.kit.app.get_app().get_extension_manager()
+        self.assertTrue(extension_manager.is_extension_enabled("omni.mobile.robots"))
+        self.assertTrue(hasattr(omni.mobile.robots, "MobileExtension"))
+
+    async def test_window_is_built(self):
+        await omni.kit.app.get_app().next_update_async()
+        window = ui_test.find("Mobile Simulator")
+        self.assertIsNotNone(window)
+        self.assertTrue(window.window.visible)
@@ -0,0 +1,208 @@
+import time
+import asyncio
+import omni.kit.test
+
+from omni.mobile.robots.ui.widgets.scene_capture.utils import farm_client
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_client import (
+    FarmClientPool,
+    FarmSubmitError,
+    get_farm_client,
+    get_farm_client_pool,
+    release_farm_client_pool,
+    submit_tasks_async,
+)
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_queue_utils import (
+    get_farm_job_templates,
+    get_farm_queue_settings,
+    invalidate_farm_queue_settings,
+)
+from omni.mobile.robots.ui.widgets.scene_capture.utils.ttl_cache import TTLCache
+from .stub_farm_queue import StubFarmQueue
+
+FARM_URL = "http://localhost:8222/queue/management"
+NUM_TASKS = 500
+
+
+def _make_tasks(num_tasks: int, batch_id: str = "batch"):
+    return [
+        {
+            "user": "test",
+            "task_type": "create-render",
+            "task_function": "render.run",
+            "task_function_args": {"render_settings": {"start_frame": index, "end_frame": index}},
+            "metadata": {"batches": {"batch_id": batch_id, "index": index}, "idempotency_key": f"{batch_id}:{index}"},
+        }
+        for index in range(num_tasks)
+    ]
+
+
+class TestFarmClient(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._queue = StubFarmQueue(latency=0.01)
+        get_farm_client_pool().set_client_factory(self._queue.client_factory)
+        invalidate_farm_queue_settings()
+
+    async def tearDown(self):
+        await get_farm_client_pool().close_async()
+        get_farm_client_pool().set_client_factory(None)
+        invalidate_farm_queue_settings()
+
+    async def test_clients_are_shared(self):
+        self.assertIs(get_farm_client(FARM_URL), get_farm_client(FARM_URL))
+        self._queue.settings = {"advanced_rendering_features": {}}
+        for _ in range(3):
+            self.assertEqual(await get_farm_queue_settings(FARM_URL), self._queue.settings)
+        self.assertEqual(self._queue.created_clients, 1)
+
+    async def test_settings_requests_are_coalesced(self):
+        self._queue.settings = {"advanced_rendering_features": {"ui_should_upload": "true"}}
+        results = await asyncio.gather(*[get_farm_queue_settings(FARM_URL) for _ in range(10)])
+        self.assertTrue(all(result == self._queue.settings for result in results))
+        self.assertEqual(self._queue.requests["/queue/settings/get"], 1)
+
+        # Cached until invalidated, e.g. when the farm combo changes
+        await get_farm_queue_settings(FARM_URL)
+        self.assertEqual(self._queue.requests["/queue/settings/get"], 1)
+        invalidate_farm_queue_settings(FARM_URL)
+        await get_farm_queue_settings(FARM_URL)
+        self.assertEqual(self._queue.requests["/queue/settings/get"], 2)
+
+    async def test_job_templates_are_cached(self):
+        for _ in range(3):
+            self.assertIn("create-render", await get_farm_job_templates("http://localhost:8222", "/queue/management"))
+        self.assertEqual(self._queue.requests["/jobs/load/get"], 1)
+
+    async def test_ttl_cache(self):
+        cache = TTLCache(ttl=0.05)
+        calls = []
+
+        async def _fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        self.assertEqual(await asyncio.gather(*[cache.get_async("key", _fetch) for _ in range(5)]), [1] * 5)
+        self.assertEqual(cache.get("key"), 1)
+        await asyncio.sleep(0.06)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(await cache.get_async("key", _fetch), 2)
+
+        # A value fetched while being invalidated is not stored
+        pending = asyncio.ensure_future(cache.get_async("other", _fetch))
+        await asyncio.sleep(0)
+        cache.invalidate("other")
+        await pending
+        self.assertIsNone(cache.get("other"))
+
+    async def test_failed_settings_are_not_cached(self):
+        self._queue.latency = 0.0
+
+        async def _fail(path, kwargs):
+            raise ConnectionError("down")
+
+        handle = self._queue.handle
+        self._queue.handle = _fail
+        self.assertEqual(await get_farm_queue_settings(FARM_URL), {})
+        self._queue.handle = handle
+        self._queue.settings = {"key": "value"}
+        self.assertEqual(await get_farm_queue_settings(FARM_URL), {"key": "value"})
+
+    async def test_large_dispatch_is_concurrent(self):
+        start = time.perf_counter()
+        results = await submit_tasks_async(get_farm_client(FARM_URL), _make_tasks(NUM_TASKS), max_concurrency=32)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(results), NUM_TASKS)
+        self.assertEqual(len({result["task_id"] for result in results}), NUM_TASKS)
+        self.assertLessEqual(self._queue.max_in_flight, 32)
+        # One task at a time would take NUM_TASKS * latency = 5 s
+        self.assertLess(elapsed, 2.0)
+
+    async def test_failed_submissions_are_retried_once_queued(self):
+        self._queue.failure_rate = 0.2
+        results = await submit_tasks_async(get_farm_client(FARM_URL), _make_tasks(NUM_TASKS), backoff=0.001)
+
+        self.assertEqual(len(results), NUM_TASKS)
+        self.assertGreater(self._queue.submit_calls, NUM_TASKS)
+        # The queue does not deduplicate, the submissions whose response was lost were found in it instead of retried
+        self.assertGreater(self._queue.requests["/tasks/list"], 0)
+        self.assertEqual(sorted(self._queue.get_queued_keys()), sorted(f"batch:{index}" for index in range(NUM_TASKS)))
+        self.assertEqual({result["task_id"] for result in results}, set(self._queue.tasks.keys()))
+
+    async def test_lost_responses_are_not_retried_unchecked(self):
+        # Every response is lost, and the queue does not tell which batch its tasks belong to
+        self._queue.failure_rate = 1.0
+        self._queue.lost_fraction = 1.0
+        self._queue.list_metadata = False
+        with self.assertRaises(FarmSubmitError) as context:
+            await submit_tasks_async(get_farm_client(FARM_URL), _make_tasks(5), backoff=0.001)
+
+        keys = [f"batch:{index}" for index in range(5)]
+        self.assertEqual(sorted(context.exception.uncertain_keys), keys)
+        self.assertEqual(sorted(context.exception.failed_keys), keys)
+        # Every task was queued once, none was submitted a second time
+        self.assertEqual(self._queue.submit_calls, 5)
+        self.assertEqual(sorted(self._queue.get_queued_keys()), keys)
+
+        # Same when the queue cannot be listed at all
+        self._queue.list_metadata = True
+        self._queue.list_error = ConnectionError("down")
+        with self.assertRaises(FarmSubmitError) as context:
+            await submit_tasks_async(get_farm_client(FARM_URL), _make_tasks(5, "other"), backoff=0.001)
+        self.assertEqual(len(context.exception.uncertain_keys), 5)
+        self.assertEqual(self._queue.submit_calls, 10)
+
+    async def test_resubmission_is_idempotent(self):
+        client = get_farm_client(FARM_URL)
+        first = await submit_tasks_async(client, _make_tasks(50))
+        submit_calls = self._queue.submit_calls
+        second = await submit_tasks_async(client, _make_tasks(50))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self._queue.submit_calls, submit_calls)
+
+    async def test_submitted_keys_are_bounded(self):
+        pool = FarmClientPool(self._queue.client_factory, submitted_ttl=0.05, max_submitted=3)
+        for index in range(5):
+            pool.set_submitted(f"key:{index}", {"task_id": index})
+        self.assertIsNone(pool.get_submitted("key:0"))
+        self.assertIsNone(pool.get_submitted("key:1"))
+        self.assertEqual(pool.get_submitted("key:4"), {"task_id": 4})
+        await asyncio.sleep(0.06)
+        self.assertIsNone(pool.get_submitted("key:4"))
+        self.assertEqual(len(pool._submitted), 0)
+
+    async def test_release(self):
+        pool = get_farm_client_pool()
+        get_farm_client(FARM_URL)
+        pool.set_submitted("key", {"task_id": 0})
+        release_farm_client_pool()
+        await asyncio.sleep(0.01)
+
+        self.assertIsNone(farm_client._FARM_CLIENT_POOL)
+        self.assertIsNone(pool.get_submitted("key"))
+        self.assertEqual(self._queue.closed_clients, 1)
+        # The next caller gets a new pool
+        self.assertIsNot(get_farm_client_pool(), pool)
+        get_farm_client_pool().set_client_factory(self._queue.client_factory)
+
+    async def test_gives_up_after_retries(self):
+        # Every connection is refused, so the tasks are surely not queued and are retried
+        self._queue.failure_rate = 1.0
+        self._queue.lost_fraction = 0.0
+        with self.assertRaises(FarmSubmitError) as context:
+            await submit_tasks_async(get_farm_client(FARM_URL), _make_tasks(5), max_retries=2, backoff=0.001)
+        self.assertEqual(sorted(context.exception.failed_keys), [f"batch:{index}" for index in range(5)])
+        self.assertEqual(context.exception.uncertain_keys, [])
+        self.assertEqual(self._queue.submit_calls, 5 * 3)
+        self.assertNotIn("/tasks/list", self._queue.requests)
+
+    async def test_tasks_need_an_idempotency_key(self):
+        tasks = _make_tasks(1)
+        del tasks[0]["metadata"]["idempotency_key"]
+        with self.assertRaises(ValueError):
+            await submit_tasks_async(get_farm_client(FARM_URL), tasks)
+        tasks = _make_tasks(1)
+        del tasks[0]["metadata"]["batches"]
+        with self.assertRaises(ValueError):
+            await submit_tasks_async(get_farm_client(FARM_URL), tasks)
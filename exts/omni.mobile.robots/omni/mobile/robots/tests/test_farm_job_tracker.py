@@ -0,0 +1,132 @@
+import asyncio
+import omni.kit.test
+
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_client import get_farm_client, get_farm_client_pool
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_job_tracker import (
+    QUERY_BATCH,
+    QUERY_EACH_TASK,
+    QUERY_TASK_IDS,
+    FarmJobTracker,
+)
+from .stub_farm_queue import StubFarmQueue
+
+FARM_URL = "http://localhost:8222/queue/management"
+NUM_TASKS = 200
+FRAMES_PER_TASK = 10
+
+
+class TestFarmJobTracker(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._queue = StubFarmQueue(latency=0.0)
+        get_farm_client_pool().set_client_factory(self._queue.client_factory)
+        client = get_farm_client(FARM_URL)
+        submitted = [
+            await client.tasks.submit(metadata={"batches": {"batch_id": "job"}, "idempotency_key": f"job:{index}"})
+            for index in range(NUM_TASKS)
+        ]
+        self._task_ids = [result["task_id"] for result in submitted]
+        self._updates = []
+        self._tracker = FarmJobTracker(
+            client,
+            {task_id: FRAMES_PER_TASK for task_id in self._task_ids},
+            batch_id="job",
+            progress_fn=self._updates.append,
+            min_interval=0.001,
+            max_interval=0.01,
+        )
+
+    async def tearDown(self):
+        self._tracker.stop()
+        get_farm_client_pool().set_client_factory(None)
+
+    async def test_one_bulk_query_per_poll(self):
+        for polls in range(1, 4):
+            await self._tracker.poll_async()
+            self.assertEqual(self._queue.requests["/tasks/list"], polls)
+        self.assertEqual(self._tracker.query_mode, QUERY_TASK_IDS)
+
+    async def test_progress_is_aggregated(self):
+        for task_id in self._task_ids[:50]:
+            self._queue.set_task_status(task_id, "finished")
+        for task_id in self._task_ids[50:60]:
+            self._queue.set_task_status(task_id, "failed")
+        for task_id in self._task_ids[60:80]:
+            self._queue.set_task_status(task_id, "running", progress=0.5)
+
+        progress = await self._tracker.poll_async()
+        self.assertEqual(progress.frames_total, NUM_TASKS * FRAMES_PER_TASK)
+        self.assertEqual(progress.frames_done, 50 * FRAMES_PER_TASK + 20 * FRAMES_PER_TASK // 2)
+        self.assertEqual(progress.tasks_finished, 50)
+        self.assertEqual(progress.tasks_failed, 10)
+        self.assertEqual(progress.tasks_running, 20)
+        self.assertFalse(progress.is_done)
+
+    async def test_falls_back_to_the_batch(self):
+        self._queue.bulk_list = False
+        # A task of another submission is not counted
+        await get_farm_client(FARM_URL).tasks.submit(metadata={"batches": {"batch_id": "other"}})
+        for task_id in self._task_ids[:50]:
+            self._queue.set_task_status(task_id, "finished")
+        for task_id in self._task_ids[50:60]:
+            self._queue.set_task_status(task_id, "running", progress=None)
+
+        for _ in range(3):
+            progress = await self._tracker.poll_async()
+        self.assertEqual(self._tracker.query_mode, QUERY_BATCH)
+        # One rejected query by id, then one query per poll
+        self.assertEqual(self._queue.requests["/tasks/list"], 4)
+        self.assertNotIn("/tasks/get", self._queue.requests)
+        # Without a progress fraction only the finished tasks count
+        self.assertEqual(progress.frames_done, 50 * FRAMES_PER_TASK)
+        self.assertEqual(progress.tasks_running, 10)
+        self.assertEqual(progress.tasks_finished, 50)
+
+    async def test_falls_back_to_one_query_per_task(self):
+        self._queue.bulk_list = False
+        self._queue.list_metadata = False
+        for task_id in self._task_ids[:50]:
+            self._queue.set_task_status(task_id, "finished")
+
+        progress = await self._tracker.poll_async()
+        self.assertEqual(self._tracker.query_mode, QUERY_EACH_TASK)
+        self.assertEqual(self._queue.requests["/tasks/get"], NUM_TASKS)
+        self.assertEqual(progress.frames_done, 50 * FRAMES_PER_TASK)
+
+        # Finished tasks are not queried again
+        await self._tracker.poll_async()
+        self.assertEqual(self._queue.requests["/tasks/list"], 2)
+        self.assertEqual(self._queue.requests["/tasks/get"], 2 * NUM_TASKS - 50)
+
+    async def test_throughput_is_not_negative(self):
+        self._queue.set_task_status(self._task_ids[0], "running", progress=1.0)
+        await self._tracker.poll_async()
+        # The task restarts, its frames are no longer done
+        self._queue.set_task_status(self._task_ids[0], "running", progress=0.0)
+        await asyncio.sleep(0.01)
+        progress = await self._tracker.poll_async()
+        self.assertEqual(progress.frames_per_minute, 0.0)
+        self.assertIsNone(progress.eta)
+
+    async def test_poll_interval_adapts(self):
+        await self._tracker.poll_async()
+        self.assertEqual(self._tracker.interval, 0.001)
+        for _ in range(10):
+            await self._tracker.poll_async()
+        self.assertEqual(self._tracker.interval, 0.01)
+        self.assertEqual(len(self._updates), 1)
+
+        self._queue.set_task_status(self._task_ids[0], "running", progress=0.5)
+        await self._tracker.poll_async()
+        self.assertEqual(self._tracker.interval, 0.001)
+        self.assertEqual(len(self._updates), 2)
+
+    async def test_tracking_stops_when_done(self):
+        task = self._tracker.start()
+        await asyncio.sleep(0.01)
+        for task_id in self._task_ids:
+            self._queue.set_task_status(task_id, "finished")
+        await asyncio.wait_for(task, timeout=1.0)
+
+        self.assertTrue(self._tracker.progress.is_done)
+        self.assertEqual(self._tracker.progress.frames_done, NUM_TASKS * FRAMES_PER_TASK)
+        self.assertEqual(self._updates[-1].frames_done, NUM_TASKS * FRAMES_PER_TASK)
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import numpy as np
+import omni.kit.test
+
+from omni.mobile.robots.logic.capture.frame_dataset import FrameDataset, FrameDatasetWriter
+
+NUM_FRAMES = 37
+
+
+class TestFrameDataset(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._folder.name, "frames.dataset")
+        rng = np.random.default_rng(0)
+        self._images = rng.integers(0, 255, size=(NUM_FRAMES, 24, 32, 4), dtype=np.uint8)
+        self._poses = rng.normal(size=(NUM_FRAMES, 4, 4))
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _get_frame(self, index: int):
+        return {
+            "cam.rgb": self._images[index],
+            "cam.pose": self._poses[index],
+            "timestamp": np.float64(index / 30.0),
+        }
+
+    def _write(self, **kwargs):
+        with FrameDatasetWriter(self._path, attributes={"fps": 30}, **kwargs) as writer:
+            for index in range(NUM_FRAMES):
+                writer.append(100 + index, self._get_frame(index))
+        return writer
+
+    def _check_frames(self, dataset: FrameDataset):
+        self.assertEqual(len(dataset), NUM_FRAMES)
+        self.assertEqual(dataset.attributes, {"fps": 30})
+        self.assertEqual(dataset.streams["cam.rgb"], ((24, 32, 4), np.dtype(np.uint8)))
+        np.testing.assert_array_equal(dataset.frame_ids, np.arange(100, 100 + NUM_FRAMES))
+        for index in (0, 7, 8, NUM_FRAMES - 1, -1):
+            frame = dataset[index]
+            np.testing.assert_array_equal(frame["cam.rgb"], self._images[index])
+            np.testing.assert_array_equal(frame["cam.pose"], self._poses[index])
+        np.testing.assert_allclose(dataset.get_stream("timestamp"), np.arange(NUM_FRAMES) / 30.0)
+        with self.assertRaises(IndexError):
+            dataset.get("cam.rgb", NUM_FRAMES)
+
+    async def test_compressed_chunks(self):
+        self._write(chunk_size=8, compression_level=1)
+        # One file per chunk and stream, not per frame
+        self.assertEqual(len(os.listdir(os.path.join(self._path, "cam.rgb"))), 5)
+        self._check_frames(FrameDataset(self._path))
+
+    async def test_memory_mapped_chunks(self):
+        self._write(chunk_size=8, compression_level=0)
+        dataset = FrameDataset(self._path)
+        self.assertIsInstance(dataset.get_chunk("cam.rgb", 0).base, np.memmap)
+        self._check_frames(dataset)
+
+    async def test_async_append(self):
+        writer = FrameDatasetWriter(self._path, chunk_size=4, attributes={"fps": 30})
+        for index in range(NUM_FRAMES):
+            await writer.append_async(100 + index, self._get_frame(index))
+        writer.close()
+        self._check_frames(FrameDataset(self._path, cache_size=1))
+
+    async def test_interrupted_capture_is_readable(self):
+        writer = FrameDatasetWriter(self._path, chunk_size=8)
+        for index in range(20):
+            writer.append(index, self._get_frame(index))
+        # Not closed: wait for the chunks in flight, the partial chunk is lost
+        while writer._pending:
+            writer._complete_oldest_chunk()
+        dataset = FrameDataset(self._path)
+        self.assertEqual(len(dataset), 16)
+        np.testing.assert_array_equal(dataset.get("cam.rgb", 15), self._images[15])
+        writer.close()
+
+    async def test_inconsistent_frames(self):
+        with FrameDatasetWriter(self._path) as writer:
+            writer.append(0, self._get_frame(0))
+            with self.assertRaises(ValueError):
+                writer.append(1, {"cam.rgb": self._images[1]})
+            with self.assertRaises(ValueError):
+                writer.append(1, dict(self._get_frame(1), timestamp=np.zeros(2)))
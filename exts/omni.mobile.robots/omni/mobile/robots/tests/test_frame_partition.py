@@ -0,0 +1,97 @@
+import random
+import itertools
+import omni.kit.test
+
+from omni.mobile.robots.ui.widgets.scene_capture.utils.frame_partition import (
+    FrameBatch,
+    partition_frames,
+    get_batch_costs,
+)
+
+# Number of random cases per property, with a fixed seed so a failure can be reproduced
+NUM_CASES = 200
+
+
+def _random_case(rng: random.Random, max_frames: int = 60):
+    start_frame = rng.randint(-20, 100)
+    num_frames = rng.randint(1, max_frames)
+    batch_count = rng.randint(1, num_frames)
+    # Mostly cheap frames with a few slow sections, like a robot entering a cluttered aisle
+    costs = [rng.uniform(0.5, 1.5) * (rng.choice([1.0, 1.0, 1.0, 8.0])) for _ in range(num_frames)]
+    return start_frame, start_frame + num_frames - 1, batch_count, costs
+
+
+def _best_max_cost(costs, batch_count):
+    """Exhaustive minimum over all the contiguous partitions, for small cases"""
+    best = float("inf")
+    for cuts in itertools.combinations(range(1, len(costs)), batch_count - 1):
+        bounds = (0,) + cuts + (len(costs),)
+        best = min(best, max(sum(costs[bounds[k]:bounds[k + 1]]) for k in range(batch_count)))
+    return best
+
+
+class TestFramePartition(omni.kit.test.AsyncTestCase):
+    def _check_covers_range(self, batches, start_frame, end_frame, batch_count):
+        self.assertEqual(len(batches), batch_count)
+        frames = [frame for batch in batches for frame in batch.frames]
+        self.assertTrue(all(len(batch.frames) > 0 for batch in batches))
+        self.assertEqual(sorted(frames), list(range(start_frame, end_frame + 1)))
+
+    async def test_single_batch(self):
+        self.assertEqual(partition_frames(3, 10, 0), [FrameBatch(3, 10)])
+        self.assertEqual(partition_frames(3, 10, 1), [FrameBatch(3, 10)])
+
+    async def test_too_many_batches(self):
+        with self.assertRaises(ValueError):
+            partition_frames(0, 4, 6)
+
+    async def test_equal_count_batches(self):
+        rng = random.Random(11)
+        for _ in range(NUM_CASES):
+            start_frame, end_frame, batch_count, _ = _random_case(rng)
+            batches = partition_frames(start_frame, end_frame, batch_count)
+            self._check_covers_range(batches, start_frame, end_frame, batch_count)
+            sizes = [len(batch.frames) for batch in batches]
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+            self.assertTrue(all(batch.step == 1 for batch in batches))
+
+    async def test_interleaved_batches(self):
+        rng = random.Random(12)
+        for _ in range(NUM_CASES):
+            start_frame, end_frame, batch_count, _ = _random_case(rng)
+            batches = partition_frames(start_frame, end_frame, batch_count, interleave=True)
+            self._check_covers_range(batches, start_frame, end_frame, batch_count)
+            sizes = [len(batch.frames) for batch in batches]
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    async def test_cost_balanced_batches(self):
+        rng = random.Random(13)
+        for _ in range(NUM_CASES):
+            start_frame, end_frame, batch_count, costs = _random_case(rng)
+            batches = partition_frames(start_frame, end_frame, batch_count, frame_costs=costs)
+            self._check_covers_range(batches, start_frame, end_frame, batch_count)
+            # Contiguous and in order
+            for previous, batch in zip(batches, batches[1:]):
+                self.assertEqual(batch.start_frame, previous.end_frame + 1)
+
+            # Never worse than splitting by frame count, and within one frame of the average
+            balanced = get_batch_costs(batches, start_frame, costs).max()
+            equal = get_batch_costs(partition_frames(start_frame, end_frame, batch_count), start_frame, costs).max()
+            self.assertLessEqual(balanced, equal + 1e-6)
+            self.assertLessEqual(balanced, sum(costs) / batch_count + max(costs) + 1e-6)
+
+    async def test_cost_balanced_batches_are_optimal(self):
+        rng = random.Random(14)
+        for _ in range(NUM_CASES):
+            start_frame, end_frame, batch_count, costs = _random_case(rng, max_frames=12)
+            batches = partition_frames(start_frame, end_frame, batch_count, frame_costs=costs)
+            balanced = get_batch_costs(batches, start_frame, costs).max()
+            self.assertAlmostEqual(balanced, _best_max_cost(costs, batch_count), delta=1e-6)
+
+    async def test_zero_and_invalid_costs(self):
+        batches = partition_frames(0, 9, 3, frame_costs=[0.0] * 10)
+        self._check_covers_range(batches, 0, 9, 3)
+        with self.assertRaises(ValueError):
+            partition_frames(0, 9, 3, frame_costs=[1.0] * 9)
+        with self.assertRaises(ValueError):
+            partition_frames(0, 9, 3, frame_costs=[1.0] * 9 + [-1.0])
@@ -0,0 +1,81 @@
+import os
+import asyncio
+import tempfile
+import numpy as np
+import omni.kit.test
+
+from omni.mobile.robots.logic.capture.frame_writer import FrameWriter, write_frame
+
+NUM_FRAMES = 24
+
+
+class TestFrameWriter(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self._frames = [rng.integers(0, 255, size=(48, 64, 4), dtype=np.uint8) for _ in range(NUM_FRAMES)]
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _path(self, index: int, file_type: str = ".png") -> str:
+        return os.path.join(self._folder.name, "camera", f"frame.{index:04d}{file_type}")
+
+    async def test_frames_are_written(self):
+        writer = FrameWriter(num_workers=3, max_queue_size=4)
+        for index, frame in enumerate(self._frames):
+            await writer.put_async(self._path(index, ".npy" if index % 2 else ".png"), frame)
+        await writer.close_async()
+
+        self.assertEqual(writer.written, NUM_FRAMES)
+        self.assertEqual(writer.failed, 0)
+        np.testing.assert_array_equal(np.load(self._path(1, ".npy")), self._frames[1])
+
+        from PIL import Image
+
+        np.testing.assert_array_equal(np.asarray(Image.open(self._path(0))), self._frames[0])
+
+    async def test_metrics(self):
+        writer = FrameWriter(num_workers=2, max_queue_size=2)
+        for index, frame in enumerate(self._frames):
+            await writer.put_async(self._path(index), frame)
+            self.assertLessEqual(writer.pending, 2)
+        await writer.flush_async()
+
+        metrics = writer.metrics
+        sizes = sum(os.path.getsize(self._path(index)) for index in range(NUM_FRAMES))
+        self.assertEqual(metrics.written, NUM_FRAMES)
+        self.assertEqual(metrics.bytes_written, sizes)
+        self.assertEqual(metrics.queue_depth, 0)
+        self.assertLessEqual(metrics.max_queue_depth, 2)
+        self.assertGreater(metrics.encode_time, 0.0)
+        self.assertGreater(metrics.bytes_per_second, 0.0)
+        await writer.close_async()
+
+    async def test_backpressure(self):
+        writer = FrameWriter(num_workers=1, max_queue_size=1)
+        writer.start()
+        # The single encoder is busy, so the third frame has to wait for a slot
+        puts = [
+            asyncio.ensure_future(writer.put_async(self._path(index), frame))
+            for index, frame in enumerate(self._frames[:3])
+        ]
+        await asyncio.sleep(0)
+        self.assertFalse(all(put.done() for put in puts))
+        await asyncio.gather(*puts)
+        await writer.close_async()
+        self.assertEqual(writer.written, 3)
+
+    async def test_failed_writes_are_counted(self):
+        writer = FrameWriter(num_workers=1)
+        await writer.put_async(self._path(0, ".bmp"), self._frames[0])
+        await writer.put_async(self._path(1), self._frames[1])
+        await writer.close_async()
+        self.assertEqual(writer.failed, 1)
+        self.assertEqual(writer.written, 1)
+
+    async def test_png_compress_level(self):
+        smooth = np.tile(np.arange(64, dtype=np.uint8), (48, 1))
+        fast = write_frame(self._path(0), smooth, png_compress_level=0)
+        small = write_frame(self._path(1), smooth, png_compress_level=9)
+        self.assertLess(small, fast)
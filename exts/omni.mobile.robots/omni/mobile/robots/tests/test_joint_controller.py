@@ -0,0 +1,65 @@
+import numpy as np
+import omni.kit.test
+
+from omni.mobile.robots.logic.arms.arm_spec import FR3_SPEC
+from omni.mobile.robots.logic.arms.joint_controller import JointImpedanceController
+
+NUM_ROBOTS = 32
+NUM_JOINTS = len(FR3_SPEC.joint_names)
+
+
+class TestJointController(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        rng = np.random.default_rng(0)
+        self._home = np.asarray(FR3_SPEC.home_positions)
+        self._positions = self._home + rng.normal(0.0, 0.01, size=(NUM_ROBOTS, NUM_JOINTS))
+        self._velocities = rng.normal(0.0, 0.1, size=(NUM_ROBOTS, NUM_JOINTS))
+
+    async def test_pd_efforts(self):
+        controller = JointImpedanceController(NUM_ROBOTS, FR3_SPEC)
+        efforts = controller.compute(self._positions, self._velocities, self._home)
+        expected = (
+            np.asarray(FR3_SPEC.stiffness) * (self._home - self._positions)
+            - np.asarray(FR3_SPEC.damping) * self._velocities
+        )
+        np.testing.assert_allclose(efforts, expected)
+
+    async def test_impedance_efforts(self):
+        controller = JointImpedanceController(NUM_ROBOTS, FR3_SPEC)
+        target_velocities = np.full(NUM_JOINTS, 0.05)
+        feedforward = np.linspace(-1.0, 1.0, NUM_JOINTS)
+        efforts = controller.compute(self._positions, self._velocities, self._home, target_velocities, feedforward)
+        expected = (
+            np.asarray(FR3_SPEC.stiffness) * (self._home - self._positions)
+            + np.asarray(FR3_SPEC.damping) * (target_velocities - self._velocities)
+            + feedforward
+        )
+        np.testing.assert_allclose(efforts, expected)
+
+    async def test_effort_limits(self):
+        controller = JointImpedanceController(NUM_ROBOTS, FR3_SPEC)
+        efforts = controller.compute(self._positions, self._velocities, self._home + 10.0)
+        np.testing.assert_allclose(efforts, np.broadcast_to(FR3_SPEC.effort_limits, efforts.shape))
+        efforts = controller.compute(self._positions, self._velocities, self._home - 10.0)
+        np.testing.assert_allclose(efforts, -np.broadcast_to(FR3_SPEC.effort_limits, efforts.shape))
+
+    async def test_gains_per_robot(self):
+        controller = JointImpedanceController(NUM_ROBOTS, FR3_SPEC)
+        controller.set_gains(stiffness=np.zeros(NUM_JOINTS), damping=np.zeros(NUM_JOINTS), indices=[3])
+        efforts = controller.compute(self._positions, self._velocities, self._home)
+        np.testing.assert_array_equal(efforts[3], np.zeros(NUM_JOINTS))
+        self.assertTrue(np.all(np.abs(efforts[2]) > 0.0))
+
+    async def test_buffers_are_reused(self):
+        controller = JointImpedanceController(NUM_ROBOTS, FR3_SPEC)
+        first = controller.compute(self._positions, self._velocities, self._home)
+        second = controller.compute(self._positions, self._velocities, self._home)
+        self.assertIs(first, second)
+        self.assertEqual(first.shape, (NUM_ROBOTS, NUM_JOINTS))
+
+    async def test_gains_without_spec(self):
+        controller = JointImpedanceController(2, stiffness=[10.0, 20.0], damping=[1.0, 2.0])
+        efforts = controller.compute(np.zeros((2, 2)), np.ones((2, 2)), np.ones(2))
+        np.testing.assert_allclose(efforts, [[9.0, 18.0], [9.0, 18.0]])
+        with self.assertRaises(ValueError):
+            JointImpedanceController(2, stiffness=[10.0, 20.0])
@@ -0,0 +1,117 @@
+import numpy as np
+import omni.kit.test
+from pxr import Usd, UsdGeom
+
+from omni.mobile.robots.logic.sensors.lidar import LidarBatch
+from omni.mobile.robots.logic.sensors.lidar_spec import LIDAR_SPECS, LidarSpec, get_beam_directions
+from omni.mobile.robots.logic.sensors.raycast_scene import (
+    OccupancyGridScene,
+    RaycastScene,
+    TriangleMeshScene,
+    get_stage_triangles,
+)
+
+# Noise free LiDAR with one beam every 90 degrees, starting along -x
+CROSS_SPEC = LidarSpec(horizontal_fov=360.0, horizontal_resolution=90.0, min_range=0.1, max_range=20.0)
+
+
+def get_room_grid() -> OccupancyGridScene:
+    """10 x 10 m room with 0.1 m thick walls, the inside spanning [0.1, 9.9] along x and y"""
+    occupancy = np.zeros((100, 100), dtype=bool)
+    occupancy[0, :] = occupancy[-1, :] = occupancy[:, 0] = occupancy[:, -1] = True
+    return OccupancyGridScene(occupancy, resolution=0.1, height=2.0)
+
+
+def get_room_mesh() -> TriangleMeshScene:
+    """The inner faces of the walls of the room of get_room_grid, as a box from z = 0 to 2"""
+    corners = np.array([[x, y, z] for z in (0.0, 2.0) for y in (0.1, 9.9) for x in (0.1, 9.9)])
+    quads = [[0, 1, 3, 2], [4, 5, 7, 6], [0, 1, 5, 4], [2, 3, 7, 6], [0, 2, 6, 4], [1, 3, 7, 5]]
+    triangles = [[a, b, c] for a, b, c, d in quads] + [[a, c, d] for a, b, c, d in quads]
+    # Only the walls, without the floor and the ceiling
+    return TriangleMeshScene(corners, np.array(triangles)[[2, 3, 4, 5, 8, 9, 10, 11]])
+
+
+class TestLidar(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        pass
+
+    async def tearDown(self):
+        pass
+
+    async def test_scene_needs_cast(self):
+        with self.assertRaises(TypeError):
+            RaycastScene()
+
+    async def test_beam_directions(self):
+        directions = get_beam_directions(LIDAR_SPECS["2D"])
+        self.assertEqual(directions.shape, (541, 3))
+        np.testing.assert_allclose(directions[270], [1.0, 0.0, 0.0], atol=1e-12)
+        directions = get_beam_directions(LIDAR_SPECS["3D"])
+        self.assertEqual(directions.shape, (16 * 1800, 3))
+        np.testing.assert_allclose(np.linalg.norm(directions, axis=1), 1.0)
+        self.assertAlmostEqual(np.degrees(np.arcsin(directions[:, 2].min())), -15.0)
+
+    async def test_grid_and_mesh_agree(self):
+        positions = np.array([[5.0, 5.0, 0.5], [2.0, 7.0, 1.0], [0.5, 0.5, 0.2]])
+        expected = np.array([[4.9, 4.9, 4.9, 4.9], [1.9, 6.9, 7.9, 2.9], [0.4, 0.4, 9.4, 9.4]])
+        for scene in (get_room_grid(), get_room_mesh()):
+            scan = LidarBatch(3, scene, CROSS_SPEC).scan(positions)
+            np.testing.assert_allclose(scan.ranges, expected, atol=1e-9)
+            self.assertTrue(scan.hits.all())
+            # Beam 0 points along -x
+            np.testing.assert_allclose(scan.points[:, 0], [[0.1, 5.0, 0.5], [0.1, 7.0, 1.0], [0.1, 0.5, 0.2]], atol=1e-9)
+
+    async def test_3d_beams(self):
+        positions = np.array([[5.0, 5.0, 1.0]])
+        spec = LidarSpec(horizontal_fov=360.0, horizontal_resolution=1.0, channel_elevations=(-10.0, 0.0, 15.0, 45.0))
+        grid = LidarBatch(1, get_room_grid(), spec).scan(positions)
+        ranges = grid.ranges.copy()
+        mesh = LidarBatch(1, get_room_mesh(), spec).scan(positions)
+        np.testing.assert_allclose(ranges, mesh.ranges, atol=1e-6)
+        # The beams at -10 degrees reach the floor before the corners, the ones at 15 and 45 degrees pass over the walls
+        self.assertTrue(grid.hits[0, 360 : 2 * 360].all())
+        self.assertEqual(grid.hits[0, [0, 45, 90]].tolist(), [True, False, True])
+        self.assertFalse(grid.hits[0, 2 * 360 :].any())
+        np.testing.assert_allclose(np.nanmax(grid.points[0, :360, 2]), 1.0 - 4.9 * np.tan(np.radians(10.0)))
+
+    async def test_orientations_and_range(self):
+        # Yawed by 90 degrees, the beams point along -y, +x, +y and -x
+        yaw = np.radians(90.0)
+        orientations = np.array([[np.cos(yaw / 2.0), 0.0, 0.0, np.sin(yaw / 2.0)]])
+        spec = CROSS_SPEC._replace(max_range=3.0)
+        scan = LidarBatch(1, get_room_grid(), spec).scan([[2.0, 7.0, 1.0]], orientations)
+        np.testing.assert_allclose(scan.ranges[0], [np.inf, np.inf, 2.9, 1.9])
+        self.assertEqual(scan.hits[0].tolist(), [False, False, True, True])
+        self.assertTrue(np.isnan(scan.points[0, :2]).all())
+        np.testing.assert_allclose(scan.points[0, 3], [0.1, 7.0, 1.0], atol=1e-9)
+
+    async def test_noise_and_dropouts(self):
+        spec = LIDAR_SPECS["2D"]._replace(range_noise_std=0.05, dropout_probability=0.1)
+        lidar = LidarBatch(64, get_room_grid(), spec, seed=0)
+        clean = LidarBatch(64, get_room_grid(), spec._replace(range_noise_std=0.0, dropout_probability=0.0))
+        positions = np.tile([[5.0, 5.0, 0.5]], (64, 1))
+        expected = clean.scan(positions).ranges.copy()
+        scan = lidar.scan(positions)
+        ranges, points = scan.ranges, scan.points
+        self.assertAlmostEqual(1.0 - scan.hits.mean(), 0.1, delta=0.01)
+        errors = scan.ranges[scan.hits] - expected[scan.hits]
+        self.assertAlmostEqual(errors.std(), 0.05, delta=0.002)
+        # The buffers are reused by the next scan
+        scan = lidar.scan(positions)
+        self.assertIs(scan.ranges, ranges)
+        self.assertIs(scan.points, points)
+
+    async def test_stage_triangles(self):
+        stage = Usd.Stage.CreateInMemory()
+        mesh = UsdGeom.Mesh.Define(stage, "/World/Wall")
+        # A 2 x 2 m quad in the plane x = 0, moved to x = 3
+        mesh.CreatePointsAttr([(0, -1, 0), (0, 1, 0), (0, 1, 2), (0, -1, 2)])
+        mesh.CreateFaceVertexCountsAttr([4])
+        mesh.CreateFaceVertexIndicesAttr([0, 1, 2, 3])
+        UsdGeom.XformCommonAPI(mesh).SetTranslate((3.0, 0.0, 0.0))
+        points, triangles = get_stage_triangles(stage, "/World")
+        self.assertEqual(triangles.tolist(), [[0, 1, 2], [0, 2, 3]])
+        np.testing.assert_allclose(points[:, 0], 3.0)
+
+        scan = LidarBatch(1, TriangleMeshScene.from_stage(stage), CROSS_SPEC).scan([[1.0, 0.0, 1.0]])
+        np.testing.assert_allclose(scan.ranges[0], [np.inf, np.inf, 2.0, np.inf])
@@ -0,0 +1,113 @@
+import os
+import sys
+import asyncio
+import tempfile
+import omni.kit.test
+from unittest import mock
+
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_client import submit_tasks_async
+from omni.mobile.robots.ui.widgets.scene_capture.utils.farm_job_tracker import FarmJobTracker
+from omni.mobile.robots.ui.widgets.scene_capture.utils.frame_partition import partition_frames
+from omni.mobile.robots.params import LOCAL_FARM_SETTINGS
+from omni.mobile.robots.ui.widgets.scene_capture.utils.local_farm import (
+    LocalFarmClient,
+    get_isaac_python_executable,
+    get_worker_cpus,
+)
+
+# Stands in for render_batch: writes the frames of its batch, or fails when the settings ask for it
+WORKER_SCRIPT = """
+import sys, json, os
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+with open(args["--settings"]) as f:
+    settings = json.load(f)
+for frame in range(settings["start_frame"], settings["end_frame"] + 1):
+    if frame == settings.get("fail_at_frame"):
+        sys.exit(3)
+    with open(os.path.join(settings["output_folder"], f"{settings['file_name']}.{frame:04d}.png"), "w") as f:
+        f.write(args["--usd-file"])
+"""
+
+
+def _make_tasks(output_folder, batches, fail_at_frame=None):
+    tasks = []
+    for index, batch in enumerate(batches):
+        render_settings = {
+            "output_folder": output_folder,
+            "file_name": "capture",
+            "start_frame": batch.start_frame,
+            "end_frame": batch.end_frame,
+            "fail_at_frame": fail_at_frame,
+        }
+        tasks.append({
+            "task_function_args": {"usd_file": "scene.usd", "render_settings": render_settings},
+            "metadata": {
+                "batches": {"batch_id": f"local:{fail_at_frame}", "index": index},
+                "idempotency_key": f"local:{fail_at_frame}:{index}",
+            },
+        })
+    return tasks
+
+
+class TestLocalFarm(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._client = LocalFarmClient(2, command=[sys.executable, "-c", WORKER_SCRIPT])
+
+    async def tearDown(self):
+        await self._client.stop_async()
+        self._folder.cleanup()
+
+    async def _run(self, batches, fail_at_frame=None):
+        results = await submit_tasks_async(self._client, _make_tasks(self._folder.name, batches, fail_at_frame))
+        tracker = FarmJobTracker(
+            self._client,
+            {result["task_id"]: len(batch.frames) for result, batch in zip(results, batches)},
+            min_interval=0.01,
+            max_interval=0.05,
+        )
+        await asyncio.wait_for(tracker.start(), timeout=60.0)
+        return tracker.progress
+
+    async def test_batches_are_merged(self):
+        progress = await self._run(partition_frames(0, 19, 4))
+
+        self.assertTrue(progress.is_done)
+        self.assertEqual(progress.tasks_finished, 4)
+        self.assertEqual(progress.frames_done, 20)
+        self.assertEqual(sorted(os.listdir(self._folder.name)), [f"capture.{frame:04d}.png" for frame in range(20)])
+
+    async def test_failed_batch_is_not_merged(self):
+        progress = await self._run(partition_frames(0, 19, 4), fail_at_frame=12)
+
+        self.assertEqual(progress.tasks_finished, 3)
+        self.assertEqual(progress.tasks_failed, 1)
+        frames = [name for name in os.listdir(self._folder.name) if name.endswith(".png")]
+        self.assertEqual(sorted(frames), [f"capture.{frame:04d}.png" for frame in list(range(10)) + list(range(15, 20))])
+
+    async def test_worker_cpus(self):
+        cpus = get_worker_cpus(3, cpus=range(8))
+        self.assertEqual(cpus, [[0, 1], [2, 3, 4], [5, 6, 7]])
+        self.assertEqual(get_worker_cpus(3, cpus=[4, 5]), [[4], [5], [4]])
+
+    async def test_isaac_python(self):
+        # An install whose app folder is <install>/apps, the python script being at the root
+        app_folder = os.path.join(self._folder.name, "apps")
+        os.makedirs(app_folder)
+        tokens = mock.Mock()
+        tokens.resolve = lambda token: {"${app}": app_folder}.get(token, token)
+        script_name = "python.bat" if sys.platform == "win32" else "python.sh"
+
+        with mock.patch("carb.tokens.get_tokens_interface", return_value=tokens), mock.patch.dict(
+            LOCAL_FARM_SETTINGS, {"python_executable": ""}
+        ):
+            with self.assertRaises(FileNotFoundError):
+                get_isaac_python_executable()
+            with self.assertRaises(FileNotFoundError):
+                LocalFarmClient(1)
+
+            script_path = os.path.join(self._folder.name, script_name)
+            open(script_path, "w").close()
+            self.assertEqual(get_isaac_python_executable(), script_path)
+            LOCAL_FARM_SETTINGS["python_executable"] = "/opt/isaac/python.sh"
+            self.assertEqual(get_isaac_python_executable(), "/opt/isaac/python.sh")
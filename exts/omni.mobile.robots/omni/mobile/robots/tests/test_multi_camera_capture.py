@@ -0,0 +1,165 @@
+import os
+import tempfile
+import functools
+import numpy as np
+import omni.kit.test
+import omni.usd
+from unittest import mock
+from pxr import Gf, UsdGeom
+
+from omni.mobile.robots.logic.capture import multi_camera_capture
+from omni.mobile.robots.logic.capture.frame_dataset import DATASET_FILE_TYPE, FrameDataset
+from omni.mobile.robots.logic.capture.multi_camera_capture import MultiCameraCapture, get_camera_output_name
+from omni.mobile.robots.logic.capture.video_stream import VideoStreamEncoder
+from omni.mobile.robots.tests.test_video_stream import _RecordingEncodingInterface
+
+CAMERA_PATHS = ["/World/front_cam", "/World/Robot/back_cam"]
+RESOLUTION = (6, 4)
+FPS = 30.0
+
+
+class _FakeRenderProduct:
+    def __init__(self, camera_path: str, resolution):
+        self.camera_path = camera_path
+        self.resolution = resolution
+        self.destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class _FakeAnnotator:
+    """rgb annotator whose frame is filled with 16 * camera index + number of orchestrator steps"""
+
+    def __init__(self, replicator: "_FakeReplicator"):
+        self._replicator = replicator
+        self.render_products = []
+
+    def attach(self, render_products):
+        self.render_products.extend(render_products)
+
+    def detach(self, render_products):
+        for render_product in render_products:
+            self.render_products.remove(render_product)
+
+    def get_data(self) -> np.ndarray:
+        render_product = self.render_products[0]
+        value = 16 * CAMERA_PATHS.index(render_product.camera_path) + self._replicator.steps
+        width, height = render_product.resolution
+        return np.full((height, width, 4), value, dtype=np.uint8)
+
+
+class _FakeReplicator:
+    """Stands for omni.replicator.core, counting the orchestrator steps"""
+
+    def __init__(self):
+        self.steps = 0
+        self.render_products = []
+        self.orchestrator = mock.Mock(step_async=self._step_async)
+        self.create = mock.Mock(render_product=self._create_render_product)
+        self.AnnotatorRegistry = mock.Mock(get_annotator=lambda name: _FakeAnnotator(self))
+
+    async def _step_async(self, rt_subframes: int = 1, pause_timeline: bool = True):
+        self.steps += 1
+
+    def _create_render_product(self, camera_path: str, resolution):
+        self.render_products.append(_FakeRenderProduct(camera_path, resolution))
+        return self.render_products[-1]
+
+
+class TestMultiCameraCapture(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        await omni.usd.get_context().new_stage_async()
+        stage = omni.usd.get_context().get_stage()
+        for index, camera_path in enumerate(CAMERA_PATHS):
+            UsdGeom.Xformable(UsdGeom.Camera.Define(stage, camera_path)).AddTranslateOp().Set(
+                Gf.Vec3d(index, 2.0, 3.0)
+            )
+        self._folder = tempfile.TemporaryDirectory()
+        self._replicator = _FakeReplicator()
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _create_capture(self, camera_paths=CAMERA_PATHS, **kwargs) -> MultiCameraCapture:
+        return MultiCameraCapture(
+            camera_paths, self._folder.name, resolution=RESOLUTION, replicator=self._replicator, **kwargs
+        )
+
+    async def test_frames_share_the_index(self):
+        capture = self._create_capture(file_type=".npy")
+        progress = []
+        captured = await capture.capture_sequence_async(
+            0, 4, FPS, every_nth_frame=2, progress_fn=lambda *args: progress.append(args)
+        )
+        await capture.close_async()
+
+        self.assertEqual(captured, 3)
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+        # One orchestrator step renders the frame of every camera
+        self.assertEqual(self._replicator.steps, 3)
+        for step, frame in enumerate([0, 2, 4], start=1):
+            for index, camera_path in enumerate(CAMERA_PATHS):
+                path = capture.get_frame_path(camera_path, frame)
+                camera_folder = os.path.join(self._folder.name, get_camera_output_name(camera_path))
+                self.assertEqual(os.path.dirname(path), camera_folder)
+                self.assertTrue(path.endswith(f"frame.{frame:04d}.npy"))
+                self.assertTrue(np.all(np.load(path) == 16 * index + step))
+        # The render products are released at the end of the capture
+        self.assertTrue(all(render_product.destroyed for render_product in self._replicator.render_products))
+        self.assertFalse(capture.is_capturing)
+
+    async def test_dataset(self):
+        capture = self._create_capture(
+            file_type=DATASET_FILE_TYPE, metadata_fn=lambda frame: {"robot.joints": np.full(3, frame, np.float32)}
+        )
+        await capture.capture_sequence_async(0, 2, FPS)
+        await capture.close_async()
+
+        # No image file, every stream of every camera in the dataset
+        self.assertEqual(os.listdir(self._folder.name), [os.path.basename(capture.dataset_path)])
+        dataset = FrameDataset(capture.dataset_path)
+        self.assertEqual(len(dataset), 3)
+        self.assertEqual(dataset.frame_ids.tolist(), [0, 1, 2])
+        self.assertEqual(dataset.attributes["cameras"], CAMERA_PATHS)
+        self.assertEqual(dataset.get("World_Robot_back_cam.rgb", 2)[0, 0, 0], 16 + 3)
+        np.testing.assert_allclose(dataset.get("World_Robot_back_cam.pose", 0)[3, :3], [1.0, 2.0, 3.0])
+        np.testing.assert_allclose(dataset.get("timestamp", 2), 2 / FPS)
+        np.testing.assert_array_equal(dataset.get("robot.joints", 1), [1.0, 1.0, 1.0])
+
+    async def test_mp4(self):
+        interface = _RecordingEncodingInterface()
+        encoder = functools.partial(VideoStreamEncoder, interface=interface)
+        capture = self._create_capture(CAMERA_PATHS[:1], file_type=".mp4")
+        # The encoder needs the number of frames of the sequence
+        with self.assertRaises(ValueError):
+            await capture.capture_frame_async(0)
+        with mock.patch.object(multi_camera_capture, "VideoStreamEncoder", encoder):
+            await capture.capture_sequence_async(0, 2, FPS)
+        await capture.close_async()
+
+        self.assertEqual(interface.started, [(capture.video_path, FPS, 3, True)])
+        self.assertEqual([frame[0, 0, 0] for frame, _, _ in interface.frames], [2, 3, 4])
+        self.assertEqual(interface.finalized, 1)
+        # The frames are streamed to the encoder, no image file is written
+        self.assertEqual(os.listdir(self._folder.name), [])
+
+        # A video streams a single camera
+        with self.assertRaises(ValueError):
+            self._create_capture(file_type=".mp4")
+        with self.assertRaises(ValueError):
+            self._create_capture([])
+
+    async def test_cancel(self):
+        capture = self._create_capture(file_type=".npy")
+        await capture.capture_sequence_async(0, 9, FPS, progress_fn=lambda captured, total: capture.cancel())
+
+        self.assertEqual(capture.captured_frames, 1)
+        self.assertFalse(capture.is_capturing)
+        self.assertTrue(os.path.isfile(capture.get_frame_path(CAMERA_PATHS[1], 0)))
+        self.assertFalse(os.path.exists(capture.get_frame_path(CAMERA_PATHS[1], 1)))
+        self.assertTrue(all(render_product.destroyed for render_product in self._replicator.render_products))
+
+        # The next capture starts over
+        self.assertEqual(await capture.capture_sequence_async(0, 2, FPS), 3)
+        await capture.close_async()
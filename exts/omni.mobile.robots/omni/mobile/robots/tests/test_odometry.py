@@ -0,0 +1,148 @@
+import numpy as np
+import omni.kit.test
+from pxr import UsdGeom
+
+from omni.mobile.robots.logic.sensors.imu import ACCEL, GYRO, ImuBatch
+from omni.mobile.robots.logic.sensors.odometry_spec import IMU_SPECS, ImuSpec, WheelEncoderSpec
+from omni.mobile.robots.logic.sensors.ring_buffer import RingBuffer
+from omni.mobile.robots.logic.sensors.wheel_odometry import SPEED, WheelOdometryBatch, X, Y, YAW, YAW_RATE
+from omni.mobile.robots.logic.vehicles.vehicle_spec import VEHICLE_SPECS
+
+DT = 1.0 / 250.0
+PERFECT_IMU = ImuSpec(0.0, 0.0, 0.0, 0.0)
+PERFECT_ENCODER = WheelEncoderSpec(ticks_per_revolution=1 << 20)
+
+
+def get_yaw_quaternions(yaws: np.ndarray) -> np.ndarray:
+    yaws = np.asarray(yaws, dtype=np.float64)
+    return np.stack([np.cos(yaws / 2.0), 0.0 * yaws, 0.0 * yaws, np.sin(yaws / 2.0)], axis=1)
+
+
+class TestOdometry(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        pass
+
+    async def tearDown(self):
+        pass
+
+    async def test_ring_buffer(self):
+        buffer = RingBuffer(4, (2, 3))
+        timestamps, samples = buffer.get_latest()
+        self.assertEqual(samples.shape, (0, 2, 3))
+        self.assertIsNone(buffer.get_last())
+        for index in range(6):
+            buffer.append(np.full((2, 3), index), timestamp=index * DT)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.num_samples, 6)
+        timestamps, samples = buffer.get_latest()
+        np.testing.assert_allclose(samples[:, 0, 0], [2, 3, 4, 5])
+        np.testing.assert_allclose(timestamps, np.arange(2, 6) * DT)
+        # Views of the storage, overwritten by the next samples
+        self.assertTrue(np.shares_memory(samples, buffer.get_latest(1)[1]))
+        np.testing.assert_allclose(buffer.get_latest(2)[1][:, 1, 2], [4, 5])
+        self.assertEqual(buffer.get_last()[0, 0], 5)
+
+        _, samples, cursor = buffer.get_since(0)
+        self.assertEqual((len(samples), cursor), (4, 6))
+        buffer.get_write_slot()[...] = 6
+        buffer.commit(6 * DT)
+        _, samples, cursor = buffer.get_since(cursor)
+        self.assertEqual((samples[:, 0, 0].tolist(), cursor), ([6], 7))
+        self.assertEqual(len(buffer.get_since(cursor)[1]), 0)
+
+    async def test_imu_at_rest(self):
+        imu = ImuBatch(3, PERFECT_IMU, dt=DT)
+        orientations = get_yaw_quaternions([0.0, np.pi / 2.0, 1.0])
+        # The third robot is pitched by 90 degrees around y: gravity measured along -x of the robot
+        orientations[2] = [np.cos(np.pi / 4.0), 0.0, np.sin(np.pi / 4.0), 0.0]
+        zeros = np.zeros((3, 3))
+        for step in range(3):
+            measurements = imu.update(zeros, zeros, orientations, step * DT)
+        np.testing.assert_allclose(measurements[:2, ACCEL], [[0.0, 0.0, 9.81]] * 2, atol=1e-12)
+        np.testing.assert_allclose(measurements[2, ACCEL], [-9.81, 0.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(measurements[:, GYRO], 0.0)
+        self.assertEqual(len(imu.history), 3)
+        self.assertIs(measurements.base, imu.history.get_last().base)
+
+    async def test_imu_y_up(self):
+        imu = ImuBatch(2, PERFECT_IMU, dt=DT, up_axis=UsdGeom.Tokens.y)
+        # The second robot is rolled by 90 degrees around x: its z axis points down the world y axis
+        orientations = np.array([[1.0, 0.0, 0.0, 0.0], [np.cos(np.pi / 4.0), np.sin(np.pi / 4.0), 0.0, 0.0]])
+        zeros = np.zeros((2, 3))
+        imu.update(zeros, zeros, orientations, 0.0)
+        measurements = imu.update(zeros, zeros, orientations, DT)
+        np.testing.assert_allclose(measurements[:, ACCEL], [[0.0, 9.81, 0.0], [0.0, 0.0, -9.81]], atol=1e-12)
+
+    async def test_imu_in_motion(self):
+        imu = ImuBatch(2, PERFECT_IMU, dt=DT)
+        # Yawed by 90 degrees, accelerating along world x at 2 m/s^2 and turning at 0.5 rad/s
+        orientations = get_yaw_quaternions([np.pi / 2.0, np.pi / 2.0])
+        angular = np.array([[0.0, 0.0, 0.5]] * 2)
+        imu.update(np.zeros((2, 3)), angular, orientations, 0.0)
+        measurements = imu.update(np.array([[2.0 * DT, 0.0, 0.0]] * 2), angular, orientations, DT)
+        np.testing.assert_allclose(measurements[:, ACCEL], [[0.0, -2.0, 9.81]] * 2, atol=1e-9)
+        np.testing.assert_allclose(measurements[:, GYRO], angular, atol=1e-12)
+
+    async def test_imu_noise(self):
+        spec = IMU_SPECS["Husky"]
+        imu = ImuBatch(200, spec, dt=DT, capacity=250, seed=0)
+        zeros, orientations = np.zeros((200, 3)), get_yaw_quaternions(np.zeros(200))
+        biases = imu.biases.copy()
+        for step in range(250):
+            imu.update(zeros, zeros, orientations, step * DT)
+        _, samples = imu.history.get_latest()
+        gyro = samples[..., GYRO]
+        # White noise of the density at 250 Hz around the bias of every robot
+        self.assertAlmostEqual((gyro - gyro.mean(axis=0)).std(), spec.gyro_noise_density * np.sqrt(250.0), delta=1e-4)
+        self.assertAlmostEqual(biases[:, GYRO].std(), spec.gyro_bias_std, delta=2e-4)
+        # The biases drift in one second as a random walk
+        drift = (imu.biases - biases)[:, ACCEL]
+        self.assertAlmostEqual(drift.std(), spec.accel_bias_random_walk, delta=5e-4)
+
+    async def test_wheel_odometry_differential(self):
+        vehicle = VEHICLE_SPECS["Husky"]
+        odometry = WheelOdometryBatch(2, vehicle, PERFECT_ENCODER, dt=DT)
+        angles = np.zeros((2, 4))
+        speed, yaw_rate = 0.5, 0.8
+        # Robot 0 drives straight, robot 1 turns in place
+        wheel_speeds = np.empty((2, 4))
+        wheel_speeds[0] = speed / vehicle.wheel_radius
+        half_track = 0.5 * vehicle.track_width * vehicle.skid_factor
+        wheel_speeds[1] = np.array([-1.0, 1.0, -1.0, 1.0]) * yaw_rate * half_track / vehicle.wheel_radius
+        for step in range(251):
+            sample = odometry.update(angles, step * DT)
+            angles += wheel_speeds * DT
+        np.testing.assert_allclose(sample[0, [X, Y, YAW]], [0.5, 0.0, 0.0], atol=1e-5)
+        np.testing.assert_allclose(sample[1, [X, Y, YAW]], [0.0, 0.0, 0.8], atol=1e-5)
+        np.testing.assert_allclose(sample[:, SPEED], [speed, 0.0], atol=1e-3)
+        np.testing.assert_allclose(sample[:, YAW_RATE], [0.0, yaw_rate], atol=1e-3)
+        self.assertEqual(odometry.encoder_history.get_last().dtype, np.int64)
+
+    async def test_wheel_odometry_ackermann(self):
+        vehicle = VEHICLE_SPECS["WeCAR"]
+        odometry = WheelOdometryBatch(1, vehicle, PERFECT_ENCODER, left_wheels=(0,), right_wheels=(1,), dt=DT)
+        steering = np.array([0.3])
+        radius = vehicle.wheelbase / np.tan(0.3)
+        # A quarter of the circle of the rear axle, at 1 m/s
+        num_steps = int(round(0.5 * np.pi * radius / DT))
+        angles = np.zeros((1, 2))
+        for step in range(num_steps + 1):
+            sample = odometry.update(angles, step * DT, steering)
+            angles += DT / vehicle.wheel_radius
+        np.testing.assert_allclose(sample[0, [X, Y]], [radius, radius], atol=1e-3)
+        self.assertAlmostEqual(sample[0, YAW], np.pi / 2.0, delta=1e-3)
+
+    async def test_wheel_odometry_errors(self):
+        encoder = WheelEncoderSpec(ticks_per_revolution=1024, radius_error_std=0.01, slip_std=0.05)
+        odometry = WheelOdometryBatch(500, encoder=encoder, dt=DT, seed=0)
+        angles = np.zeros((500, 4))
+        for step in range(251):
+            odometry.update(angles, step * DT)
+            angles += 1.0 / VEHICLE_SPECS["Husky"].wheel_radius * DT
+        # 1 m straight, the radius errors of the sides make every robot drift
+        distances = odometry.poses[:, X]
+        self.assertAlmostEqual(distances.mean(), 1.0, delta=0.01)
+        self.assertGreater(np.abs(odometry.poses[:, YAW]).max(), 0.01)
+        odometry.reset()
+        self.assertEqual(len(odometry.odometry_history), 0)
+        np.testing.assert_allclose(odometry.poses, 0.0)
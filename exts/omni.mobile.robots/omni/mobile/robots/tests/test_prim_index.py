@@ -0,0 +1,96 @@
+import omni.kit.test
+from pxr import Sdf, Usd, UsdGeom
+
+from omni.mobile.robots.logic.stage import prim_index
+from omni.mobile.robots.logic.stage.prim_index import PrimIndex, release_prim_index
+
+
+class TestPrimIndex(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.Xform.Define(self._stage, "/World")
+        UsdGeom.Camera.Define(self._stage, "/World/Camera")
+        UsdGeom.Cube.Define(self._stage, "/World/Cube")
+        self._index = PrimIndex()
+        self._changes = []
+        self._index.add_change_fn(lambda added, removed: self._changes.append((set(added), set(removed))))
+        self._index.attach(self._stage)
+
+    async def tearDown(self):
+        self._index.destroy()
+        self._stage = None
+
+    def _define_robot_stage(self) -> Usd.Stage:
+        # A robot with a camera, referenced by the instanceable prims
+        robot_stage = Usd.Stage.Open(Sdf.Layer.CreateAnonymous(".usda"))
+        robot = UsdGeom.Xform.Define(robot_stage, "/Robot")
+        UsdGeom.Camera.Define(robot_stage, "/Robot/Camera")
+        robot_stage.SetDefaultPrim(robot.GetPrim())
+        return robot_stage
+
+    def _define_instance(self, path: str, layer: Sdf.Layer) -> Usd.Prim:
+        prim = self._stage.DefinePrim(path, "Xform")
+        prim.GetReferences().AddReference(layer.identifier)
+        prim.SetInstanceable(True)
+        return prim
+
+    async def test_types_and_base_types(self):
+        camera_path = Sdf.Path("/World/Camera")
+        cube_path = Sdf.Path("/World/Cube")
+        self.assertEqual(self._index.get_prims_of_type("Camera"), [camera_path])
+        self.assertEqual(self._index.get_prims_of_type(UsdGeom.Camera), [camera_path])
+        self.assertEqual(
+            set(self._index.get_prims_of_type(UsdGeom.Xformable)), {Sdf.Path("/World"), camera_path, cube_path}
+        )
+        self.assertIn("Gprim", self._index.get_type_names(cube_path))
+        self.assertEqual(self._changes, [({Sdf.Path("/World"), camera_path, cube_path}, set())])
+
+    async def test_applied_apis(self):
+        Usd.CollectionAPI.Apply(self._stage.GetPrimAtPath("/World"), "lights")
+        self.assertEqual(self._index.get_prims_with_api("CollectionAPI:lights"), [Sdf.Path("/World")])
+        self.assertEqual(self._index.get_prims_with_api("CollectionAPI"), [Sdf.Path("/World")])
+
+    async def test_resyncs(self):
+        UsdGeom.Camera.Define(self._stage, "/World/Rig/Camera")
+        self.assertEqual(
+            set(self._index.get_prims_of_type("Camera")), {Sdf.Path("/World/Camera"), Sdf.Path("/World/Rig/Camera")}
+        )
+        self._stage.RemovePrim("/World/Rig")
+        self._stage.GetPrimAtPath("/World/Camera").SetActive(False)
+        self.assertEqual(self._index.get_prims_of_type("Camera"), [])
+        self.assertEqual(self._index.get_type_names(Sdf.Path("/World/Rig")), ())
+        added, removed = self._changes[-1]
+        self.assertFalse(added)
+        self.assertEqual(removed, {Sdf.Path("/World/Camera"), Sdf.Path("/World/Rig"), Sdf.Path("/World/Rig/Camera")})
+
+    async def test_prototypes_are_not_indexed(self):
+        robot_stage = self._define_robot_stage()
+        layer = robot_stage.GetRootLayer()
+        self._define_instance("/World/Robot_0", layer)
+        # Indexed from the traversal of attach, then from the resyncs of new instances and of their prototype
+        self._index.attach(self._stage)
+        self._define_instance("/World/Robot_1", layer)
+        self._define_instance("/World/Robot_2", layer)
+        UsdGeom.Camera.Define(robot_stage, "/Robot/Wrist/Camera")
+
+        self.assertTrue(self._stage.GetPrototypes())
+        cameras = self._index.get_prims_of_type("Camera")
+        self.assertEqual(cameras, [Sdf.Path("/World/Camera")])
+        for path in self._index.get_prims_of_type(UsdGeom.Xformable):
+            self.assertFalse(self._stage.GetPrimAtPath(path).IsInPrototype(), path)
+        # The instances themselves are indexed
+        self.assertIn(Sdf.Path("/World/Robot_2"), self._index.get_prims_of_type("Xform"))
+
+    async def test_release(self):
+        prim_index._PRIM_INDEX = self._index
+        release_prim_index()
+        self.assertIsNone(prim_index._PRIM_INDEX)
+        self.assertIsNone(self._index.stage)
+        self.assertEqual(self._index.get_prims_of_type("Camera"), [])
+
+        # Changes of the stage are no longer followed
+        changes = len(self._changes)
+        UsdGeom.Camera.Define(self._stage, "/World/Other")
+        self.assertEqual(self._index.get_prims_of_type("Camera"), [])
+        self.assertEqual(len(self._changes), changes)
+        release_prim_index()
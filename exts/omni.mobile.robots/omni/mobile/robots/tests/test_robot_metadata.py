@@ -0,0 +1,84 @@
+import numpy as np
+import omni.kit.test
+from unittest import mock
+from pxr import Usd, UsdGeom, UsdPhysics
+
+from omni.mobile.robots.logic.capture import robot_metadata
+from omni.mobile.robots.logic.capture.robot_metadata import RobotMetadata
+from omni.mobile.robots.logic.stage.prim_index import PrimIndex
+
+ROBOT_PATHS = ["/World/Robot", "/World/Fleet/Robot_01"]
+
+
+class _FakeArticulationView:
+    """Stands for the ArticulationView of Isaac Sim, with one degree of freedom more per robot"""
+
+    views = []
+
+    def __init__(self, prim_paths_expr: str, name: str, reset_xform_properties: bool = True):
+        self.prim_path = prim_paths_expr
+        self.name = name
+        self.physics_sim_view = None
+        self.index = ROBOT_PATHS.index(prim_paths_expr)
+        _FakeArticulationView.views.append(self)
+
+    def initialize(self, physics_sim_view=None):
+        self.physics_sim_view = physics_sim_view
+
+    def get_world_poses(self):
+        return np.array([[self.index, 1.0, 2.0]]), np.array([[1.0, 0.0, 0.0, 0.0]])
+
+    def get_joint_positions(self):
+        return np.full((1, self.index + 2), 0.5)
+
+
+class TestRobotMetadata(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.Xform.Define(self._stage, "/World")
+        for path in ROBOT_PATHS + ["/Robot"]:
+            UsdPhysics.ArticulationRootAPI.Apply(UsdGeom.Xform.Define(self._stage, path).GetPrim())
+        UsdGeom.Xform.Define(self._stage, "/World/Box")
+        self._index = PrimIndex()
+        self._index.attach(self._stage)
+        _FakeArticulationView.views = []
+
+    async def tearDown(self):
+        self._index.destroy()
+        self._stage = None
+
+    async def test_stage_articulations(self):
+        with mock.patch.object(robot_metadata, "get_prim_index", lambda: self._index):
+            # The articulations outside of the prim are left out
+            self.assertEqual(RobotMetadata.get_stage_articulations("/World"), sorted(ROBOT_PATHS))
+            self.assertEqual(RobotMetadata.get_stage_articulations("/World/Fleet"), ROBOT_PATHS[1:])
+            self.assertEqual(RobotMetadata.get_stage_articulations("/World/Box"), [])
+
+    async def test_streams(self):
+        metadata = RobotMetadata(ROBOT_PATHS)
+        with mock.patch.object(robot_metadata, "ArticulationView", _FakeArticulationView):
+            frames = [metadata(frame) for frame in range(2)]
+
+        # The views are bound once, on the first frame
+        self.assertEqual([view.prim_path for view in _FakeArticulationView.views], ROBOT_PATHS)
+        self.assertEqual(len({view.name for view in _FakeArticulationView.views}), 2)
+        self.assertEqual(
+            set(frames[0]),
+            {
+                "World_Robot.root_pose",
+                "World_Robot.joint_positions",
+                "World_Fleet_Robot_01.root_pose",
+                "World_Fleet_Robot_01.joint_positions",
+            },
+        )
+        root_pose = frames[1]["World_Fleet_Robot_01.root_pose"]
+        self.assertEqual(root_pose.dtype, np.float64)
+        np.testing.assert_array_equal(root_pose, [1.0, 1.0, 2.0, 1.0, 0.0, 0.0, 0.0])
+        # Every robot has its own number of degrees of freedom
+        self.assertEqual(frames[1]["World_Robot.joint_positions"].shape, (2,))
+        self.assertEqual(frames[1]["World_Fleet_Robot_01.joint_positions"].dtype, np.float32)
+        self.assertEqual(frames[1]["World_Fleet_Robot_01.joint_positions"].shape, (3,))
+
+    async def test_no_articulation(self):
+        with self.assertRaises(ValueError):
+            RobotMetadata([])
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import numpy as np
+import omni.kit.test
+from unittest import mock
+from pxr import Gf, Sdf, Usd, UsdGeom, UsdPhysics
+
+from omni.mobile.robots.params import ROBOT_SPAWNER_SETTINGS
+from omni.mobile.robots.logic.world.robot_spawner import RobotSpawner
+from omni.mobile.robots.logic.world.xform_utils import get_grid_positions
+
+NUM_LINKS = 6
+NUM_MESH_PRIMS = 4
+
+
+def _write_meshes(path: str, collision: bool = False):
+    """Visual or collision meshes of a link, as the robot usds of Isaac Sim reference them"""
+    stage = Usd.Stage.CreateNew(path)
+    root = UsdGeom.Xform.Define(stage, "/Meshes")
+    for index in range(NUM_MESH_PRIMS - 1):
+        mesh = UsdGeom.Mesh.Define(stage, f"/Meshes/mesh_{index}")
+        if collision:
+            UsdPhysics.CollisionAPI.Apply(mesh.GetPrim())
+    stage.SetDefaultPrim(root.GetPrim())
+    stage.Save()
+
+
+def _write_articulated_robot(folder: str) -> str:
+    """Robot whose links reference their visual and collision meshes, with a joint and a camera"""
+    _write_meshes(os.path.join(folder, "visuals.usda"))
+    _write_meshes(os.path.join(folder, "collisions.usda"), collision=True)
+    path = os.path.join(folder, "articulated_robot.usda")
+    stage = Usd.Stage.CreateNew(path)
+    root = UsdGeom.Xform.Define(stage, "/Robot")
+    UsdPhysics.ArticulationRootAPI.Apply(root.GetPrim())
+    for link in ["base_link", "wheel_link"]:
+        UsdPhysics.RigidBodyAPI.Apply(UsdGeom.Xform.Define(stage, f"/Robot/{link}").GetPrim())
+        for name in ["visuals", "collisions"]:
+            prim = UsdGeom.Xform.Define(stage, f"/Robot/{link}/{name}").GetPrim()
+            prim.GetReferences().AddReference(f"./{name}.usda")
+    # A referenced subtree with a camera, and one which is a collider itself, stay expanded
+    sensor = UsdGeom.Xform.Define(stage, "/Robot/base_link/sensor").GetPrim()
+    sensor.GetReferences().AddReference("./visuals.usda")
+    UsdGeom.Camera.Define(stage, "/Robot/base_link/sensor/camera")
+    bumper = UsdGeom.Xform.Define(stage, "/Robot/base_link/bumper").GetPrim()
+    bumper.GetReferences().AddReference("./visuals.usda")
+    UsdPhysics.CollisionAPI.Apply(bumper)
+    joint = UsdPhysics.RevoluteJoint.Define(stage, "/Robot/base_link/wheel_joint")
+    joint.CreateBody0Rel().SetTargets([Sdf.Path("/Robot/base_link")])
+    joint.CreateBody1Rel().SetTargets([Sdf.Path("/Robot/wheel_link")])
+    stage.SetDefaultPrim(root.GetPrim())
+    stage.Save()
+    return path
+
+
+class TestRobotSpawner(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        # A small robot: a root xform and a few links
+        usd_path = os.path.join(self._folder.name, "robot.usda")
+        robot_stage = Usd.Stage.CreateNew(usd_path)
+        root = UsdGeom.Xform.Define(robot_stage, "/Robot")
+        for index in range(NUM_LINKS):
+            UsdGeom.Cube.Define(robot_stage, f"/Robot/link_{index}")
+        robot_stage.SetDefaultPrim(root.GetPrim())
+        robot_stage.Save()
+
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.SetStageUpAxis(self._stage, UsdGeom.Tokens.z)
+        self._spawner = RobotSpawner(self._stage, usd_paths={"Husky": usd_path, "Husky + FR3": usd_path})
+
+    async def tearDown(self):
+        self._stage = None
+        self._folder.cleanup()
+
+    async def test_instances_share_one_prototype(self):
+        report = self._spawner.spawn("Husky", 50, instanceable=True)
+        paths = self._spawner.get_instance_paths("Husky")
+        self.assertEqual(report.num_instances, 50)
+        self.assertEqual([path.name for path in paths], [f"Husky_{index}" for index in range(50)])
+        self.assertEqual(len(self._stage.GetPrototypes()), 1)
+        for path in paths:
+            self.assertTrue(self._stage.GetPrimAtPath(path).IsInstance())
+        # The links are composed through the prototype, not expanded under every robot
+        link = self._stage.GetPrimAtPath(paths[7].AppendChild("link_3"))
+        self.assertTrue(link.IsInstanceProxy())
+        # The prototype prims are spawned once
+        self.assertAlmostEqual(report.prims_per_instance, (50 + 2 + 1 + NUM_LINKS) / 50)
+        self.assertGreaterEqual(report.spawn_time, 0.0)
+
+        report = self._spawner.spawn("Husky", 50, instanceable=True)
+        self.assertEqual(report.prims_per_instance, 1.0)
+        self.assertEqual(len(self._spawner.get_instance_paths("Husky")), 100)
+        self.assertEqual(len(self._stage.GetPrototypes()), 1)
+
+    async def test_expanded_robots(self):
+        # Robots are expanded by default, so their links are prims of the stage
+        report = self._spawner.spawn("Husky", 10)
+        self.assertEqual(len(self._stage.GetPrototypes()), 0)
+        link = self._stage.GetPrimAtPath(self._spawner.get_instance_paths("Husky")[3].AppendChild("link_3"))
+        self.assertTrue(link and not link.IsInstanceProxy())
+        self.assertAlmostEqual(report.prims_per_instance, (10 * (1 + NUM_LINKS) + 2 + 1 + NUM_LINKS) / 10)
+
+    async def test_instanceable_meshes(self):
+        spawner = RobotSpawner(self._stage, usd_paths={"Husky": _write_articulated_robot(self._folder.name)})
+        report = spawner.spawn("Husky", 10)
+        robot_path = spawner.get_instance_paths("Husky")[3]
+
+        # The physics and the sensors see the links, joints and cameras of every robot
+        for path in ["", "base_link", "base_link/wheel_joint", "base_link/sensor/camera", "base_link/bumper/mesh_0"]:
+            prim = self._stage.GetPrimAtPath(robot_path.AppendPath(path) if path else robot_path)
+            self.assertTrue(prim and not prim.IsInstanceProxy(), path)
+        # The visuals and collisions of all the links of all the robots share two prototypes
+        for link in ["base_link", "wheel_link"]:
+            for name in ["visuals", "collisions"]:
+                self.assertTrue(self._stage.GetPrimAtPath(robot_path.AppendPath(f"{link}/{name}")).IsInstance())
+        mesh = self._stage.GetPrimAtPath(robot_path.AppendPath("wheel_link/collisions/mesh_0"))
+        self.assertTrue(mesh.IsInstanceProxy() and mesh.HasAPI(UsdPhysics.CollisionAPI))
+        self.assertEqual(len(self._stage.GetPrototypes()), 2)
+
+        # Each instanced subtree adds one prim per robot, and to the prototype, instead of its meshes
+        self._stage = Usd.Stage.CreateInMemory()
+        spawner = RobotSpawner(self._stage, usd_paths=spawner._usd_paths)
+        with mock.patch.dict(ROBOT_SPAWNER_SETTINGS, {"instanceable_meshes": False}):
+            expanded_report = spawner.spawn("Husky", 10)
+        self.assertEqual(len(self._stage.GetPrototypes()), 0)
+        num_instanced_prims = 4 * (NUM_MESH_PRIMS - 1) * (10 + 1)
+        self.assertAlmostEqual(expanded_report.prims_per_instance - report.prims_per_instance, num_instanced_prims / 10)
+
+    async def test_poses(self):
+        self._spawner.spawn("Husky", 5, spacing=3.0)
+        orientations = np.tile([[0.0, 0.0, 0.0, 1.0]], (2, 1))
+        self._spawner.spawn("Husky + FR3", 2, positions=[[1.0, 2.0, 0.0], [4.0, 5.0, 0.0]], orientations=orientations)
+
+        expected = get_grid_positions(5, 3.0)
+        for path, position in zip(self._spawner.get_instance_paths("Husky"), expected):
+            transform = UsdGeom.Xformable(self._stage.GetPrimAtPath(path)).ComputeLocalToWorldTransform(0)
+            np.testing.assert_allclose(transform.ExtractTranslation(), position)
+        path = self._spawner.get_instance_paths("Husky + FR3")[1]
+        self.assertEqual(path.name, "Husky_FR3_1")
+        transform = UsdGeom.Xformable(self._stage.GetPrimAtPath(path)).ComputeLocalToWorldTransform(0)
+        np.testing.assert_allclose(transform.ExtractTranslation(), [4.0, 5.0, 0.0])
+        self.assertTrue(Gf.IsClose(transform.ExtractRotationQuat().GetImaginary(), Gf.Vec3d(0, 0, 1), 1e-9))
+
+    async def test_clear(self):
+        self._spawner.spawn("Husky", 3)
+        self._spawner.spawn("Husky + FR3", 2)
+        self._spawner.clear("Husky")
+        self.assertEqual(self._spawner.get_instance_paths("Husky"), [])
+        self.assertEqual(len(self._spawner.get_instance_paths("Husky + FR3")), 2)
+
+        # A new spawner carries on the numbering of the robots of the stage
+        spawner = RobotSpawner(self._stage, usd_paths={"Husky + FR3": self._spawner._usd_paths["Husky + FR3"]})
+        spawner.spawn("Husky + FR3", 1)
+        self.assertEqual(spawner.get_instance_paths("Husky + FR3")[-1].name, "Husky_FR3_2")
+
+        spawner.clear()
+        self.assertFalse(self._stage.GetPrimAtPath(spawner.root_path))
+        with self.assertRaises(ValueError):
+            spawner.spawn("WeCAR", 1)
@@ -0,0 +1,89 @@
+import numpy as np
+import omni.kit.test
+from pxr import Gf, Sdf, Usd, UsdGeom
+
+from omni.mobile.robots.logic.world.scene_cloner import SceneCloner
+
+ROOT_PATH = "/World/envs"
+
+
+def _define_asset_layer(type_name: str) -> Sdf.Layer:
+    """Anonymous usd with a default prim of the given type, referenced by the copies"""
+    stage = Usd.Stage.Open(Sdf.Layer.CreateAnonymous(".usda"))
+    root = UsdGeom.Xform.Define(stage, "/Root")
+    stage.DefinePrim("/Root/Geometry", type_name)
+    stage.SetDefaultPrim(root.GetPrim())
+    return stage.GetRootLayer()
+
+
+class TestSceneCloner(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.SetStageUpAxis(self._stage, UsdGeom.Tokens.z)
+        UsdGeom.Xform.Define(self._stage, "/World")
+        self._env_layer = _define_asset_layer("Cube")
+        self._robot_layer = _define_asset_layer("Sphere")
+        self._cloner = SceneCloner(self._stage, ROOT_PATH)
+
+    async def tearDown(self):
+        self._stage = None
+
+    def _get_translation(self, path: Sdf.Path) -> Gf.Vec3d:
+        return self._stage.GetPrimAtPath(path).GetAttribute("xformOp:translate").Get()
+
+    async def test_clone(self):
+        env_paths = self._cloner.clone(self._env_layer.identifier, 6, spacing=10.0)
+
+        self.assertEqual(env_paths, [Sdf.Path(f"{ROOT_PATH}/env_{index}") for index in range(6)])
+        self.assertEqual(self._cloner.get_env_paths(), env_paths)
+        positions = self._cloner.get_grid_positions(6, 10.0)
+        for env_path, position in zip(env_paths, positions):
+            prim = self._stage.GetPrimAtPath(env_path)
+            self.assertEqual(prim.GetTypeName(), "Xform")
+            self.assertEqual(UsdGeom.Xformable(prim).GetXformOpOrderAttr().Get(), ["xformOp:translate"])
+            np.testing.assert_allclose(self._get_translation(env_path), position)
+            environment = prim.GetChild(SceneCloner.ENVIRONMENT_NAME)
+            self.assertTrue(environment.IsInstance())
+            self.assertFalse(prim.GetChild(SceneCloner.ROBOT_NAME))
+
+        # The instanceable copies share one prototype
+        self.assertEqual(len(self._stage.GetPrototypes()), 1)
+        self.assertEqual(self._stage.GetPrimAtPath(f"{ROOT_PATH}/env_5/Environment/Geometry").GetTypeName(), "Cube")
+
+    async def test_clone_robots(self):
+        self._cloner.clone(self._env_layer.identifier, 4, robot_usd_path=self._robot_layer.identifier)
+        for env_path in self._cloner.get_env_paths():
+            robot = self._stage.GetPrimAtPath(env_path.AppendChild(SceneCloner.ROBOT_NAME))
+            self.assertFalse(robot.IsInstance())
+            self.assertEqual(robot.GetChild("Geometry").GetTypeName(), "Sphere")
+
+        self._cloner.clear()
+        self._cloner.clone(
+            self._env_layer.identifier, 4, robot_usd_path=self._robot_layer.identifier, instanceable_robots=True
+        )
+        robot = self._stage.GetPrimAtPath(f"{ROOT_PATH}/env_3/Robot")
+        self.assertTrue(robot.IsInstance())
+        self.assertEqual(len(self._stage.GetPrototypes()), 2)
+
+    async def test_clone_twice_needs_clear(self):
+        self._cloner.clone(self._env_layer.identifier, 2)
+        with self.assertRaises(Exception):
+            self._cloner.clone(self._env_layer.identifier, 2)
+
+        self._cloner.clear()
+        self.assertFalse(self._stage.GetPrimAtPath(ROOT_PATH))
+        self.assertEqual(self._cloner.get_env_paths(), [])
+        self.assertEqual(len(self._cloner.clone(self._env_layer.identifier, 3)), 3)
+        self._cloner.clear()
+        # Clearing an empty root does nothing
+        self._cloner.clear()
+
+    async def test_clone_nothing(self):
+        self.assertEqual(self._cloner.clone(self._env_layer.identifier, 0), [])
+        self.assertFalse(self._stage.GetPrimAtPath(ROOT_PATH))
+
+    async def test_grid_follows_up_axis(self):
+        UsdGeom.SetStageUpAxis(self._stage, UsdGeom.Tokens.y)
+        self._cloner.clone(self._env_layer.identifier, 4, spacing=2.0)
+        translations = [self._get_translation(path) for path in self._cloner.get_env_paths()]
+        np.testing.assert_allclose(translations, [[-1, 0, -1], [1, 0, -1], [-1, 0, 1], [1, 0, 1]])
@@ -0,0 +1,37 @@
+import sys
+import carb.settings
+import omni.kit.app
+import omni.kit.test
+
+from omni.mobile.robots.extension import STARTUP_TIME_SETTING_PATH, STARTUP_BUDGET_SETTING_PATH
+from omni.mobile.robots.ui.ui_window import WidgetWindow, WINDOW_SECTIONS
+
+
+class TestStartup(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._window = None
+
+    async def tearDown(self):
+        if self._window is not None:
+            self._window.destroy()
+            self._window = None
+
+    async def test_startup_time_within_budget(self):
+        settings = carb.settings.get_settings()
+        startup_time = settings.get(STARTUP_TIME_SETTING_PATH)
+        self.assertIsNotNone(startup_time, "The startup time of the extension has not been recorded")
+        self.assertLess(startup_time, settings.get(STARTUP_BUDGET_SETTING_PATH))
+
+    async def test_sections_are_built_on_first_expand(self):
+        self._window = WidgetWindow("Mobile Simulator Startup Test", width=260, height=270)
+        await omni.kit.app.get_app().next_update_async()
+
+        sections = self._window.sections
+        self.assertEqual(len(sections), len(WINDOW_SECTIONS))
+        self.assertFalse(any(section.is_built for section in sections))
+
+        sections[0].frame.collapsed = False
+        await omni.kit.app.get_app().next_update_async()
+        self.assertTrue(sections[0].is_built)
+        self.assertIn(WINDOW_SECTIONS[0][2], sys.modules)
+        self.assertFalse(any(section.is_built for section in sections[1:]))
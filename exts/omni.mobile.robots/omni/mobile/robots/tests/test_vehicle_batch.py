@@ -0,0 +1,114 @@
+import time
+import numpy as np
+import omni.kit.test
+
+from omni.mobile.robots.logic.vehicles.vehicle_batch import STEER, VX, VehicleBatch, YAW_RATE
+from omni.mobile.robots.logic.vehicles.vehicle_spec import VEHICLE_SPECS
+
+DT = 1.0 / 250.0
+
+
+class TestVehicleBatch(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._husky = VEHICLE_SPECS["Husky"]
+        self._wecar = VEHICLE_SPECS["WeCAR"]
+
+    async def test_straight_line(self):
+        batch = VehicleBatch(["Husky", "WeCAR"], dynamic=False)
+        batch.reset(poses=np.array([[0.0, 0.0, 0.0], [1.0, 2.0, np.pi / 2]]))
+        for _ in range(250):
+            batch.step(np.array([[0.5, 0.0], [0.5, 0.0]]), DT)
+        np.testing.assert_allclose(batch.poses, [[0.5, 0.0, 0.0], [1.0, 2.5, np.pi / 2]], atol=1e-9)
+
+    async def test_kinematic_turning_radius(self):
+        steer = 0.3
+        rear_radius = self._wecar.wheelbase / np.tan(steer)
+        batch = VehicleBatch(["Husky", "WeCAR"], dynamic=False)
+        commands = np.array([[0.5, 0.5], [0.5, steer]])
+        # Half a turn of the Husky, a radius of 1 m
+        for _ in range(int(round(np.pi / 0.5 / DT))):
+            batch.step(commands, DT)
+        self.assertAlmostEqual(batch.poses[0, 1], 2.0, places=2)
+        # The WeCAR turns around a point of its rear axle line, at wheelbase / tan(steer)
+        self.assertAlmostEqual(batch.state[1, YAW_RATE], 0.5 / rear_radius)
+
+        batch.reset()
+        for _ in range(int(round(2.0 * np.pi * rear_radius / 0.5 / DT))):
+            batch.step(commands, DT)
+        # Back to the start after a full circle
+        np.testing.assert_allclose(batch.poses[1], [0.0, 0.0, 0.0], atol=0.01)
+
+    async def test_limits(self):
+        batch = VehicleBatch(["Husky", "WeCAR"], dynamic=True)
+        batch.step(np.array([[10.0, 10.0], [10.0, 10.0]]), DT)
+        # The acceleration and steering rate limits apply first
+        self.assertAlmostEqual(batch.state[0, VX], self._husky.max_accel * DT)
+        self.assertAlmostEqual(batch.state[1, STEER], self._wecar.max_steer_rate * DT)
+        for _ in range(1000):
+            batch.step(np.array([[10.0, 10.0], [10.0, 10.0]]), DT)
+        self.assertAlmostEqual(batch.state[0, VX], self._husky.max_speed)
+        self.assertAlmostEqual(batch.state[0, YAW_RATE], self._husky.max_yaw_rate)
+        self.assertAlmostEqual(batch.state[1, VX], self._wecar.max_speed)
+        self.assertAlmostEqual(batch.state[1, STEER], self._wecar.max_steer)
+
+    async def test_mixed_batch_matches_single_vehicles(self):
+        names = ["Husky", "WeCAR", "Husky + FR3", "WeCAR", "Husky"]
+        rng = np.random.default_rng(0)
+        commands = rng.uniform(-1.0, 1.0, size=(200, len(names), 2))
+        batch = VehicleBatch(names)
+        singles = [VehicleBatch([name]) for name in names]
+        for step_commands in commands:
+            batch.step(step_commands, DT)
+            for index, single in enumerate(singles):
+                single.step(step_commands[index:index + 1], DT)
+        np.testing.assert_allclose(batch.state, np.concatenate([single.state for single in singles]), atol=1e-12)
+
+    async def test_dynamic_ackermann_slips(self):
+        kinematic = VehicleBatch(["WeCAR"], dynamic=False)
+        dynamic = VehicleBatch(["WeCAR"], dynamic=True)
+        commands = np.array([[2.0, 0.3]])
+        for _ in range(1000):
+            kinematic.step(commands, DT)
+            dynamic.step(commands, DT)
+        # The understeering car turns less than its kinematic model, and settles on a steady turn
+        self.assertTrue(np.isfinite(dynamic.state).all())
+        self.assertLess(dynamic.state[0, YAW_RATE], kinematic.state[0, YAW_RATE])
+        self.assertGreater(dynamic.state[0, YAW_RATE], 0.5 * kinematic.state[0, YAW_RATE])
+        previous = dynamic.state[0, YAW_RATE]
+        dynamic.step(commands, DT)
+        self.assertAlmostEqual(dynamic.state[0, YAW_RATE], previous, places=6)
+
+    async def test_wheel_commands(self):
+        batch = VehicleBatch(["Husky", "WeCAR"], dynamic=False)
+        batch.step(np.array([[0.5, 0.4], [1.0, 0.0]]), DT)
+        wheel_velocities, steering_angles = batch.get_wheel_commands()
+
+        half_track = 0.5 * self._husky.skid_factor * self._husky.track_width
+        left, right = (0.5 - 0.4 * half_track) / self._husky.wheel_radius, (0.5 + 0.4 * half_track) / self._husky.wheel_radius
+        np.testing.assert_allclose(wheel_velocities[0], [left, right, left, right])
+        np.testing.assert_allclose(steering_angles[0], [0.0, 0.0])
+        np.testing.assert_allclose(wheel_velocities[1], np.full(4, 1.0 / self._wecar.wheel_radius))
+
+        batch.step(np.array([[0.5, 0.4], [1.0, 0.3]]), DT)
+        _, steering_angles = batch.get_wheel_commands()
+        # The inner wheel turns more
+        self.assertGreater(steering_angles[1, 0], 0.3)
+        self.assertLess(steering_angles[1, 1], 0.3)
+
+    async def test_large_batch(self):
+        names = ["Husky", "WeCAR", "Husky + FR3"] * 1000
+        batch = VehicleBatch(names)
+        commands = np.tile([[0.5, 0.2]], (len(names), 1))
+        batch.step(commands, DT)
+        start = time.perf_counter()
+        for _ in range(100):
+            batch.step(commands, DT)
+        self.assertEqual(batch.state.shape, (3000, 7))
+        # A few numpy operations per step, far below a physics step of a python loop over 3000 robots
+        self.assertLess((time.perf_counter() - start) / 100, 0.01)
+
+    async def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            VehicleBatch(["Husky", "Tank"])
+        with self.assertRaises(ValueError):
+            VehicleBatch(["Husky"]).step(np.zeros((2, 2)), DT)
@@ -0,0 +1,98 @@
+import os
+import asyncio
+import tempfile
+import threading
+import numpy as np
+import omni.kit.test
+
+from omni.mobile.robots.logic.capture.video_stream import VideoStreamEncoder
+
+NUM_FRAMES = 12
+
+
+class _RecordingEncodingInterface:
+    """Stands for the omni.videoencoding interface, recording what the encoder is given"""
+
+    def __init__(self, release: threading.Event = None):
+        self.started = []
+        self.frames = []
+        self.finalized = 0
+        self._release = release
+
+    def start_encoding(self, path, fps, num_frames, overwrite):
+        self.started.append((path, fps, num_frames, overwrite))
+        return True
+
+    def encode_next_frame_from_buffer(self, frame, width, height):
+        if self._release is not None:
+            self._release.wait()
+        self.frames.append((frame.copy(), width, height))
+
+    def finalize_encoding(self):
+        self.finalized += 1
+
+
+class TestVideoStream(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._folder.name, "video", "capture.mp4")
+        rng = np.random.default_rng(0)
+        self._frames = [rng.integers(0, 255, size=(32, 48, 4), dtype=np.uint8) for _ in range(NUM_FRAMES)]
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    async def test_frames_are_encoded_in_order(self):
+        interface = _RecordingEncodingInterface()
+        encoder = VideoStreamEncoder(self._path, 30.0, NUM_FRAMES, max_queue_size=2, interface=interface)
+        for frame in self._frames:
+            await encoder.put_async(frame)
+        await encoder.close_async()
+
+        self.assertEqual(interface.started, [(self._path, 30.0, NUM_FRAMES, True)])
+        self.assertEqual(interface.finalized, 1)
+        self.assertEqual(encoder.encoded, NUM_FRAMES)
+        self.assertEqual(encoder.failed, 0)
+        self.assertGreater(encoder.encode_time, 0.0)
+        self.assertFalse(encoder.is_encoding)
+        for (encoded, width, height), frame in zip(interface.frames, self._frames):
+            self.assertEqual((width, height), (48, 32))
+            np.testing.assert_array_equal(encoded, frame)
+
+    async def test_rgb_frames_are_converted(self):
+        interface = _RecordingEncodingInterface()
+        encoder = VideoStreamEncoder(self._path, 30.0, 1, interface=interface)
+        await encoder.put_async(self._frames[0][:, :, :3])
+        await encoder.close_async()
+
+        encoded = interface.frames[0][0]
+        self.assertEqual(encoded.shape, (32, 48, 4))
+        np.testing.assert_array_equal(encoded[:, :, :3], self._frames[0][:, :, :3])
+        self.assertTrue(np.all(encoded[:, :, 3] == 255))
+
+    async def test_single_stream(self):
+        encoder = VideoStreamEncoder(self._path, 30.0, 1, interface=_RecordingEncodingInterface())
+        encoder.start()
+        other = VideoStreamEncoder(self._path + ".2.mp4", 30.0, 1, interface=_RecordingEncodingInterface())
+        with self.assertRaises(RuntimeError):
+            other.start()
+        await encoder.close_async()
+
+        # The encoder is free again once the first stream is written
+        other.start()
+        await other.close_async()
+
+    async def test_backpressure(self):
+        release = threading.Event()
+        interface = _RecordingEncodingInterface(release)
+        encoder = VideoStreamEncoder(self._path, 30.0, NUM_FRAMES, max_queue_size=1, interface=interface)
+        encoder.start()
+        # The encoder thread holds one frame and the queue one more, so the third frame has to wait
+        puts = [asyncio.ensure_future(encoder.put_async(frame)) for frame in self._frames[:3]]
+        await asyncio.sleep(0.1)
+        self.assertFalse(puts[2].done())
+
+        release.set()
+        await asyncio.gather(*puts)
+        await encoder.close_async()
+        self.assertEqual(encoder.encoded, 3)
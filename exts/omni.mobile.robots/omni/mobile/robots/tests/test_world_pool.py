@@ -0,0 +1,54 @@
+import omni.kit.test
+from pxr import Usd, UsdGeom
+
+from omni.mobile.robots.logic.world.world_pool import WorldPool
+
+SERVER_URL = "omniverse://server/Isaac/Environments/Simple_Warehouse/warehouse.usd"
+OTHER_SERVER_URL = "omniverse://other/Projects/Simple_Warehouse/warehouse.usd"
+
+
+class TestWorldPool(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.Xform.Define(self._stage, "/World")
+        self._pool = WorldPool("/World/EnvPool", max_worlds=3, max_size=100)
+        self._pool.bind(self._stage)
+
+    async def tearDown(self):
+        self._pool.clear()
+        self._stage = None
+
+    def _add(self, usd_path: str, size: int = 10) -> str:
+        key = self._pool.get_key(usd_path)
+        prim = self._stage.DefinePrim(self._pool.get_prim_path(key), "Xform")
+        self._pool.add(key, prim, [], size)
+        return key
+
+    async def test_same_file_name_on_different_servers(self):
+        key = self._add(SERVER_URL)
+        other_key = self._add(OTHER_SERVER_URL)
+
+        self.assertNotEqual(key, other_key)
+        self.assertNotEqual(self._pool.get_prim_path(key), self._pool.get_prim_path(other_key))
+        self.assertEqual(len(self._pool), 2)
+        self.assertTrue(self._pool.get_prim_path(key).name.startswith("warehouse_"))
+        self.assertEqual(self._pool.activate(key).GetPath(), self._pool.get_prim_path(key))
+        self.assertFalse(self._stage.GetPrimAtPath(self._pool.get_prim_path(other_key)).IsActive())
+
+    async def test_local_paths_are_absolute(self):
+        self.assertEqual(self._pool.get_key("warehouse.usd"), self._pool.get_key("./warehouse.usd"))
+        self.assertNotEqual(self._pool.get_key("warehouse.usd"), self._pool.get_key("/tmp/warehouse.usd"))
+
+    async def test_eviction(self):
+        keys = [self._add(f"omniverse://server/Environments/env_{index}.usd", size=40) for index in range(3)]
+        # 120 bytes do not fit in the pool, the least recently used environment is evicted
+        self.assertNotIn(keys[0], self._pool)
+        self.assertEqual(self._pool.active_key, keys[2])
+        self.assertEqual(self._pool.size, 80)
+        self.assertFalse(self._stage.GetPrimAtPath(self._pool.get_prim_path(keys[0])))
+        self.assertIsNone(self._pool.activate(keys[0]))
+
+        # A key whose primitive was removed from the stage is forgotten
+        self._stage.RemovePrim(self._pool.get_prim_path(keys[1]))
+        self.assertIsNone(self._pool.activate(keys[1]))
+        self.assertEqual(len(self._pool), 1)
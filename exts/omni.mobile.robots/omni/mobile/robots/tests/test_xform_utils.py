@@ -0,0 +1,84 @@
+import numpy as np
+import omni.kit.test
+from pxr import Gf, Sdf, Usd, UsdGeom
+
+from omni.mobile.robots.logic.world.xform_utils import get_grid_positions, set_prim_poses, write_xform_specs
+
+NUM_PRIMS = 5
+
+
+class TestXformUtils(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        UsdGeom.Xform.Define(self._stage, "/World")
+        self._paths = [Sdf.Path(f"/World/Prim_{index}") for index in range(NUM_PRIMS)]
+        for path in self._paths:
+            UsdGeom.Xform.Define(self._stage, path)
+        self._positions = np.arange(NUM_PRIMS * 3, dtype=np.float64).reshape(NUM_PRIMS, 3)
+
+    async def tearDown(self):
+        self._stage = None
+
+    def _get_ops(self, path: Sdf.Path):
+        return [op.GetOpName() for op in UsdGeom.Xformable(self._stage.GetPrimAtPath(path)).GetOrderedXformOps()]
+
+    async def test_grid_positions(self):
+        positions = get_grid_positions(4, 2.0)
+        np.testing.assert_allclose(positions, [[-1, -1, 0], [1, -1, 0], [-1, 1, 0], [1, 1, 0]])
+        np.testing.assert_allclose(get_grid_positions(4, 2.0, UsdGeom.Tokens.y)[:, [0, 2]], positions[:, :2])
+
+        # An incomplete last row is still centered on the grid
+        positions = get_grid_positions(5, 1.0)
+        self.assertEqual(positions.shape, (5, 3))
+        np.testing.assert_allclose(positions[:3, 0], [-1.0, 0.0, 1.0])
+        np.testing.assert_allclose(positions[:, 1], [-0.5, -0.5, -0.5, 0.5, 0.5])
+        self.assertEqual(get_grid_positions(0, 1.0).shape, (0, 3))
+
+    async def test_write_xform_specs(self):
+        layer = self._stage.GetRootLayer()
+        orientations = np.tile([0.0, 0.0, 0.0, 1.0], (NUM_PRIMS, 1))
+        scales = np.full((NUM_PRIMS, 3), 2.0)
+        write_xform_specs(layer, self._paths, self._positions, orientations, scales)
+
+        for path, position in zip(self._paths, self._positions):
+            self.assertEqual(self._get_ops(path), ["xformOp:translate", "xformOp:orient", "xformOp:scale"])
+            prim = self._stage.GetPrimAtPath(path)
+            np.testing.assert_allclose(prim.GetAttribute("xformOp:translate").Get(), position)
+            self.assertEqual(prim.GetAttribute("xformOp:orient").Get(), Gf.Quatd(0.0, 0.0, 0.0, 1.0))
+            self.assertEqual(prim.GetAttribute("xformOp:scale").Get(), Gf.Vec3d(2.0, 2.0, 2.0))
+
+        # Specs are created for primitives which do not exist yet
+        write_xform_specs(layer, ["/World/New"], positions=[[1.0, 2.0, 3.0]])
+        self.assertEqual(self._get_ops(Sdf.Path("/World/New")), ["xformOp:translate"])
+
+    async def test_write_nothing_and_bad_shapes(self):
+        layer = self._stage.GetRootLayer()
+        write_xform_specs(layer, self._paths)
+        self.assertEqual(self._get_ops(self._paths[0]), [])
+        with self.assertRaises(ValueError):
+            write_xform_specs(layer, self._paths, positions=np.zeros((NUM_PRIMS, 4)))
+
+    async def test_existing_ops_are_reused(self):
+        # An op stack authored with the Usd API, with float precision
+        xformable = UsdGeom.Xformable(self._stage.GetPrimAtPath(self._paths[0]))
+        xformable.AddTranslateOp(UsdGeom.XformOp.PrecisionFloat)
+        xformable.AddRotateXYZOp()
+
+        for _ in range(3):
+            set_prim_poses(self._stage, self._paths, positions=self._positions)
+        self.assertEqual(self._get_ops(self._paths[0]), ["xformOp:translate", "xformOp:rotateXYZ"])
+        self.assertEqual(self._get_ops(self._paths[1]), ["xformOp:translate"])
+        translate = self._stage.GetPrimAtPath(self._paths[0]).GetAttribute("xformOp:translate")
+        self.assertEqual(translate.GetTypeName(), Sdf.ValueTypeNames.Float3)
+        self.assertEqual(translate.Get(), Gf.Vec3f(0.0, 1.0, 2.0))
+
+        # The orientation goes after the translation, the scale last
+        set_prim_poses(self._stage, self._paths[:1], scales=[[1.0, 1.0, 1.0]], orientations=[[1.0, 0.0, 0.0, 0.0]])
+        self.assertEqual(
+            self._get_ops(self._paths[0]),
+            ["xformOp:translate", "xformOp:orient", "xformOp:rotateXYZ", "xformOp:scale"],
+        )
+
+    async def test_missing_prim(self):
+        with self.assertRaises(ValueError):
+            set_prim_poses(self._stage, ["/World/Missing"], positions=[[0.0, 0.0, 0.0]])
@@ -10,7 +10,7 @@ import asyncio
 from abc import abstractmethod
 from omni.isaac.core import World
 from omni.isaac.core.scenes.scene import Scene
-from omni.isaac.core.utils.nucleus import get_assets_root_path
+from omni.mobile.robots.params import _get_assets_root_path
 from omni.isaac.core.utils.stage import create_new_stage_async, update_stage_async
 
 
@@ -34,7 +34,7 @@ class UIFunction:
         return World.instance()
     
     def asset_server(self, asset_path):
-        asset_root_path = get_assets_root_path()
+        asset_root_path = _get_assets_root_path()
         if asset_root_path is None:
             carb.log_error("Could not find Isaac Sim assets folder")
             return
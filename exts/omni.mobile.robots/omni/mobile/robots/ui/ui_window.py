@@ -2,51 +2,98 @@ __all__ = ["WidgetWindow"]
 
 
 # Omniverse general API
+import time
 import carb
-import numpy as np
+import importlib
 import omni.ui as ui
 from omni.mobile.robots.ui.styles import style
-from omni.mobile.robots.ui.widgets.world_framework import world_selection_widget
-from omni.mobile.robots.ui.widgets.robot_framework import robot_selection_widget
-from omni.mobile.robots.ui.widgets.learning_framework import learning_framework_widget
-from omni.mobile.robots.ui.widgets.scene_capture import capture_settings_widget
+
+
+# Sections of the window as (title, frame name, module, widget class). The module of a section is only imported, and
+# its widget only created, when the section is expanded for the first time
+WINDOW_SECTIONS = [
+    # ("WORLD LAYOUT", "env_frame", "omni.mobile.robots.ui.widgets.world_framework.world_selection_widget", "WorldSelectionWidget"),
+    ("ROBOT LAYOUT", "robot_selection", "omni.mobile.robots.ui.widgets.robot_framework.robot_selection_widget", "RobotSelectionWidget"),
+    ("RECORDING LAYOUT", "robot_selection", "omni.mobile.robots.ui.widgets.scene_capture.capture_settings_widget", "MovieCaptureWidget"),
+    ("LEARNING LAYOUT", "learning_layout", "omni.mobile.robots.ui.widgets.learning_framework.learning_framework_widget", "LearningFrameworkWidget"),
+]
+
+
+class LazySection:
+    """Collapsed frame whose widget is imported, created and built the first time the frame is expanded"""
+
+    def __init__(self, title: str, name: str, module_name: str, class_name: str):
+        self._module_name = module_name
+        self._class_name = class_name
+        self._widget = None
+
+        self.frame = ui.CollapsableFrame(
+            title=title, name=name, collapsed=True, collapsed_changed_fn=self._on_collapsed_changed
+        )
+        with self.frame:
+            self._content = ui.Frame()
+
+    @property
+    def widget(self):
+        return self._widget
+
+    @property
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def build(self):
+        if self._widget is not None:
+            return
+        start = time.perf_counter()
+        module = importlib.import_module(self._module_name)
+        self._widget = getattr(module, self._class_name)()
+        self._content.set_build_fn(self._widget._build_content)
+        self._content.rebuild()
+        carb.log_info(f"{self._class_name} built in {(time.perf_counter() - start) * 1000.0:.1f} ms")
+
+    def destroy(self):
+        if self._widget is not None and hasattr(self._widget, "destroy"):
+            self._widget.destroy()
+        self._widget = None
+        self._content = None
+        self.frame = None
+
+    def _on_collapsed_changed(self, collapsed: bool):
+        if not collapsed:
+            self.build()
 
 
 class WidgetWindow(ui.Window):
     def __init__(self, title: str, **kwargs) -> None:
         super().__init__(title, **kwargs)
-        
-        self._world_selection_widget = world_selection_widget.WorldSelectionWidget()
-        self._robot_selection_widget = robot_selection_widget.RobotSelectionWidget()
-        self._movie_capture_widget = capture_settings_widget.MovieCaptureWidget()
-        self._learning_widget = learning_framework_widget.LearningFrameworkWidget()
-        
+
+        self._sections = []
+
         self._build_window()
-        
+
+    @property
+    def sections(self):
+        return list(self._sections)
+
     def _build_window(self):
         with self.frame:
             self.frame.style = style.julia_modeler_style
             with ui.ScrollingFrame():
-                
+
                 self.task_desc_ui = ui.StringField(height=20, style={ "margin_height": 2})
                 self.task_desc_ui.model.set_value(" Welcome to Mobile Simulator!")
-                
+
                 # Vertical Stack of menus
                 with ui.VStack(height=0):
-                    
-                    # Create a frame for selecting which scene to load
-                    # self._world_selection_widget._main_ui()
                     ui.Spacer(height=5)
-                    
-                    # Create a frame for selecting which vehicle to load in the simulation environment
-                    self._robot_selection_widget._select_robot()
-                    ui.Spacer(height=5)
-                    
-                    # Create a frame for selecting the camera position, and what it should point torwards to
-                    self._movie_capture_widget._build_ui_capture_settings()
-                    ui.Spacer(height=5)
-                    
-                    self._learning_widget._main_ui()
-                    ui.Spacer(height=5)
-    
-                
\ No newline at end of file
+
+                    # Robot selection, movie capture and learning frames, built on demand
+                    for title, name, module_name, class_name in WINDOW_SECTIONS:
+                        self._sections.append(LazySection(title, name, module_name, class_name))
+                        ui.Spacer(height=5)
+
+    def destroy(self):
+        for section in self._sections:
+            section.destroy()
+        self._sections = []
+        super().destroy()
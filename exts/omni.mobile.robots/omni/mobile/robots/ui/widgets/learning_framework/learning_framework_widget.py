@@ -39,13 +39,17 @@ class LearningFrameworkWidget():
         """
         
         with ui.CollapsableFrame(title=self._title, name="learning_layout"):
-            with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
-                ui.Line(style_type_name_override="HeaderLine")
-                ui.Spacer(height = 0)   # 5
+            self._build_content()
 
-                self._task_setup_ui()
+    def _build_content(self):
+        """Content of the learning frame, built when the frame is first expanded"""
+        with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
+            ui.Line(style_type_name_override="HeaderLine")
+            ui.Spacer(height = 0)   # 5
+
+            self._task_setup_ui()
                             
-                ui.Spacer(height=self._spacing)
+            ui.Spacer(height=self._spacing)
     
     def _task_setup_ui(self):
         with ui.HStack():
@@ -11,6 +11,7 @@ import carb
 import omni
 import omni.ui as ui
 from omni.mobile.robots.params import ROBOT_ENVIRONMENTS, ROBOT_THUMBNAIL, default_file_path, RECORD_TYPE
+from omni.mobile.robots.logic.world.robot_spawner import RobotSpawner
 from omni.mobile.robots.ui.widgets.custom_multifield_widget import CustomMultifieldWidget
 from omni.mobile.robots.ui.widgets.custom_env_combo_widget import EnvComboboxWidget, RobotComboboxWidget, RecordEnvComboboxWidget
 
@@ -23,6 +24,9 @@ class RobotSelectionWidget:
         self._button_height = 40    # 40
         
         self._title = "ROBOT LAYOUT"
+        self._spawner = None
+        self._robot_count_field = None
+        self._spawn_status_label = None
         
     def _select_robot(self):
         """
@@ -32,46 +36,82 @@ class RobotSelectionWidget:
         """
         
         with ui.CollapsableFrame(title=self._title, name="robot_selection"):
-            with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
-                ui.Line(style_type_name_override="HeaderLine")
-                ui.Spacer(height = 0)   # 5
+            self._build_content()
+
+    def _build_content(self):
+        """Content of the robot frame, built when the frame is first expanded"""
+        with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
+            ui.Line(style_type_name_override="HeaderLine")
+            ui.Spacer(height = 0)   # 5
                 
-                self.robot_type_ui = RobotComboboxWidget(label="Robot (", options=ROBOT_ENVIRONMENTS)
+            self.robot_type_ui = RobotComboboxWidget(label="Robot (", options=ROBOT_ENVIRONMENTS)
+
+            with ui.HStack():
+                ui.Label("Robots: ", width=self._label_padding)
+                self._robot_count_field = ui.IntField(height=0)
+                self._robot_count_field.model.set_value(1)
                 
-                with ui.HStack():
-                    # Add a thumbnail image to have a preview of the world that is about to be loaded
-                    with ui.ZStack(width=self._label_padding, height=self._button_height * 2):
-                        ui.Rectangle()
-                        ui.Image(
-                            ROBOT_THUMBNAIL,
-                            name="thumbnail", 
-                            fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP,
-                            alignment=ui.Alignment.LEFT_CENTER,
-                        )
+            with ui.HStack():
+                # Add a thumbnail image to have a preview of the world that is about to be loaded
+                with ui.ZStack(width=self._label_padding, height=self._button_height * 2):
+                    ui.Rectangle()
+                    ui.Image(
+                        ROBOT_THUMBNAIL,
+                        name="thumbnail", 
+                        fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP,
+                        alignment=ui.Alignment.LEFT_CENTER,
+                    )
                     
-                    ui.Spacer(width=self._spacing)
+                ui.Spacer(width=self._spacing)
                                         
-                    with ui.VStack(spacing=0):
-                        ui.Button("Load Robot", width=200, height=40, name="load_button", style={ "color": "lightblue"},
-                                #   clicked_fn=,
-                                    )
-                        # Button for loading a desired scene
-                        ui.Button("Clear Robot", width=200, height=40, name="load_button", style={ "color": "lightblue"},
-                                  #   clicked_fn=,
-                                    )
+                with ui.VStack(spacing=0):
+                    ui.Button("Load Robot", width=200, height=40, name="load_button", style={ "color": "lightblue"},
+                              clicked_fn=self._on_click_load_robot,
+                                )
+                    # Button for removing every spawned robot
+                    ui.Button("Clear Robot", width=200, height=40, name="load_button", style={ "color": "lightblue"},
+                              clicked_fn=self._on_click_clear_robot,
+                                )
                             
-                        # ui.Spacer(width=WidgetWindow.GENERAL_SPACING)
+                    # ui.Spacer(width=WidgetWindow.GENERAL_SPACING)
                     
-                ui.Spacer(height=self._spacing)
-                # CustomMultifieldWidget(label="Orientation: \t", default_vals=[0.0, 0.0, 0.0])
-                # CustomMultifieldWidget(label="Scale: \t", default_vals=[0.0, 0.0, 0.0])
+            self._spawn_status_label = ui.Label("", height=0)
+            ui.Spacer(height=self._spacing)
+            # CustomMultifieldWidget(label="Orientation: \t", default_vals=[0.0, 0.0, 0.0])
+            # CustomMultifieldWidget(label="Scale: \t", default_vals=[0.0, 0.0, 0.0])
                 
-                ui.Line(style_type_name_override="HeaderLine")
-                self._replay_data(default_val=default_file_path)
+            ui.Line(style_type_name_override="HeaderLine")
+            self._replay_data(default_val=default_file_path)
                 
-                ui.Line(style_type_name_override="HeaderLine")
-                self._connect_robot_ui()
+            ui.Line(style_type_name_override="HeaderLine")
+            self._connect_robot_ui()
                                 
+    def _get_spawner(self) -> RobotSpawner:
+        stage = omni.usd.get_context().get_stage()
+        # A new stage has been opened since the last spawn
+        if self._spawner is None or self._spawner.stage != stage:
+            self._spawner = RobotSpawner(stage)
+        return self._spawner
+
+    """ Robot Load Button"""
+    def _on_click_load_robot(self):
+        robot_name = ROBOT_ENVIRONMENTS[self.robot_type_ui.model.get_item_value_model().get_value_as_int()]
+        num_robots = max(self._robot_count_field.model.get_value_as_int(), 1)
+        try:
+            report = self._get_spawner().spawn(robot_name, num_robots)
+        except Exception as e:
+            carb.log_warn(f"Could not spawn the {robot_name} robots: {e}")
+            return
+        status = f"{report.num_instances} {robot_name} in {report.spawn_time * 1000.0:.1f} ms"
+        status += f", {report.prims_per_instance:.1f} prims per robot"
+        if report.memory_per_instance is not None:
+            status += f", {report.memory_per_instance / 1024.0:.1f} KB per robot"
+        self._spawn_status_label.text = status
+
+    def _on_click_clear_robot(self):
+        self._get_spawner().clear()
+        self._spawn_status_label.text = ""
+
     def _replay_data(self, default_val):
         with ui.CollapsableFrame(title="Replay Trajectories", name="replay_trajectories"):
             with ui.VStack(height=0, spacing=10, name="frame_v_stack"):
@@ -10,6 +10,7 @@ __all__ = ["MovieCaptureWidget"]
 import os
 import json
 import carb
+import typing
 import omni
 import omni.ui as ui
 from omni.mobile.robots.params import output_default_path, RECORD_TYPE, TYPE_INDEX_OF_PNG, CAPTURE_FILE_TYPES
@@ -19,6 +20,9 @@ from omni.mobile.robots.ui.widgets.custom_bool_widget import CustomBoolWidget
 
 from . import base_widget
 from .quick_input import QuickNumberInput, QuickNumberInputType
+from .render_settings_widget import RenderSettingsWidget
+from .farm_settings_widget import FarmSettingsWidget
+from .output_settings_widget import OutputSettingsWidget
 from .ui_values_storage import UIValuesStorage 
 
 
@@ -67,6 +71,13 @@ class MovieCaptureWidget(base_widget.BaseMovieCaptureWidget):
         )
         self._dict = carb.dictionary.get_dictionary()
         ###################### Capture_settings_widget ######################
+
+        # Rendering, queue and output settings, built under the recording settings. The output widget starts the
+        # captures and farm submissions with the options collected from all of them
+        self._capture_instance = omni.kit.capture.viewport.CaptureExtension.get_instance()
+        self._render_settings_widget = RenderSettingsWidget(self._capture_instance)
+        self._farm_settings_widget = FarmSettingsWidget()
+        self._output_settings_widget = OutputSettingsWidget(self._collect_capture_settings, self._capture_instance)
     
     def _on_fps_setting_changed(self, item, event_type):
         fps = self._dict.get(item)
@@ -83,10 +94,19 @@ class MovieCaptureWidget(base_widget.BaseMovieCaptureWidget):
     def destroy(self):
         self._stage_sub = None
         self._settings.unsubscribe_to_change_events(self._fps_setting_changed_sub)
-        self._camera_combo_model.clear()
-        self._camera_combo_model = None
-        self._animation_fps_model.clear()
-        self._animation_fps_model = None
+        # The models only exist once the content of the frame has been built
+        if getattr(self, "_camera_combo_model", None) is not None:
+            self._camera_combo_model.clear()
+            self._camera_combo_model = None
+        if self._animation_fps_model is not None:
+            self._animation_fps_model.clear()
+            self._animation_fps_model = None
+        for widget in (self._output_settings_widget, self._farm_settings_widget, self._render_settings_widget):
+            widget.destroy()
+        self._output_settings_widget = None
+        self._farm_settings_widget = None
+        self._render_settings_widget = None
+        self._capture_instance = None
     
     def update_widgets_for_new_movie_type(self, movie_type: omni.kit.capture.viewport.CaptureMovieType):
         self._ui_capture_range_sequence.visible = movie_type == omni.kit.capture.viewport.CaptureMovieType.SEQUENCE
@@ -100,32 +120,71 @@ class MovieCaptureWidget(base_widget.BaseMovieCaptureWidget):
     ############################ Main ############################
     def _build_ui_capture_settings(self):
         with ui.CollapsableFrame(title=self._title, name="robot_selection"):
-            with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
-                ui.Line(style_type_name_override="HeaderLine")
-                ui.Spacer(height = 0)   # 5
-                
-                self._build_ui_movie_type_settings()
-                with ui.HStack(width=400):
-                    ui.Label("Camera")
-                    with ui.ZStack(width=300):
-                        ui.Rectangle(name="combobox", height=22)
-                        self._camera_combo_model = base_widget.CamerasModel()
-                        self._ui_kit_combobox_camera_type = ui.ComboBox(self._camera_combo_model, name="dropdown_menu", identifier="cap_setting_id_combo_camera_type")
-                        self._ui_kit_combobox_camera_type.model.add_item_changed_fn(self._on_kit_camera_changed)
-                        ui.Spacer(width=base_widget.RIGHT_SPACING)
-                ui.Spacer()
-                self._build_ui_capture_range_settings()
-                self._build_ui_capture_resolution_settings()
-                self._build_ui_app_level_capture_settings()
-
-                # self._render_ui()
-                # ui.Spacer(spacing=self._spacing)
-                
-                # self._queue_setting_ui()
-                # ui.Spacer(spacing=self._spacing)
+            self._build_content()
+
+    def _build_content(self):
+        """Content of the recording frame, built when the frame is first expanded"""
+        with ui.VStack(height=0, spacing=7, name="frame_v_stack"):
+            ui.Line(style_type_name_override="HeaderLine")
+            ui.Spacer(height = 0)   # 5
                 
-                # self._output_ui(file_path=output_default_path)
-                # ui.Spacer(spacing=self._spacing)
+            self._build_ui_movie_type_settings()
+            with ui.HStack(width=400):
+                ui.Label("Camera")
+                with ui.ZStack(width=300):
+                    ui.Rectangle(name="combobox", height=22)
+                    self._camera_combo_model = base_widget.CamerasModel()
+                    self._ui_kit_combobox_camera_type = ui.ComboBox(self._camera_combo_model, name="dropdown_menu", identifier="cap_setting_id_combo_camera_type")
+                    self._ui_kit_combobox_camera_type.model.add_item_changed_fn(self._on_kit_camera_changed)
+                    ui.Spacer(width=base_widget.RIGHT_SPACING)
+            ui.Spacer()
+            self._build_ui_capture_range_settings()
+            self._build_ui_capture_resolution_settings()
+            self._build_ui_app_level_capture_settings()
+
+            self._render_settings_widget.build_ui()
+            self._farm_settings_widget.build_ui()
+            self._output_settings_widget.build_ui()
+
+    def _collect_capture_settings(
+        self, collect_farm_settings: bool = False
+    ) -> typing.Tuple[omni.kit.capture.viewport.capture_options.CaptureOptions, typing.Optional[dict]]:
+        """
+        Options of the capture from the recording, rendering and output settings, and the farm settings of the queue
+        settings when they are asked for. Called by the output widget before a capture or a farm submission.
+        """
+        options = self._capture_instance.options
+        self.collect_settings(options)
+        self._render_settings_widget.collect_settings(options)
+        self._output_settings_widget.collect_settings(options)
+        if not collect_farm_settings:
+            return options, None
+
+        farm = self._farm_settings_widget
+        metadata = {}
+        if farm.get_task_extensions() is not None:
+            metadata["extensions"] = farm.get_task_extensions()
+        if farm.get_task_registries() is not None:
+            metadata["registries"] = farm.get_task_registries()
+        farm_settings = {
+            "farm_url": farm.get_selected_farm(),
+            "task_type": farm.get_task_type(),
+            "start_delay": farm.get_start_delay(),
+            "batch_count": farm.get_batch_count(),
+            "interleave_batches": farm.get_interleave_batches(),
+            "balance_batches": farm.get_balance_batches(),
+            "local_workers": farm.get_local_worker_count(),
+            "task_comment": farm.get_task_comment(),
+            "priority": farm.get_task_priority(as_int=True),
+            "metadata": metadata,
+            "bad_frame_size_threshold": farm.get_task_valid_frame_size(),
+            "max_bad_frame_threshold": farm.get_task_frame_size_threshold(),
+            "upload_to_s3": farm.get_upload_to_s3(),
+            "skip_upload": farm.get_skip_upload_to_s3(),
+            "generate_shader_cache": farm.get_generate_shader_cache(),
+            "texture_streaming_memory_budget": farm.get_texture_streaming_memory_budget(),
+        }
+        return options, farm_settings
     
     def _build_ui_app_level_capture_settings(self):
         with ui.HStack(width=260):
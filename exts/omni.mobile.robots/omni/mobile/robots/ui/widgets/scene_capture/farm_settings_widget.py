@@ -11,13 +11,12 @@ from typing import List, Optional, Union
 
 import carb
 
-from omni.kit.window.movie_capture import base_widget
-from omni.services.client import AsyncClient
+from . import base_widget
 import omni.ui as ui
 
 from .ui import FarmStatusWidget
 from .ui_values_storage import UIValuesStorage
-from .utils.farm_queue_utils import get_farm_queue_settings, get_ui_should_upload, get_ui_skip_upload_to_s3, supports_ui_should_upload, \
+from .utils.farm_queue_utils import get_farm_job_templates, invalidate_farm_queue_settings, get_farm_queue_settings, get_ui_should_upload, get_ui_skip_upload_to_s3, supports_ui_should_upload, \
     supports_ui_skip_upload_to_s3, supports_ui_task_extensions, supports_ui_task_registries, supports_ui_generate_shader_cache, \
     get_ui_generate_shader_cache, get_ovc_available_farm_queues
 from.quick_input import QuickNumberInput, QuickNumberInputType
@@ -114,10 +113,17 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
         ]
         current_index = combo_model.get_item_value_model().as_int
         self._farm_field_model.as_string = all_options[current_index]
+
+        # Read the settings of the newly selected queue once, the callers below share that request
+        selected_farm_url = self._get_selected_farm_queue_url()
+        if selected_farm_url:
+            invalidate_farm_queue_settings(selected_farm_url)
         self._check_farm_queue_status()
 
         if self._farm_task_types_future:
             self._farm_task_types_future.cancel()
+        if self._handle_advanced_rendering_features_future:
+            self._handle_advanced_rendering_features_future.cancel()
 
         self._farm_task_types_future = asyncio.ensure_future(self._populate_create_render_task_types())
         self._handle_advanced_rendering_features_future = asyncio.ensure_future(
@@ -205,6 +211,8 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
                     self._build_ui_dispatch_delay()
                     self._build_ui_task_comment()
                     self._build_ui_batch_size()
+                    self._build_ui_batch_partition()
+                    self._build_ui_local_workers()
                     self._build_ui_task_size_thresholds()
                     self._build_ui_task_priority()
                     self._build_ui_texture_streaming_memory_budget()
@@ -240,12 +248,10 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 self._farm_status_widget.visible = not self._is_ovc_mode()
 
     async def _get_job_templates(self) -> List[str]:
-        queue_prefix = self._queue_management_endpoint_prefix
         current_farm = self.get_selected_farm()
-        farm_services_client = AsyncClient(uri=f"{current_farm}{queue_prefix}")
 
         try:
-            job_templates = await farm_services_client.jobs.load.get()
+            job_templates = await get_farm_job_templates(current_farm, self._queue_management_endpoint_prefix)
         except Exception as exc:
             carb.log_warn(f"Issue loading jobs from {current_farm}: {str(exc)}")
             return []
@@ -297,16 +303,9 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
             if current_task_type != self._default_job_type:
                 combo_model.remove_item(child)
 
-        # Check if we have a queue that is up.
-        queue_is_up = False
-        attempts = 5
-        while not queue_is_up and attempts:
-            farm_status = self._farm_status_widget.get_farm_status()
-            queue_is_up = farm_status == FarmStatusWidget.FarmStatus.UP
-            await asyncio.sleep(2)
-            attempts -= 1
-
-        if not queue_is_up:
+        # Check if we have a queue that is up, waiting for the ongoing status check instead of polling it.
+        farm_status = await self._farm_status_widget.wait_for_farm_status()
+        if farm_status != FarmStatusWidget.FarmStatus.UP:
             return
 
         # Populate the combo box.
@@ -381,6 +380,38 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 tooltip="Amount of batches to divide the frames into"
             )
 
+    def _build_ui_batch_partition(self):
+        with ui.HStack():
+            self._build_ui_left_column("Interleave batches")
+            with ui.VStack():
+                ui.Spacer(height=FRAME_SPACING)
+                self._ui_interleave_batches = ui.CheckBox(
+                    tooltip="Give every batch one frame out of N instead of a contiguous range, so slow sections are shared by all the batches",
+                    identifier="farm_setting_id_check_interleave_batches",
+                )
+                self._ui_interleave_batches.model.set_value(False)
+        with ui.HStack():
+            self._build_ui_left_column("Balance by previous run")
+            with ui.VStack():
+                ui.Spacer(height=FRAME_SPACING)
+                self._ui_balance_batches = ui.CheckBox(
+                    tooltip="Size the batches by the render time of the frames already in the output folder instead of by frame count",
+                    identifier="farm_setting_id_check_balance_batches",
+                )
+                self._ui_balance_batches.model.set_value(False)
+
+    def _build_ui_local_workers(self):
+        with ui.HStack():
+            self._build_ui_left_column("Local workers")
+            self._ui_local_workers = QuickNumberInput(
+                input_type=QuickNumberInputType.INT,
+                init_value=0,
+                step=1,
+                min_value=0,
+                identifier="farm_setting_id_field_local_workers",
+                tooltip="Render the batches in this many headless processes on this machine instead of submitting them to the Queue, 0 to use the Queue"
+            )
+
     def _build_ui_task_comment(self):
         with ui.HStack():
             self._build_ui_left_column("Task comment")
@@ -493,6 +524,15 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
     def get_batch_count(self) -> int:
         return self._ui_batch_size.value
 
+    def get_interleave_batches(self) -> bool:
+        return self._ui_interleave_batches.model.as_bool
+
+    def get_balance_batches(self) -> bool:
+        return self._ui_balance_batches.model.as_bool
+
+    def get_local_worker_count(self) -> int:
+        return self._ui_local_workers.value
+
     def get_task_comment(self) -> str:
         return self._ui_task_comment.model.as_string
 
@@ -644,6 +684,9 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
         ui_values.set(UIValuesStorage.SETTING_NAME_START_DELAY_SECONDS, self.get_start_delay())
         ui_values.set(UIValuesStorage.SETTING_NAME_TASK_COMMENT, self.get_task_comment())
         ui_values.set(UIValuesStorage.SETTING_NAME_BATCH_COUNT, self.get_batch_count())
+        ui_values.set(UIValuesStorage.SETTING_NAME_INTERLEAVE_BATCHES, self.get_interleave_batches())
+        ui_values.set(UIValuesStorage.SETTING_NAME_BALANCE_BATCHES, self.get_balance_batches())
+        ui_values.set(UIValuesStorage.SETTING_NAME_LOCAL_WORKERS, self.get_local_worker_count())
         ui_values.set(UIValuesStorage.SETTING_NAME_TASK_PRIORITY, self.get_task_priority())
         ui_values.set(UIValuesStorage.SETTING_NAME_UPLOAD_TO_S3, self.get_upload_to_s3_ui_value())
         ui_values.set(UIValuesStorage.SETTING_NAME_SKIP_UPLOAD_TO_S3, self.get_skip_upload_to_s3_ui_value())
@@ -658,6 +701,9 @@ class FarmSettingsWidget(base_widget.BaseMovieCaptureWidget):
         self._ui_server_delay.value = ui_values.get(UIValuesStorage.SETTING_NAME_START_DELAY_SECONDS)
         self._ui_task_comment.model.as_string = ui_values.get(UIValuesStorage.SETTING_NAME_TASK_COMMENT)
         self._ui_batch_size.value = ui_values.get(UIValuesStorage.SETTING_NAME_BATCH_COUNT)
+        self._ui_interleave_batches.model.as_bool = ui_values.get(UIValuesStorage.SETTING_NAME_INTERLEAVE_BATCHES, False)
+        self._ui_balance_batches.model.as_bool = ui_values.get(UIValuesStorage.SETTING_NAME_BALANCE_BATCHES, False)
+        self._ui_local_workers.value = ui_values.get(UIValuesStorage.SETTING_NAME_LOCAL_WORKERS, 0)
         self._ui_task_priority.value = ui_values.get(UIValuesStorage.SETTING_NAME_TASK_PRIORITY)
         self._stored_upload_to_s3_value = ui_values.get(UIValuesStorage.SETTING_NAME_UPLOAD_TO_S3)
         self._stored_skip_uploat_to_s3_value = ui_values.get(UIValuesStorage.SETTING_NAME_SKIP_UPLOAD_TO_S3, False)
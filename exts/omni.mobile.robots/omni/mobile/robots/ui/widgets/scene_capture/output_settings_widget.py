@@ -21,6 +21,7 @@ from omni.kit.widget.prompt import Prompt
 import omni.ui as ui
 import omni.usd
 import omni.kit.usd.layers as layers
+from omni.kit.viewport.utility import get_active_viewport
 
 import omni.services.client as _services_client
 
@@ -34,8 +35,16 @@ from .moive_capture_icons import MovieCaptureIcons
 from .ui_values_storage import UIValuesStorage
 from .utils.farm_queue_utils import get_farm_aws_profile, get_farm_queue_settings, get_farm_ingress_bucket, \
     get_farm_ingress_bucket_url, get_farm_egress_bucket, get_farm_egress_archive_bucket, get_farm_utilities_server
+from .utils.farm_client import IDEMPOTENCY_KEY, FarmSubmitError, get_farm_client, submit_tasks_async
+from .utils.farm_job_tracker import FarmJobProgress, FarmJobTracker
+from .utils.local_farm import LocalFarmClient
+from .utils.capture_resume import plan_resume, write_capture_manifest
+from .utils.frame_partition import FrameBatch, partition_frames, get_batch_costs, get_frame_costs_from_output
 from .ui import FileOptionsWindow
 from .file_options import FileOptions
+from omni.mobile.robots.logic.capture.frame_dataset import DATASET_FILE_TYPE
+from omni.mobile.robots.logic.capture.multi_camera_capture import MultiCameraCapture
+from omni.mobile.robots.logic.capture.robot_metadata import RobotMetadata
 
 
 CAPTURE_FILE_NUM_PATTERN = (".####",)
@@ -115,6 +124,11 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         self._client_bookmarks_changed_subscription = None
         self._current_servers = []
         self._user_name = ""
+        self._multi_camera_capture = None
+        self._farm_job_tracker = None
+        self._local_farm_client = None
+        # Frames smaller than this many bytes are captured again when resuming
+        self._resume_min_frame_size = 0
 
     def _init_file_options(self):
         self._file_options_wnd = FileOptionsWindow()
@@ -125,6 +139,15 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         self._file_options_from_storage_applied = False
 
     def destroy(self):
+        if self._multi_camera_capture is not None:
+            self._multi_camera_capture.cancel()
+            self._multi_camera_capture = None
+        if self._farm_job_tracker is not None:
+            self._farm_job_tracker.stop()
+            self._farm_job_tracker = None
+        if self._local_farm_client is not None:
+            asyncio.ensure_future(self._local_farm_client.stop_async())
+            self._local_farm_client = None
         self._capture_instance = None
         self._filepicker = None
         self._settings.unsubscribe_to_change_events(self._capture_type_setting_changed_sub)
@@ -187,7 +210,11 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                     self._build_ui_output_path()
                     self._build_ui_output_name()
                     self._build_ui_overwrite_existing_frames()
+                    self._build_ui_resume_capture()
+                    self._build_ui_camera_dataset()
+                    self._build_ui_stream_mp4()
                     self._build_ui_output_capture()
+                    self._build_ui_farm_progress()
                     self._set_default_capture_type()
                 ui.Spacer(width=base_widget.RIGHT_SPACING)
 
@@ -205,6 +232,21 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 ui.Label(" Overwrite existing frame images")
             ui.Spacer()
 
+    def _build_ui_resume_capture(self):
+        with ui.HStack(style=base_widget.WINDOW_DARK_STYLE, height=0):
+            self._build_ui_left_column("")
+            with ui.HStack(width=ui.Percent(50)):
+                with ui.VStack(width=0):
+                    ui.Spacer()
+                    self._ui_kit_resume_capture_check = ui.CheckBox(height=0, name="green_check", identifier="output_setting_id_check_resume_capture")
+                    self._ui_kit_resume_capture_check.model.add_value_changed_fn(self._on_resume_capture_clicked)
+                    ui.Spacer()
+                ui.Label(
+                    " Resume: only capture missing or bad frames",
+                    tooltip="Capture only the frames missing from the output folder or smaller than the minimum valid file size of the Queue settings",
+                )
+            ui.Spacer()
+
     def _build_ui_output_path(self):
         with ui.HStack(height=0):
             self._build_ui_left_column("Path")
@@ -293,6 +335,13 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                         style=SUBMIT_BUTTON_STYLE,
                         identifier="output_setting_id_button_capture_current_frame",
                     )
+                    self._ui_kit_capture_cameras_button = ui.Button(
+                        "Capture All Cameras",
+                        clicked_fn=self._on_capture_cameras_clicked,
+                        style=SUBMIT_BUTTON_STYLE,
+                        tooltip="Capture the sequence from every camera of the stage in a single pass",
+                        identifier="output_setting_id_button_capture_cameras",
+                    )
                 self._ui_kit_dispatch_button = ui.Button(
                     "Submit to Queue",
                     clicked_fn=self._on_dispatch_clicked,
@@ -301,6 +350,23 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 )
                 self._ui_capture_buttons.visible = not self._is_ovc_mode()
 
+    def _build_ui_farm_progress(self):
+        self._ui_farm_progress_stack = ui.HStack(visible=False)
+        with self._ui_farm_progress_stack:
+            self._build_ui_left_column("Farm progress")
+            self._ui_farm_progress_label = ui.Label("", identifier="output_setting_id_label_farm_progress")
+
+    def _on_farm_job_progress(self, progress: FarmJobProgress):
+        text = f"{progress.frames_done}/{progress.frames_total} frames, {progress.tasks_running} running"
+        if progress.tasks_failed:
+            text += f", {progress.tasks_failed} failed"
+        if progress.frames_per_minute > 0.0:
+            text += f", {progress.frames_per_minute:.1f} frames/min"
+            if not progress.is_done:
+                text += f", {progress.eta / 60.0:.0f} min left"
+        self._ui_farm_progress_label.text = text
+        self._ui_farm_progress_stack.visible = True
+
     def on_window_width_changed(self, width) -> None:
         if self._is_ovc_mode():
             return
@@ -320,7 +386,7 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
 
     def _on_overwrite_mp4_popup_yes_clicked(self, dialog):
         dialog.hide()
-        self._capture_instance.start()
+        self._start_sequence_capture()
 
     def _on_render_product_conflict_popup_yes_clicked(self, dialog):
         dialog.hide()
@@ -348,10 +414,44 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
 
     def _on_overwrite_existing_frames_clicked(self, model):
         if model.as_bool is True:
+            self._ui_kit_resume_capture_check.model.as_bool = False
             if self._overwrite_warning_popup is None:
                 self._overwrite_warning_popup = self._build_overwrite_warning_popup()
             self._overwrite_warning_popup.show()
 
+    def _build_ui_camera_dataset(self):
+        with ui.HStack(style=base_widget.WINDOW_DARK_STYLE, height=0):
+            self._build_ui_left_column("")
+            with ui.HStack(width=ui.Percent(50)):
+                with ui.VStack(width=0):
+                    ui.Spacer()
+                    self._ui_kit_camera_dataset_check = ui.CheckBox(height=0, name="green_check", identifier="output_setting_id_check_camera_dataset")
+                    ui.Spacer()
+                ui.Label(
+                    " Capture All Cameras into a chunked dataset",
+                    tooltip="Write the images, camera poses and timestamps of all the cameras into chunked, compressed arrays instead of one image file per frame and camera",
+                )
+            ui.Spacer()
+
+    def _build_ui_stream_mp4(self):
+        with ui.HStack(style=base_widget.WINDOW_DARK_STYLE, height=0):
+            self._build_ui_left_column("")
+            with ui.HStack(width=ui.Percent(50)):
+                with ui.VStack(width=0):
+                    ui.Spacer()
+                    self._ui_kit_stream_mp4_check = ui.CheckBox(height=0, name="green_check", identifier="output_setting_id_check_stream_mp4")
+                    ui.Spacer()
+                ui.Label(
+                    " Stream .mp4 to the encoder",
+                    tooltip="Encode the frames of the active viewport camera as they are rendered instead of writing image frames and assembling them afterwards",
+                )
+            ui.Spacer()
+
+    def _on_resume_capture_clicked(self, model):
+        # Resuming keeps the valid frames, it cannot be combined with overwriting them
+        if model.as_bool is True:
+            self._ui_kit_overwrite_existing_frames_check.model.as_bool = False
+
     def _on_render_preset_rp_support_change(self, item, event_type):
         pass
 
@@ -453,7 +553,8 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         if not self._check_output_path():
             return
 
-        self._collect_capture_settings_fn(True)
+        _, farm_settings = self._collect_capture_settings_fn(True)
+        self._resume_min_frame_size = farm_settings.get("bad_frame_size_threshold", 0) * 1024
         # if mp4 type to check if the result file is exist or not, and warn it
         file_type = self._get_combobox_value(self._ui_kit_capture_type, CAPTURE_FILE_TYPES)
         mp4_path = os.path.join(
@@ -471,7 +572,141 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
             dialog.show()
         else:
             if self._check_render_product_and_exr() is False:
-                self._capture_instance.start()
+                self._start_sequence_capture()
+
+    def _start_sequence_capture(self):
+        """
+        Start the capture of the sequence. When resuming, the frames already in the output folder are kept and only the
+        missing or bad ones are captured. The capture manifest is updated once the capture is finished, so the next
+        resume does not have to scan the output folder.
+        """
+        options = self._capture_instance.options
+        if options.file_type == ".mp4" and self._ui_kit_stream_mp4_check.model.as_bool:
+            self._start_mp4_stream_capture(options)
+            return
+        is_frame_sequence = options.file_type != ".mp4"
+        if is_frame_sequence and self._ui_kit_resume_capture_check.model.as_bool:
+            if options.range_type != omni.kit.capture.viewport.CaptureRangeType.FRAMES:
+                carb.log_warn("Movie capture: resuming needs a range of frames, capturing the whole range.")
+            else:
+                plan = plan_resume(
+                    options.output_folder,
+                    options.file_name,
+                    options.file_type,
+                    options.start_frame,
+                    options.end_frame,
+                    step=max(1, options.capture_every_Nth_frames),
+                    min_frame_size=self._resume_min_frame_size,
+                )
+                if plan.span is None:
+                    carb.log_warn(f"Movie capture: all the {plan.valid_frames} frames are already captured.")
+                    return
+                for bad_file in plan.bad_files:
+                    os.remove(os.path.join(options.output_folder, bad_file))
+                carb.log_info(
+                    f"Movie capture: resuming with {len(plan.missing_frames)} frames to capture "
+                    f"({len(plan.bad_files)} bad), keeping {plan.valid_frames} frames."
+                )
+                # The valid frames between the first and the last missing frame are skipped by the capture
+                options.start_frame, options.end_frame = plan.span
+                options.overwrite_existing_frames = False
+
+        if is_frame_sequence:
+            output_folder, file_name, file_type = options.output_folder, options.file_name, options.file_type
+            previous_finished_fn = self._capture_instance.capture_finished_fn
+
+            def _on_capture_finished(*args):
+                self._capture_instance.capture_finished_fn = previous_finished_fn
+                try:
+                    write_capture_manifest(output_folder, file_name, file_type)
+                except OSError as exc:
+                    carb.log_warn(f"Movie capture: could not write the capture manifest: {exc}")
+                if previous_finished_fn is not None:
+                    previous_finished_fn(*args)
+
+            self._capture_instance.capture_finished_fn = _on_capture_finished
+        self._capture_instance.start()
+
+    def _on_capture_cameras_clicked(self):
+        if is_in_live_session():
+            Prompt(title="Movie Capture unavailable", text=LIVE_SESSION_RESTRICTION_WARNING, modal=True).show()
+            return
+
+        if self._multi_camera_capture is not None and self._multi_camera_capture.is_capturing:
+            carb.log_warn("Movie capture: a multi camera capture is already running.")
+            return
+
+        if not self._check_output_path():
+            return
+
+        camera_paths = MultiCameraCapture.get_stage_cameras()
+        if not camera_paths:
+            carb.log_warn("Movie capture: there is no camera in the stage to capture.")
+            return
+
+        self._collect_capture_settings_fn(True)
+        options = self._capture_instance.options
+        # Every camera writes image frames, .exr and .mp4 outputs fall back to .png frames
+        file_type = options.file_type if options.file_type in (".png", ".tga") else DEFAULT_IMAGE_FRAME_TYPE_FOR_VIDEO
+        if self._ui_kit_camera_dataset_check.model.as_bool:
+            file_type = DATASET_FILE_TYPE
+        start_frame, end_frame = self._get_capture_frame_range(options)
+
+        # A dataset also records the root pose and joint positions of every robot of the World
+        metadata_fn = None
+        if file_type == DATASET_FILE_TYPE:
+            articulation_paths = RobotMetadata.get_stage_articulations("/World")
+            if articulation_paths:
+                metadata_fn = RobotMetadata(articulation_paths)
+
+        self._multi_camera_capture = MultiCameraCapture(
+            camera_paths,
+            options.output_folder,
+            file_name=options.file_name,
+            file_type=file_type,
+            resolution=(options.res_width, options.res_height),
+            metadata_fn=metadata_fn,
+        )
+        asyncio.ensure_future(self._capture_cameras_async(self._multi_camera_capture, start_frame, end_frame, options))
+
+    def _get_capture_frame_range(self, options) -> typing.Tuple[int, int]:
+        if options.range_type == omni.kit.capture.viewport.CaptureRangeType.FRAMES:
+            return options.start_frame, options.end_frame
+        return int(options.start_time * options.fps), int(options.end_time * options.fps)
+
+    def _start_mp4_stream_capture(self, options):
+        """Capture the camera of the active viewport and stream its frames to the video encoder, without image files"""
+        if self._multi_camera_capture is not None and self._multi_camera_capture.is_capturing:
+            carb.log_warn("Movie capture: a camera capture is already running.")
+            return
+        camera_path = get_active_viewport().camera_path.pathString
+        start_frame, end_frame = self._get_capture_frame_range(options)
+        encoding_settings = {
+            "bitrate": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_BITRATE, FileOptions.DEFAULT_MP4_ENCODING_BITRATE),
+            "iframe_interval": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_IFRAME_INTERVAL, FileOptions.DEFAULT_MP4_ENCODING_IFRAME_INTERVAL),
+            "preset": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_PRESET, FileOptions.DEFAULT_MP4_ENCODING_PRESET),
+            "profile": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_PROFILE, FileOptions.DEFAULT_MP4_ENCODING_PROFILE),
+            "rc_mode": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_RC_MODE, FileOptions.DEFAULT_MP4_ENCODING_RCMODE),
+            "rc_target_quality": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_RC_TARGET_QUALITY, FileOptions.DEFAULT_MP4_ENCODING_RC_TARGET_QUALITY),
+            "video_full_range": self._file_options.get_option(FileOptions.OPTION_MP4_ENCODING_VIDEO_FULL_RANGE_FLAG, FileOptions.DEFAULT_MP4_ENCODING_VIDEO_FULL_RANGE_FLAG),
+        }
+        self._multi_camera_capture = MultiCameraCapture(
+            [camera_path],
+            options.output_folder,
+            file_name=options.file_name,
+            file_type=".mp4",
+            resolution=(options.res_width, options.res_height),
+            encoding_settings=encoding_settings,
+        )
+        asyncio.ensure_future(self._capture_cameras_async(self._multi_camera_capture, start_frame, end_frame, options))
+
+    async def _capture_cameras_async(self, capture: MultiCameraCapture, start_frame: int, end_frame: int, options):
+        try:
+            await capture.capture_sequence_async(
+                start_frame, end_frame, options.fps, every_nth_frame=max(1, options.capture_every_Nth_frames)
+            )
+        finally:
+            await capture.close_async()
 
     def _check_render_product_and_exr(self):
         if self._capture_instance.options.file_type != ".exr" and len(self._capture_instance.options.render_product) > 0:
@@ -753,6 +988,15 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         task_type = farm_settings["task_type"]
         render_start_delay = farm_settings.get("start_delay", 10)
         batch_count = farm_settings.get("batch_count", 1)
+        interleave_batches = farm_settings.get("interleave_batches", False)
+        frame_costs = farm_settings.get("frame_costs", None)
+        if frame_costs is None and farm_settings.get("balance_batches", False):
+            frame_costs = get_frame_costs_from_output(
+                options["output_folder"], options["file_name"], options["file_type"],
+                options["start_frame"], options["end_frame"]
+            )
+            if frame_costs is None:
+                carb.log_warn("Movie capture: no frames of a previous run to balance the batches, splitting them by frame count.")
         task_comment = farm_settings.get("task_comment", "")
         usd_file = self._usd_context.get_stage_url()
         task_priority = farm_settings.get("priority", 65535)
@@ -762,6 +1006,7 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         should_upload_to_s3 = farm_settings.get("upload_to_s3", False)
         skip_upload = farm_settings.get("skip_upload", False)
         generate_shader_cache = farm_settings.get("generate_shader_cache", False)
+        local_workers = farm_settings.get("local_workers", 0)
 
         # add the texture streaming memory budget into capture options to send it to Farm without changing the interface
         # eventually, it will be in capture options after we support it in omni.kit.capture.viewport
@@ -781,6 +1026,8 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 render_start_delay=render_start_delay,
                 task_comment=task_comment,
                 batch_count=batch_count,
+                interleave_batches=interleave_batches,
+                frame_costs=frame_costs,
                 priority=task_priority,
                 metadata=metadata,
                 bad_frame_size_threshold=bad_frame_size_threshold,
@@ -788,52 +1035,23 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 should_upload_to_s3=should_upload_to_s3,
                 skip_upload=skip_upload,
                 generate_shader_cache=generate_shader_cache,
+                local_workers=local_workers,
             )
         )
 
-    def _prepare_batches(self, start_frame: int, end_frame: int, batch_count: int) -> typing.List[typing.Tuple[int, int]]:
-        batches = []
-
-        if batch_count in (0, 1):
-            return [(start_frame, end_frame)]
-
-        frame_range = range(start_frame, end_frame)
-        if batch_count > len(frame_range) + 1:
-            raise ValueError(f"Batch count {batch_count} is larger than the frame range {len(frame_range)}")
-
-        # for the remainder, we will give batches 1 more frame from the end to beginning in the batches list
-        # till we run out of the remainder
-        steps, remainder = divmod(len(frame_range) + 1, batch_count)
-
-        start_frame_step = start_frame
-        end_frame_step = 0
-        batch_index = 0
-        batch_index_to_add_1_frame = batch_count - remainder
-        for end_frame_step in range(start_frame + steps - 1, end_frame, steps):
-            if len(batches) == batch_count - 1:
-                end_frame_step = end_frame
-
-            # # add the 1 more frame from the remainder of remainder
-            actual_end_frame = end_frame_step
-            if remainder > 0:
-                if batch_index >= batch_index_to_add_1_frame:
-                    actual_end_frame = end_frame_step + (batch_index - batch_index_to_add_1_frame) + 1
-                    if actual_end_frame > end_frame:
-                        actual_end_frame = end_frame
-            batch_index += 1
-
-            batches.append((start_frame_step, actual_end_frame))
-            start_frame_step = actual_end_frame + 1
-
-            # # in the case the frames can evenly distributed into batches, the last batch will fail the for loop check
-            # # so pre-check it here and add it as the last batch
-            if end_frame_step + steps == end_frame:
-                batches.append((start_frame_step, end_frame))
-
-            if len(batches) == batch_count:
-                break
-
-        return batches
+    def _prepare_batches(
+        self,
+        start_frame: int,
+        end_frame: int,
+        batch_count: int,
+        frame_costs: typing.Optional[typing.Sequence[float]] = None,
+        interleave: bool = False,
+    ) -> typing.List[FrameBatch]:
+        """
+        Split the frame range into batch_count farm tasks. With a predicted render time per frame the batches are
+        balanced by time instead of by frame count, and interleaved batches render one frame out of batch_count.
+        """
+        return partition_frames(start_frame, end_frame, batch_count, frame_costs=frame_costs, interleave=interleave)
 
     async def _dispatch_for_remote_rendering(
         self,
@@ -844,6 +1062,8 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         render_start_delay: int,
         task_comment: str,
         batch_count: int,
+        interleave_batches: bool,
+        frame_costs: typing.Optional[typing.Sequence[float]],
         priority: int,
         metadata: typing.Dict[str, typing.Any],
         bad_frame_size_threshold: int,
@@ -851,30 +1071,39 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         should_upload_to_s3: bool,
         skip_upload: bool,
         generate_shader_cache: typing.Optional[bool],
+        local_workers: int = 0,
     ) -> None:
         initial_button_text = self._ui_kit_dispatch_button.text
         self._ui_kit_dispatch_button.text = "Submitting task..."
         self._ui_kit_dispatch_button.enabled = False
 
         try:
-            batches = self._prepare_batches(options["start_frame"], options["end_frame"], batch_count)
+            batches = self._prepare_batches(
+                options["start_frame"], options["end_frame"], batch_count,
+                frame_costs=frame_costs,
+                interleave=interleave_batches and options.get("capture_every_Nth_frames", -1) <= 1,
+            )
+            if frame_costs is not None:
+                carb.log_info(
+                    f"Predicted batch costs: {get_batch_costs(batches, options['start_frame'], frame_costs).round(2).tolist()}"
+                )
             task_function = "render.run"
             queue_management_endpoint_prefix = self._settings.get_as_string(
                 "exts/omni.kit.window.movie_capture/queue_management_endpoint_prefix"
             )
 
-            management_services = _services_client.AsyncClient(uri=f"{server}{queue_management_endpoint_prefix}")
+            if local_workers > 0:
+                # Render the batches in headless processes on this machine, the frames stay in the output folder
+                if self._local_farm_client is None or self._local_farm_client.num_workers != local_workers:
+                    self._local_farm_client = LocalFarmClient(local_workers)
+                management_services = self._local_farm_client
+                should_upload_to_s3 = False
+            else:
+                management_services = get_farm_client(f"{server}{queue_management_endpoint_prefix}")
 
             final_batch_index = len(batches) - 1
             batch_id = str(uuid4())
-            metadata = {
-                "batches": {
-                    "last_index": final_batch_index,
-                    "batch_id": batch_id
-                }
-            }
 
-            task_ids = []
             root_usd_stage = usd_file
             chunks: omni.client.Url = omni.client.break_url(usd_file)
             path = chunks.path
@@ -893,11 +1122,24 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
                 output_path = output_path.replace("\\", "/")
                 options["output_folder"] = "s3://" + egress_bucket + output_path
 
+            tasks = []
             for idx, batch in enumerate(batches):
                 batch_options = options.copy()
-                batch_options["start_frame"] = batch[0]
-                batch_options["end_frame"] = batch[1]
-                metadata["batches"]["index"] = idx
+                batch_options["start_frame"] = batch.start_frame
+                batch_options["end_frame"] = batch.end_frame
+                if batch.step > 1:
+                    # Interleaved batches render one frame out of every step frames
+                    batch_options["capture_every_Nth_frames"] = batch.step
+                # Every task gets its own metadata. A submission which failed without telling whether its task was
+                # queued looks for its idempotency key in the tasks of the batch before being retried
+                metadata = {
+                    "batches": {
+                        "last_index": final_batch_index,
+                        "batch_id": batch_id,
+                        "index": idx,
+                    },
+                    IDEMPOTENCY_KEY: f"{batch_id}:{idx}",
+                }
 
                 task_args = {
                     "user": user_name,
@@ -919,9 +1161,24 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
 
                 if should_upload_to_s3 and not skip_upload:
                     task_args["status"] = "paused"
-
-                data = await management_services.tasks.submit(**task_args)
-                task_ids.append(data["task_id"])
+                tasks.append(task_args)
+
+            def _on_progress(submitted: int, total: int):
+                self._ui_kit_dispatch_button.text = f"Submitting task {submitted}/{total}..."
+
+            results = await submit_tasks_async(management_services, tasks, progress_fn=_on_progress)
+            task_ids = [data["task_id"] for data in results]
+
+            # Follow all the batches of the submission with one status query per poll
+            if self._farm_job_tracker is not None:
+                self._farm_job_tracker.stop()
+            self._farm_job_tracker = FarmJobTracker(
+                management_services,
+                {task_id: len(batch.frames) for task_id, batch in zip(task_ids, batches)},
+                batch_id=batch_id,
+                progress_fn=self._on_farm_job_progress,
+            )
+            self._farm_job_tracker.start()
 
             if should_upload_to_s3 and not skip_upload:
                 await self._submit_for_collection(
@@ -941,6 +1198,8 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         except Exception as exc:
             self._ui_kit_dispatch_button.text = "Task submission failed"
             carb.log_error(f"Error submitting render to Queue: {str(exc)}")
+            if isinstance(exc, FarmSubmitError) and exc.uncertain_keys:
+                carb.log_warn(f"These farm tasks may be queued, check the queue before submitting again: {exc.uncertain_keys}")
         finally:
             # Sleep 2 seconds for the text on the button to be visible
             await asyncio.sleep(2)
@@ -963,7 +1222,7 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         farm_settings = await get_farm_queue_settings(farm_queue_server_url=server)
         farm_utilities_server = get_farm_utilities_server(settings=farm_settings)
 
-        utilities_services = _services_client.AsyncClient(uri=f"{farm_utilities_server}{queue_prefix}")
+        utilities_services = get_farm_client(f"{farm_utilities_server}{queue_prefix}")
 
         # TODO: should this come from the utilities farm?
         farm_utilities_settings = farm_settings  #await get_farm_queue_settings(farm_queue_server_url=farm_utilities_server)
@@ -1059,6 +1318,10 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
             self._ui_kit_overwrite_existing_frames_check.model.as_bool
         )
 
+        ui_values.set(UIValuesStorage.SETTING_NAME_RESUME_CAPTURE_CHECKED, self._ui_kit_resume_capture_check.model.as_bool)
+        ui_values.set(UIValuesStorage.SETTING_NAME_CAMERA_DATASET_CHECKED, self._ui_kit_camera_dataset_check.model.as_bool)
+        ui_values.set(UIValuesStorage.SETTING_NAME_STREAM_MP4_CHECKED, self._ui_kit_stream_mp4_check.model.as_bool)
+
         self._save_file_options_to_storage(ui_values)
 
     def apply_ui_values(self, ui_values: UIValuesStorage):
@@ -1071,6 +1334,9 @@ class OutputSettingsWidget(base_widget.BaseMovieCaptureWidget):
         self._overwrite_image_change_fn = self._ui_kit_overwrite_existing_frames_check.model.add_value_changed_fn(
             self._on_overwrite_existing_frames_clicked
         )
+        self._ui_kit_resume_capture_check.model.as_bool = ui_values.get(UIValuesStorage.SETTING_NAME_RESUME_CAPTURE_CHECKED, False)
+        self._ui_kit_camera_dataset_check.model.as_bool = ui_values.get(UIValuesStorage.SETTING_NAME_CAMERA_DATASET_CHECKED, False)
+        self._ui_kit_stream_mp4_check.model.as_bool = ui_values.get(UIValuesStorage.SETTING_NAME_STREAM_MP4_CHECKED, False)
 
         self._read_file_options_from_storage(ui_values)
         self._file_options_from_storage_applied = False
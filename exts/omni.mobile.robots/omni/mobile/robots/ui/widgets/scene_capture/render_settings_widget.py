@@ -383,17 +383,14 @@ class RenderSettingsWidget(base_widget.BaseMovieCaptureWidget):
         rps = [""]
 
         try:
-            import omni.usd
             from pxr import UsdRender
+            from omni.mobile.robots.logic.stage.prim_index import get_prim_index
 
-            usd_context = omni.usd.get_context()
-            stage = usd_context.get_stage()
-            if stage is not None:
-                for prim in stage.Traverse():
-                    if prim.IsA(UsdRender.Product):
-                        prim_path = prim.GetPath().pathString
-                        if not prim_path.endswith("_MovieRecord_Script"):
-                            rps.append(prim_path)
+            # The render products come from the prim index instead of a traversal of the stage
+            for path in sorted(get_prim_index().get_prims_of_type(UsdRender.Product)):
+                prim_path = path.pathString
+                if not prim_path.endswith("_MovieRecord_Script"):
+                    rps.append(prim_path)
         except Exception as e:
             rps.clear()
 
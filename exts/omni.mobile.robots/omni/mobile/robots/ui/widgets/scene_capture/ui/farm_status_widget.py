@@ -17,6 +17,8 @@ import omni.ui as ui
 from omni.kit.window.popup_dialog import MessageDialog
 from omni.services.client import AsyncClient
 
+from ..utils.farm_client import get_farm_client
+
 FRAME_SPACING = 5
 RIGHT_SPACING = 12
 
@@ -86,6 +88,8 @@ class FarmStatusWidget(ui.Widget):
 
         """
         self._farm_url = farm_url
+        if self._farm_ping_future and not self._farm_ping_future.done():
+            self._farm_ping_future.cancel()
         self._farm_ping_future = asyncio.ensure_future(self._check_farm_queue_status())
 
     async def _has_dashboard_page(self) -> bool:
@@ -112,9 +116,8 @@ class FarmStatusWidget(ui.Widget):
         self._open_farm_queue_button.enabled = False
 
         try:
-            if self._farm_services_client:
-                await self._farm_services_client.stop_async()
-            self._farm_services_client = AsyncClient(uri=f"{self._farm_url}{self._queue_management_endpoint_prefix}")
+            # The client is shared and kept open, so checking the same queue again reuses its connection
+            self._farm_services_client = get_farm_client(f"{self._farm_url}{self._queue_management_endpoint_prefix}")
 
             # Query the Omniverse Farm Management Dashboard UI, as this is the location Users would be redirected to
             # were they to click on the "Open Dashboard" button, but also because it only hits static services, and does
@@ -224,3 +227,22 @@ class FarmStatusWidget(ui.Widget):
 
         """
         return self._farm_status
+
+    async def wait_for_farm_status(self) -> "FarmStatusWidget.FarmStatus":
+        """
+        Wait for the ongoing check of the Farm Queue, if any, and return the status of the connection with Farm Queue.
+
+        Args:
+            None
+
+        Returns:
+            FarmStatusWidget.FarmStatus: The status of the connection with Farm Queue.
+
+        """
+        if self._farm_ping_future and not self._farm_ping_future.done():
+            try:
+                await asyncio.shield(self._farm_ping_future)
+            except asyncio.CancelledError:
+                # The check was replaced by the one of another Farm Queue
+                return FarmStatusWidget.FarmStatus.CHECKING
+        return self._farm_status
@@ -57,6 +57,9 @@ class UIValuesStorage:
     SETTING_NAME_START_DELAY_SECONDS = "start_delay_seconds"
     SETTING_NAME_TASK_COMMENT = "task_comment"
     SETTING_NAME_BATCH_COUNT = "batch_count"
+    SETTING_NAME_INTERLEAVE_BATCHES = "interleave_batches"
+    SETTING_NAME_BALANCE_BATCHES = "balance_batches"
+    SETTING_NAME_LOCAL_WORKERS = "local_workers"
     SETTING_NAME_TASK_PRIORITY = "task_priority"
     SETTING_NAME_UPLOAD_TO_S3 = "upload_to_s3"
     SETTING_NAME_SKIP_UPLOAD_TO_S3 = "skip_upload_to_s3"
@@ -70,6 +73,9 @@ class UIValuesStorage:
     SETTING_NAME_OUTPUT_FORMAT = "output_format"
     SETTING_NAME_SAVE_ALPHA_CHECKED = "save_alpha_checked"
     SETTING_NAME_OVERWRITE_EXISTING_FRAME_CHECKED = "overwrite_existing_frame_checked"
+    SETTING_NAME_RESUME_CAPTURE_CHECKED = "resume_capture_checked"
+    SETTING_NAME_CAMERA_DATASET_CHECKED = "camera_dataset_checked"
+    SETTING_NAME_STREAM_MP4_CHECKED = "stream_mp4_checked"
     SETTING_NAME_HDR_FOR_EXR_CHECKED = "hdr_for_exr_checked"
     SETTING_NAME_HDR_FOR_EXT_VISIBLE = "hdr_for_exr_visible"
     SETTING_NAME_EXR_COMPRESSION_METHOD = "exr_compression_method"
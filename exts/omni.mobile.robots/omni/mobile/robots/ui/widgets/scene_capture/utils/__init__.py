@@ -6,4 +6,10 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-from .farm_queue_utils import *
\ No newline at end of file
+from .farm_queue_utils import *
+from .frame_partition import *
+from .farm_client import *
+from .ttl_cache import *
+from .farm_job_tracker import *
+from .local_farm import *
+from .capture_resume import *
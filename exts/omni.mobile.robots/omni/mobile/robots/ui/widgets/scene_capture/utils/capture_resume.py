@@ -0,0 +1,148 @@
+"""
+| File: capture_resume.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Frames left to capture when resuming a capture, from one scan of the output folder or its manifest
+"""
+
+__all__ = ["ResumePlan", "scan_output_frames", "plan_resume", "write_capture_manifest", "get_manifest_path"]
+
+import os
+import re
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Folder of the output folder holding the manifests. Writing a manifest there does not change the modification time
+# of the output folder, which is what tells whether a manifest is still up to date
+MANIFEST_FOLDER = ".capture_manifest"
+MANIFEST_VERSION = 1
+
+
+class ResumePlan(NamedTuple):
+    """Frames of a range still to capture: missing from the output folder, or present but too small to be valid"""
+
+    missing_frames: List[int]
+    bad_files: List[str]
+    valid_frames: int
+    from_manifest: bool = False
+
+    @property
+    def span(self) -> Optional[Tuple[int, int]]:
+        """First and last frame to capture, None when the range is complete"""
+        if not self.missing_frames:
+            return None
+        return self.missing_frames[0], self.missing_frames[-1]
+
+
+def _get_frame_pattern(file_name: str, file_type: str):
+    return re.compile(re.escape(file_name) + r"\.(-?\d+)" + re.escape(file_type) + "$")
+
+
+def get_manifest_path(output_folder: str, file_name: str, file_type: str) -> str:
+    return os.path.join(output_folder, MANIFEST_FOLDER, f"{file_name}{file_type}.json")
+
+
+def scan_output_frames(output_folder: str, file_name: str, file_type: str) -> Dict[int, Tuple[str, int]]:
+    """The file name and size of every frame of the capture in the output folder, from a single scan of the folder"""
+    pattern = _get_frame_pattern(file_name, file_type)
+    frames: Dict[int, Tuple[str, int]] = {}
+    try:
+        with os.scandir(output_folder) as entries:
+            for entry in entries:
+                match = pattern.match(entry.name)
+                if match is not None and entry.is_file():
+                    frames[int(match.group(1))] = (entry.name, entry.stat().st_size)
+    except FileNotFoundError:
+        pass
+    return frames
+
+
+def write_capture_manifest(
+    output_folder: str, file_name: str, file_type: str, frames: Optional[Dict[int, Tuple[str, int]]] = None
+) -> Dict[int, Tuple[str, int]]:
+    """
+    Record the frames of the capture in the output folder, scanning it unless the frames are given, so the next resume
+    is planned without scanning the folder again as long as no frame was added or removed.
+
+    Returns:
+        Dict[int, Tuple[str, int]]: The file name and size of every frame.
+    """
+    manifest_path = get_manifest_path(output_folder, file_name, file_type)
+    # Created before reading the folder modification time, since creating it changes it
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    folder_mtime_ns = os.stat(output_folder).st_mtime_ns
+    if frames is None:
+        frames = scan_output_frames(output_folder, file_name, file_type)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "folder_mtime_ns": folder_mtime_ns,
+        "frames": {str(frame): [name, size] for frame, (name, size) in frames.items()},
+    }
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temp_path, manifest_path)
+    return frames
+
+
+def _read_capture_manifest(output_folder: str, file_name: str, file_type: str) -> Optional[Dict[int, Tuple[str, int]]]:
+    """The frames recorded by the manifest, or None when there is none or frames were added or removed since"""
+    try:
+        with open(get_manifest_path(output_folder, file_name, file_type)) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        if manifest.get("folder_mtime_ns") != os.stat(output_folder).st_mtime_ns:
+            return None
+        return {int(frame): (name, size) for frame, (name, size) in manifest["frames"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def plan_resume(
+    output_folder: str,
+    file_name: str,
+    file_type: str,
+    start_frame: int,
+    end_frame: int,
+    step: int = 1,
+    min_frame_size: int = 0,
+) -> ResumePlan:
+    """
+    Find the frames from start_frame to end_frame (included) which still have to be captured. The frames on disk are
+    read from the manifest of the capture when it is up to date, otherwise from one scan of the output folder, after
+    which the manifest is written again.
+
+    Args:
+        output_folder (str): The output folder of the capture.
+        file_name (str): The file name of the frames, without frame number and extension.
+        file_type (str): The extension of the frames, e.g. ".png".
+        start_frame (int): The first frame of the capture.
+        end_frame (int): The last frame of the capture, included.
+        step (int): Capture one frame out of step.
+        min_frame_size (int): Frames smaller than this many bytes are considered bad and captured again.
+
+    Returns:
+        ResumePlan: The frames to capture and the bad frames to remove first.
+    """
+    frames = _read_capture_manifest(output_folder, file_name, file_type)
+    from_manifest = frames is not None
+    if frames is None:
+        frames = scan_output_frames(output_folder, file_name, file_type)
+        if os.path.isdir(output_folder):
+            write_capture_manifest(output_folder, file_name, file_type, frames)
+
+    missing_frames = []
+    bad_files = []
+    valid_frames = 0
+    for frame in range(start_frame, end_frame + 1, max(1, step)):
+        entry = frames.get(frame)
+        if entry is None:
+            missing_frames.append(frame)
+        elif entry[1] < min_frame_size:
+            missing_frames.append(frame)
+            bad_files.append(entry[0])
+        else:
+            valid_frames += 1
+    return ResumePlan(missing_frames, bad_files, valid_frames, from_manifest)
@@ -0,0 +1,268 @@
+"""
+| File: farm_client.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Persistent Farm Queue clients, shared by every caller, and concurrent task submission with retries
+"""
+
+__all__ = [
+    "FarmClientPool",
+    "FarmSubmitError",
+    "get_farm_client",
+    "get_farm_client_pool",
+    "list_batch_tasks_async",
+    "release_farm_client_pool",
+    "submit_tasks_async",
+]
+
+import time
+import random
+import asyncio
+import carb
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from omni.mobile.robots.params import FARM_CLIENT_SETTINGS
+
+# Key of the task metadata holding its idempotency key
+IDEMPOTENCY_KEY = "idempotency_key"
+
+
+class FarmSubmitError(Exception):
+    """
+    Raised when some tasks could not be submitted. failed_keys are the idempotency keys of all of them, uncertain_keys
+    the ones whose submission failed without telling whether the task was queued, and which the queue could not be
+    checked for. Those tasks may be queued, they are not submitted again to avoid rendering them twice.
+    """
+
+    def __init__(self, message: str, failed_keys: List[str], uncertain_keys: List[str] = None):
+        super().__init__(message)
+        self.failed_keys = failed_keys
+        self.uncertain_keys = uncertain_keys or []
+
+
+class FarmClientPool:
+    """
+    One persistent client per Farm service url. A client keeps its http session, and so its connections, between
+    calls, instead of every request building and tearing down its own AsyncClient. The pool also remembers the
+    response of the recently submitted tasks by idempotency key, so submitting the same tasks again from this process
+    (e.g. a second click on the dispatch button) does not queue them twice. A response is forgotten after
+    submitted_ttl seconds, and the oldest ones once there are more than max_submitted.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], Any] = None,
+        submitted_ttl: float = FARM_CLIENT_SETTINGS["submitted_ttl"],
+        max_submitted: int = FARM_CLIENT_SETTINGS["max_submitted"],
+    ):
+        self._client_factory = client_factory or self._create_client
+        self._clients: Dict[str, Any] = {}
+        # Expiry time and result of the submitted tasks, oldest first
+        self._submitted: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._submitted_ttl = submitted_ttl
+        self._max_submitted = max_submitted
+
+    def get(self, uri: str) -> Any:
+        """Client of the service at the given url, created on first use"""
+        client = self._clients.get(uri)
+        if client is None:
+            client = self._client_factory(uri)
+            self._clients[uri] = client
+        return client
+
+    def set_client_factory(self, client_factory: Callable[[str], Any]):
+        """Create the clients with the given factory from now on, e.g. to talk to a stub queue in tests"""
+        self._client_factory = client_factory or self._create_client
+        self._clients = {}
+        self._submitted.clear()
+
+    def get_submitted(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        self._expire_submitted()
+        entry = self._submitted.get(idempotency_key)
+        return None if entry is None else entry[1]
+
+    def set_submitted(self, idempotency_key: str, result: Dict[str, Any]):
+        self._submitted.pop(idempotency_key, None)
+        self._submitted[idempotency_key] = (time.monotonic() + self._submitted_ttl, result)
+        self._expire_submitted()
+
+    async def close_async(self):
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._submitted.clear()
+        for client in clients:
+            stop_async = getattr(client, "stop_async", None)
+            if stop_async is not None:
+                try:
+                    await stop_async()
+                except Exception as exc:
+                    carb.log_warn(f"Failed to close farm client: {exc}")
+
+    def _expire_submitted(self):
+        # Every result has the same ttl, so the oldest entries expire first
+        now = time.monotonic()
+        while self._submitted:
+            key, (expiry, _) = next(iter(self._submitted.items()))
+            if expiry >= now and len(self._submitted) <= self._max_submitted:
+                break
+            del self._submitted[key]
+
+    def _create_client(self, uri: str) -> Any:
+        from omni.services.client import AsyncClient
+
+        return AsyncClient(uri=uri)
+
+
+_FARM_CLIENT_POOL = None
+
+
+def get_farm_client_pool() -> FarmClientPool:
+    global _FARM_CLIENT_POOL
+    if _FARM_CLIENT_POOL is None:
+        _FARM_CLIENT_POOL = FarmClientPool()
+    return _FARM_CLIENT_POOL
+
+
+def release_farm_client_pool():
+    """
+    Close the clients of the shared pool and forget it, e.g. when the extension shuts down, so their http sessions do
+    not outlive the extension. The next caller creates a new pool.
+    """
+    global _FARM_CLIENT_POOL
+    if _FARM_CLIENT_POOL is not None:
+        pool, _FARM_CLIENT_POOL = _FARM_CLIENT_POOL, None
+        asyncio.ensure_future(pool.close_async())
+
+
+def get_farm_client(uri: str) -> Any:
+    """Shared persistent client of the Farm service at the given url"""
+    return get_farm_client_pool().get(uri)
+
+
+def _get_tasks(response: Any) -> List[Dict[str, Any]]:
+    return response.get("tasks", []) if isinstance(response, dict) else list(response or [])
+
+
+def _get_batch_id(task: Dict[str, Any]) -> Optional[str]:
+    return (task.get("metadata") or {}).get("batches", {}).get("batch_id")
+
+
+async def list_batch_tasks_async(client: Any, batch_id: str) -> List[Dict[str, Any]]:
+    """
+    Tasks of the queue submitted with the given batch_id in their metadata, with one tasks.list query. The queue is
+    asked to filter the tasks by their metadata, and the answer is filtered again here, so a queue ignoring the filter
+    only costs a larger answer.
+
+    Raises:
+        ValueError: The queue does not return the metadata of its tasks, so the tasks of the batch cannot be told
+            apart from the others.
+    """
+    tasks = _get_tasks(await client.tasks.list(metadata={"batches": {"batch_id": batch_id}}))
+    if any("metadata" not in task for task in tasks):
+        raise ValueError("The farm queue does not return the metadata of its tasks")
+    return [task for task in tasks if _get_batch_id(task) == batch_id]
+
+
+async def _find_queued_async(client: Any, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The task of the queue with the idempotency key of the given task, None if it was not queued"""
+    key = task["metadata"][IDEMPOTENCY_KEY]
+    for queued in await list_batch_tasks_async(client, _get_batch_id(task)):
+        if queued["metadata"].get(IDEMPOTENCY_KEY) == key:
+            return dict(queued, task_id=queued.get("task_id", queued.get("id")))
+    return None
+
+
+async def submit_tasks_async(
+    client: Any,
+    tasks: List[Dict[str, Any]],
+    max_concurrency: int = FARM_CLIENT_SETTINGS["max_concurrency"],
+    max_retries: int = FARM_CLIENT_SETTINGS["max_retries"],
+    backoff: float = FARM_CLIENT_SETTINGS["backoff"],
+    progress_fn: Callable[[int, int], None] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Submit tasks to a Farm Queue, at most max_concurrency at a time, retrying each failed submission with an
+    exponential backoff. Every task must carry an idempotency key and a batch_id in its metadata.
+
+    The Farm Queue does not deduplicate tasks, and a failed submission (e.g. a timeout) may have queued its task
+    anyway. Only a refused connection surely did not, so before retrying any other failure the tasks of the batch are
+    listed, and a task found there with the same key is not submitted again. When the queue cannot be listed, the task
+    is not retried and is reported in FarmSubmitError.uncertain_keys.
+
+    Args:
+        client (Any): The Farm Queue management client, from get_farm_client.
+        tasks (List[Dict[str, Any]]): The arguments of tasks.submit for every task.
+        max_concurrency (int): The maximum number of submissions in flight.
+        max_retries (int): The number of retries of a failed submission.
+        backoff (float): The delay before the first retry in seconds, doubled for every retry.
+        progress_fn (Callable[[int, int], None]): Called with (submitted, total) after every submitted task.
+
+    Returns:
+        List[Dict[str, Any]]: The response of the queue for every task, in the order of the tasks.
+    """
+    pool = get_farm_client_pool()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    failed_keys: List[str] = []
+    uncertain_keys: List[str] = []
+    submitted = 0
+
+    for task in tasks:
+        if not task.get("metadata", {}).get(IDEMPOTENCY_KEY):
+            raise ValueError(f"Farm task is missing metadata[\"{IDEMPOTENCY_KEY}\"]")
+        if not _get_batch_id(task):
+            raise ValueError("Farm task is missing metadata[\"batches\"][\"batch_id\"]")
+
+    async def _submit(index: int, task: Dict[str, Any]):
+        nonlocal submitted
+        key = task["metadata"][IDEMPOTENCY_KEY]
+        result = pool.get_submitted(key)
+        attempt = 0
+        may_be_queued = False
+        while result is None:
+            async with semaphore:
+                try:
+                    if may_be_queued:
+                        # The previous attempt may have reached the queue, do not queue the task a second time
+                        try:
+                            result = await _find_queued_async(client, task)
+                        except Exception as exc:
+                            carb.log_error(f"Farm task {key} may be queued, not submitting it again: {exc}")
+                            failed_keys.append(key)
+                            uncertain_keys.append(key)
+                            return
+                    if result is None:
+                        result = await client.tasks.submit(**task)
+                    pool.set_submitted(key, result)
+                    break
+                except Exception as exc:
+                    may_be_queued = may_be_queued or not isinstance(exc, ConnectionRefusedError)
+                    if attempt >= max_retries:
+                        carb.log_error(f"Failed to submit farm task {key} after {attempt + 1} attempts: {exc}")
+                        failed_keys.append(key)
+                        if may_be_queued:
+                            uncertain_keys.append(key)
+                        return
+                    carb.log_warn(f"Failed to submit farm task {key}, retrying: {exc}")
+            # Back off outside of the semaphore, so the other submissions keep going, and a request which timed out
+            # has reached the queue before it is listed
+            await asyncio.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+            attempt += 1
+
+        results[index] = result
+        submitted += 1
+        if progress_fn is not None:
+            progress_fn(submitted, len(tasks))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_submit(index, task) for index, task in enumerate(tasks)])
+    carb.log_info(f"Submitted {submitted} farm tasks in {time.perf_counter() - start:.2f} s")
+
+    if failed_keys:
+        raise FarmSubmitError(
+            f"{len(failed_keys)} of {len(tasks)} farm tasks could not be submitted, {len(uncertain_keys)} of them may "
+            "be queued",
+            failed_keys,
+            uncertain_keys,
+        )
+    return results
@@ -0,0 +1,284 @@
+"""
+| File: farm_job_tracker.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Progress of the batches of a farm submission, polled at an adaptive interval
+"""
+
+__all__ = ["FarmJobProgress", "FarmJobTracker", "QUERY_TASK_IDS", "QUERY_BATCH", "QUERY_EACH_TASK"]
+
+import time
+import asyncio
+import carb
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from omni.mobile.robots.params import FARM_CLIENT_SETTINGS
+from .farm_client import list_batch_tasks_async
+
+FINISHED_STATUSES = ("finished", "completed")
+FAILED_STATUSES = ("failed", "errored", "cancelled")
+RUNNING_STATUSES = ("running",)
+# Window over which the throughput is measured, in seconds
+THROUGHPUT_WINDOW = 120.0
+# How the status of the tasks is queried: one tasks.list by task ids, one tasks.list by the batch_id of the
+# submission, or one tasks.get per task
+QUERY_TASK_IDS = "task_ids"
+QUERY_BATCH = "batch"
+QUERY_EACH_TASK = "each_task"
+
+
+class FarmJobProgress:
+    """Aggregated state of all the batches of a submission, handed to the progress callback of the FarmJobTracker"""
+
+    def __init__(
+        self,
+        frames_done: int = 0,
+        frames_total: int = 0,
+        tasks_total: int = 0,
+        tasks_running: int = 0,
+        tasks_finished: int = 0,
+        tasks_failed: int = 0,
+        frames_per_minute: float = 0.0,
+    ):
+        self.frames_done = frames_done
+        self.frames_total = frames_total
+        self.tasks_total = tasks_total
+        self.tasks_running = tasks_running
+        self.tasks_finished = tasks_finished
+        self.tasks_failed = tasks_failed
+        self.frames_per_minute = frames_per_minute
+
+    @property
+    def is_done(self) -> bool:
+        return self.tasks_finished + self.tasks_failed >= self.tasks_total
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated remaining time in seconds, or None while there is no throughput yet"""
+        if self.frames_per_minute <= 0.0:
+            return None
+        return 60.0 * (self.frames_total - self.frames_done) / self.frames_per_minute
+
+    def __repr__(self):
+        return (
+            f"FarmJobProgress({self.frames_done}/{self.frames_total} frames, {self.tasks_running} running, "
+            f"{self.tasks_finished} finished, {self.tasks_failed} failed, {self.frames_per_minute:.1f} frames/min)"
+        )
+
+
+class FarmJobTracker:
+    """
+    Follow the tasks of one submission with a single status query per poll, whatever the number of batches. The
+    status of all the tasks is asked with tasks.list(task_ids=...). A Farm Queue without that filter is asked for the
+    tasks of the batch_id of the submission instead, filtered here by task id. Only a queue which answers neither is
+    queried with one tasks.get(task_id=...) per unfinished task, at most max_concurrency at a time. The poll interval
+    starts at min_interval, grows while nothing changes, and goes back to min_interval as soon as a task progresses.
+    Polling stops once every task is finished or failed.
+
+    The frames of a task count as done once it is finished, or before if its status reports a "progress" fraction.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        task_frames: Dict[str, int],
+        batch_id: Optional[str] = None,
+        progress_fn: Callable[[FarmJobProgress], None] = None,
+        min_interval: float = FARM_CLIENT_SETTINGS["poll_min_interval"],
+        max_interval: float = FARM_CLIENT_SETTINGS["poll_max_interval"],
+        max_concurrency: int = FARM_CLIENT_SETTINGS["max_concurrency"],
+    ):
+        """
+        Args:
+            client (Any): The Farm Queue management client, from get_farm_client.
+            task_frames (Dict[str, int]): The number of frames of every task, by task id.
+            batch_id (str): The batch_id of the metadata of the tasks, to list them when the queue cannot list tasks
+                by id.
+            progress_fn (Callable[[FarmJobProgress], None]): Called after every poll which changed the progress.
+            min_interval (float): The shortest time between two polls, in seconds.
+            max_interval (float): The longest time between two polls, in seconds.
+            max_concurrency (int): The most status queries in flight when the tasks are queried one by one.
+        """
+        self._client = client
+        self._task_frames = dict(task_frames)
+        self._progress_fn = progress_fn
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = min_interval
+        self._max_concurrency = max_concurrency
+        self._batch_id = batch_id
+        # Falls back to the next kind of query once the Farm Queue rejects one
+        self._query_mode = QUERY_TASK_IDS
+        # Last status of every task, by task id
+        self._statuses: Dict[str, Dict[str, Any]] = {}
+
+        self._progress = FarmJobProgress(frames_total=sum(self._task_frames.values()), tasks_total=len(task_frames))
+        # (time, frames done) samples over the throughput window
+        self._history: Deque[Tuple[float, int]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+
+    @property
+    def progress(self) -> FarmJobProgress:
+        return self._progress
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def polls(self) -> int:
+        return self._polls
+
+    @property
+    def query_mode(self) -> str:
+        """How the status of the tasks is queried, one of QUERY_TASK_IDS, QUERY_BATCH and QUERY_EACH_TASK"""
+        return self._query_mode
+
+    @property
+    def is_tracking(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        if not self.is_tracking:
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def poll_async(self) -> FarmJobProgress:
+        """Query the status of all the tasks and update the progress"""
+        self._polls += 1
+        await self._query_statuses_async()
+        progress = self._aggregate(self._statuses.values())
+
+        # The throughput changes with time alone, only a change of the tasks resets the poll interval
+        changed = self._get_counts(progress) != self._get_counts(self._progress) or self._polls == 1
+        self._progress = progress
+        if changed:
+            self._interval = self._min_interval
+            if self._progress_fn is not None:
+                self._progress_fn(progress)
+        else:
+            self._interval = min(self._interval * 1.5, self._max_interval)
+        return progress
+
+    def _get_counts(self, progress: FarmJobProgress) -> Tuple[int, int, int, int]:
+        return progress.frames_done, progress.tasks_running, progress.tasks_finished, progress.tasks_failed
+
+    async def _query_statuses_async(self):
+        if self._query_mode == QUERY_TASK_IDS:
+            try:
+                response = await self._client.tasks.list(task_ids=list(self._task_frames.keys()))
+                self._update_statuses(self._get_tasks(response))
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._fall_back(QUERY_BATCH if self._batch_id else QUERY_EACH_TASK, f"cannot list tasks by id: {exc}")
+
+        if self._query_mode == QUERY_BATCH:
+            try:
+                self._update_statuses(await list_batch_tasks_async(self._client, self._batch_id))
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._fall_back(QUERY_EACH_TASK, f"cannot list the tasks of batch {self._batch_id}: {exc}")
+
+        await self._query_each_task_async()
+
+    def _fall_back(self, query_mode: str, reason: str):
+        self._query_mode = query_mode
+        if query_mode == QUERY_BATCH:
+            carb.log_warn(f"The farm queue {reason}, listing the tasks of their batch instead")
+        else:
+            carb.log_warn(
+                f"The farm queue {reason}, querying the {len(self._task_frames)} tasks one at a time: every poll "
+                "sends one query per unfinished task"
+            )
+
+    async def _query_each_task_async(self):
+        # Last resort, the cost of a poll grows with the number of tasks. Finished and failed tasks no longer change
+        pending = [task_id for task_id in self._task_frames if not self._is_final(self._statuses.get(task_id))]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _query(task_id: str):
+            async with semaphore:
+                return await self._client.tasks.get(task_id=task_id)
+
+        responses = await asyncio.gather(*[_query(task_id) for task_id in pending], return_exceptions=True)
+        errors = [response for response in responses if isinstance(response, Exception)]
+        if pending and len(errors) == len(pending):
+            raise errors[0]
+        for response in responses:
+            if not isinstance(response, Exception):
+                self._update_statuses(self._get_tasks(response))
+
+    def _get_tasks(self, response: Any) -> List[Dict[str, Any]]:
+        # A list of tasks, bare or under "tasks", or a single task, bare or under "task"
+        if isinstance(response, dict):
+            if "tasks" in response:
+                return response["tasks"]
+            return [response.get("task", response)]
+        return list(response or [])
+
+    def _update_statuses(self, tasks: List[Dict[str, Any]]):
+        for task in tasks:
+            task_id = task.get("task_id", task.get("id"))
+            if task_id in self._task_frames:
+                self._statuses[task_id] = task
+
+    def _is_final(self, task: Optional[Dict[str, Any]]) -> bool:
+        if task is None:
+            return False
+        status = str(task.get("status", "")).lower()
+        return status in FINISHED_STATUSES or status in FAILED_STATUSES
+
+    async def _run(self):
+        while True:
+            try:
+                progress = await self.poll_async()
+                if progress.is_done:
+                    carb.log_info(f"Farm job done: {progress}")
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                carb.log_warn(f"Failed to read the status of the farm tasks: {exc}")
+                self._interval = min(self._interval * 2.0, self._max_interval)
+            await asyncio.sleep(self._interval)
+
+    def _aggregate(self, tasks: Iterable[Dict[str, Any]]) -> FarmJobProgress:
+        progress = FarmJobProgress(frames_total=self._progress.frames_total, tasks_total=self._progress.tasks_total)
+        for task in tasks:
+            task_id = task.get("task_id", task.get("id"))
+            frames = self._task_frames.get(task_id)
+            if frames is None:
+                continue
+            status = str(task.get("status", "")).lower()
+            if status in FINISHED_STATUSES:
+                progress.tasks_finished += 1
+                progress.frames_done += frames
+            elif status in FAILED_STATUSES:
+                progress.tasks_failed += 1
+            else:
+                if status in RUNNING_STATUSES:
+                    progress.tasks_running += 1
+                # Running tasks may report a fraction of their frames as done
+                fraction = min(max(float(task.get("progress", 0.0) or 0.0), 0.0), 1.0)
+                progress.frames_done += int(fraction * frames)
+
+        now = time.monotonic()
+        self._history.append((now, progress.frames_done))
+        while len(self._history) > 2 and now - self._history[0][0] > THROUGHPUT_WINDOW:
+            self._history.popleft()
+        first_time, first_frames = self._history[0]
+        if now > first_time:
+            # Frames of a restarted task are done again, the throughput does not go negative meanwhile
+            frames_per_minute = 60.0 * (progress.frames_done - first_frames) / (now - first_time)
+            progress.frames_per_minute = max(frames_per_minute, 0.0)
+        return progress
@@ -10,16 +10,25 @@ from typing import Any, Dict, Optional
 
 import carb
 
-from omni.services.client import AsyncClient
+from omni.mobile.robots.params import FARM_CLIENT_SETTINGS
+from .farm_client import get_farm_client
+from .ttl_cache import TTLCache
 
 
 ADVANCED_RENDERING_FEATURES_SETTINGS_KEY = "advanced_rendering_features"
 """Key used to detect if the selected Farm Queue supports advanced rendering features."""
 
+_FARM_QUEUE_SETTINGS_CACHE = TTLCache(ttl=FARM_CLIENT_SETTINGS["settings_ttl"])
+"""Settings of every Farm Queue, shared by all the callers and read at most once at a time per queue."""
+
+_FARM_JOB_TEMPLATES_CACHE = TTLCache(ttl=FARM_CLIENT_SETTINGS["settings_ttl"])
+"""Job templates of every Farm Queue, by server URL."""
+
 
 async def get_farm_queue_settings(farm_queue_server_url: str) -> Dict[str, Any]:
     """
-    Return the settings from the selected Farm Queue.
+    Return the settings from the selected Farm Queue. They are cached for FARM_CLIENT_SETTINGS["settings_ttl"]
+    seconds, and concurrent callers share a single request.
 
     Args:
         farm_queue_server_url(str): Server URL of the selected Farm Queue.
@@ -28,14 +37,51 @@ async def get_farm_queue_settings(farm_queue_server_url: str) -> Dict[str, Any]:
         Dict[str, Any]: Settings exposed by the selected Farm Queue.
 
     """
-    try:
-        client = AsyncClient(uri=farm_queue_server_url)
+    async def _fetch_settings() -> Dict[str, Any]:
+        client = get_farm_client(farm_queue_server_url)
         settings_response = await client.queue.settings.get()
         return settings_response["settings"]
+
+    try:
+        return await _FARM_QUEUE_SETTINGS_CACHE.get_async(farm_queue_server_url, _fetch_settings)
     except Exception as exc:
         carb.log_warn(f"Failed to read farm queue settings: {exc}")
         return {}
 
+
+async def get_farm_job_templates(farm_queue_server_url: str, queue_management_endpoint_prefix: str) -> Dict[str, Any]:
+    """
+    Return the job templates loaded by the given Farm Queue, cached and shared like its settings.
+
+    Args:
+        farm_queue_server_url(str): Server URL of the selected Farm Queue.
+        queue_management_endpoint_prefix(str): Path of the queue management service on the server.
+
+    Returns:
+        Dict[str, Any]: Job templates of the Farm Queue, by name.
+
+    """
+    async def _fetch_job_templates() -> Dict[str, Any]:
+        client = get_farm_client(f"{farm_queue_server_url}{queue_management_endpoint_prefix}")
+        return await client.jobs.load.get()
+
+    return await _FARM_JOB_TEMPLATES_CACHE.get_async(farm_queue_server_url, _fetch_job_templates)
+
+
+def invalidate_farm_queue_settings(farm_queue_server_url: Optional[str] = None) -> None:
+    """
+    Read the settings and job templates of the given Farm Queue (or of every Farm Queue) again on their next use.
+
+    Args:
+        farm_queue_server_url(Optional[str]): Server URL of the Farm Queue, or ``None`` for every Farm Queue.
+
+    Returns:
+        None
+
+    """
+    _FARM_QUEUE_SETTINGS_CACHE.invalidate(farm_queue_server_url)
+    _FARM_JOB_TEMPLATES_CACHE.invalidate(farm_queue_server_url)
+
 async def farm_queue_supports_advanced_features(farm_queue_server_url: str) -> bool:
     """
     Check if the Farm Queue at the given URL supports advanced rendering features.
@@ -0,0 +1,180 @@
+"""
+| File: frame_partition.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Partition of a frame range into farm batches, balanced by frame count or by predicted render time
+"""
+
+__all__ = ["FrameBatch", "partition_frames", "get_batch_costs", "estimate_frame_costs", "get_frame_costs_from_output"]
+
+import os
+import re
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# Number of bisection steps on the batch cost limit, far below the resolution of render timings
+_BISECTION_STEPS = 64
+# Frame timings above this multiple of the median are treated as outliers (e.g. a pause between two batches)
+_OUTLIER_FACTOR = 10.0
+
+
+class FrameBatch(NamedTuple):
+    """Frames start_frame, start_frame + step, ... up to end_frame (included)"""
+
+    start_frame: int
+    end_frame: int
+    step: int = 1
+
+    @property
+    def frames(self) -> range:
+        return range(self.start_frame, self.end_frame + 1, self.step)
+
+
+def partition_frames(
+    start_frame: int,
+    end_frame: int,
+    batch_count: int,
+    frame_costs: Optional[Sequence[float]] = None,
+    interleave: bool = False,
+) -> List[FrameBatch]:
+    """
+    Split the frames from start_frame to end_frame (included) into batch_count non-empty batches.
+
+    Without costs, contiguous batches hold the same number of frames, give or take one. With a predicted cost (e.g. the
+    render time) per frame, contiguous batches are chosen to minimize the cost of the most expensive batch, which is
+    what bounds the duration of the farm job. Interleaved batches take every batch_count-th frame, which spreads slow
+    sections over all the batches without any estimate, so the costs are not used for them.
+
+    Args:
+        start_frame (int): The first frame.
+        end_frame (int): The last frame, included.
+        batch_count (int): The number of batches, 0 or 1 for a single batch.
+        frame_costs (Optional[Sequence[float]]): Predicted cost of every frame from start_frame to end_frame.
+        interleave (bool): Make strided batches instead of contiguous ones.
+
+    Returns:
+        List[FrameBatch]: The batches, in frame order.
+    """
+    if batch_count in (0, 1):
+        return [FrameBatch(start_frame, end_frame)]
+
+    num_frames = end_frame - start_frame + 1
+    if batch_count > num_frames:
+        raise ValueError(f"Batch count {batch_count} is larger than the frame range {num_frames}")
+
+    if interleave:
+        return [
+            FrameBatch(start_frame + k, start_frame + k + ((num_frames - 1 - k) // batch_count) * batch_count, batch_count)
+            for k in range(batch_count)
+        ]
+
+    if frame_costs is None:
+        bounds = (num_frames * np.arange(batch_count + 1)) // batch_count
+    else:
+        costs = np.asarray(frame_costs, dtype=np.float64)
+        if costs.shape != (num_frames,):
+            raise ValueError(f"Expected {num_frames} frame costs, got {costs.shape}")
+        if not np.all(np.isfinite(costs)) or np.any(costs < 0.0):
+            raise ValueError("Frame costs must be finite and positive")
+        bounds = _get_balanced_bounds(costs, batch_count)
+
+    return [
+        FrameBatch(start_frame + int(bounds[k]), start_frame + int(bounds[k + 1]) - 1) for k in range(batch_count)
+    ]
+
+
+def get_batch_costs(batches: Sequence[FrameBatch], start_frame: int, frame_costs: Sequence[float]) -> np.ndarray:
+    """Predicted cost of every batch, from the cost of every frame starting at start_frame"""
+    costs = np.asarray(frame_costs, dtype=np.float64)
+    return np.array([costs[np.asarray(batch.frames) - start_frame].sum() for batch in batches])
+
+
+def _get_balanced_bounds(costs: np.ndarray, batch_count: int) -> np.ndarray:
+    """
+    Bounds of the contiguous batches minimizing the cost of the most expensive batch. The smallest feasible limit is
+    bisected between the average and the average plus the most expensive frame, which is always feasible.
+    """
+    prefix = np.concatenate(([0.0], np.cumsum(costs)))
+    total = prefix[-1]
+    if total <= 0.0:
+        return (len(costs) * np.arange(batch_count + 1)) // batch_count
+
+    low = max(total / batch_count, costs.max())
+    high = total / batch_count + costs.max()
+    bounds = _get_greedy_bounds(prefix, batch_count, high)
+    for _ in range(_BISECTION_STEPS):
+        limit = 0.5 * (low + high)
+        candidate = _get_greedy_bounds(prefix, batch_count, limit)
+        if candidate is None:
+            low = limit
+        else:
+            high = limit
+            bounds = candidate
+        if high - low <= 1e-9 * total:
+            break
+    return bounds
+
+
+def _get_greedy_bounds(prefix: np.ndarray, batch_count: int, limit: float) -> Optional[np.ndarray]:
+    """Fill each batch up to the limit, leaving at least one frame per remaining batch. None if the limit is too low"""
+    num_frames = len(prefix) - 1
+    tolerance = 1e-12 * prefix[-1]
+    bounds = np.empty(batch_count + 1, dtype=np.int64)
+    bounds[0] = 0
+    position = 0
+    for k in range(batch_count - 1):
+        end = int(np.searchsorted(prefix, prefix[position] + limit + tolerance, side="right")) - 1
+        end = min(max(end, position + 1), num_frames - (batch_count - 1 - k))
+        if prefix[end] - prefix[position] > limit + tolerance:
+            return None
+        bounds[k + 1] = end
+        position = end
+    bounds[batch_count] = num_frames
+    if prefix[num_frames] - prefix[position] > limit + tolerance:
+        return None
+    return bounds
+
+
+def estimate_frame_costs(frame_times: Dict[int, float], start_frame: int, end_frame: int) -> Optional[np.ndarray]:
+    """
+    Cost of every frame from start_frame to end_frame (included), from the measured time of some of them. Frames
+    without a measure are interpolated from their neighbours. Returns None when nothing was measured.
+    """
+    if not frame_times:
+        return None
+    known_frames = np.array(sorted(frame_times.keys()), dtype=np.float64)
+    known_times = np.array([frame_times[frame] for frame in sorted(frame_times.keys())], dtype=np.float64)
+    return np.interp(np.arange(start_frame, end_frame + 1, dtype=np.float64), known_frames, known_times)
+
+
+def get_frame_costs_from_output(
+    output_folder: str, file_name: str, file_type: str, start_frame: int, end_frame: int
+) -> Optional[np.ndarray]:
+    """
+    Estimate the render time of every frame from the frames a previous capture wrote to the output folder: a frame
+    took the time between its modification time and the one of the frame before it. Only one scan of the folder is
+    done. Returns None when there is no previous output.
+    """
+    pattern = re.compile(re.escape(file_name) + r"\.(-?\d+)" + re.escape(file_type) + "$")
+    modification_times: Dict[int, float] = {}
+    try:
+        with os.scandir(output_folder) as entries:
+            for entry in entries:
+                match = pattern.match(entry.name)
+                if match is not None:
+                    modification_times[int(match.group(1))] = entry.stat().st_mtime
+    except OSError:
+        return None
+
+    frame_times = {
+        frame: modification_times[frame] - modification_times[frame - 1]
+        for frame in modification_times
+        if frame - 1 in modification_times and modification_times[frame] > modification_times[frame - 1]
+    }
+    if not frame_times:
+        return None
+
+    # Frames written by different farm agents or after a pause give meaningless differences
+    limit = _OUTLIER_FACTOR * float(np.median(list(frame_times.values())))
+    frame_times = {frame: duration for frame, duration in frame_times.items() if duration <= limit}
+    return estimate_frame_costs(frame_times, start_frame, end_frame)
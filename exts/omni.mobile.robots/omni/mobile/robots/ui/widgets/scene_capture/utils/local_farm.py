@@ -0,0 +1,260 @@
+"""
+| File: local_farm.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Farm Queue stand-in running the render batches in headless Kit processes on this machine
+"""
+
+__all__ = ["LocalFarmClient", "get_isaac_python_executable", "get_worker_cpus"]
+
+import os
+import sys
+import json
+import uuid
+import shutil
+import asyncio
+import carb
+import carb.tokens
+from typing import Any, Dict, List, Optional, Sequence
+from omni.mobile.robots.params import LOCAL_FARM_SETTINGS, ROOT
+from omni.mobile.robots.render_batch import count_written_frames, get_num_frames
+
+
+def get_isaac_python_executable() -> str:
+    """
+    Python starting the render workers: LOCAL_FARM_SETTINGS["python_executable"] if set, else the python.sh
+    (python.bat on Windows) of the Isaac Sim install running this process. The python of Kit itself does not set up
+    the environment of Isaac Sim, so a worker started with it could not import SimulationApp.
+
+    Raises:
+        FileNotFoundError: The python of Isaac Sim could not be found.
+    """
+    if LOCAL_FARM_SETTINGS["python_executable"]:
+        return LOCAL_FARM_SETTINGS["python_executable"]
+
+    script_name = "python.bat" if sys.platform == "win32" else "python.sh"
+    tokens = carb.tokens.get_tokens_interface()
+    folders = []
+    # The app (<install>/apps) and kit (<install>/kit) folders are next to the script, at the root of the install
+    for token in ("${app}", "${kit}"):
+        folder = tokens.resolve(token)
+        if folder and not folder.startswith("${"):
+            folder = os.path.normpath(folder)
+            folders += [folder, os.path.dirname(folder)]
+    for folder in folders:
+        path = os.path.join(folder, script_name)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(
+        f"Could not find the {script_name} of Isaac Sim in {sorted(set(folders))}, set the python of the local render "
+        "workers in LOCAL_FARM_SETTINGS[\"python_executable\"]"
+    )
+
+
+def get_worker_cpus(num_workers: int, cpus: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    Split the cpus available to this process (or the given ones) into num_workers disjoint sets of contiguous cores,
+    one per worker. With more workers than cores, the workers share the cores round robin.
+    """
+    if cpus is None:
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    cpus = list(cpus)
+    if num_workers >= len(cpus):
+        return [[cpus[index % len(cpus)]] for index in range(num_workers)]
+    return [cpus[len(cpus) * index // num_workers:len(cpus) * (index + 1) // num_workers] for index in range(num_workers)]
+
+
+class _LocalTask:
+    def __init__(self, task_id: str, args: Dict[str, Any], staging_folder: str):
+        self.task_id = task_id
+        self.args = args
+        self.staging_folder = staging_folder
+        self.status = "submitted"
+        self.frames_written = 0
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.args.get("metadata", {})
+
+    @property
+    def render_settings(self) -> Dict[str, Any]:
+        return self.args["task_function_args"]["render_settings"]
+
+
+class _LocalTasks:
+    """The tasks endpoint of the client: tasks.submit and tasks.list, with the arguments of the Farm Queue ones"""
+
+    def __init__(self, client: "LocalFarmClient"):
+        self._client = client
+
+    async def submit(self, **task_args) -> Dict[str, Any]:
+        return self._client._submit(task_args)
+
+    async def list(self, task_ids: List[str] = None, metadata: Dict[str, Any] = None, **_) -> Dict[str, Any]:
+        return {"tasks": self._client._list(task_ids, metadata)}
+
+
+class LocalFarmClient:
+    """
+    Runs the tasks of a farm submission as headless Kit processes on this machine instead of sending them to a Farm
+    Queue, so a workstation without a farm deployment renders the batches on all its cores. The client answers the
+    tasks.submit and tasks.list endpoints like the Farm Queue management client, so submit_tasks_async and the
+    FarmJobTracker work with it unchanged.
+
+    At most num_workers tasks run at a time. Every worker slot is pinned to its own set of cores and to a GPU, round
+    robin over the given GPUs. A worker renders its batch into its own staging folder, and the frames are moved into
+    the output folder once the batch succeeded, so a failed batch never leaves partial frames in the output.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        gpus: Sequence[int] = LOCAL_FARM_SETTINGS["gpus"],
+        command: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            num_workers (int): The number of worker processes running at the same time.
+            gpus (Sequence[int]): The GPUs the workers are spread over, empty for the default GPU of Kit.
+            command (Optional[Sequence[str]]): The command starting a worker, the task arguments are appended to it.
+                Defaults to the render_batch entry point of the extension, run by get_isaac_python_executable.
+
+        Raises:
+            FileNotFoundError: No command is given and the python of Isaac Sim could not be found.
+        """
+        self._num_workers = max(1, num_workers)
+        self._gpus = list(gpus)
+        self._command = list(command) if command is not None else [
+            get_isaac_python_executable(), "-m", "omni.mobile.robots.render_batch"
+        ]
+        self._worker_cpus = get_worker_cpus(self._num_workers)
+        self._free_slots: Optional[asyncio.Queue] = None
+        self._tasks: Dict[str, _LocalTask] = {}
+        self._futures: List[asyncio.Future] = []
+        self.tasks = _LocalTasks(self)
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    async def wait_async(self):
+        """Wait for every submitted task to finish or fail"""
+        await asyncio.gather(*self._futures, return_exceptions=True)
+
+    async def stop_async(self):
+        """Kill the running workers and drop the tasks still waiting for one"""
+        for future in self._futures:
+            future.cancel()
+        await asyncio.gather(*self._futures, return_exceptions=True)
+        self._futures = []
+
+    def _submit(self, task_args: Dict[str, Any]) -> Dict[str, Any]:
+        if self._free_slots is None:
+            # Created on first use, on the loop of the caller
+            self._free_slots = asyncio.Queue()
+            for slot in range(self._num_workers):
+                self._free_slots.put_nowait(slot)
+
+        task_id = str(uuid.uuid4())
+        output_folder = task_args["task_function_args"]["render_settings"]["output_folder"]
+        staging_folder = os.path.join(output_folder, LOCAL_FARM_SETTINGS["staging_folder"], task_id)
+        task = _LocalTask(task_id, task_args, staging_folder)
+        self._tasks[task_id] = task
+        self._futures.append(asyncio.ensure_future(self._run_task(task)))
+        return {"task_id": task_id, "status": task.status}
+
+    def _list(self, task_ids: Optional[List[str]], metadata: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        tasks = [self._tasks[task_id] for task_id in task_ids or self._tasks.keys() if task_id in self._tasks]
+        # The filter of the Farm Queue by metadata, on the batch_id only
+        batch_id = (metadata or {}).get("batches", {}).get("batch_id")
+        if batch_id is not None:
+            tasks = [task for task in tasks if task.metadata.get("batches", {}).get("batch_id") == batch_id]
+        return [
+            {
+                "task_id": task.task_id,
+                "status": task.status,
+                "progress": self._get_task_progress(task),
+                "metadata": task.metadata,
+            }
+            for task in tasks
+        ]
+
+    def _get_task_progress(self, task: _LocalTask) -> float:
+        if task.status != "running":
+            return 1.0 if task.status == "finished" else 0.0
+        task.frames_written = count_written_frames(task.staging_folder)
+        return min(1.0, task.frames_written / max(1, get_num_frames(task.render_settings)))
+
+    async def _run_task(self, task: _LocalTask):
+        slot = await self._free_slots.get()
+        try:
+            task.status = "running"
+            os.makedirs(task.staging_folder, exist_ok=True)
+            return_code = await self._run_worker(task, slot)
+            if return_code != 0:
+                task.status = "failed"
+                carb.log_error(f"Local render worker of task {task.task_id} exited with code {return_code}")
+                return
+            self._merge_output(task)
+            task.status = "finished"
+        except asyncio.CancelledError:
+            task.status = "cancelled"
+            raise
+        except Exception as exc:
+            task.status = "failed"
+            carb.log_error(f"Local render task {task.task_id} failed: {exc}")
+        finally:
+            self._free_slots.put_nowait(slot)
+
+    async def _run_worker(self, task: _LocalTask, slot: int) -> int:
+        render_settings = dict(task.render_settings)
+        render_settings["output_folder"] = task.staging_folder
+        settings_path = os.path.join(task.staging_folder, "..", f"{task.task_id}.json")
+        with open(settings_path, "w") as settings_file:
+            json.dump(render_settings, settings_file)
+
+        function_args = task.args["task_function_args"]
+        args = [
+            "--usd-file", function_args["usd_file"],
+            "--settings", settings_path,
+            "--start-delay", str(function_args.get("render_start_delay", 0)),
+        ]
+        if self._gpus:
+            args += ["--gpu", str(self._gpus[slot % len(self._gpus)])]
+
+        env = dict(os.environ)
+        # The workers import the extension from its folder, like the extension manager does for this process
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+        env["OMP_NUM_THREADS"] = str(len(self._worker_cpus[slot]))
+
+        process = await asyncio.create_subprocess_exec(*self._command, *args, env=env)
+        task.process = process
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(process.pid, self._worker_cpus[slot])
+            except OSError as exc:
+                carb.log_warn(f"Could not pin local render worker {process.pid} to its cores: {exc}")
+        try:
+            return await process.wait()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        finally:
+            os.remove(settings_path)
+
+    def _merge_output(self, task: _LocalTask):
+        output_folder = task.render_settings["output_folder"]
+        for folder, _, file_names in os.walk(task.staging_folder):
+            target_folder = os.path.join(output_folder, os.path.relpath(folder, task.staging_folder))
+            os.makedirs(target_folder, exist_ok=True)
+            for file_name in file_names:
+                os.replace(os.path.join(folder, file_name), os.path.join(target_folder, file_name))
+        shutil.rmtree(task.staging_folder, ignore_errors=True)
+        # Remove the staging root once the last batch is merged
+        try:
+            os.rmdir(os.path.dirname(task.staging_folder))
+        except OSError:
+            pass
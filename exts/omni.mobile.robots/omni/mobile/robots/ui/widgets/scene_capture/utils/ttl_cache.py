@@ -0,0 +1,76 @@
+"""
+| File: ttl_cache.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Cache of asynchronously fetched values with an expiry time and a single request in flight per key
+"""
+
+__all__ = ["TTLCache"]
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Values fetched by coroutines, kept for ttl seconds. While a value is being fetched, every other caller asking for
+    the same key awaits the same request instead of sending its own. Failed fetches are not cached.
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._values: Dict[Hashable, Tuple[float, Any]] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._generations: Dict[Hashable, int] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The cached value of the key if it has not expired, without fetching it"""
+        entry = self._values.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def get_async(self, key: Hashable, fetch_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value of the key, or fetch it with fetch_fn if it is missing or expired.
+
+        Args:
+            key (Hashable): The key of the value, e.g. the url it is read from.
+            fetch_fn (Callable[[], Awaitable[Any]]): Coroutine function fetching the value.
+
+        Returns:
+            Any: The value.
+        """
+        entry = self._values.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            return entry[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._fetch_async(key, fetch_fn, self._generations.get(key, 0)))
+            self._in_flight[key] = in_flight
+        # The request is shared, so a caller giving up must not cancel it for the others
+        return await asyncio.shield(in_flight)
+
+    def invalidate(self, key: Hashable = None):
+        """Forget the value of the key, or of every key. A request in flight is not stored when it completes"""
+        keys = set(self._values) | set(self._in_flight) if key is None else [key]
+        for invalidated_key in keys:
+            self._values.pop(invalidated_key, None)
+            self._in_flight.pop(invalidated_key, None)
+            self._generations[invalidated_key] = self._generations.get(invalidated_key, 0) + 1
+
+    async def _fetch_async(self, key: Hashable, fetch_fn: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await fetch_fn()
+        finally:
+            if self._generations.get(key, 0) == generation:
+                self._in_flight.pop(key, None)
+        if self._generations.get(key, 0) == generation:
+            self._values[key] = (time.monotonic() + self._ttl, value)
+        return value
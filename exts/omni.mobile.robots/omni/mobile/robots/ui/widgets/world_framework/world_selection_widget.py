@@ -21,6 +21,8 @@ from omni.isaac.core.scenes import Scene
 from omni.isaac.core.utils.stage import create_new_stage_async, update_stage_async, clear_stage
 from omni.mobile.robots.params import SIMULATION_ENVIRONMENTS, WORLD_THUMBNAIL, WORLD_THUMBNAILS, _asset_server
 from omni.mobile.robots.ui.widgets import custom_multifield_widget, custom_env_combo_widget
+from omni.mobile.robots.logic.world.env_loader import EnvironmentLoader, LoadProgress
+from omni.mobile.robots.logic.world.world_session import WorldSession
 from omni.isaac.core.utils.prims import create_prim
 
 
@@ -36,9 +38,11 @@ class WorldSelectionWidget(object):
         self.timeline = omni.timeline.get_timeline_interface()
 
         self._current_tasks = None
+        self._load_world_task = None
         
         self._world = None
         self._world_settings = {"physics_dt": 1.0 / 60.0, "stage_units_in_meters": 1.0, "rendering_dt": 1.0 / 60.0}
+        self._session = WorldSession(world_settings=self._world_settings, progress_fn=self._on_env_load_progress)
     
     def _main_ui(self):
         """
@@ -48,33 +52,37 @@ class WorldSelectionWidget(object):
         """
         
         with ui.CollapsableFrame(title=self._title, name="env_frame"):
-            with ui.VStack(height=0, spacing=5, name="frame_v_stack"):
-                ui.Line(style_type_name_override="HeaderLine")
-                ui.Spacer(height = 5)
+            self._build_content()
+
+    def _build_content(self):
+        """Content of the world frame, built right away by _main_ui since the world is not one of WINDOW_SECTIONS"""
+        with ui.VStack(height=0, spacing=5, name="frame_v_stack"):
+            ui.Line(style_type_name_override="HeaderLine")
+            ui.Spacer(height = 5)
                 
-                self.env_type_ui = custom_env_combo_widget.EnvComboboxWidget(label="Environment (", options=SIMULATION_ENVIRONMENTS, on_restore_fn=self._env_info_func)
+            self.env_type_ui = custom_env_combo_widget.EnvComboboxWidget(label="Environment (", options=SIMULATION_ENVIRONMENTS, on_restore_fn=self._env_info_func)
                 
-                with ui.HStack():
-                    # Add a thumbnail image to have a preview of the world that is about to be loaded
-                    with ui.ZStack(width=self._label_padding, height=40*2):
-                        self.thumbnail_image = ui.Image(
-                            WORLD_THUMBNAIL,
-                            name="thumbnail", 
-                            fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP,
-                            alignment=ui.Alignment.LEFT_CENTER,
-                            )
+            with ui.HStack():
+                # Add a thumbnail image to have a preview of the world that is about to be loaded
+                with ui.ZStack(width=self._label_padding, height=40*2):
+                    self.thumbnail_image = ui.Image(
+                        WORLD_THUMBNAIL,
+                        name="thumbnail", 
+                        fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP,
+                        alignment=ui.Alignment.LEFT_CENTER,
+                        )
 
-                    ui.Spacer(width=self._spacing)
+                ui.Spacer(width=self._spacing)
                     
-                    with ui.VStack():
-                        # Button for loading a desired scene
-                        self._load_world_btn = ui.Button("Load Scene", width=200, height=40, name="load_button", style={ "color": "lightblue"}, clicked_fn=self._on_click_load_func)
-                        self._clear_world_btn = ui.Button("Clear Scene", width=200, height=40, name="load_button", style={ "color": "lightblue"}, clicked_fn=self.clear_test)
+                with ui.VStack():
+                    # Button for loading a desired scene
+                    self._load_world_btn = ui.Button("Load Scene", width=200, height=40, name="load_button", style={ "color": "lightblue"}, clicked_fn=self._on_click_load_func)
+                    self._clear_world_btn = ui.Button("Clear Scene", width=200, height=40, name="load_button", style={ "color": "lightblue"}, clicked_fn=self.clear_test)
                         
-                ui.Spacer(height=self._spacing)
-                # pos = custom_multifield_widget.CustomMultifieldWidget(label="Orientation: \t", default_vals=[0.0, 0.0, 0.0])
-                # scale = custom_multifield_widget.CustomMultifieldWidget(label="Scale: \t", default_vals=[0.0, 0.0, 0.0])
-                # ui.Spacer(height=self._spacing)
+            ui.Spacer(height=self._spacing)
+            # pos = custom_multifield_widget.CustomMultifieldWidget(label="Orientation: \t", default_vals=[0.0, 0.0, 0.0])
+            # scale = custom_multifield_widget.CustomMultifieldWidget(label="Scale: \t", default_vals=[0.0, 0.0, 0.0])
+            # ui.Spacer(height=self._spacing)
 
     """ WORLD THUMBNAIL Change """
     # def env_thumbnail_change(self):
@@ -94,28 +102,42 @@ class WorldSelectionWidget(object):
     
     """ World Load Button"""    
     def _on_click_load_func(self):
-        asyncio.ensure_future(self.load_world_async())
+        # A second click while the scene is loading cancels the load
+        if self._load_world_task is not None and not self._load_world_task.done():
+            self._load_world_task.cancel()
+            return
+        self._load_world_task = asyncio.ensure_future(self.load_world_async())
     
-    async def load_world_async(self):
-        if World.instance() is None:
-            print("World instance is None!!")
-            await create_new_stage_async()
-            self._world = World(**self._world_settings)
-            await self._world.initialize_simulation_context_async()
-            self.setup_scene(self._scene)
+    def _on_env_load_progress(self, progress: LoadProgress):
+        if progress.phase == EnvironmentLoader.PHASE_PREFETCH:
+            self._load_world_btn.text = f"Loading {progress.completed}/{progress.total} (click to cancel)"
+        elif progress.phase == EnvironmentLoader.PHASE_RESOLVE and progress.total > 1:
+            self._load_world_btn.text = f"Caching {progress.completed}/{progress.total} (click to cancel)"
         else:
-            self._world = World.instance()
+            self._load_world_btn.text = f"Loading {progress.phase}... (click to cancel)"
+    
+    async def load_world_async(self):
+        try:
+            await self._load_world_async()
+        except asyncio.CancelledError:
+            carb.log_warn("Loading of the environment has been cancelled")
+        finally:
+            self._load_world_btn.text = "Load Scene"
+    
+    async def _load_world_async(self):
+        self._world = await self._session.create_world_async(setup_scene_fn=lambda: self.setup_scene(self._scene))
         self._current_tasks = self._world.get_current_tasks()
-        await self._world.reset_async()
-        await self._world.pause_async()
         await self.setup_post_load()  # setup_post_load 호출
         if len(self._current_tasks) > 0:
             self._world.add_physics_callback("tasks_step", self._world.step_async)
         
         try:
-            self._load_env(self.env_type_ui._env_name, "/World", "/World/base_env")
+            await self._load_env_async(self.env_type_ui._env_name, "/World", "/World/base_env")
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             carb.log_warn("Could not load the desired environment: " + str(e))
+            return
 
         carb.log_info("A new environment has been loaded successfully")
     
@@ -135,18 +157,11 @@ class WorldSelectionWidget(object):
         print("Post load setup complete.")
     
     
-    def _load_env(self, usd_path: str, stage_prefix: str, asset_stage_prefix: str):
-        if self._world.stage.GetPrimAtPath(stage_prefix):
-            raise Exception("A primitive already exists at the specified path")
-        
-        # Create the stage primitive and load the usd into it
-        prim = self._world.stage.DefinePrim(stage_prefix)
-        custom_env = prim.GetReferences().AddReference(usd_path)
-        
-        if not custom_env:
-            raise Exception("The usd asset" + usd_path + "is not load at stage path " + stage_prefix)
-        
-        self.set_env_pos(custom_env, pos=np.array([1, 2, 3]), scale=np.array([0.1, 0.1, 0.1]))
+    async def _load_env_async(self, usd_path: str, stage_prefix: str, asset_stage_prefix: str):
+        # Environments that are still resident in the warm pool are only re-activated
+        await self._session.load_env_async(
+            usd_path, stage_prefix, position=np.array([1, 2, 3]), scale=np.array([0.1, 0.1, 0.1])
+        )
         
         # usd_asset = create_prim(prim_path=asset_stage_prefix,
         #                         position=[2.0, 0.0, 0.0],
@@ -159,43 +174,16 @@ class WorldSelectionWidget(object):
         stage.SetDefaultPrim(default_prim.GetPrim())
     
     def set_env_pos(self, base_env, pos: np.ndarray, scale: np.ndarray):
-        if not isinstance(base_env, Usd.Prim):
-            raise ValueError("base_env must be a Usd.Prim object")
-    
-        xformable_env = UsdGeom.Xformable(base_env)
-        
-        # Translation operation
-        translateOp = xformable_env.AddXformOp(UsdGeom.XformOp.TypeTranslate, UsdGeom.XformOp.PrecisionDouble)
-        translateOp.Set(Gf.Vec3d(*pos))  # Convert numpy array to Gf.Vec3d
-        
-        # Scale operation
-        scaleOp = xformable_env.AddXformOp(UsdGeom.XformOp.TypeScale, UsdGeom.XformOp.PrecisionDouble)
-        scaleOp.Set(Gf.Vec3d(*scale))  # Convert numpy array to Gf.Vec3d
-        
-        print(f"Set position to: {pos}")
-        print(f"Set scale to: {scale}")
-        
-        # Uncomment if you need to set rotation as well
-        # rotateOp = xformable_env.AddXformOp(UsdGeom.XformOp.TypeRotateXYZ, UsdGeom.XformOp.PrecisionDouble)
-        # rotateOp.Set(ori)  # Set rotation
-        
-        # Save the stage if needed
-        # stage.GetRootLayer().Save()
+        # The existing translate/scale ops are reused, so loading the same environment again does not add new ones
+        self._session.place(base_env, position=pos, scale=scale)
+        carb.log_info(f"Environment placed at {pos} with scale {scale}")
 
     """ World reset Button """    
     def clear_test(self):
-        if self._world is not None:
-            self._world.stop()
+        self._session.clear()
         
         if self._world is not None:
-            self._world.clear_all_callbacks()
-            self._world.clear()
-        
-        clear_stage()
-        
-        gc.collect()
-        
-        asyncio.ensure_future(self._world.initialize_simulation_context_async())
+            asyncio.ensure_future(self._world.initialize_simulation_context_async())
         carb.log_info("Current Scene has been deleted")
         
     def _on_click_reset_func(self):
@@ -0,0 +1,82 @@
+"""
+| File: test_kit_free_imports.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: The numpy and pxr models of the extension import and run in a plain python, without Kit
+
+Unlike the tests of omni/mobile/robots/tests, which run inside Kit, these run with numpy and usd-core only:
+    python -m pytest exts/omni.mobile.robots/tests
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+
+EXTENSION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which must not need Kit, carb, omni.ui or omni.isaac.core
+KIT_FREE_MODULES = [
+    "omni.mobile.robots.logic.vehicles.vehicle_spec",
+    "omni.mobile.robots.logic.vehicles.vehicle_batch",
+    "omni.mobile.robots.logic.arms.arm_spec",
+    "omni.mobile.robots.logic.arms.joint_controller",
+    "omni.mobile.robots.logic.sensors.lidar_spec",
+    "omni.mobile.robots.logic.sensors.raycast_scene",
+    "omni.mobile.robots.logic.sensors.lidar",
+    "omni.mobile.robots.logic.sensors.ring_buffer",
+    "omni.mobile.robots.logic.sensors.odometry_spec",
+    "omni.mobile.robots.logic.sensors.imu",
+    "omni.mobile.robots.logic.sensors.wheel_odometry",
+    "omni.mobile.robots.logic.world.xform_utils",
+    "omni.mobile.robots.render_batch",
+]
+
+# Run after the imports: one step of every model
+SMOKE_TEST = """
+import numpy as np
+from omni.mobile.robots.logic.vehicles.vehicle_batch import VehicleBatch
+from omni.mobile.robots.logic.arms.arm_spec import FR3_SPEC
+from omni.mobile.robots.logic.arms.joint_controller import JointImpedanceController
+from omni.mobile.robots.logic.sensors.imu import ImuBatch
+from omni.mobile.robots.logic.sensors.lidar import LidarBatch
+from omni.mobile.robots.logic.sensors.raycast_scene import OccupancyGridScene
+from omni.mobile.robots.logic.sensors.wheel_odometry import WheelOdometryBatch
+
+VehicleBatch(["Husky", "WeCAR"]).step(np.zeros((2, 2)), 0.004)
+controller = JointImpedanceController(2, FR3_SPEC)
+controller.compute(np.zeros((2, 7)), np.zeros((2, 7)), np.asarray(FR3_SPEC.home_positions))
+LidarBatch(2, OccupancyGridScene(np.ones((4, 4), dtype=bool), 1.0)).scan(np.full((2, 3), 2.0))
+ImuBatch(2).update(np.zeros((2, 3)), np.zeros((2, 3)), np.tile([1.0, 0.0, 0.0, 0.0], (2, 1)), 0.0)
+WheelOdometryBatch(2).update(np.zeros((2, 4)), 0.0)
+"""
+
+
+class TestKitFreeImports(unittest.TestCase):
+    def _run(self, code: str) -> subprocess.CompletedProcess:
+        # A fresh interpreter, so the modules loaded by the other tests do not hide a missing dependency
+        environment = dict(os.environ, PYTHONPATH=EXTENSION_ROOT)
+        return subprocess.run(
+            [sys.executable, "-c", code], cwd=EXTENSION_ROOT, env=environment, capture_output=True, text=True
+        )
+
+    def test_imports_without_kit(self):
+        code = "\n".join(
+            ["import sys"]
+            + [f"import {module}" for module in KIT_FREE_MODULES]
+            + [
+                "kit = sorted(m for m in sys.modules if m.split('.')[0] == 'carb' or m.startswith(('omni.ext', 'omni.ui', "
+                "'omni.kit', 'omni.isaac')))",
+                "assert not kit, kit",
+            ]
+        )
+        result = self._run(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_models_run_without_kit(self):
+        result = self._run(SMOKE_TEST)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+| File: test_render_batch.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Exit codes of the render worker, with a stand-in of the viewport capture, without Kit
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from omni.mobile.robots import render_batch  # noqa: E402
+
+CANCELLED = "cancelled"
+
+
+class _FakeCapture:
+    """Writes one frame per update, stalls after num_written frames or cancels after cancel_after updates"""
+
+    def __init__(self, output_folder: str, num_written: int, finish: bool = True, cancel_after: int = None):
+        self.output_folder = output_folder
+        self.num_written = num_written
+        self.finish = finish
+        self.cancel_after = cancel_after
+        self.capture_finished_fn = None
+        self.progress = mock.Mock(capture_status="capturing")
+        self.num_updates = 0
+        self.cancelled = False
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def update(self):
+        self.num_updates += 1
+        if self.cancel_after is not None and self.num_updates >= self.cancel_after:
+            self.progress.capture_status = CANCELLED
+            return
+        frame = self.num_updates - 1
+        if frame < self.num_written:
+            open(os.path.join(self.output_folder, f"frame_{frame:04d}.png"), "w").close()
+        elif self.finish:
+            self.capture_finished_fn()
+
+
+class _FakeApp:
+    def __init__(self, capture: _FakeCapture):
+        self._capture = capture
+
+    def update(self):
+        self._capture.update()
+
+
+class TestRenderBatch(unittest.TestCase):
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._settings = {"output_folder": self._folder.name, "start_frame": 0, "end_frame": 9}
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def _run(self, capture: _FakeCapture, frame_timeout: float = 0.0) -> int:
+        return render_batch.run_capture(
+            _FakeApp(capture), capture, self._settings, frame_timeout, cancelled_status=CANCELLED
+        )
+
+    def test_num_frames(self):
+        self.assertEqual(render_batch.get_num_frames(self._settings), 10)
+        self.assertEqual(render_batch.get_num_frames(dict(self._settings, capture_every_Nth_frames=3)), 4)
+        self.assertEqual(render_batch.get_num_frames(dict(self._settings, start_frame=9)), 1)
+
+    def test_every_frame_written(self):
+        self.assertEqual(self._run(_FakeCapture(self._folder.name, 10)), 0)
+        self.assertEqual(render_batch.count_written_frames(self._folder.name), 10)
+
+    def test_missing_frames(self):
+        self.assertEqual(self._run(_FakeCapture(self._folder.name, 7)), 2)
+
+    def test_cancelled(self):
+        capture = _FakeCapture(self._folder.name, 10, cancel_after=3)
+        self.assertEqual(self._run(capture), 1)
+        self.assertEqual(capture.num_updates, 3)
+
+    def test_stalled(self):
+        capture = _FakeCapture(self._folder.name, 2, finish=False)
+        # Every update is one more second, the frames are counted once per second
+        clock = iter(range(1000))
+        with mock.patch.object(render_batch.time, "perf_counter", lambda: float(next(clock))):
+            self.assertEqual(self._run(capture, frame_timeout=5.0), 1)
+        self.assertTrue(capture.cancelled)
+        self.assertLess(capture.num_updates, 20)
@@ -0,0 +1,44 @@
+"""
+| File: test_robot_assets.py
+| Author: Ji Sue Lee (brunoleej@gmail.com)
+| License: BSD-3-Clause. Copyright (c) 2024, Ji Sue Lee. All rights reserved.
+| Description: Resolution of the usd of the robots of ROBOT_ENVIRONMENTS, without Kit
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from omni.mobile.robots import params  # noqa: E402
+
+
+class TestRobotAssets(unittest.TestCase):
+    def test_every_robot_has_a_source(self):
+        self.assertEqual(set(params.ROBOT_ASSET_PATHS), set(params.ROBOT_ENVIRONMENTS))
+        self.assertEqual(set(params.ROBOT_LOCAL_USD_PATHS), set(params.ROBOT_ENVIRONMENTS))
+
+    def test_local_usd_first(self):
+        with tempfile.TemporaryDirectory() as folder:
+            local_path = os.path.join(folder, "husky.usd")
+            open(local_path, "w").close()
+            with mock.patch.dict(params.ROBOT_LOCAL_USD_PATHS, {"Husky": local_path}):
+                self.assertEqual(params.get_robot_usd_path("Husky"), local_path)
+
+    def test_asset_server(self):
+        with mock.patch.object(params, "_get_assets_root_path", return_value="omniverse://server/Assets"):
+            self.assertEqual(
+                params.get_robot_usd_path("FR3"), "omniverse://server/Assets/Isaac/Robots/Franka/FR3/fr3.usd"
+            )
+            # No stock asset and no local usd
+            with self.assertRaises(FileNotFoundError):
+                params.get_robot_usd_path("WeCAR")
+        with self.assertRaises(ValueError):
+            params.get_robot_usd_path("Jetbot")
+
+
+if __name__ == "__main__":
+    unittest.main()